@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Parser Microbenchmarks - µs per record for the pure-Python extraction hot paths
+- Listing cards: extract_single_school_data, extract_email_from_school_element
+- Detail pages: the page_source fallbacks (fill_missing_from_page), parse_detail_page
+  and extract_value_from_element_text
+- Inputs are card / detail page markup rendered from the repo's recorded CSV rows
+  (synthetic fixtures when no CSV is present)
+- timeit based, results stored as JSON next to the end-to-end benchmark results
+
+Usage: python benchmark_parsers.py [csv_file ...]
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+from benchmark_suite import BENCHMARK_RESULTS_DIR, git_revision
+from detail_page_parser import (
+    BASIC_FIELDS_MAP, empty_detail_record, fill_missing_from_page, html_to_text, parse_detail_page,
+)
+from portal_fixtures import (
+    build_fixtures_from_csv, build_synthetic_fixtures, render_detail_page, render_school_card,
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Recorded rows turned into card / detail page samples
+PARSER_BENCH_SAMPLES = 500
+
+# timeit repeats per benchmark (best and median are reported)
+PARSER_BENCH_REPEAT = 5
+# ===== END CONFIGURATION SECTION =====
+
+CARD_BODY_PATTERN = re.compile(r'class="accordion-body">(.*)</div>\s*</div>\s*$', re.DOTALL)
+
+
+class RecordedElement:
+    """WebElement stand-in for a recorded card: innerHTML plus its rendered text"""
+
+    def __init__(self, inner_html):
+        self.inner_html = inner_html
+        self.text = html_to_text(inner_html)
+
+    def get_attribute(self, name):
+        return self.inner_html if name == 'innerHTML' else None
+
+
+def load_sample_schools(csv_files=None, limit=PARSER_BENCH_SAMPLES):
+    """School rows from recorded CSVs (Phase 2 files first, for real counts) or synthetic fixtures"""
+    if csv_files is None:
+        csv_files = sorted(glob.glob("*_phase2_complete_*.csv")) + sorted(glob.glob("*_phase1_complete_*.csv"))
+    schools = []
+    if csv_files:
+        schools = list(build_fixtures_from_csv(csv_files).schools_by_id.values())
+    if not schools:
+        logger.info("📋 No recorded CSVs found - using synthetic fixtures")
+        schools = list(build_synthetic_fixtures(states=1, districts_per_state=2,
+                                                schools_per_district=limit).schools_by_id.values())
+    return schools[:limit]
+
+
+def build_samples(schools):
+    """Card elements and (url, page_source, page_text) detail samples"""
+    cards = []
+    details = []
+    for school in schools:
+        card_match = CARD_BODY_PATTERN.search(render_school_card(school))
+        cards.append(RecordedElement(card_match.group(1)))
+        page_source = f"<html><body>{render_detail_page(school)}</body></html>"
+        details.append((school['know_more_link'], page_source, html_to_text(page_source)))
+    return cards, details
+
+
+def time_per_record(func, inputs, repeat=PARSER_BENCH_REPEAT):
+    """Best and median µs per input over `repeat` passes"""
+    runs = timeit.Timer(lambda: [func(item) for item in inputs]).repeat(repeat=repeat, number=1)
+    return {
+        'records': len(inputs),
+        'best_us': round(min(runs) / len(inputs) * 1e6, 2),
+        'median_us': round(statistics.median(runs) / len(inputs) * 1e6, 2),
+    }
+
+
+def detail_benchmarks(details):
+    """Benchmarks of the browser-free detail page parser"""
+    def fallback_fill(sample):
+        url, page_source, _ = sample
+        return fill_missing_from_page(empty_detail_record(url), page_source)
+
+    def full_parse(sample):
+        url, page_source, _ = sample
+        return parse_detail_page(page_source, url)
+
+    return [
+        ('detail_fill_missing_from_page', fallback_fill, details),
+        ('detail_parse_detail_page', full_parse, details),
+    ]
+
+
+def scraper_benchmarks(cards, details):
+    """Benchmarks of the scraper methods (need the scraper modules' dependencies)"""
+    benchmarks = []
+    try:
+        from phase1_statewise_scraper import StatewiseSchoolScraper
+        from sequential_state_processor import EnhancedStatewiseSchoolScraper
+        import phase2_automated_processor
+    except ImportError as e:
+        logger.warning(f"⚠️ Scraper modules not importable ({e}) - benchmarking the detail parser only")
+        return benchmarks
+
+    scraper = StatewiseSchoolScraper()
+    scraper.current_state = {'stateId': 130, 'stateName': 'BENCHMARK'}
+    scraper.current_district = {'districtId': 4001, 'districtName': 'BENCHMARK DISTRICT'}
+    enhanced = EnhancedStatewiseSchoolScraper()
+
+    phase2_automated_processor.GOOGLE_SHEETS_ENABLED = False
+    processor = phase2_automated_processor.AutomatedPhase2Processor()
+    labels = list(BASIC_FIELDS_MAP)
+
+    def value_from_text(sample):
+        page_text = sample[2]
+        return [processor.extract_value_from_element_text(page_text, label) for label in labels]
+
+    benchmarks.append(('card_extract_single_school_data', scraper.extract_single_school_data, cards))
+    benchmarks.append(('card_extract_email_from_school_element', enhanced.extract_email_from_school_element, cards))
+    benchmarks.append(('detail_extract_value_from_element_text', value_from_text, details))
+    return benchmarks
+
+
+def run_parser_benchmarks(schools, repeat=PARSER_BENCH_REPEAT, include_scrapers=True):
+    """Run every benchmark over the samples, return {name: timing}"""
+    cards, details = build_samples(schools)
+    benchmarks = detail_benchmarks(details)
+    if include_scrapers:
+        benchmarks = scraper_benchmarks(cards, details) + benchmarks
+
+    results = {}
+    for name, func, inputs in benchmarks:
+        results[name] = time_per_record(func, inputs, repeat)
+        logger.info(f"   ⏱️ {name}: {results[name]['best_us']:.1f} µs/record "
+                    f"(median {results[name]['median_us']:.1f})")
+    return results
+
+
+def save_parser_results(results, sample_count, results_dir=BENCHMARK_RESULTS_DIR):
+    """Write one JSON file per run"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    commit = git_revision()
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"parsers_{timestamp}_{commit}.json")
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({'timestamp': timestamp, 'git_commit': commit, 'samples': sample_count,
+                   'repeat': PARSER_BENCH_REPEAT, 'benchmarks': results}, handle, indent=2)
+    return path
+
+
+def main():
+    """Main function for the parser microbenchmarks"""
+    print("🚀 PARSER MICROBENCHMARKS")
+    print("µs per record for the card and detail page extraction code")
+    print()
+
+    schools = load_sample_schools(sys.argv[1:] or None)
+    logger.info(f"📊 Benchmarking with {len(schools)} recorded schools, {PARSER_BENCH_REPEAT} repeats")
+
+    results = run_parser_benchmarks(schools)
+    path = save_parser_results(results, len(schools))
+    print(f"\n✅ Results saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
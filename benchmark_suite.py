@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Reproducible end-to-end Phase 1 / Phase 2 timings
+- Starts the local portal (deterministic synthetic fixtures, fixed latency)
+- Phase 1: runs extract_schools_basic_data_enhanced / enhanced_click_next_page for one district
+- Phase 2: runs extract_focused_data over a fixed list of school detail pages
+- Reports p50/p95 page and school latency, WebDriver calls per record and records/minute
+- Stores every run as JSON in benchmark_results/ and compares it with the previous run
+
+Usage: python benchmark_suite.py [phase1|phase2|all]
+"""
+
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from local_portal_server import LocalPortalServer
+from portal_fixtures import DEFAULT_YEAR_CODE, build_synthetic_fixtures
+from stats_utils import percentile
+from webdriver_profiler import attach_profiler
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+BENCHMARK_RESULTS_DIR = "benchmark_results"
+
+# Fixture size: one district of 250 schools = 3 pages at 100 results per page
+BENCHMARK_SCHOOLS_PER_DISTRICT = 250
+BENCHMARK_PHASE2_SCHOOLS = 20
+
+# Fixed portal behaviour so that runs are comparable
+BENCHMARK_LATENCY_MS = 150
+BENCHMARK_JITTER_MS = 0
+BENCHMARK_SEED = 42
+
+# Metric change (fraction) reported as a regression against the previous run
+REGRESSION_THRESHOLD = 0.10
+# ===== END CONFIGURATION SECTION =====
+
+# Metrics compared between runs, and whether a higher value is better
+COMPARED_METRICS = {
+    'page_latency_p50': False,
+    'page_latency_p95': False,
+    'school_latency_p50': False,
+    'school_latency_p95': False,
+    'webdriver_calls_per_record': False,
+    'records_per_minute': True,
+}
+
+
+def git_revision():
+    """Short commit hash of the working tree, or 'unknown'"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=10).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def latency_summary(page_durations, school_durations, records, elapsed, profiler):
+    """Common metric block for a phase (WebDriver calls from a webdriver_profiler.WebDriverProfiler)"""
+    return {
+        'records': records,
+        'elapsed_seconds': round(elapsed, 3),
+        'page_latency_p50': round(percentile(page_durations, 50), 3),
+        'page_latency_p95': round(percentile(page_durations, 95), 3),
+        'school_latency_p50': round(percentile(school_durations, 50), 3),
+        'school_latency_p95': round(percentile(school_durations, 95), 3),
+        'webdriver_calls': profiler.total_calls,
+        'webdriver_calls_per_record': round(profiler.total_calls / records, 2) if records else 0,
+        'webdriver_seconds': round(profiler.total_seconds, 3),
+        'records_per_minute': round(records / elapsed * 60, 1) if elapsed > 0 else 0,
+        'calls_by_command': {command: calls for command, (calls, _) in
+                             sorted(profiler.by_command.items(), key=lambda item: -item[1][0])},
+    }
+
+
+def benchmark_phase1(portal):
+    """Paginated listing extraction for the first district of the first state"""
+    from sequential_state_processor import EnhancedStatewiseSchoolScraper
+
+    scraper = EnhancedStatewiseSchoolScraper()
+    scraper.setup_driver()  # raises when Chrome cannot be started
+
+    profiler = attach_profiler(scraper.driver, "benchmark_phase1", enabled=True)
+    page_starts = []
+    page_sizes = []
+    extract_page = scraper.extract_schools_from_current_page_with_email
+
+    def timed_extract_page():
+        page_starts.append(time.time())
+        schools = extract_page()
+        page_sizes.append(len(schools))
+        return schools
+
+    scraper.extract_schools_from_current_page_with_email = timed_extract_page
+
+    try:
+        if not scraper.navigate_to_portal():
+            raise RuntimeError("Local portal navigation failed")
+        state = scraper.extract_states_data()[0]
+        scraper.select_state(state)
+        district = scraper.extract_districts_data()[0]
+        scraper.select_district(district)
+        if not scraper.enhanced_click_search_button():
+            raise RuntimeError("Search failed on the local portal")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_dir = os.getcwd()
+            os.chdir(temp_dir)
+            try:
+                scraper.initialize_csv_file(state['stateName'])
+                profiler.reset()
+                start_time = time.time()
+                schools = scraper.extract_schools_basic_data_enhanced()
+                end_time = time.time()
+            finally:
+                os.chdir(original_dir)
+    finally:
+        profiler.detach()
+        scraper.driver.quit()
+
+    page_durations = [end - start for start, end in zip(page_starts, page_starts[1:] + [end_time])]
+    school_durations = [duration / size for duration, size in zip(page_durations, page_sizes) if size]
+
+    result = latency_summary(page_durations, school_durations, len(schools), end_time - start_time, profiler)
+    result['pages'] = len(page_starts)
+    result['district'] = district['districtName']
+    return result
+
+
+def benchmark_phase2(portal):
+    """Detail page extraction for a fixed list of schools"""
+    import phase2_automated_processor
+    phase2_automated_processor.GOOGLE_SHEETS_ENABLED = False
+    processor = phase2_automated_processor.AutomatedPhase2Processor()
+    processor.setup_driver()  # raises when Chrome cannot be started
+
+    schools = sorted(portal.fixtures.schools_by_id.values(), key=lambda school: school['school_id'])
+    urls = [f"{portal.base_url}#/schooldetail/{school['school_id']}/{DEFAULT_YEAR_CODE}"
+            for school in schools[:BENCHMARK_PHASE2_SCHOOLS]]
+
+    profiler = attach_profiler(processor.driver, "benchmark_phase2", enabled=True)
+    school_durations = []
+    status_counts = {}
+    start_time = time.time()
+    try:
+        for url in urls:
+            school_start = time.time()
+            data = processor.extract_focused_data(url)
+            school_durations.append(time.time() - school_start)
+            status = data.get('extraction_status', 'UNKNOWN') if data else 'NONE'
+            status_counts[status] = status_counts.get(status, 0) + 1
+    finally:
+        elapsed = time.time() - start_time
+        profiler.detach()
+        processor.driver.quit()
+
+    # One detail page per school: page and school latency are the same
+    result = latency_summary(school_durations, school_durations, len(urls), elapsed, profiler)
+    result['status_counts'] = status_counts
+    return result
+
+
+def load_previous_results(results_dir=BENCHMARK_RESULTS_DIR):
+    """Most recent stored benchmark run, or None"""
+    files = sorted(glob.glob(os.path.join(results_dir, "benchmark_*.json")))
+    if not files:
+        return None
+    with open(files[-1], 'r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def compare_results(previous, current, threshold=REGRESSION_THRESHOLD):
+    """List of (phase, metric, old, new, change, regressed) for the compared metrics"""
+    comparisons = []
+    for phase in ('phase1', 'phase2'):
+        if phase not in previous or phase not in current:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old = previous[phase].get(metric)
+            new = current[phase].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regressed = change < -threshold if higher_is_better else change > threshold
+            comparisons.append((phase, metric, old, new, change, regressed))
+    return comparisons
+
+
+def save_results(results, results_dir=BENCHMARK_RESULTS_DIR):
+    """Write one JSON file per run"""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"benchmark_{results['timestamp']}_{results['git_commit']}.json")
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2)
+    return path
+
+
+def show_report(results, comparisons):
+    """Log the metrics of this run and the changes since the previous one"""
+    logger.info(f"\n{'='*80}")
+    logger.info(f"🎯 BENCHMARK RESULTS ({results['git_commit']})")
+    logger.info(f"{'='*80}")
+    for phase in ('phase1', 'phase2'):
+        if phase not in results:
+            continue
+        metrics = results[phase]
+        logger.info(f"📊 {phase.upper()}: {metrics['records']} records in {metrics['elapsed_seconds']:.1f}s")
+        logger.info(f"   📄 Page latency p50/p95: {metrics['page_latency_p50']:.2f}s / {metrics['page_latency_p95']:.2f}s")
+        logger.info(f"   🏫 School latency p50/p95: {metrics['school_latency_p50']:.3f}s / {metrics['school_latency_p95']:.3f}s")
+        logger.info(f"   🔌 WebDriver calls: {metrics['webdriver_calls']} ({metrics['webdriver_calls_per_record']} per record)")
+        logger.info(f"   🚀 Throughput: {metrics['records_per_minute']} records/min")
+
+    if comparisons:
+        logger.info("📈 Change since previous run:")
+        for phase, metric, old, new, change, regressed in comparisons:
+            marker = "❌ REGRESSION" if regressed else "✅"
+            logger.info(f"   {marker} {phase}.{metric}: {old} → {new} ({change*100:+.1f}%)")
+
+
+def run_benchmarks(phases=('phase1', 'phase2')):
+    """Run the selected phases against a fresh local portal and store the results"""
+    fixtures = build_synthetic_fixtures(states=1, districts_per_state=1,
+                                        schools_per_district=BENCHMARK_SCHOOLS_PER_DISTRICT, seed=BENCHMARK_SEED)
+    portal = LocalPortalServer(fixtures, port=0, latency_ms=BENCHMARK_LATENCY_MS,
+                               jitter_ms=BENCHMARK_JITTER_MS, seed=BENCHMARK_SEED).start()
+
+    # portal_config reads these when the scrapers are first imported
+    os.environ.update(portal.scraper_environment())
+    os.environ.setdefault("CHROME_HEADLESS", "1")
+
+    results = {
+        'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+        'git_commit': git_revision(),
+        'config': {
+            'schools_per_district': BENCHMARK_SCHOOLS_PER_DISTRICT,
+            'phase2_schools': BENCHMARK_PHASE2_SCHOOLS,
+            'latency_ms': BENCHMARK_LATENCY_MS,
+            'jitter_ms': BENCHMARK_JITTER_MS,
+        },
+    }
+    try:
+        if 'phase1' in phases:
+            logger.info("🚀 Benchmarking Phase 1 listing extraction...")
+            results['phase1'] = benchmark_phase1(portal)
+        if 'phase2' in phases:
+            logger.info("🚀 Benchmarking Phase 2 detail extraction...")
+            results['phase2'] = benchmark_phase2(portal)
+    finally:
+        results['portal'] = portal.stats()
+        portal.stop()
+
+    previous = load_previous_results()
+    comparisons = compare_results(previous, results) if previous else []
+    path = save_results(results)
+    show_report(results, comparisons)
+    logger.info(f"📁 Results saved: {path}")
+    return results, comparisons
+
+
+def main():
+    """Main function for the benchmark suite"""
+    print("🚀 SCRAPER BENCHMARK SUITE")
+    print("Phase 1 and Phase 2 against the local portal")
+    print()
+
+    choice = sys.argv[1] if len(sys.argv) > 1 else 'all'
+    phases = ('phase1', 'phase2') if choice == 'all' else (choice,)
+
+    _, comparisons = run_benchmarks(phases)
+    if any(regressed for *_, regressed in comparisons):
+        print("\n❌ Regressions detected against the previous run")
+        sys.exit(1)
+    print("\n✅ Benchmark completed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Browser Cache - Seeded HTTP disk cache for every scraper browser
+- Every driver used to start on an empty profile and download the portal's Angular
+  bundle, stylesheets and fonts again after each launch
+- A read-only template holds the disk cache of one browser that loaded the portal
+  (python browser_cache.py --seed); every launch copies it into its own
+  user-data-dir, so static assets come from the local cache from the first page on
+- Only the cache folders are copied, never cookies or local storage, so workers do
+  not share a session; Chrome cannot share one user-data-dir between browsers
+- Without a seeded template browsers keep Chrome's own temporary profile
+- A worker profile is removed when its driver quits (remove_profile_on_quit), the
+  rest at exit, and those of dead processes on the next start
+- Cache hits show up in the network statistics (NETWORK_STATS=1) under the
+  profile name with "+cache", next to the runs without the cache
+
+Usage: python browser_cache.py --seed   (seed or refresh the template)
+       python browser_cache.py          (show the template)
+"""
+
+import atexit
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Start browsers on a copy of the seeded cache (BROWSER_CACHE=0 = empty profiles)
+BROWSER_CACHE = os.environ.get("BROWSER_CACHE", "1") == "1"
+
+# Template and per-worker profiles
+BROWSER_CACHE_DIR = os.environ.get("BROWSER_CACHE_DIR", "browser_cache")
+
+# Disk cache limit per browser
+BROWSER_CACHE_SIZE_MB = 200
+
+# Profile folders that make up the HTTP and compiled-script caches
+CACHE_FOLDERS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+]
+
+# Seconds the seeding browser stays on the portal so the lazy chunks load
+SEED_SETTLE_SECONDS = 10
+# ===== END CONFIGURATION SECTION =====
+
+SEED_INFO_FILE = "seeded.json"
+
+_worker_dirs = []
+_cleanup_registered = False
+
+
+def template_dir(cache_dir=BROWSER_CACHE_DIR):
+    return os.path.join(cache_dir, "template")
+
+
+def workers_dir(cache_dir=BROWSER_CACHE_DIR):
+    return os.path.join(cache_dir, "workers")
+
+
+def seed_info(cache_dir=BROWSER_CACHE_DIR):
+    """Information on the seeded template, None when it was not seeded"""
+    try:
+        with open(os.path.join(template_dir(cache_dir), SEED_INFO_FILE), 'r', encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def folder_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+def copy_cache_folders(source, target):
+    """Copy the cache folders of one user-data-dir into another"""
+    for folder in CACHE_FOLDERS:
+        if os.path.isdir(os.path.join(source, folder)):
+            shutil.copytree(os.path.join(source, folder), os.path.join(target, folder), dirs_exist_ok=True)
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True   # exists, owned by someone else
+    return True
+
+
+def prune_worker_dirs(cache_dir=BROWSER_CACHE_DIR):
+    """Remove worker profiles left behind by processes that are gone"""
+    root = workers_dir(cache_dir)
+    if not os.path.isdir(root):
+        return 0
+    removed = 0
+    for name in os.listdir(root):
+        pid = name.split('_', 1)[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not process_alive(int(pid)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def remove_worker_dirs():
+    """Remove the worker profiles of this process (at exit)"""
+    while _worker_dirs:
+        shutil.rmtree(_worker_dirs.pop(), ignore_errors=True)
+
+
+def release_worker_dir(path):
+    """Remove one worker profile (its browser has quit)"""
+    if path in _worker_dirs:
+        _worker_dirs.remove(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_profile_on_quit(driver, path):
+    """Make driver.quit() also remove the driver's worker profile"""
+    original_quit = driver.quit
+
+    def quit(*args, **kwargs):
+        try:
+            return original_quit(*args, **kwargs)
+        finally:
+            release_worker_dir(path)
+
+    driver.quit = quit
+    return driver
+
+
+def worker_profile_dir(cache_dir=BROWSER_CACHE_DIR):
+    """New user-data-dir for one browser holding a copy of the seeded cache,
+    None when there is no template (Chrome's temporary profile is used then)"""
+    if seed_info(cache_dir) is None:
+        return None
+    root = workers_dir(cache_dir)
+    os.makedirs(root, exist_ok=True)
+    global _cleanup_registered
+    if not _cleanup_registered:
+        _cleanup_registered = True
+        prune_worker_dirs(cache_dir)
+        atexit.register(remove_worker_dirs)
+    path = tempfile.mkdtemp(prefix=f"{os.getpid()}_", dir=root)
+    _worker_dirs.append(path)
+    copy_cache_folders(template_dir(cache_dir), path)
+    return path
+
+
+def apply_cache_profile(options, profile_dir):
+    """Point ChromeOptions at a worker user-data-dir with a bounded disk cache"""
+    options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    options.add_argument(f"--disk-cache-size={BROWSER_CACHE_SIZE_MB * 1024 * 1024}")
+    return options
+
+
+def save_template(profile_dir, cache_dir=BROWSER_CACHE_DIR, **details):
+    """Replace the template with the cache folders of a browser profile"""
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix="template_", dir=cache_dir)
+    copy_cache_folders(profile_dir, staging)
+    info = {'seeded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'size_mb': round(folder_size_mb(staging), 1), **details}
+    with open(os.path.join(staging, SEED_INFO_FILE), 'w', encoding='utf-8') as handle:
+        json.dump(info, handle, indent=2)
+    template = template_dir(cache_dir)
+    previous = f"{template}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(template):
+        os.replace(template, previous)
+    os.replace(staging, template)
+    shutil.rmtree(previous, ignore_errors=True)
+    return info
+
+
+def seed_template(cache_dir=BROWSER_CACHE_DIR):
+    """Load the portal once in a fresh profile and keep its cache as the template"""
+    from driver_factory import launch_chrome
+    from portal_config import UDISE_PORTAL_URL
+
+    profile_dir = tempfile.mkdtemp(prefix="seed_")
+    driver = None
+    try:
+        driver = launch_chrome(profile_dir=profile_dir)
+        driver.get(UDISE_PORTAL_URL)
+        time.sleep(SEED_SETTLE_SECONDS)
+        driver.quit()   # Chrome writes its cache index on exit
+        driver = None
+        return save_template(profile_dir, cache_dir, url=UDISE_PORTAL_URL)
+    finally:
+        if driver is not None:
+            driver.quit()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def main():
+    """Seed the template or show what it holds"""
+    if '--seed' in sys.argv[1:]:
+        print("🗄️ Seeding the browser cache template...")
+        info = seed_template()
+        print(f"✅ Template seeded: {info['size_mb']} MB at {template_dir()}")
+        return
+
+    info = seed_info()
+    if info is None:
+        print("❌ No browser cache template yet - run: python browser_cache.py --seed")
+        return
+    print("🗄️ BROWSER CACHE TEMPLATE")
+    print("=" * 50)
+    print(f"   Path:    {template_dir()}")
+    print(f"   Seeded:  {info.get('seeded_at')} from {info.get('url', '?')}")
+    print(f"   Size:    {info.get('size_mb')} MB")
+    print(f"   Enabled: {'yes' if BROWSER_CACHE else 'no (BROWSER_CACHE=0)'}")
+
+
+if __name__ == "__main__":
+    main()
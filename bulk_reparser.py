@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Bulk Reparser - Multi-core re-extraction of cached Phase 2 detail pages
+- Shards the keys of the detail page cache across a multiprocessing pool
+- Each worker opens its own read connection and runs the shared detail page parser
+- Results are joined back onto the Phase 1 rows and written as a Phase 2 output CSV
+- Reports throughput in pages/sec overall and per core
+
+Usage: python bulk_reparser.py [STATE] [phase1_csv]
+"""
+
+import csv
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime
+
+from detail_page_cache import DETAIL_PAGE_CACHE_DB, DetailPageCache
+from detail_page_parser import empty_detail_record, parse_detail_page, parse_school_url
+from snapshot_merger import clean_state_name
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Number of worker processes (None = one per CPU core)
+REPARSE_WORKERS = None
+
+# Cache keys handed to a worker per task
+SHARD_SIZE = 250
+
+# Columns dropped from the combined output (same as the standalone Phase 2 processor)
+UNWANTED_COLUMNS = ['last_modified', 'source_url']
+# ===== END CONFIGURATION SECTION =====
+
+STATUS_FIELDS = ['extraction_status', 'fields_extracted', 'critical_fields_extracted']
+
+# Per-process cache connection, opened by the pool initializer
+_worker_cache = None
+
+
+def init_worker(db_path):
+    """Pool initializer: open one read connection per worker process"""
+    global _worker_cache
+    _worker_cache = DetailPageCache(db_path)
+
+
+def parse_shard(keys):
+    """Worker task: parse the cached pages of a shard of (school_id, year_code) keys"""
+    cpu_start = time.process_time()
+    results = []
+    for school_id, year_code in keys:
+        entry = _worker_cache.get_entry(school_id, year_code)
+        if entry is None:
+            continue
+        url, state, page_source = entry
+        data = parse_detail_page(page_source, url)
+        data['school_id'] = school_id
+        data['year_code'] = year_code
+        data['state'] = state or 'N/A'
+        results.append(data)
+    return results, time.process_time() - cpu_start
+
+
+def load_phase1_rows(phase1_csv):
+    """Return (header, {school_id: row}) of a Phase 1 CSV"""
+    rows = {}
+    with open(phase1_csv, 'r', newline='', encoding='utf-8') as handle:
+        reader = csv.DictReader(handle)
+        header = reader.fieldnames or []
+        for row in reader:
+            school_id, _ = parse_school_url(row.get('know_more_link'))
+            if school_id:
+                rows[school_id] = row
+    logger.info(f"📊 Loaded {len(rows)} Phase 1 rows with detail links from {phase1_csv}")
+    return header, rows
+
+
+class BulkReparser:
+    """Re-parse cached detail pages on every core"""
+
+    def __init__(self, state_name=None, phase1_csv=None, db_path=DETAIL_PAGE_CACHE_DB,
+                 workers=REPARSE_WORKERS, output_csv=None):
+        self.state_name = state_name
+        self.phase1_csv = phase1_csv
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = clean_state_name(state_name) if state_name else "ALL_STATES"
+        self.output_csv = output_csv or f"{prefix}_phase2_reparsed_{timestamp}.csv"
+
+        self.pages_parsed = 0
+        self.rows_written = 0
+        self.worker_cpu_seconds = 0.0
+        self.elapsed_seconds = 0.0
+        self.status_counts = {}
+
+    def build_fieldnames(self, phase1_header):
+        """Phase 1 columns followed by the detail page columns"""
+        detail_fields = ['school_id', 'year_code'] + list(empty_detail_record()) + STATUS_FIELDS
+        if not phase1_header:
+            return ['state'] + detail_fields
+        fieldnames = [column for column in phase1_header if column not in UNWANTED_COLUMNS]
+        fieldnames += [field for field in detail_fields if field not in fieldnames and field not in UNWANTED_COLUMNS]
+        return fieldnames
+
+    def run(self):
+        """Shard, parse in parallel and write the combined CSV"""
+        cache = DetailPageCache(self.db_path)
+        try:
+            keys = cache.keys(self.state_name)
+        finally:
+            cache.close()
+
+        if not keys:
+            logger.warning(f"⚠️ No cached pages found{' for ' + self.state_name if self.state_name else ''}")
+            return None
+
+        phase1_header, phase1_rows = ([], {})
+        if self.phase1_csv:
+            phase1_header, phase1_rows = load_phase1_rows(self.phase1_csv)
+
+        shards = [keys[i:i + SHARD_SIZE] for i in range(0, len(keys), SHARD_SIZE)]
+        logger.info(f"🚀 Reparsing {len(keys)} cached pages in {len(shards)} shards on {self.workers} workers")
+
+        start_time = time.time()
+        with open(self.output_csv, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, fieldnames=self.build_fieldnames(phase1_header),
+                                    restval='N/A', extrasaction='ignore')
+            writer.writeheader()
+
+            with multiprocessing.Pool(self.workers, initializer=init_worker, initargs=(self.db_path,)) as pool:
+                for results, cpu_seconds in pool.imap_unordered(parse_shard, shards):
+                    self.worker_cpu_seconds += cpu_seconds
+                    for data in results:
+                        self.write_result(writer, data, phase1_rows)
+
+                    logger.info(f"   📄 Reparsed {self.pages_parsed}/{len(keys)} pages")
+
+        self.elapsed_seconds = time.time() - start_time
+        self.show_throughput_report()
+        return self.output_csv
+
+    def write_result(self, writer, data, phase1_rows):
+        """Write one parsed page, combined with its Phase 1 row when available"""
+        self.pages_parsed += 1
+        self.status_counts[data['extraction_status']] = self.status_counts.get(data['extraction_status'], 0) + 1
+
+        phase1_row = phase1_rows.get(data['school_id'])
+        if phase1_rows and phase1_row is None:
+            # Cached page of a school outside this Phase 1 file
+            return
+
+        combined_data = dict(phase1_row) if phase1_row else {}
+        combined_data.update(data)
+        writer.writerow(combined_data)
+        self.rows_written += 1
+
+    def show_throughput_report(self):
+        """Log pages/sec overall and per core"""
+        pages_per_second = self.pages_parsed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0
+        cpu_pages_per_second = self.pages_parsed / self.worker_cpu_seconds if self.worker_cpu_seconds > 0 else 0
+
+        logger.info(f"\n{'='*80}")
+        logger.info("🎯 BULK REPARSE COMPLETED")
+        logger.info(f"{'='*80}")
+        logger.info(f"📊 Pages parsed: {self.pages_parsed}")
+        logger.info(f"📝 Rows written: {self.rows_written}")
+        for status, count in sorted(self.status_counts.items()):
+            logger.info(f"   {status}: {count}")
+        logger.info(f"⏱️ Wall time: {self.elapsed_seconds:.2f}s with {self.workers} workers")
+        logger.info(f"🚀 Throughput: {pages_per_second:.0f} pages/sec, "
+                    f"{pages_per_second / self.workers:.0f} pages/sec/core")
+        logger.info(f"🧮 Parser CPU rate: {cpu_pages_per_second:.0f} pages/sec per busy core")
+        logger.info(f"📁 Output file: {self.output_csv}")
+
+
+def main():
+    """Main function for the bulk reparser"""
+    print("🚀 BULK REPARSER")
+    print("Re-extracts cached detail pages on every CPU core")
+    print()
+
+    if not os.path.exists(DETAIL_PAGE_CACHE_DB):
+        print(f"❌ Cache database not found: {DETAIL_PAGE_CACHE_DB}")
+        return
+
+    state_name = sys.argv[1] if len(sys.argv) > 1 else None
+    phase1_csv = sys.argv[2] if len(sys.argv) > 2 else None
+
+    reparser = BulkReparser(state_name, phase1_csv)
+    output_csv = reparser.run()
+
+    if output_csv:
+        print(f"\n✅ Reparse completed: {output_csv}")
+    else:
+        print("\n❌ Nothing to reparse. Check logs for details.")
+
+
+if __name__ == "__main__":
+    main()
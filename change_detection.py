@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Change Detection - Incremental refresh support for Phase 2
+- Fingerprints each school's Phase 1 listing fields plus last_modified
+- Compares the current listing with the fingerprint store of the previous run
+- Queues only new or changed schools for detail page extraction
+- Store is one small JSON file per state, updated after each successful extraction
+
+Usage: python change_detection.py seed <phase1_csv> [phase2_csv]
+       python change_detection.py diff <phase1_csv>
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+
+from snapshot_merger import MISSING_VALUES, clean_state_name, school_key, state_from_filename
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Directory holding the per-state fingerprint stores
+CHANGE_STORE_DIR = "change_store"
+
+# Listing card fields that describe a school in Phase 1. A change in any of these
+# (or in last_modified) means the detail page has to be visited again.
+LISTING_FIELDS = [
+    'school_name', 'udise_code', 'operational_status', 'edu_district', 'edu_block',
+    'academic_year', 'school_category', 'school_management', 'class_range',
+    'school_type', 'school_location', 'address', 'pin_code', 'email', 'last_modified',
+]
+
+# Persist the store every N extractions so a crash loses little progress
+SAVE_EVERY = 25
+
+# Extraction statuses that mean the detail data was not (fully) captured; such
+# schools are queued again on the next run (gap_repair.RETRY_STATUSES)
+FAILED_STATUSES = {'FAILED', 'PARTIAL', 'ERROR'}
+
+
+def normalize_value(value):
+    """Normalize a CSV/pandas value for fingerprinting"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        # pandas turns numeric columns with blanks into floats (NaN, 403001.0)
+        if value != value:
+            return ''
+        if value.is_integer():
+            value = int(value)
+    text = str(value).strip()
+    return '' if text in MISSING_VALUES else text
+
+
+def listing_fingerprint(row):
+    """Return a stable hash of the listing fields of a school row"""
+    payload = '\x1f'.join(normalize_value(row.get(field)) for field in LISTING_FIELDS)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ListingChangeDetector:
+    """Tracks listing fingerprints of schools whose details were extracted"""
+
+    def __init__(self, state_name, store_dir=CHANGE_STORE_DIR):
+        self.state_name = state_name
+        self.store_dir = store_dir
+        self.store_file = os.path.join(store_dir, f"{clean_state_name(state_name)}_listing_fingerprints.json")
+        self.fingerprints = {}
+        self.pending_updates = 0
+
+        self.new_count = 0
+        self.changed_count = 0
+        self.unchanged_count = 0
+
+        self.load()
+
+    def load(self):
+        """Load the fingerprint store of the previous run"""
+        try:
+            if os.path.exists(self.store_file):
+                with open(self.store_file, 'r', encoding='utf-8') as handle:
+                    self.fingerprints = json.load(handle).get('schools', {})
+                logger.info(f"📂 Loaded {len(self.fingerprints)} listing fingerprints from {self.store_file}")
+            else:
+                logger.info(f"📂 No fingerprint store for {self.state_name} yet - all schools are new")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read fingerprint store {self.store_file}: {e}")
+            self.fingerprints = {}
+
+    def save(self):
+        """Write the store atomically (temp file + rename)"""
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            temp_file = f"{self.store_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as handle:
+                json.dump({
+                    'state': self.state_name,
+                    'updated': datetime.now().isoformat(),
+                    'schools': self.fingerprints,
+                }, handle)
+            os.replace(temp_file, self.store_file)
+            self.pending_updates = 0
+            logger.debug(f"💾 Saved {len(self.fingerprints)} fingerprints to {self.store_file}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error saving fingerprint store: {e}")
+            return False
+
+    def classify(self, row):
+        """Return 'new', 'changed' or 'unchanged' for a listing row"""
+        previous = self.fingerprints.get(school_key(row))
+        if previous is None:
+            return 'new'
+        if previous != listing_fingerprint(row):
+            return 'changed'
+        return 'unchanged'
+
+    def needs_refresh(self, row):
+        """True if the school's detail page should be (re)extracted"""
+        status = self.classify(row)
+        if status == 'new':
+            self.new_count += 1
+        elif status == 'changed':
+            self.changed_count += 1
+        else:
+            self.unchanged_count += 1
+        return status != 'unchanged'
+
+    def filter_changed(self, schools_df):
+        """Return only the rows of a Phase 1 DataFrame that are new or changed"""
+        mask = [self.needs_refresh(school.to_dict()) for _, school in schools_df.iterrows()]
+        changed_df = schools_df[mask].copy() if len(schools_df) else schools_df
+        self.log_summary(len(schools_df))
+        return changed_df
+
+    def log_summary(self, total):
+        """Log how much of the state needs a refresh"""
+        queued = self.new_count + self.changed_count
+        logger.info(f"🔍 Change detection for {self.state_name}:")
+        logger.info(f"   🆕 New: {self.new_count}")
+        logger.info(f"   ✏️ Changed: {self.changed_count}")
+        logger.info(f"   ⏭️ Unchanged (skipped): {self.unchanged_count}")
+        if total:
+            logger.info(f"   🎯 Queued for Phase 2: {queued}/{total} ({queued/total*100:.1f}%)")
+
+    def mark_extracted(self, row, extraction_status=None):
+        """Record the listing fingerprint of a school whose details were extracted"""
+        if extraction_status in FAILED_STATUSES:
+            return
+        self.fingerprints[school_key(row)] = listing_fingerprint(row)
+        self.pending_updates += 1
+        if self.pending_updates >= SAVE_EVERY:
+            self.save()
+
+    def finalize(self):
+        """Flush remaining updates to disk"""
+        if self.pending_updates:
+            self.save()
+
+
+def read_rows(csv_file):
+    """Stream the rows of a CSV file as dicts"""
+    with open(csv_file, 'r', newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            yield row
+
+
+def seed_store(phase1_csv, phase2_csv=None):
+    """Seed a state's store from an existing run.
+
+    Fingerprints come from the Phase 1 listing (Phase 2 outputs drop
+    last_modified). If a Phase 2 output is given, only schools it extracted
+    successfully are recorded.
+    """
+    state_name = state_from_filename(phase1_csv)
+    detector = ListingChangeDetector(state_name)
+
+    extracted_keys = None
+    if phase2_csv:
+        extracted_keys = {
+            school_key(row) for row in read_rows(phase2_csv)
+            if normalize_value(row.get('extraction_status')) not in FAILED_STATUSES
+        }
+        logger.info(f"📊 {len(extracted_keys)} extracted schools found in {phase2_csv}")
+
+    seeded = 0
+    for row in read_rows(phase1_csv):
+        if extracted_keys is not None and school_key(row) not in extracted_keys:
+            continue
+        detector.fingerprints[school_key(row)] = listing_fingerprint(row)
+        seeded += 1
+
+    detector.save()
+    logger.info(f"✅ Seeded {seeded} fingerprints into {detector.store_file}")
+    return detector
+
+
+def diff_listing(phase1_csv):
+    """Report new/changed/unchanged counts of a Phase 1 file against the store"""
+    detector = ListingChangeDetector(state_from_filename(phase1_csv))
+    total = 0
+    for row in read_rows(phase1_csv):
+        detector.needs_refresh(row)
+        total += 1
+    detector.log_summary(total)
+    return detector
+
+
+def main():
+    """Main function for the change detection store"""
+    print("🚀 CHANGE DETECTION STORE")
+    print("Tracks listing fingerprints so Phase 2 only revisits new or changed schools")
+    print()
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('seed', 'diff'):
+        print("Usage: python change_detection.py seed <phase1_csv> [phase2_csv]")
+        print("       python change_detection.py diff <phase1_csv>")
+        return
+
+    if sys.argv[1] == 'seed':
+        seed_store(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    else:
+        diff_listing(sys.argv[2])
+
+
+if __name__ == "__main__":
+    main()
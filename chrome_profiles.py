@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Chrome Profiles - Headless execution and per-worker memory for dense worker packing
+- CHROME_HEADLESS=1 starts Chrome's new headless mode through undetected-chromedriver
+  (uc.Chrome(headless=True)), so uc still masks the HeadlessChrome user agent and the
+  headless navigator properties; no display, GPU or compositor per worker
+- Every driver gets the same fixed viewport (CHROME_WINDOW_SIZE) instead of
+  maximize_window(), headed or headless, so the portal renders the same layout
+- browser_memory_mb() sums the proportional set size (PSS) of a driver's browser
+  process tree from /proc; the scrapers log it when a driver closes
+
+Usage: python chrome_profiles.py [WORKERS]
+       (starts WORKERS headless browsers on the portal, measures memory per worker
+        and estimates how many workers fit in the available memory)
+"""
+
+import logging
+import os
+import sys
+
+from portal_config import CHROME_HEADLESS, UDISE_PORTAL_URL
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Fixed viewport of every driver (WIDTHxHEIGHT)
+CHROME_WINDOW_SIZE = os.environ.get("CHROME_WINDOW_SIZE", "1366x768")
+
+# Extra switches for headless workers: no scrollbars/audio, fewer renderer processes
+HEADLESS_ARGUMENTS = [
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--renderer-process-limit=2",
+]
+
+# Memory kept free for the OS when estimating workers per machine
+MEMORY_RESERVE_MB = 1024
+# ===== END CONFIGURATION SECTION =====
+
+
+def window_size():
+    """(width, height) of CHROME_WINDOW_SIZE"""
+    width, _, height = CHROME_WINDOW_SIZE.lower().partition('x')
+    return int(width), int(height)
+
+
+def apply_window_profile(options, headless=None):
+    """Add the fixed viewport (and the headless worker switches) to ChromeOptions"""
+    headless = CHROME_HEADLESS if headless is None else headless
+    width, height = window_size()
+    options.add_argument(f"--window-size={width},{height}")
+    if headless:
+        for argument in HEADLESS_ARGUMENTS:
+            options.add_argument(argument)
+    return options
+
+
+def start_chrome(options, headless=None, **kwargs):
+    """uc.Chrome with the window profile; headless through uc so its headless patches apply"""
+    import undetected_chromedriver as uc
+
+    headless = CHROME_HEADLESS if headless is None else headless
+    apply_window_profile(options, headless)
+    driver = uc.Chrome(options=options, headless=headless, **kwargs)
+    if not headless:
+        # A headed window may be resized by the window manager; pin the viewport
+        driver.set_window_size(*window_size())
+    return driver
+
+
+def process_children():
+    """parent pid -> child pids of all processes (from /proc/*/stat)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, ...
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(pid, children=None):
+    """pid and all of its descendants"""
+    children = process_children() if children is None else children
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        pending.extend(children.get(current, []))
+    return pids
+
+
+def process_memory_kb(pid):
+    """Proportional set size of a process in KB (resident size where PSS is unavailable)"""
+    for path, field in ((f'/proc/{pid}/smaps_rollup', 'Pss:'), (f'/proc/{pid}/status', 'VmRSS:')):
+        try:
+            with open(path, 'r') as handle:
+                for line in handle:
+                    if line.startswith(field):
+                        return int(line.split()[1])
+        except OSError:
+            continue
+    return 0
+
+
+def driver_root_pid(driver):
+    """Browser pid of a uc driver, else the chromedriver service pid"""
+    pid = getattr(driver, 'browser_pid', None)
+    if not pid:
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        pid = getattr(process, 'pid', None)
+    return pid
+
+
+def browser_memory_mb(driver):
+    """(processes, MB) of the driver's browser process tree; (0, 0.0) when unknown"""
+    pid = driver_root_pid(driver)
+    if not pid or not os.path.isdir('/proc'):
+        return 0, 0.0
+    pids = process_tree(pid)
+    return len(pids), sum(process_memory_kb(child) for child in pids) / 1024
+
+
+def log_browser_memory(driver, label):
+    """Log the memory of one driver's browser (per worker)"""
+    try:
+        processes, memory_mb = browser_memory_mb(driver)
+    except Exception as e:
+        logger.debug(f"Browser memory not available: {e}")
+        return None
+    if processes:
+        logger.info(f"🧠 {label}: {memory_mb:.0f} MB in {processes} browser processes "
+                    f"({'headless' if CHROME_HEADLESS else 'headed'}, {CHROME_WINDOW_SIZE})")
+    return memory_mb
+
+
+def available_memory_mb():
+    """MemAvailable of /proc/meminfo in MB (0 when unknown)"""
+    try:
+        with open('/proc/meminfo', 'r') as handle:
+            for line in handle:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0
+
+
+def main():
+    """Measure memory per worker with WORKERS browsers on the portal"""
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 2
+    import undetected_chromedriver as uc
+
+    print("🧠 CHROME MEMORY PER WORKER")
+    print(f"{workers} {'headless' if CHROME_HEADLESS else 'headed'} browsers, viewport {CHROME_WINDOW_SIZE}")
+    print()
+
+    drivers = []
+    try:
+        for _ in range(workers):
+            options = uc.ChromeOptions()
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--disable-gpu")
+            driver = start_chrome(options, version_main=138)
+            driver.get(UDISE_PORTAL_URL)
+            drivers.append(driver)
+
+        memory = [browser_memory_mb(driver)[1] for driver in drivers]
+        for number, memory_mb in enumerate(memory, 1):
+            print(f"   Worker {number}: {memory_mb:.0f} MB")
+        per_worker = sum(memory) / len(memory)
+        free_mb = available_memory_mb()
+        print(f"\n📊 {per_worker:.0f} MB per worker, {free_mb:.0f} MB available")
+        if per_worker:
+            print(f"🎯 About {int(max(0, free_mb - MEMORY_RESERVE_MB) // per_worker) + workers} workers fit on this machine")
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Completeness Verifier - Compare scraped Phase 1 rows with the portal's district counts
+- Joins per-district row counts of a Phase 1 file (grouped by district) with the
+  district totals of the school counting tool (*_school_counts.csv)
+- Rows are deduplicated by school key, so repeated pages do not hide gaps
+- With the page_number column, short districts are narrowed to the missing page
+  ranges; older files without it get the whole district
+- Writes a repair schedule (work_plans/repair_*.json) that work_planner.py runs,
+  so only the missing ranges are re-scraped
+
+Usage: python completeness_verifier.py PHASE1_FILE.csv [WORKERS] [counts.csv ...]
+"""
+
+import csv
+import logging
+import math
+import sys
+
+from processing_time_calculator import ProcessingTimeCalculator
+from snapshot_merger import MISSING_VALUES, school_key
+from work_planner import (PLAN_PAGE_SIZE, UNIT_OVERHEAD_SECONDS, PAGE_SKIP_SECONDS, load_district_counts,
+                          save_schedule, schedule_from_units)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Schools a district may be short before it is reported (counts drift between runs)
+COUNT_TOLERANCE = 0
+
+
+def scan_phase1_file(csv_file):
+    """Per district: unique school keys and rows per results page"""
+    districts = {}
+    has_page_numbers = False
+    with open(csv_file, 'r', encoding='utf-8', newline='') as handle:
+        reader = csv.DictReader(handle)
+        has_page_numbers = 'page_number' in (reader.fieldnames or [])
+        for row in reader:
+            key = ((row.get('state') or '').strip(), (row.get('district') or '').strip())
+            district = districts.setdefault(key, {'schools': set(), 'pages': {}})
+            school = school_key(row)
+            if school in district['schools']:
+                continue
+            district['schools'].add(school)
+            page = (row.get('page_number') or '').strip()
+            if has_page_numbers and page not in MISSING_VALUES:
+                page = int(float(page))
+                district['pages'][page] = district['pages'].get(page, 0) + 1
+    return districts, has_page_numbers
+
+
+def missing_page_ranges(expected, pages, page_size=PLAN_PAGE_SIZE):
+    """[(first_page, last_page)] of pages holding fewer rows than the count implies"""
+    total_pages = math.ceil(expected / page_size)
+    missing = []
+    for page in range(1, total_pages + 1):
+        expected_rows = min(page_size, expected - (page - 1) * page_size)
+        if pages.get(page, 0) < expected_rows:
+            missing.append(page)
+
+    ranges = []
+    for page in missing:
+        if ranges and ranges[-1][1] == page - 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    # The last range runs to the end of the results
+    return [(first, last if last < total_pages else None) for first, last in ranges]
+
+
+def verify_phase1_file(csv_file, district_counts, tolerance=COUNT_TOLERANCE):
+    """Short districts of the file's state(s) with the ranges to re-scrape"""
+    scraped, has_page_numbers = scan_phase1_file(csv_file)
+    states = {state for state, _ in scraped}
+
+    results = []
+    for state, district, expected in district_counts:
+        if state not in states:
+            continue
+        found = scraped.get((state, district), {'schools': set(), 'pages': {}})
+        rows = len(found['schools'])
+        if rows >= expected - tolerance:
+            continue
+
+        if has_page_numbers and found['pages'] and max(found['pages'].values()) <= PLAN_PAGE_SIZE:
+            ranges = missing_page_ranges(expected, found['pages'])
+        else:
+            ranges = []
+        # No page numbers, or pages all present but still short: re-scrape the district
+        ranges = ranges or [(1, None)]
+
+        results.append({'state': state, 'district': district, 'expected': expected,
+                        'scraped': rows, 'missing': expected - rows, 'ranges': ranges})
+    return results
+
+
+def repair_units(results, calculator):
+    """work_planner units for the missing page ranges"""
+    units = []
+    for result in results:
+        total_pages = math.ceil(result['expected'] / PLAN_PAGE_SIZE)
+        for first_page, last_page in result['ranges']:
+            pages = (last_page or total_pages) - first_page + 1
+            schools = min(pages * PLAN_PAGE_SIZE, result['expected'] - (first_page - 1) * PLAN_PAGE_SIZE)
+            estimate = calculator.get_percentile_estimate(schools, "combined", state_name=result['state'])
+            units.append({
+                'state': result['state'], 'district': result['district'],
+                'first_page': first_page, 'last_page': last_page, 'schools': schools,
+                'expected_seconds': round(estimate['p50_seconds'] + UNIT_OVERHEAD_SECONDS +
+                                          (first_page - 1) * PAGE_SKIP_SECONDS, 1),
+            })
+    return units
+
+
+def show_results(csv_file, results):
+    logger.info(f"\n{'='*80}")
+    logger.info(f"🔍 COMPLETENESS: {csv_file}")
+    logger.info(f"{'='*80}")
+    if not results:
+        logger.info("✅ Every district matches the portal counts")
+        return
+    for result in results:
+        ranges = ", ".join(f"{first}-{last or 'end'}" for first, last in result['ranges'])
+        logger.info(f"   ❌ {result['district']:<35} {result['scraped']:>6}/{result['expected']:<6} "
+                    f"missing {result['missing']:>5}  pages {ranges}")
+    logger.info(f"📊 {len(results)} short districts, {sum(r['missing'] for r in results):,} schools missing")
+
+
+def main():
+    """Main function for the completeness verifier"""
+    print("🔍 COMPLETENESS VERIFIER")
+    print("Phase 1 rows against the portal district counts")
+    print()
+
+    if len(sys.argv) < 2:
+        print("Usage: python completeness_verifier.py PHASE1_FILE.csv [WORKERS] [counts.csv ...]")
+        return
+
+    csv_file = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 1
+    counts_files = [argument for argument in sys.argv[2:] if argument.endswith('.csv')]
+
+    district_counts = load_district_counts(counts_files)
+    if not district_counts:
+        print("❌ No school counts found - run school_counting_tool.py first")
+        return
+
+    results = verify_phase1_file(csv_file, district_counts)
+    show_results(csv_file, results)
+    if results:
+        schedule = schedule_from_units(repair_units(results, ProcessingTimeCalculator.from_measurements()), workers)
+        path = save_schedule(schedule, prefix="repair")
+        logger.info(f"🛠️ Repair schedule: {path}")
+        logger.info(f"   Run with: python work_planner.py run {path} WORKER_ID")
+
+
+if __name__ == "__main__":
+    main()
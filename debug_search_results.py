@@ -12,6 +12,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
 import json
 
+from portal_config import CHROME_HEADLESS, UDISE_PORTAL_URL
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -30,6 +32,9 @@ def debug_search_results():
         options.add_argument("--disable-gpu")
         options.add_argument("--disable-extensions")
         
+        if CHROME_HEADLESS:
+            options.add_argument("--headless=new")
+
         driver = uc.Chrome(options=options, version_main=138)
         driver.maximize_window()
         driver.implicitly_wait(3)
@@ -37,7 +42,7 @@ def debug_search_results():
         
         # Navigate to portal
         print("\n1. Navigating to UDISE Plus portal...")
-        driver.get("https://udiseplus.gov.in/#/en/home")
+        driver.get(UDISE_PORTAL_URL)
         time.sleep(2)
         
         # Click Visit Portal
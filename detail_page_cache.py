@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Detail Page Cache - Content-addressed storage of Phase 2 detail pages
+- Stores the zlib-compressed page_source of every visited school detail page
+- Blobs are keyed by SHA-256 of the page, so identical pages are stored once
+- Index is keyed by (school_id, year_code) parsed from the know_more_link
+- Single SQLite file, safe to copy between machines
+- "reparse" re-runs the current detail page parser over cached pages, no browser needed
+
+Usage: python detail_page_cache.py stats
+       python detail_page_cache.py reparse [STATE] [output.csv]
+"""
+
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from datetime import datetime
+
+from detail_page_parser import empty_detail_record, parse_detail_page, parse_school_url
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Cache database location
+DETAIL_PAGE_CACHE_DB = "detail_page_cache.sqlite3"
+
+# zlib level 6 is the usual size/speed trade-off; pages compress roughly 8-10x
+COMPRESSION_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    content BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    school_id TEXT NOT NULL,
+    year_code TEXT NOT NULL,
+    url TEXT NOT NULL,
+    state TEXT,
+    sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (school_id, year_code)
+);
+CREATE INDEX IF NOT EXISTS pages_state ON pages(state);
+"""
+
+
+class DetailPageCache:
+    """SQLite blob store for detail page sources"""
+
+    def __init__(self, db_path=DETAIL_PAGE_CACHE_DB):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        # WAL lets a reparse job read while a scraper keeps writing
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.commit()
+
+    def close(self):
+        """Close the database connection"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def store(self, url, page_source, state=None):
+        """Store a detail page; returns its content hash (None if the URL is not a detail page)"""
+        school_id, year_code = parse_school_url(url)
+        if not school_id:
+            logger.debug(f"   Not caching non-detail URL: {url}")
+            return None
+
+        raw = page_source.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        try:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO blobs (sha256, size, content) VALUES (?, ?, ?)",
+                (digest, len(raw), zlib.compress(raw, COMPRESSION_LEVEL))
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages (school_id, year_code, url, state, sha256, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (school_id, year_code, url, state, digest, datetime.now().isoformat())
+            )
+            self.connection.commit()
+            logger.debug(f"   💾 Cached detail page {school_id}/{year_code} ({len(raw)} bytes)")
+            return digest
+        except Exception as e:
+            logger.warning(f"⚠️ Could not cache detail page {url}: {e}")
+            return None
+
+    def load_blob(self, digest):
+        """Return the decompressed page source for a content hash"""
+        row = self.connection.execute("SELECT content FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def get(self, school_id, year_code):
+        """Return the cached page source of a school, or None"""
+        row = self.connection.execute(
+            "SELECT sha256 FROM pages WHERE school_id = ? AND year_code = ?", (str(school_id), str(year_code))
+        ).fetchone()
+        return self.load_blob(row[0]) if row else None
+
+    def get_entry(self, school_id, year_code):
+        """Return (url, state, page_source) of a cached page, or None"""
+        row = self.connection.execute(
+            "SELECT p.url, p.state, b.content FROM pages p JOIN blobs b ON b.sha256 = p.sha256 "
+            "WHERE p.school_id = ? AND p.year_code = ?", (str(school_id), str(year_code))
+        ).fetchone()
+        if not row:
+            return None
+        return row[0], row[1], zlib.decompress(row[2]).decode('utf-8')
+
+    def get_by_url(self, url):
+        """Return the cached page source for a know_more_link, or None"""
+        school_id, year_code = parse_school_url(url)
+        return self.get(school_id, year_code) if school_id else None
+
+    def keys(self, state=None):
+        """List (school_id, year_code) keys, optionally for one state"""
+        if state:
+            cursor = self.connection.execute(
+                "SELECT school_id, year_code FROM pages WHERE state = ? ORDER BY school_id", (state,)
+            )
+        else:
+            cursor = self.connection.execute("SELECT school_id, year_code FROM pages ORDER BY school_id")
+        return cursor.fetchall()
+
+    def iter_pages(self, state=None):
+        """Yield (url, state, page_source) for cached pages"""
+        query = "SELECT p.url, p.state, b.content FROM pages p JOIN blobs b ON b.sha256 = p.sha256"
+        params = ()
+        if state:
+            query += " WHERE p.state = ?"
+            params = (state,)
+        for url, page_state, content in self.connection.execute(query + " ORDER BY p.school_id", params):
+            yield url, page_state, zlib.decompress(content).decode('utf-8')
+
+    def stats(self):
+        """Return page/blob counts and sizes"""
+        pages = self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        blobs, raw_bytes, stored_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(content)), 0) FROM blobs"
+        ).fetchone()
+        states = self.connection.execute(
+            "SELECT COALESCE(state, 'UNKNOWN'), COUNT(*) FROM pages GROUP BY state ORDER BY state"
+        ).fetchall()
+        return {
+            'pages': pages,
+            'blobs': blobs,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'states': dict(states),
+        }
+
+
+def reparse_cached_pages(cache, state=None, output_csv=None):
+    """Re-run the detail page parser over cached pages and write a CSV"""
+    if not output_csv:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = state.replace(' ', '_').replace('&', 'and').replace('/', '_').upper() if state else "ALL_STATES"
+        output_csv = f"{prefix}_reparsed_{timestamp}.csv"
+
+    fieldnames = ['state', 'school_id', 'year_code'] + list(empty_detail_record()) + \
+        ['extraction_status', 'fields_extracted', 'critical_fields_extracted']
+
+    start_time = time.time()
+    parsed_count = 0
+    status_counts = {}
+
+    with open(output_csv, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+
+        for url, page_state, page_source in cache.iter_pages(state):
+            data = parse_detail_page(page_source, url)
+            data['school_id'], data['year_code'] = parse_school_url(url)
+            data['state'] = page_state or 'N/A'
+            writer.writerow(data)
+
+            parsed_count += 1
+            status_counts[data['extraction_status']] = status_counts.get(data['extraction_status'], 0) + 1
+            if parsed_count % 1000 == 0:
+                logger.info(f"   📄 Reparsed {parsed_count} pages...")
+
+    elapsed = time.time() - start_time
+    logger.info(f"✅ Reparsed {parsed_count} cached pages in {elapsed:.1f}s "
+                f"({parsed_count / elapsed if elapsed > 0 else 0:.0f} pages/sec)")
+    for status, count in sorted(status_counts.items()):
+        logger.info(f"   {status}: {count}")
+    logger.info(f"📝 Output file: {output_csv}")
+    return output_csv
+
+
+def main():
+    """Main function for the detail page cache tool"""
+    print("🚀 DETAIL PAGE CACHE")
+    print("Stores Phase 2 detail pages and re-parses them without a browser")
+    print()
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if not os.path.exists(DETAIL_PAGE_CACHE_DB):
+        print(f"❌ Cache database not found: {DETAIL_PAGE_CACHE_DB}")
+        print("Enable DETAIL_PAGE_CACHE_ENABLED in the Phase 2 processor to populate it")
+        return
+
+    cache = DetailPageCache()
+    try:
+        if command == 'stats':
+            stats = cache.stats()
+            print(f"📊 Cached pages: {stats['pages']}")
+            print(f"📦 Unique blobs: {stats['blobs']}")
+            print(f"💾 Raw size: {stats['raw_bytes']/1024/1024:.1f} MB, "
+                  f"stored: {stats['stored_bytes']/1024/1024:.1f} MB")
+            for state, count in stats['states'].items():
+                print(f"   🏛️ {state}: {count}")
+        elif command == 'reparse':
+            state = sys.argv[2] if len(sys.argv) > 2 else None
+            output_csv = sys.argv[3] if len(sys.argv) > 3 else None
+            reparse_cached_pages(cache, state, output_csv)
+        else:
+            print("Usage: python detail_page_cache.py stats")
+            print("       python detail_page_cache.py reparse [STATE] [output.csv]")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
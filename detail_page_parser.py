@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Detail Page Parser - Browser-free extraction of school detail pages
+- Parses the saved page_source of a kys.udiseplus.gov.in school detail page
+- Basic Details from .schoolInfoCol title/blueCol pairs
+- Student and Teacher counts from label/.H3Value pairs
+- Shared by the Phase 2 processors (regex fallbacks) and the detail page cache reparse
+"""
+
+import html
+import re
+from datetime import datetime
+
+SCHOOL_URL_PATTERN = re.compile(r'schooldetail/(\d+)/(\d+)')
+
+# Basic Details titles (.title p.fw-600) -> output columns
+BASIC_FIELDS_MAP = {
+    'Location': 'location',
+    'School Category': 'school_category',
+    'Class From': 'class_from',
+    'Class To': 'class_to',
+    'School Type': 'school_type',
+    'Year of Establishment': 'year_of_establishment',
+    'National Management': 'national_management',
+    'State Management': 'state_management',
+    'Affiliation Board Sec.': 'affiliation_board_sec',
+    'Affiliation Board HSec.': 'affiliation_board_hsec',
+}
+
+# Labels in front of .H3Value elements -> output columns
+COUNT_FIELDS_MAP = {
+    'total students': 'total_students',
+    'boys': 'total_boys',
+    'girls': 'total_girls',
+    'total teachers': 'total_teachers',
+    'male': 'male_teachers',
+    'male teachers': 'male_teachers',
+    'female': 'female_teachers',
+    'female teachers': 'female_teachers',
+}
+
+BASIC_DETAIL_FIELDS = ['academic_year'] + list(BASIC_FIELDS_MAP.values())
+STUDENT_FIELDS = ['total_students', 'total_boys', 'total_girls']
+TEACHER_FIELDS = ['total_teachers', 'male_teachers', 'female_teachers']
+
+# Looser patterns used when the label/.H3Value structure is not found
+LOOSE_COUNT_PATTERNS = {
+    'total_students': [r'Total Students[^>]*>\s*(\d+)\s*<', r'Total Students[:\s]*(\d+)'],
+    'total_boys': [r'\bBoys[^>]*>\s*(\d+)\s*<', r'\bBoys[:\s]*(\d+)'],
+    'total_girls': [r'\bGirls[^>]*>\s*(\d+)\s*<', r'\bGirls[:\s]*(\d+)'],
+    'total_teachers': [r'Total Teachers[^>]*>\s*(\d+)\s*<', r'Total Teachers[:\s]*(\d+)'],
+    'male_teachers': [r'\bMale Teachers[^>]*>\s*(\d+)\s*<', r'\bMale[:\s]*(\d+)'],
+    'female_teachers': [r'\bFemale Teachers[^>]*>\s*(\d+)\s*<', r'\bFemale[:\s]*(\d+)'],
+}
+
+SCHOOL_INFO_COL_PATTERN = re.compile(r'<div[^>]*class="[^"]*\bschoolInfoCol\b[^"]*"[^>]*>', re.IGNORECASE)
+INFO_TITLE_PATTERN = re.compile(r'<p[^>]*class="[^"]*\bfw-600\b[^"]*"[^>]*>(.*?)</p>', re.IGNORECASE | re.DOTALL)
+INFO_VALUE_PATTERN = re.compile(r'<div[^>]*class="[^"]*\bblueCol\b[^"]*"[^>]*>(.*?)</div>', re.IGNORECASE | re.DOTALL)
+H3_VALUE_PAIR_PATTERN = re.compile(
+    r'<p[^>]*>\s*([^<]+?)\s*</p>\s*<p[^>]*class="[^"]*\bH3Value\b[^"]*"[^>]*>\s*([^<]*?)\s*</p>',
+    re.IGNORECASE | re.DOTALL
+)
+ACADEMIC_YEAR_PATTERN = re.compile(r'Academic Year\s*:?\s*(?:<[^>]*>\s*)*([^<\n]+)', re.IGNORECASE)
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+NAME_PATTERNS = [
+    r'School Name[:\s]*([^\n<]+)',
+    r'Name of School[:\s]*([^\n<]+)',
+    r'Institution Name[:\s]*([^\n<]+)',
+]
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def parse_school_url(url):
+    """Return (school_id, year_code) from a know_more_link, or (None, None)"""
+    match = SCHOOL_URL_PATTERN.search(url or '')
+    if match:
+        return match.group(1), match.group(2)
+    return None, None
+
+
+def html_to_text(fragment):
+    """Visible text of an HTML fragment (tags removed, whitespace collapsed)"""
+    text = html.unescape(TAG_PATTERN.sub(' ', fragment))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def empty_detail_record(url=None):
+    """Data structure with every Phase 2 detail field set to 'N/A'"""
+    return {
+        'detail_school_name': 'N/A',
+        'source_url': url or 'N/A',
+        'extraction_timestamp': datetime.now().isoformat(),
+
+        # Basic Details section
+        'academic_year': 'N/A',
+        'location': 'N/A',
+        'school_category': 'N/A',
+        'class_from': 'N/A',
+        'class_to': 'N/A',
+        'class_range': 'N/A',
+        'school_type': 'N/A',
+        'year_of_establishment': 'N/A',
+        'national_management': 'N/A',
+        'state_management': 'N/A',
+        'affiliation_board_sec': 'N/A',
+        'affiliation_board_hsec': 'N/A',
+
+        # Student Enrollment section
+        'total_students': 'N/A',
+        'total_boys': 'N/A',
+        'total_girls': 'N/A',
+        'enrollment_class_range': 'N/A',
+
+        # Teacher section
+        'total_teachers': 'N/A',
+        'male_teachers': 'N/A',
+        'female_teachers': 'N/A',
+    }
+
+
+def extract_basic_details(page_source):
+    """Return {column: value} from the .schoolInfoCol title/blueCol pairs"""
+    details = {}
+    starts = [match.start() for match in SCHOOL_INFO_COL_PATTERN.finditer(page_source)]
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else start + 2000
+        block = page_source[start:end]
+
+        title_match = INFO_TITLE_PATTERN.search(block)
+        value_match = INFO_VALUE_PATTERN.search(block)
+        if not title_match or not value_match:
+            continue
+
+        field = BASIC_FIELDS_MAP.get(html_to_text(title_match.group(1)))
+        value = html_to_text(value_match.group(1))
+        if field and value and field not in details:
+            details[field] = value
+
+    year_match = ACADEMIC_YEAR_PATTERN.search(page_source)
+    if year_match and year_match.group(1).strip():
+        details['academic_year'] = html.unescape(year_match.group(1)).strip()
+
+    return details
+
+
+def extract_counts(page_source):
+    """Return {column: value} from the label/.H3Value pairs (first occurrence wins)"""
+    counts = {}
+    for label, value in H3_VALUE_PAIR_PATTERN.findall(page_source):
+        field = COUNT_FIELDS_MAP.get(html_to_text(label).lower())
+        if field and value.isdigit() and field not in counts:
+            counts[field] = value
+
+    for field, patterns in LOOSE_COUNT_PATTERNS.items():
+        if field in counts:
+            continue
+        for pattern in patterns:
+            match = re.search(pattern, page_source, re.IGNORECASE)
+            if match:
+                counts[field] = match.group(1).strip()
+                break
+
+    return counts
+
+
+def extract_school_name(page_source):
+    """School name from the page title or labelled text, 'N/A' if not found"""
+    title_match = TITLE_PATTERN.search(page_source)
+    if title_match:
+        page_title = html_to_text(title_match.group(1))
+        if page_title and page_title != "Know Your School" and "UDISE" not in page_title:
+            clean_title = page_title.replace("Know Your School", "").replace("-", "").strip()
+            if len(clean_title) > 3:
+                return clean_title
+
+    for pattern in NAME_PATTERNS:
+        match = re.search(pattern, page_source, re.IGNORECASE)
+        if match and len(match.group(1).strip()) > 3:
+            return match.group(1).strip()
+
+    return 'N/A'
+
+
+def fill_missing_from_page(data, page_source, fields=None):
+    """Fill fields still at 'N/A' in data from the page source.
+
+    Used by the Phase 2 processors after their Selenium extraction. Returns
+    the list of fields that were filled.
+    """
+    parsed = extract_basic_details(page_source)
+    parsed.update(extract_counts(page_source))
+
+    filled = []
+    for field in fields or list(parsed):
+        if data.get(field, 'N/A') == 'N/A' and parsed.get(field):
+            data[field] = parsed[field]
+            filled.append(field)
+
+    if data.get('class_range', 'N/A') == 'N/A' and data.get('class_from', 'N/A') != 'N/A' \
+            and data.get('class_to', 'N/A') != 'N/A':
+        data['class_range'] = f"{data['class_from']} To {data['class_to']}"
+
+    return filled
+
+
+def apply_extraction_status(data):
+    """Add extraction_status / fields_extracted / critical_fields_extracted"""
+    critical_fields = sum(1 for field in ('total_students', 'total_teachers') if data[field] != 'N/A')
+    extracted_fields = critical_fields
+    if data['detail_school_name'] != 'N/A' and not data['detail_school_name'].startswith('School_ID_'):
+        extracted_fields += 1
+
+    additional_fields = [
+        'total_boys', 'total_girls', 'male_teachers', 'female_teachers',
+        'school_category', 'school_type', 'location', 'academic_year'
+    ]
+    extracted_fields += sum(1 for field in additional_fields if data[field] != 'N/A')
+
+    data['extraction_status'] = 'SUCCESS' if critical_fields >= 2 else 'PARTIAL' if critical_fields >= 1 else 'FAILED'
+    data['fields_extracted'] = extracted_fields
+    data['critical_fields_extracted'] = critical_fields
+    return data
+
+
+def parse_detail_page(page_source, url=None):
+    """Extract a complete Phase 2 record from a detail page source"""
+    data = empty_detail_record(url)
+    fill_missing_from_page(data, page_source)
+
+    data['detail_school_name'] = extract_school_name(page_source)
+    if data['detail_school_name'] == 'N/A':
+        school_id, _ = parse_school_url(url)
+        data['detail_school_name'] = f"School_ID_{school_id or 'unknown'}"
+
+    return apply_extraction_status(data)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Diagnostics - On-failure DOM, screenshot and page state capture
+- note() keeps the recent scraper actions in a ring buffer (plain Python, no
+  WebDriver calls), so the happy path pays nothing for debugging output
+- capture() runs only when a step fails: page source, screenshot, URL/title and
+  the recent actions go to diagnostics/{time}_{label}_{reason}/
+- page_has_text() answers "is this an empty result page?" in one script call
+  instead of serializing driver.page_source
+
+Disable captures with DIAGNOSTICS=0
+"""
+
+import json
+import logging
+import os
+import re
+from collections import deque
+from datetime import datetime
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+DIAGNOSTICS_ENABLED = os.environ.get("DIAGNOSTICS", "1") == "1"
+DIAGNOSTICS_DIR = "diagnostics"
+
+# Recent actions kept for a capture
+DIAGNOSTICS_RING_SIZE = 50
+
+# Captures per run (a broken portal must not fill the disk)
+DIAGNOSTICS_MAX_CAPTURES = 25
+# ===== END CONFIGURATION SECTION =====
+
+# Texts the portal shows for a district without schools / while results load
+NO_RESULTS_TEXTS = ("No records found", "No data available")
+LOADING_TEXTS = ("loading", "please wait")
+
+
+def page_has_text(driver, *texts):
+    """First of texts that occurs in the page body (any case), or None (one WebDriver call)"""
+    try:
+        return driver.execute_script(
+            "var body = document.body ? document.body.textContent.toLowerCase() : '';"
+            "for (var i = 0; i < arguments.length; i++) {"
+            "  if (body.indexOf(arguments[i].toLowerCase()) >= 0) return arguments[i];"
+            "}"
+            "return null;", *texts)
+    except Exception as e:
+        logger.debug(f"Page text check failed: {e}")
+        return None
+
+
+class Diagnostics:
+    """Ring buffer of recent actions, dumped with the page state when a step fails"""
+
+    def __init__(self, label, diagnostics_dir=DIAGNOSTICS_DIR, ring_size=DIAGNOSTICS_RING_SIZE,
+                 max_captures=DIAGNOSTICS_MAX_CAPTURES, enabled=DIAGNOSTICS_ENABLED):
+        self.label = label
+        self.diagnostics_dir = diagnostics_dir
+        self.max_captures = max_captures
+        self.enabled = enabled
+        self.actions = deque(maxlen=ring_size)
+        self.captures = 0
+
+    def note(self, action, **details):
+        """Remember an action (kept in memory only)"""
+        self.actions.append(dict(details, time=datetime.now().isoformat(timespec='milliseconds'), action=action))
+
+    def capture(self, driver, reason, **details):
+        """Write page source, screenshot and state of a failed step; returns the directory"""
+        self.note('failure', reason=reason, **details)
+        if not self.enabled or driver is None:
+            return None
+        if self.captures >= self.max_captures:
+            logger.debug(f"Diagnostics limit reached, not capturing {reason}")
+            return None
+        self.captures += 1
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', reason).strip('_').lower()[:60]
+        capture_dir = os.path.join(self.diagnostics_dir, f"{timestamp}_{self.label}_{slug}")
+        os.makedirs(capture_dir, exist_ok=True)
+
+        state = {'label': self.label, 'reason': reason, 'details': details,
+                 'captured_at': datetime.now().isoformat(), 'recent_actions': list(self.actions)}
+        for key, read in (('url', lambda: driver.current_url), ('title', lambda: driver.title)):
+            try:
+                state[key] = read()
+            except Exception as e:
+                state[key] = f"unavailable: {e}"
+        try:
+            with open(os.path.join(capture_dir, "page.html"), 'w', encoding='utf-8') as handle:
+                handle.write(driver.page_source)
+        except Exception as e:
+            state['page_source_error'] = str(e)
+        try:
+            driver.save_screenshot(os.path.join(capture_dir, "screenshot.png"))
+        except Exception as e:
+            state['screenshot_error'] = str(e)
+
+        with open(os.path.join(capture_dir, "state.json"), 'w', encoding='utf-8') as handle:
+            json.dump(state, handle, indent=2, default=str)
+        logger.warning(f"🩺 Diagnostics for '{reason}' saved to {capture_dir}")
+        return capture_dir
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Driver Factory - One place that starts Chrome for every scraper
+- The chromedriver binary is patched once into DRIVER_CACHE_DIR (under a file lock)
+  and reused by every later start, in this and in other processes, so
+  undetected-chromedriver no longer locates, downloads and patches a driver per start
+- Every browser starts on a copy of the seeded HTTP cache (browser_cache.py), so the
+  portal's static assets are not downloaded again after each launch
+- One option set for all phases (phase specifics are applied after the start:
+  waits, network profile, page load timeout)
+- A small pool of pre-launched idle browsers (DRIVER_POOL_SIZE): create_driver(...,
+  keep_warm=True) hands out an idle browser and starts its replacement in the
+  background, so a driver restart between states no longer waits for Chrome
+- Cold (started on demand) and warm (taken from the pool) startup times are
+  reported when the process exits
+
+Usage: python driver_factory.py --patch   (prepare the cached driver, e.g. on deploy)
+       python driver_factory.py           (measure cold vs warm startup)
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+
+from browser_cache import (BROWSER_CACHE, apply_cache_profile, release_worker_dir, remove_profile_on_quit,
+                           worker_profile_dir)
+from chrome_profiles import start_chrome
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Patched chromedriver binaries, shared by all processes
+DRIVER_CACHE_DIR = os.environ.get("DRIVER_CACHE_DIR", "driver_cache")
+
+# Chrome major version the driver is patched for
+CHROME_VERSION_MAIN = int(os.environ.get("CHROME_VERSION_MAIN", "138"))
+
+# Idle browsers kept ready for keep_warm callers (0 = start every driver on demand)
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "1"))
+
+# Switches of every scraper browser
+CHROME_ARGUMENTS = [
+    # Core stability options
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-blink-features=AutomationControlled",
+    # Performance (JavaScript stays enabled for the Angular portal)
+    "--disable-plugins",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    # Memory and resource optimizations
+    "--memory-pressure-off",
+    "--max_old_space_size=4096",
+]
+# ===== END CONFIGURATION SECTION =====
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serializes the patching
+    fcntl = None
+
+# uc.Chrome is not safe to start concurrently; starts are serialized per process
+DRIVER_START_LOCK = threading.Lock()
+
+
+def cached_driver_path(cache_dir=DRIVER_CACHE_DIR, version_main=CHROME_VERSION_MAIN):
+    name = f"chromedriver_{version_main}" + (".exe" if sys.platform.startswith("win") else "")
+    return os.path.join(cache_dir, name)
+
+
+def patched_driver(cache_dir=DRIVER_CACHE_DIR, version_main=CHROME_VERSION_MAIN):
+    """Path of the patched chromedriver, patching it into the cache on first use"""
+    import undetected_chromedriver as uc
+
+    os.makedirs(cache_dir, exist_ok=True)
+    driver_path = cached_driver_path(cache_dir, version_main)
+    with open(os.path.join(cache_dir, ".lock"), 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)   # one process patches, the others wait
+        try:
+            if os.path.exists(driver_path) and uc.Patcher(executable_path=driver_path).is_binary_patched(driver_path):
+                return driver_path
+            started = time.perf_counter()
+            patcher = uc.Patcher(version_main=version_main)
+            patcher.auto()
+            temp_path = f"{driver_path}.tmp"
+            shutil.copy2(patcher.executable_path, temp_path)
+            os.replace(temp_path, driver_path)
+            logger.info(f"🩹 Patched chromedriver {version_main} cached at {driver_path} "
+                        f"({time.perf_counter() - started:.1f}s)")
+            return driver_path
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def chrome_options():
+    """Fresh ChromeOptions with the scraper switches (uc options cannot be reused)"""
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    return options
+
+
+def launch_chrome(profile_dir=None):
+    """Start one browser on the cached patched driver and its own copy of the HTTP cache"""
+    options = chrome_options()
+    worker_dir = worker_profile_dir() if profile_dir is None and BROWSER_CACHE else None
+    if profile_dir or worker_dir:
+        apply_cache_profile(options, profile_dir or worker_dir)
+    try:
+        driver = start_chrome(options, version_main=CHROME_VERSION_MAIN,
+                              driver_executable_path=patched_driver())
+    except Exception:
+        if worker_dir:
+            release_worker_dir(worker_dir)
+        raise
+    if worker_dir:
+        remove_profile_on_quit(driver, worker_dir)
+    driver.browser_cache = worker_dir is not None   # network statistics are kept apart for seeded browsers
+    return driver
+
+
+class DriverFactory:
+    """Starts browsers, keeps a pool of idle ones and times cold vs warm starts"""
+
+    def __init__(self, pool_size=DRIVER_POOL_SIZE, launcher=launch_chrome):
+        self.pool_size = pool_size
+        self.launcher = launcher
+        self.lock = threading.Lock()
+        self.idle = []           # pre-launched browsers
+        self.launching = 0       # pool refills in progress
+        self.startups = {'cold': [], 'warm': []}
+        self.closed = False
+
+    def launch(self):
+        with DRIVER_START_LOCK:
+            return self.launcher()
+
+    def acquire(self, label="driver", keep_warm=False):
+        """A browser for label: an idle one when available, else started now"""
+        started = time.perf_counter()
+        with self.lock:
+            driver = self.idle.pop(0) if self.idle else None
+        kind = 'warm' if driver is not None else 'cold'
+        if driver is None:
+            driver = self.launch()
+        seconds = time.perf_counter() - started
+        with self.lock:
+            self.startups[kind].append(seconds)
+        logger.info(f"🚗 {kind.capitalize()} driver start for {label}: {seconds:.2f}s")
+        if keep_warm:
+            self.refill()
+        return driver
+
+    def refill(self):
+        """Start idle browsers in the background up to the pool size"""
+        with self.lock:
+            missing = self.pool_size - len(self.idle) - self.launching
+            if self.closed or missing <= 0:
+                return
+            self.launching += missing
+        for _ in range(missing):
+            threading.Thread(target=self._launch_idle, name="driver-pool", daemon=True).start()
+
+    def _launch_idle(self):
+        driver = None
+        try:
+            driver = self.launch()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not pre-launch a browser: {e}")
+        with self.lock:
+            self.launching -= 1
+            if driver is not None and not self.closed:
+                self.idle.append(driver)
+                driver = None
+        if driver is not None:
+            driver.quit()
+
+    def report(self):
+        """Log cold vs warm startup times"""
+        with self.lock:
+            startups = {kind: list(seconds) for kind, seconds in self.startups.items()}
+        if not any(startups.values()):
+            return
+        summary = ", ".join(f"{kind} {len(seconds)} x {sum(seconds) / len(seconds):.2f}s"
+                            for kind, seconds in startups.items() if seconds)
+        logger.info(f"🚗 Driver starts: {summary}")
+
+    def shutdown(self):
+        """Quit the idle browsers (at exit)"""
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error closing idle driver: {e}")
+        self.report()
+
+
+_factory = None
+_factory_lock = threading.Lock()
+
+
+def shared_driver_factory():
+    """Process-wide factory (idle browsers are quit at exit)"""
+    global _factory
+    with _factory_lock:
+        if _factory is None:
+            _factory = DriverFactory()
+            atexit.register(_factory.shutdown)
+        return _factory
+
+
+def create_driver(label, keep_warm=False):
+    """Browser for a scraper phase; keep_warm pre-launches the next one (driver restarts)"""
+    return shared_driver_factory().acquire(label, keep_warm=keep_warm)
+
+
+def main():
+    """Prepare the cached driver, or measure cold vs warm startup"""
+    if '--patch' in sys.argv[1:]:
+        print(f"🩹 Cached driver: {patched_driver()}")
+        return
+
+    print("🚗 DRIVER STARTUP")
+    print("=" * 50)
+    factory = DriverFactory(pool_size=1)
+    try:
+        cold = factory.acquire("cold start", keep_warm=True)
+        cold.quit()
+        while factory.launching:
+            time.sleep(0.5)
+        warm = factory.acquire("warm start")
+        warm.quit()
+    finally:
+        factory.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Gap Repair - Re-scrape only the missing parts of a canonical state file
+- Phase 1: page ranges of short districts, given on the command line
+  (STATE:DISTRICT:FIRST-LAST) or as a repair schedule of completeness_verifier.py
+- Phase 2: schools whose extraction_status is FAILED/PARTIAL/ERROR, or given UDISE codes
+- Only new schools and Phase 2 records that are not worse are kept, then merged into the
+  canonical file in place (snapshot_merger rules: newest record per school wins)
+
+Usage: python gap_repair.py CANONICAL.csv [--failed] [--udise CODE,CODE]
+                            [--ranges STATE:DISTRICT:3-5 ...] [--schedule repair_*.json]
+"""
+
+import csv
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+from snapshot_merger import MISSING_VALUES, SnapshotMerger, clean_state_name, school_key, state_from_filename
+from work_planner import run_phase1_units, run_phase2_files
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Phase 1 / Phase 2 output of repair runs
+REPAIR_DIR = "repairs"
+
+# Phase 2 results that are retried with --failed
+RETRY_STATUSES = {'FAILED', 'PARTIAL', 'ERROR'}
+
+# A repaired record never replaces a canonical record of a higher status
+STATUS_RANK = {'SUCCESS': 3, 'PARTIAL': 2, 'FAILED': 1, 'ERROR': 1}
+# ===== END CONFIGURATION SECTION =====
+
+
+def parse_range_spec(spec, unit_number=1):
+    """STATE:DISTRICT[:FIRST[-LAST|-end]] -> work_planner unit (whole district without pages)"""
+    parts = spec.split(':')
+    if len(parts) not in (2, 3) or not parts[0].strip() or not parts[1].strip():
+        raise ValueError(f"Invalid range '{spec}' (expected STATE:DISTRICT:FIRST-LAST)")
+
+    first_page, last_page = 1, None
+    if len(parts) == 3 and parts[2].strip():
+        first, dash, last = parts[2].strip().partition('-')
+        first_page = int(first)
+        if not dash:
+            last_page = first_page
+        elif last.strip().lower() not in ('', 'end'):
+            last_page = int(last)
+        if first_page < 1 or (last_page is not None and last_page < first_page):
+            raise ValueError(f"Invalid page range in '{spec}'")
+
+    return {'state': parts[0].strip(), 'district': parts[1].strip(),
+            'first_page': first_page, 'last_page': last_page,
+            'schools': None, 'unit_id': f"r{unit_number:04d}"}
+
+
+def load_schedule_units(schedule_file):
+    """All units of a schedule, whatever worker they were assigned to"""
+    with open(schedule_file, 'r', encoding='utf-8') as handle:
+        schedule = json.load(handle)
+    return [unit for assignment in schedule['assignments'] for unit in assignment['units']]
+
+
+def status_rank(row):
+    return STATUS_RANK.get((row.get('extraction_status') or '').strip().upper(), 0)
+
+
+def read_rows(csv_file):
+    with open(csv_file, 'r', encoding='utf-8', newline='') as handle:
+        return list(csv.DictReader(handle))
+
+
+class GapRepair:
+    """Targeted re-scrape of one canonical state file"""
+
+    def __init__(self, canonical_file, repair_dir=REPAIR_DIR):
+        self.canonical_file = canonical_file
+        self.repair_dir = repair_dir
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        with open(canonical_file, 'r', encoding='utf-8', newline='') as handle:
+            reader = csv.DictReader(handle)
+            self.header = list(reader.fieldnames or [])
+            self.rows = list(reader)
+
+        states = {(row.get('state') or '').strip() for row in self.rows} - {''}
+        self.state_name = states.pop() if len(states) == 1 else state_from_filename(canonical_file)
+        self.has_phase2 = 'extraction_status' in self.header
+        # school key -> status rank of the canonical record
+        self.ranks = {school_key(row): status_rank(row) for row in self.rows}
+
+    def phase2_targets(self, udise_codes=None, retry_failed=True):
+        """Canonical rows to re-extract: the given UDISE codes and/or failed records"""
+        codes = {code.strip() for code in (udise_codes or [])}
+        targets = []
+        for row in self.rows:
+            udise_code = (row.get('udise_code') or '').strip()
+            if udise_code in codes:
+                targets.append(row)
+                codes.discard(udise_code)
+            elif retry_failed and self.has_phase2 and \
+                    (row.get('extraction_status') or '').strip().upper() in RETRY_STATUSES:
+                targets.append(row)
+        for code in sorted(codes):
+            logger.warning(f"⚠️ UDISE {code} is not in {self.canonical_file}")
+        return [row for row in targets if (row.get('know_more_link') or '').strip() not in MISSING_VALUES]
+
+    def new_schools(self, rows):
+        """Phase 1 rows of schools the canonical file does not have yet"""
+        fresh = {}
+        for row in rows:
+            key = school_key(row)
+            if key not in self.ranks:
+                fresh.setdefault(key, row)
+        return list(fresh.values())
+
+    def improved_records(self, rows):
+        """Phase 2 rows whose status is not worse than the canonical record's"""
+        return [row for row in rows if status_rank(row) >= self.ranks.get(school_key(row), 0)]
+
+    def write_rows(self, rows, kind):
+        """Write rows to repairs/{STATE}_{kind}_{timestamp}_repair.csv"""
+        os.makedirs(self.repair_dir, exist_ok=True)
+        filename = os.path.join(self.repair_dir,
+                                f"{clean_state_name(self.state_name)}_{kind}_{self.timestamp}_repair.csv")
+        columns = list(self.header)
+        for row in rows:
+            for column in row:
+                if column not in columns:
+                    columns.append(column)
+        with open(filename, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=columns, restval='N/A', extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+        return filename
+
+    def merge_in_place(self, repair_files):
+        """Merge repair files into the canonical file and replace it atomically"""
+        output_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(self.canonical_file)))
+        try:
+            output_files = SnapshotMerger([self.canonical_file] + list(repair_files), output_dir=output_dir).merge()
+            if len(output_files) != 1:
+                raise RuntimeError(f"Expected one state in the merge, got {sorted(output_files)}")
+            os.replace(next(iter(output_files.values())), self.canonical_file)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        logger.info(f"💾 Merged {len(repair_files)} repair files into {self.canonical_file}")
+        return self.canonical_file
+
+    def repair(self, units=(), udise_codes=None, retry_failed=True):
+        """Scrape the requested gaps and merge what improved; returns the number of merged rows"""
+        repair_files = []
+        phase2_rows = self.phase2_targets(udise_codes, retry_failed)
+
+        if units:
+            logger.info(f"🧩 Phase 1 repair: {len(units)} page ranges of {self.state_name}")
+            unit_files, failed_units = run_phase1_units(list(units))
+            if failed_units:
+                logger.warning(f"⚠️ Failed ranges: {', '.join(failed_units)}")
+            scraped = [row for _, csv_file in unit_files for row in read_rows(csv_file)]
+            fresh = self.new_schools(scraped)
+            logger.info(f"   📊 {len(scraped)} rows scraped, {len(fresh)} new schools")
+            if fresh:
+                repair_files.append(self.write_rows(fresh, "phase1_complete"))
+                if self.has_phase2:
+                    for row in fresh:
+                        row['phase2_ready'] = (row.get('know_more_link') or '').strip() not in MISSING_VALUES
+                    phase2_rows.extend(row for row in fresh if row['phase2_ready'])
+
+        if phase2_rows:
+            logger.info(f"🔁 Phase 2 repair: {len(phase2_rows)} schools of {self.state_name}")
+            import phase2_automated_processor
+            # Repairs are explicit targets: no change filtering, no partial Sheets uploads
+            phase2_automated_processor.INCREMENTAL_REFRESH = False
+            phase2_automated_processor.GOOGLE_SHEETS_ENABLED = False
+
+            phase2_input = self.write_rows([dict(row, phase2_ready=True) for row in phase2_rows],
+                                           "phase1_complete_retry")
+            output_files, _ = run_phase2_files([({'unit_id': 'repair'}, phase2_input)])
+            extracted = [row for _, csv_file in output_files for row in read_rows(csv_file)]
+            improved = self.improved_records(extracted)
+            logger.info(f"   📊 {len(extracted)} schools re-extracted, {len(improved)} improved")
+            if improved:
+                repair_files.append(self.write_rows(improved, "phase2_repaired"))
+
+        if not repair_files:
+            logger.info("✅ Nothing to merge - the canonical file is unchanged")
+            return 0
+        merged = sum(len(read_rows(csv_file)) for csv_file in repair_files)
+        self.merge_in_place(repair_files)
+        return merged
+
+
+def main():
+    """Main function for gap repair"""
+    print("🛠️ GAP REPAIR")
+    print("Re-scrapes missing page ranges and failed schools of a canonical file")
+    print()
+
+    arguments = sys.argv[1:]
+    if not arguments or not arguments[0].endswith('.csv'):
+        print("Usage: python gap_repair.py CANONICAL.csv [--failed] [--udise CODE,CODE]")
+        print("                            [--ranges STATE:DISTRICT:3-5 ...] [--schedule repair_*.json]")
+        return
+
+    canonical_file = arguments.pop(0)
+    units, udise_codes, retry_failed = [], [], False
+    option = None
+    for argument in arguments:
+        if argument == '--failed':
+            retry_failed, option = True, None
+        elif argument in ('--udise', '--ranges', '--schedule'):
+            option = argument
+        elif option == '--udise':
+            udise_codes.extend(code for code in argument.split(',') if code.strip())
+        elif option == '--ranges':
+            units.append(parse_range_spec(argument, len(units) + 1))
+        elif option == '--schedule':
+            units.extend(load_schedule_units(argument))
+        else:
+            print(f"❌ Unexpected argument: {argument}")
+            return
+
+    if not (units or udise_codes or retry_failed):
+        print("❌ Nothing to repair: pass --failed, --udise or --ranges/--schedule")
+        return
+
+    merged = GapRepair(canonical_file).repair(units, udise_codes, retry_failed)
+    logger.info(f"🎯 Repair finished: {merged} rows merged into {canonical_file}")
+
+
+if __name__ == "__main__":
+    main()
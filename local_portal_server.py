@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Local Portal Server - Offline stand-in for udiseplus.gov.in / kys.udiseplus.gov.in
+- Serves a small hash-routed single page app with the real portal markup:
+  home ("Visit Portal"), KYS home (a#advanceSearch), advance search
+  (select.form-select.select, button.purpleBtn), paginated results
+  (.accordion-body, a.nextBtn, select.form-select.w11110) and school detail pages
+- Data comes from recorded Phase 1 / Phase 2 CSV files (or synthetic fixtures)
+- Recorded detail pages from the detail page cache are served verbatim when available
+- Configurable latency, jitter and error injection on every API call
+
+Usage: python local_portal_server.py [csv_file ...]
+       then run a scraper with UDISE_PORTAL_URL=http://127.0.0.1:8765/#/en/home
+                                 KYS_BASE_URL=http://127.0.0.1:8765/
+"""
+
+import glob
+import html
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from detail_page_cache import DetailPageCache
+from portal_fixtures import (
+    build_fixtures_from_csv, build_synthetic_fixtures, option_value,
+    render_detail_page, render_results_page,
+)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+LOCAL_PORTAL_HOST = os.environ.get("LOCAL_PORTAL_HOST", "127.0.0.1")
+LOCAL_PORTAL_PORT = int(os.environ.get("LOCAL_PORTAL_PORT", "8765"))
+
+# Added to every API response: LATENCY_MS + uniform(0, JITTER_MS)
+LOCAL_PORTAL_LATENCY_MS = float(os.environ.get("LOCAL_PORTAL_LATENCY_MS", "300"))
+LOCAL_PORTAL_JITTER_MS = float(os.environ.get("LOCAL_PORTAL_JITTER_MS", "200"))
+
+# Fraction of API calls answered with HTTP 500
+LOCAL_PORTAL_ERROR_RATE = float(os.environ.get("LOCAL_PORTAL_ERROR_RATE", "0"))
+
+# Cap per district when loading recorded CSVs (None = all rows)
+MAX_SCHOOLS_PER_DISTRICT = None
+# ===== END CONFIGURATION SECTION =====
+
+SPA_SHELL = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Know Your School</title>
+<style>
+body { font-family: sans-serif; margin: 0; }
+.page-item.disabled a { pointer-events: none; color: #999; }
+.pagination { display: flex; list-style: none; gap: 8px; }
+.d-none { display: none; }
+</style>
+</head>
+<body>
+<div id="app"></div>
+<script>
+const app = document.getElementById('app');
+const search = { stateId: null, districtId: null, page: 1, size: 10 };
+
+async function api(path) {
+  const response = await fetch(path);
+  if (!response.ok) { throw new Error('HTTP ' + response.status); }
+  return response.text();
+}
+
+function showError(target) {
+  target.innerHTML = '<div class="alert alert-danger">Something went wrong. Please try again.</div>';
+}
+
+function renderHome() {
+  app.innerHTML = '<header class="udiseHeader"><h1>UDISE+</h1></header>' +
+    '<section class="banner"><a class="btn visitBtn" href="#/kys">Visit Portal</a></section>';
+}
+
+function renderKysHome() {
+  app.innerHTML = '<header class="kysHeader"><h1>Know Your School</h1></header>' +
+    '<a id="advanceSearch" class="nav-link" href="#/advanceSearch">Advance Search</a>';
+}
+
+async function renderAdvanceSearch() {
+  app.innerHTML =
+    '<div class="searchForm">' +
+    '<select class="form-select select" id="stateSelect"><option value="">Select State</option></select>' +
+    '<select class="form-select select" id="districtSelect"><option value="">Select District</option></select>' +
+    '<button type="button" class="btn purpleBtn" id="searchBtn">Search</button>' +
+    '</div><div id="results"></div>';
+
+  const stateSelect = document.getElementById('stateSelect');
+  const districtSelect = document.getElementById('districtSelect');
+
+  stateSelect.addEventListener('change', async () => {
+    search.stateId = stateSelect.value ? JSON.parse(stateSelect.value).stateId : null;
+    search.districtId = null;
+    districtSelect.innerHTML = '<option value="">Select District</option>';
+    if (!search.stateId) { return; }
+    try {
+      districtSelect.innerHTML += await api('/api/districts?stateId=' + search.stateId);
+    } catch (error) {
+      showError(document.getElementById('results'));
+    }
+  });
+  districtSelect.addEventListener('change', () => {
+    search.districtId = districtSelect.value ? JSON.parse(districtSelect.value).districtId : null;
+  });
+  document.getElementById('searchBtn').addEventListener('click', () => {
+    search.page = 1;
+    loadResults();
+  });
+
+  try {
+    stateSelect.innerHTML += await api('/api/states');
+  } catch (error) {
+    showError(document.getElementById('results'));
+  }
+}
+
+async function loadResults() {
+  const results = document.getElementById('results');
+  if (!search.stateId) { return; }
+  results.innerHTML = '<div class="spinner-border">Loading...</div>';
+  const query = 'stateId=' + search.stateId + '&districtId=' + (search.districtId || '') +
+    '&page=' + search.page + '&size=' + search.size;
+  try {
+    results.innerHTML = await api('/api/search?' + query);
+  } catch (error) {
+    showError(results);
+    return;
+  }
+  const next = results.querySelector('a.nextBtn');
+  const previous = results.querySelector('a.prevBtn');
+  const pageSize = results.querySelector('select.form-select.w11110');
+  if (next) {
+    next.addEventListener('click', () => {
+      if (next.parentElement.classList.contains('disabled')) { return; }
+      search.page += 1;
+      loadResults();
+    });
+  }
+  if (previous) {
+    previous.addEventListener('click', () => {
+      if (previous.parentElement.classList.contains('disabled')) { return; }
+      search.page -= 1;
+      loadResults();
+    });
+  }
+  if (pageSize) {
+    pageSize.addEventListener('change', () => {
+      search.size = parseInt(pageSize.value, 10);
+      search.page = 1;
+      loadResults();
+    });
+  }
+}
+
+async function renderSchoolDetail(schoolId, yearCode) {
+  app.innerHTML = '<div class="spinner-border">Loading...</div>';
+  try {
+    app.innerHTML = await api('/api/detail/' + schoolId + '/' + yearCode);
+  } catch (error) {
+    showError(app);
+  }
+}
+
+function route() {
+  const hash = window.location.hash || '#/en/home';
+  const detail = hash.match(/^#\\/schooldetail\\/(\\d+)\\/(\\d+)/);
+  if (detail) { renderSchoolDetail(detail[1], detail[2]); }
+  else if (hash.startsWith('#/advanceSearch')) { renderAdvanceSearch(); }
+  else if (hash.startsWith('#/kys')) { renderKysHome(); }
+  else { renderHome(); }
+}
+
+window.addEventListener('hashchange', route);
+route();
+</script>
+</body>
+</html>
+'''
+
+BODY_PATTERN = re.compile(r'<body[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+SCRIPT_PATTERN = re.compile(r'<script\b.*?</script>', re.IGNORECASE | re.DOTALL)
+
+
+class PortalRequestHandler(BaseHTTPRequestHandler):
+    """Serves the SPA shell and its fragment API"""
+
+    def log_message(self, format, *args):
+        logger.debug(f"   🌐 {self.address_string()} {format % args}")
+
+    def send_text(self, status, body, content_type="text/html; charset=utf-8"):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        portal = self.server.portal
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        portal.count_request(path)
+
+        if path in ("/", "/index.html"):
+            self.send_text(200, SPA_SHELL)
+            return
+        if path == "/health":
+            self.send_text(200, json.dumps(portal.stats()), "application/json")
+            return
+        if not path.startswith("/api/"):
+            self.send_text(404, "Not Found", "text/plain")
+            return
+
+        # Simulated network/server behaviour for API calls
+        portal.apply_latency()
+        if portal.should_fail():
+            self.send_text(500, "Internal Server Error", "text/plain")
+            return
+
+        try:
+            status, body = portal.handle_api(path, query)
+        except Exception as e:
+            logger.error(f"❌ Local portal error for {self.path}: {e}")
+            status, body = 500, "Internal Server Error"
+        self.send_text(status, body)
+
+
+class LocalPortalServer:
+    """Local UDISE portal with configurable latency and error injection"""
+
+    def __init__(self, fixtures, host=LOCAL_PORTAL_HOST, port=LOCAL_PORTAL_PORT,
+                 latency_ms=LOCAL_PORTAL_LATENCY_MS, jitter_ms=LOCAL_PORTAL_JITTER_MS,
+                 error_rate=LOCAL_PORTAL_ERROR_RATE, seed=None, page_cache_db=None):
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.page_cache_db = page_cache_db
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+        self.request_counts = {}
+        self.injected_errors = 0
+        self.stats_lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), PortalRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.portal = self
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """Root URL, also the KYS base for know_more_links"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def portal_url(self):
+        """Equivalent of https://udiseplus.gov.in/#/en/home"""
+        return f"{self.base_url}#/en/home"
+
+    def scraper_environment(self):
+        """Environment variables that point the scrapers at this server"""
+        return {"UDISE_PORTAL_URL": self.portal_url, "KYS_BASE_URL": self.base_url}
+
+    def start(self):
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"✅ Local portal running at {self.portal_url}")
+        return self
+
+    def stop(self):
+        """Stop serving"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+        logger.info("🔒 Local portal stopped")
+
+    def count_request(self, path):
+        key = path if not path.startswith("/api/detail/") else "/api/detail"
+        with self.stats_lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def stats(self):
+        with self.stats_lock:
+            return {'requests': dict(self.request_counts), 'injected_errors': self.injected_errors,
+                    'fixtures': self.fixtures.summary()}
+
+    def apply_latency(self):
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self.random_lock:
+            delay_ms = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        time.sleep(delay_ms / 1000.0)
+
+    def should_fail(self):
+        if self.error_rate <= 0:
+            return False
+        with self.random_lock:
+            failed = self.random.random() < self.error_rate
+        if failed:
+            with self.stats_lock:
+                self.injected_errors += 1
+        return failed
+
+    def handle_api(self, path, query):
+        """Return (status, html fragment) for an API path"""
+        if path == "/api/states":
+            return 200, self.render_options(self.fixtures.states, 'stateName')
+
+        if path == "/api/districts":
+            districts = self.fixtures.districts.get(int(query.get('stateId') or 0), [])
+            return 200, self.render_options(districts, 'districtName')
+
+        if path == "/api/search":
+            schools = self.fixtures.district_schools(query.get('stateId') or 0, query.get('districtId') or None)
+            page_size = max(1, int(query.get('size') or 10))
+            page = max(1, int(query.get('page') or 1))
+            start = (page - 1) * page_size
+            return 200, render_results_page(schools[start:start + page_size], page, page_size, len(schools))
+
+        detail_match = re.match(r'^/api/detail/(\d+)/(\d+)$', path)
+        if detail_match:
+            school_id, year_code = detail_match.groups()
+            recorded = self.recorded_detail_page(school_id, year_code)
+            if recorded:
+                return 200, recorded
+            school = self.fixtures.schools_by_id.get(school_id)
+            if not school:
+                return 404, '<div class="noRecord"><p>No data available</p></div>'
+            return 200, render_detail_page(school)
+
+        return 404, "Not Found"
+
+    def render_options(self, items, name_key):
+        return ''.join(f'<option value="{option_value(item)}">{html.escape(item[name_key])}</option>' for item in items)
+
+    def recorded_detail_page(self, school_id, year_code):
+        """Body of a recorded detail page from the detail page cache, if any"""
+        if not self.page_cache_db or not os.path.exists(self.page_cache_db):
+            return None
+        # sqlite connections are per thread; requests run on handler threads
+        cache = DetailPageCache(self.page_cache_db)
+        try:
+            page_source = cache.get(school_id, year_code)
+        finally:
+            cache.close()
+        if not page_source:
+            return None
+        body_match = BODY_PATTERN.search(page_source)
+        return SCRIPT_PATTERN.sub('', body_match.group(1) if body_match else page_source)
+
+
+def load_default_fixtures(csv_files=None):
+    """Fixtures from the given CSVs, the newest Phase 1 files, or synthetic data"""
+    if not csv_files:
+        csv_files = sorted(glob.glob("*_phase1_complete_*.csv"), key=os.path.getmtime)
+    if csv_files:
+        fixtures = build_fixtures_from_csv(csv_files, MAX_SCHOOLS_PER_DISTRICT)
+        if fixtures.schools_by_id:
+            return fixtures
+    logger.info("📋 No recorded CSVs found - using synthetic fixtures")
+    return build_synthetic_fixtures()
+
+
+def main():
+    """Main function for the local portal server"""
+    print("🚀 LOCAL UDISE PORTAL")
+    print("Offline stand-in for the UDISE Plus portal, for tests and benchmarks")
+    print()
+
+    fixtures = load_default_fixtures(sys.argv[1:])
+    summary = fixtures.summary()
+    print(f"📊 Fixtures: {summary['states']} states, {summary['districts']} districts, {summary['schools']} schools")
+    print(f"⏱️ Latency: {LOCAL_PORTAL_LATENCY_MS:.0f}ms + up to {LOCAL_PORTAL_JITTER_MS:.0f}ms jitter")
+    print(f"💥 Error rate: {LOCAL_PORTAL_ERROR_RATE*100:.1f}%")
+
+    server = LocalPortalServer(fixtures, page_cache_db="detail_page_cache.sqlite3")
+    print(f"\n🌐 Portal URL: {server.portal_url}")
+    print("Point the scrapers at it with:")
+    for key, value in server.scraper_environment().items():
+        print(f"   export {key}={value}")
+    print("\nPress Ctrl+C to stop")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Stopping local portal")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Logging Setup - Non-blocking, structured logging for the scrapers
+- configure_logging() replaces the root handlers of logging.basicConfig with a
+  QueueHandler: scraping threads only enqueue records, one QueueListener thread
+  formats and writes them, so parallel workers never contend on the output stream
+- Records are not formatted in the calling thread; %-style calls
+  (logger.info("Found %s", value)) are only formatted by the listener
+- LOG_FORMAT=json writes one JSON object per line (time, level, logger, thread,
+  school, message) for log processing; the default stays the text format
+- Per-school sampling: inside school_scope() only every LOG_SCHOOL_SAMPLE-th school
+  keeps its INFO/DEBUG detail; warnings and errors are always written
+
+Usage: from logging_setup import configure_logging; configure_logging()  (in main())
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# ===== CONFIGURATION SECTION =====
+# "text" (same lines as logging.basicConfig) or "json" (one object per line)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+
+# Optional log file written next to the console stream
+LOG_FILE = os.environ.get("LOG_FILE", "")
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+# Every Nth school logs its INFO detail (1 = every school)
+LOG_SCHOOL_SAMPLE = int(os.environ.get("LOG_SCHOOL_SAMPLE", "25"))
+# ===== END CONFIGURATION SECTION =====
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_school = threading.local()
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage().strip(),
+        }
+        if getattr(record, 'school', None) is not None:
+            entry['school'] = record.school
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SchoolSampleFilter(logging.Filter):
+    """Drops INFO/DEBUG records of unsampled schools; tags records with the current school"""
+
+    def filter(self, record):
+        record.school = getattr(_school, 'key', None)
+        return record.levelno >= logging.WARNING or not getattr(_school, 'muted', False)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record):
+        # In-process queue: the record is handed over as is (QueueHandler.prepare
+        # would format the message here, in the scraping thread)
+        return record
+
+
+@contextmanager
+def school_scope(index, key=None, sample_every=None):
+    """Log context of one school: INFO detail is kept for every sample_every-th index"""
+    sample_every = LOG_SCHOOL_SAMPLE if sample_every is None else sample_every
+    previous = (getattr(_school, 'muted', False), getattr(_school, 'key', None))
+    _school.muted = sample_every > 1 and (index - 1) % sample_every != 0
+    _school.key = key if key is not None else index
+    try:
+        yield not _school.muted
+    finally:
+        _school.muted, _school.key = previous
+
+
+def school_log_sampled():
+    """True when the current school keeps its INFO detail (guard for costly log arguments)"""
+    return not getattr(_school, 'muted', False)
+
+
+def build_formatter(log_format=None):
+    return JsonFormatter() if (log_format or LOG_FORMAT) == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(log_format=None, log_file=None, level=None, stream=None):
+    """Route the root logger through a queue to a background writer; returns the listener"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = build_formatter(log_format)
+        handlers = [logging.StreamHandler(stream or sys.stderr)]
+        log_file = LOG_FILE if log_file is None else log_file
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(SchoolSampleFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level or LOG_LEVEL)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging():
+    """Write the queued records and stop the background writer"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        for handler in _listener.handlers:
+            handler.flush()
+            root.addHandler(handler)
+        _listener = None
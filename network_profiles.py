@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Network Profiles - Per-phase resource blocking through the Chrome DevTools Protocol
+- --disable-images / --disable-plugins do not stop image, font or tracker downloads;
+  Network.setBlockedURLs does, for every request of the page (including the SPA's)
+- Profiles per phase block images, fonts, media and third-party trackers; scripts
+  and XHR, which the Angular portal needs, are never blocked
+- Opt-in measurement (NETWORK_STATS=1): bytes transferred, requests and page-ready
+  time per loaded page (Resource/Navigation Timing, one script call per page),
+  accumulated per phase and profile in network_stats.json
+- Browsers started on the seeded HTTP cache (browser_cache.py) are counted under
+  "<profile>+cache", with their cache hits and the first page of each browser
+  (cold start) kept apart
+
+Compare:  NETWORK_PROFILE=off NETWORK_STATS=1 python phase2_automated_processor.py
+          NETWORK_STATS=1 python phase2_automated_processor.py
+          BROWSER_CACHE=0 NETWORK_STATS=1 python phase2_automated_processor.py
+          python network_profiles.py   (before/after per phase)
+"""
+
+import json
+import logging
+import os
+import threading
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# "auto" = the profile of each phase, "off" = block nothing, or one profile name for all phases
+NETWORK_PROFILE = os.environ.get("NETWORK_PROFILE", "auto")
+
+# Measure bytes and page-ready time per page (one extra script call per page)
+NETWORK_STATS = os.environ.get("NETWORK_STATS", "0") == "1"
+NETWORK_STATS_FILE = "network_stats.json"
+
+# URL patterns (Network.setBlockedURLs wildcards) per resource category
+BLOCKED_URL_PATTERNS = {
+    'images': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    'fonts': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    'media': ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"],
+    'trackers': ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                 "*facebook.net*", "*hotjar.com*", "*clarity.ms*"],
+    # Not in the phase profiles: element text depends on the portal's CSS (hidden panels)
+    'stylesheets': ["*.css"],
+}
+
+# Blocked categories per phase (wait_manager labels)
+NETWORK_PROFILES = {
+    'phase1': ('images', 'fonts', 'media', 'trackers'),
+    'phase2': ('images', 'fonts', 'media', 'trackers'),
+    'counting': ('images', 'fonts', 'media', 'trackers'),
+    'lean': ('images', 'fonts', 'media', 'trackers', 'stylesheets'),
+    'off': (),
+}
+# ===== END CONFIGURATION SECTION =====
+
+# Traffic since the last sample; the navigation entry and ready time once per document
+PAGE_STATS_SCRIPT = """
+    var stats = {bytes: 0, requests: 0, cached: 0, ready_ms: null};
+    if (!window.__networkSampled) {
+        window.__networkSampled = true;
+        var nav = performance.getEntriesByType('navigation')[0];
+        if (nav) {
+            stats.bytes += nav.transferSize || 0;
+            stats.requests += 1;
+            stats.ready_ms = nav.loadEventEnd || nav.domContentLoadedEventEnd || null;
+        }
+    }
+    var resources = performance.getEntriesByType('resource');
+    for (var i = 0; i < resources.length; i++) {
+        stats.bytes += resources[i].transferSize || 0;
+        if (resources[i].transferSize === 0 && resources[i].decodedBodySize > 0) {
+            stats.cached += 1;   // served from the disk cache
+        }
+    }
+    stats.requests += resources.length;
+    performance.clearResourceTimings();
+    return stats;
+"""
+
+_stats_file_lock = threading.Lock()
+
+
+def profile_name(label, profile=None):
+    """Profile used for a phase label"""
+    profile = profile or NETWORK_PROFILE
+    if profile == "auto":
+        return label if label in NETWORK_PROFILES else 'phase2'
+    if profile not in NETWORK_PROFILES:
+        raise ValueError(f"Unknown network profile '{profile}' (known: {', '.join(NETWORK_PROFILES)})")
+    return profile
+
+
+def blocked_patterns(profile):
+    return [pattern for category in NETWORK_PROFILES[profile] for pattern in BLOCKED_URL_PATTERNS[category]]
+
+
+class NetworkProfile:
+    """Blocked URL patterns of one driver and its page traffic statistics"""
+
+    def __init__(self, driver, label="driver", profile=None, measure=NETWORK_STATS, stats_file=NETWORK_STATS_FILE):
+        self.driver = driver
+        self.label = label
+        self.profile = profile_name(label, profile)
+        # Stats key: browsers on the seeded cache are compared against those without
+        self.key = f"{self.profile}+cache" if getattr(driver, 'browser_cache', False) else self.profile
+        self.measure = measure
+        self.stats_file = stats_file
+        self.patterns = []
+        self.first_page_seen = False
+        self.reset()
+
+    def reset(self):
+        self.stats = {'pages': 0, 'samples': 0, 'bytes': 0, 'requests': 0, 'cached': 0, 'ready_ms': 0.0,
+                      'first_pages': 0, 'first_bytes': 0, 'first_ready_ms': 0.0}
+
+    def apply(self):
+        """Block the profile's URL patterns in the browser; False when CDP is unavailable"""
+        self.patterns = blocked_patterns(self.profile)
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+        except Exception as e:
+            logger.warning(f"⚠️ Network profile '{self.profile}' not applied for {self.label}: {e}")
+            self.patterns = []
+            return False
+        logger.info(f"🌐 Network profile '{self.profile}' for {self.label}: "
+                    f"{', '.join(NETWORK_PROFILES[self.profile]) or 'nothing'} blocked")
+        return True
+
+    def sample(self):
+        """Add the traffic of the current page since the last sample (NETWORK_STATS only)"""
+        if not self.measure:
+            return None
+        try:
+            page = self.driver.execute_script(PAGE_STATS_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Network sample failed: {e}")
+            return None
+        self.stats['samples'] += 1
+        self.stats['bytes'] += int(page.get('bytes') or 0)
+        self.stats['requests'] += int(page.get('requests') or 0)
+        self.stats['cached'] += int(page.get('cached') or 0)
+        if page.get('ready_ms'):
+            self.stats['pages'] += 1
+            self.stats['ready_ms'] += float(page['ready_ms'])
+            if not self.first_page_seen:
+                # First page of this browser: what a cold start costs
+                self.first_page_seen = True
+                self.stats['first_pages'] += 1
+                self.stats['first_bytes'] += int(page.get('bytes') or 0)
+                self.stats['first_ready_ms'] += float(page['ready_ms'])
+        return page
+
+    def save(self):
+        """Add this window's statistics to the stats file (per label and profile)"""
+        with _stats_file_lock:
+            data = {}
+            try:
+                with open(self.stats_file, 'r', encoding='utf-8') as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                pass
+            totals = data.setdefault(self.label, {}).setdefault(self.key, {})
+            for key, value in self.stats.items():
+                totals[key] = totals.get(key, 0) + value
+            temp_file = f"{self.stats_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, indent=2, sort_keys=True)
+            os.replace(temp_file, self.stats_file)
+
+    def report(self, name=None, reset=True):
+        """Log bytes and page-ready time per page, then persist them"""
+        if not self.measure:
+            return
+        self.sample()  # traffic of the current page since its last sample
+        if not self.stats['samples']:
+            return
+        pages = max(self.stats['pages'], 1)
+        logger.info(f"🌐 NETWORK ({self.key}): {name or self.label}: {self.stats['pages']} pages, "
+                    f"{self.stats['bytes'] / pages / 1024:.1f} KB/page, {self.stats['requests'] / pages:.1f} requests/page, "
+                    f"{self.stats['cached'] / pages:.1f} from cache, ready after {self.stats['ready_ms'] / pages:.0f} ms")
+        self.save()
+        if reset:
+            self.reset()
+
+
+def attach_network_profile(driver, label):
+    """Apply the phase's network profile (NETWORK_PROFILE) and return it"""
+    network = NetworkProfile(driver, label)
+    network.apply()
+    if network.measure:
+        logger.info(f"📏 Network statistics enabled for {label} ({NETWORK_STATS_FILE})")
+    return network
+
+
+def main():
+    """Show bytes and page-ready time per phase and profile, against blocking nothing
+    (and each "+cache" profile against the same profile without the cache)"""
+    if not os.path.exists(NETWORK_STATS_FILE):
+        print(f"❌ No {NETWORK_STATS_FILE} yet - run a phase with NETWORK_STATS=1")
+        return
+
+    with open(NETWORK_STATS_FILE, 'r', encoding='utf-8') as handle:
+        data = json.load(handle)
+
+    print("🌐 NETWORK PROFILES")
+    print("=" * 78)
+    for label, profiles in sorted(data.items()):
+        print(f"{label}:")
+        for profile, totals in sorted(profiles.items()):
+            pages = max(totals.get('pages', 0), 1)
+            kb_per_page = totals.get('bytes', 0) / pages / 1024
+            ready_ms = totals.get('ready_ms', 0) / pages
+            line = f"   {profile:<16} {totals.get('pages', 0):>8} pages {kb_per_page:>9.1f} KB/page {ready_ms:>8.0f} ms ready"
+            if totals.get('first_pages'):
+                line += (f"   cold start {totals['first_bytes'] / totals['first_pages'] / 1024:.1f} KB, "
+                         f"{totals['first_ready_ms'] / totals['first_pages']:.0f} ms")
+            baseline = profiles.get(profile[:-len('+cache')] if profile.endswith('+cache') else 'off')
+            if baseline and baseline is not totals and baseline.get('pages'):
+                base_kb = baseline['bytes'] / baseline['pages'] / 1024
+                base_ms = baseline['ready_ms'] / baseline['pages']
+                line += f"   ({base_kb - kb_per_page:.1f} KB, {base_ms - ready_ms:.0f} ms saved per page)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
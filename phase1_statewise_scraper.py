@@ -12,15 +12,25 @@ from selenium.webdriver.common.by import By
 # Removed unused import for performance
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import csv
 import json
 import re
-import undetected_chromedriver as uc
 import logging
 from datetime import datetime
 import os
 
+from chrome_profiles import log_browser_memory
+from diagnostics import NO_RESULTS_TEXTS, Diagnostics, page_has_text
+from driver_factory import create_driver
+from logging_setup import configure_logging
+from network_profiles import attach_network_profile
+from portal_catalog import DISTRICT_OPTION_SELECTOR, STATE_OPTION_SELECTOR, PortalCatalog
+from portal_config import UDISE_PORTAL_URL, kys_url
+from wait_manager import attach_wait_manager
+from wait_policy import (WAIT_POLICY, district_options_text, districts_changed, element_in_view, results_changed,
+                         results_label_text)
+from webdriver_profiler import attach_profiler
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -34,37 +44,35 @@ class StatewiseSchoolScraper:
         # State-wise data storage
         self.state_schools_with_links = {}  # Schools WITH know_more_links
         self.state_schools_no_links = {}    # Schools WITHOUT know_more_links
+
+        # WebDriver call profiler (WEBDRIVER_PROFILING=1)
+        self.profiler = None
+
+        # Explicit waits per call site (implicit wait is 0)
+        self.waits = None
+
+        # Blocked resources (CDP) and traffic statistics
+        self.network = None
+
+        # Named wait points instead of fixed sleeps (wait_policy.py)
+        self.wait_policy = WAIT_POLICY
+
+        # Recent actions, page dumps on failure only
+        self.diagnostics = Diagnostics("phase1")
+
+        # States and districts cached on disk (portal_catalog.py)
+        self.catalog = PortalCatalog()
         
     def setup_driver(self):
         """Initialize the Chrome browser driver with optimized performance settings"""
         try:
-            # Setup Chrome options for optimal performance and reliability
-            options = uc.ChromeOptions()
-
-            # Core stability options
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-
-            # Performance optimizations (balanced for speed and functionality)
-            options.add_argument("--disable-images")  # Speed optimization
-            options.add_argument("--disable-plugins")
-            options.add_argument("--disable-background-timer-throttling")
-            options.add_argument("--disable-renderer-backgrounding")
-            options.add_argument("--disable-backgrounding-occluded-windows")
-
-            # Memory and resource optimizations
-            options.add_argument("--memory-pressure-off")
-            options.add_argument("--max_old_space_size=4096")
-
-            # Initialize Chrome driver
-            self.driver = uc.Chrome(options=options, version_main=138)
-            self.driver.maximize_window()
-
-            # Balanced timeouts for reliability and speed
-            self.driver.implicitly_wait(5)  # Balanced from 3 for stability
+            # Patched driver from the cache (driver_factory.py), fixed viewport / headless profile
+            self.driver = create_driver("phase1")
+            self.profiler = attach_profiler(self.driver, "phase1")
+
+            # Explicit waits only (a missing fallback selector no longer blocks)
+            self.waits = attach_wait_manager(self.driver, "phase1")
+            self.network = attach_network_profile(self.driver, "phase1")
             self.driver.set_page_load_timeout(20)  # Balanced from 15 for stability
 
             logger.info("✅ Chrome browser driver initialized with optimized settings")
@@ -73,13 +81,17 @@ class StatewiseSchoolScraper:
             logger.error("Please ensure Chrome browser is installed and updated")
             raise
 
+    def pause(self, name, condition=None):
+        """Wait at a named wait point (wait_policy.WAIT_POINTS) instead of a fixed sleep"""
+        return self.wait_policy.wait(name, self.driver, condition)
+
     def navigate_to_portal(self, max_retries=3):
         """Navigate to the UDISE Plus portal and access advance search with retry mechanism"""
         for attempt in range(max_retries):
             try:
                 logger.info(f"🌐 Navigating to UDISE Plus portal... (attempt {attempt + 1}/{max_retries})")
-                self.driver.get("https://udiseplus.gov.in/#/en/home")
-                time.sleep(3)  # Slightly increased for connection stability
+                self.driver.get(UDISE_PORTAL_URL)
+                self.pause('portal_load')
 
                 # Click on Visit Portal with optimized selector
                 logger.info("🔍 Looking for Visit Portal button...")
@@ -88,13 +100,13 @@ class StatewiseSchoolScraper:
                 )
                 visit_portal_btn.click()
                 logger.info("✅ Clicked Visit Portal button")
-                time.sleep(3)  # Increased for stability
+                self.pause('visit_portal')
 
                 # Switch to new tab if opened
                 if len(self.driver.window_handles) > 1:
                     self.driver.switch_to.window(self.driver.window_handles[-1])
                     logger.info("🔄 Switched to new tab")
-                    time.sleep(2)  # Increased for stability
+                    self.pause('portal_tab_switch')
 
                 # Click on Advance Search with optimized approach
                 logger.info("🔍 Looking for Advance Search button...")
@@ -116,11 +128,11 @@ class StatewiseSchoolScraper:
                 logger.error(f"❌ Failed to navigate to portal (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
                     logger.info(f"⏳ Retrying navigation in 15 seconds...")
-                    time.sleep(15)
+                    self.pause('navigation_retry')
                     # Refresh the page before retry
                     try:
                         self.driver.refresh()
-                        time.sleep(5)
+                        self.pause('navigation_refresh')
                     except:
                         pass
                 else:
@@ -132,6 +144,11 @@ class StatewiseSchoolScraper:
     def extract_states_data(self):
         """Extract all states data from dropdown using optimized approach"""
         try:
+            states = self.catalog.states()
+            if states and self.waits.find('state_options', STATE_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(states)} states from the catalog")
+                return states
+
             logger.info("🔍 Looking for state dropdown...")
 
             # Wait for state dropdown to be present and populated
@@ -141,7 +158,7 @@ class StatewiseSchoolScraper:
             logger.info("✅ Found state dropdown")
 
             # Minimal wait for options to populate
-            time.sleep(1)  # Reduced from 3
+            self.pause('state_options')
 
             # Get all state options
             state_options = state_select.find_elements(By.TAG_NAME, "option")
@@ -178,6 +195,8 @@ class StatewiseSchoolScraper:
                     continue
 
             logger.info(f"✅ Extracted {len(states)} valid states")
+            if states:
+                self.catalog.put_states(states)
             return states
 
         except Exception as e:
@@ -197,9 +216,13 @@ class StatewiseSchoolScraper:
         try:
             self.current_state = state_data
             logger.info(f"🔄 Selecting state: {state_data['stateName']}")
+            self.diagnostics.note('select_state', state=state_data['stateName'])
 
-            state_select_element = self.driver.find_element(By.CSS_SELECTOR, "select.form-select.select")
+            state_select_element = self.waits.find('state_dropdown', "select.form-select.select")
+            if state_select_element is None:
+                raise Exception("state dropdown not found")
             state_select = Select(state_select_element)
+            previous_districts = district_options_text(self.driver)
 
             # Try multiple methods to select the state (exact copy from working Schools.py)
             success = False
@@ -269,7 +292,8 @@ class StatewiseSchoolScraper:
                     logger.error(f"  Option {i}: text='{option.text}', value='{option.get_attribute('value')[:100]}...'")
                 raise Exception(f"Could not select state {state_data['stateName']} using any method")
 
-            time.sleep(1)  # Reduced wait for districts to load
+            # Wait for the districts of the new state to load
+            self.pause('districts_loaded', districts_changed(previous_districts))
             return True
 
         except Exception as e:
@@ -292,10 +316,15 @@ class StatewiseSchoolScraper:
                 logger.error(f"❌ current_state missing stateName: {self.current_state}")
                 return []
 
+            districts = self.catalog.districts(self.current_state['stateName'])
+            if districts and self.waits.find('district_options', DISTRICT_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(districts)} districts of {self.current_state['stateName']} from the catalog")
+                return districts
+
             logger.info(f"🔍 Extracting districts for {self.current_state['stateName']}...")
 
             # Optimized wait for district dropdown to be populated
-            time.sleep(2)  # Reduced from 5
+            self.pause('district_options')
 
             # Find all select elements and get the district one (usually the second one)
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
@@ -341,6 +370,8 @@ class StatewiseSchoolScraper:
                     logger.warning(f"⚠️ Empty district option: text='{district_text}', value='{district_value}'")
 
             logger.info(f"✅ Extracted {len(districts_data)} districts for {self.current_state['stateName']}")
+            if districts_data:
+                self.catalog.put_districts(self.current_state['stateName'], districts_data)
             return districts_data
 
         except Exception as e:
@@ -352,9 +383,10 @@ class StatewiseSchoolScraper:
         try:
             self.current_district = district_data
             logger.info(f"🔄 Selecting district: {district_data['districtName']}")
+            self.diagnostics.note('select_district', district=district_data['districtName'])
 
             # Minimal wait for district dropdown to populate
-            time.sleep(1)  # Reduced from 3
+            self.pause('district_select_ready')
 
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
 
@@ -433,7 +465,7 @@ class StatewiseSchoolScraper:
                     logger.error(f"  Option {i}: text='{option.text}', value='{option.get_attribute('value')[:100]}...'")
                 raise Exception(f"Could not select district {district_data['districtName']} using any method")
 
-            time.sleep(1)  # Reduced from 2
+            self.pause('district_selected')
             return True
 
         except Exception as e:
@@ -452,35 +484,21 @@ class StatewiseSchoolScraper:
                 "//button[normalize-space()='Search']"  # Normalized text search
             ]
 
-            search_button = None
-            working_selector = None
-
-            for selector in search_selectors:
-                try:
-                    if selector.startswith("//") or selector.startswith("("):
-                        # XPath selector
-                        search_button = WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                    else:
-                        # CSS selector
-                        search_button = WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                    working_selector = selector
-                    break
-                except:
-                    continue
+            working_selector, elements = self.waits.find_first('search_button', search_selectors)
+            search_button = elements[0] if elements else None
 
             if not search_button:
                 logger.error("❌ Search button not found with any selector")
+                self.diagnostics.capture(self.driver, "search button not found")
                 return False
+            self.diagnostics.note('search', selector=working_selector)
 
             # CRITICAL FIX: Scroll element into view before clicking
             try:
                 # Scroll to the element to ensure it's in viewport
                 self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", search_button)
-                time.sleep(1)  # Wait for scroll to complete
+                self.pause('search_scroll', element_in_view(search_button))
+                previous_label = results_label_text(self.driver)
 
                 # Verify element is now clickable
                 WebDriverWait(self.driver, 5).until(
@@ -505,7 +523,6 @@ class StatewiseSchoolScraper:
             logger.info("⏳ Waiting for search results to load...")
 
             # Try multiple selectors for results
-            result_found = False
             selectors_to_try = [
                 ".accordion-body",
                 ".accordion-item",
@@ -516,32 +533,21 @@ class StatewiseSchoolScraper:
                 ".school-item"
             ]
 
-            for selector in selectors_to_try:
-                try:
-                    WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        logger.info(f"✅ Found {len(elements)} result elements with selector: {selector}")
-                        result_found = True
-                        break
-                except:
-                    continue
+            selector, elements = self.waits.find_first('search_results', selectors_to_try)
+            result_found = bool(elements)
+            if result_found:
+                logger.info(f"✅ Found {len(elements)} result elements with selector: {selector}")
 
             if not result_found:
                 logger.warning("⚠️ No results found with any selector - checking page content")
-                # Debug: Check what's actually on the page
-                page_text = self.driver.page_source[:2000]  # First 2000 chars
-                logger.info(f"Page content preview: {page_text}")
-
                 # Check for common "no results" messages
-                if "No records found" in page_text or "No data available" in page_text:
+                if page_has_text(self.driver, *NO_RESULTS_TEXTS):
                     logger.info("📄 No schools found for this district")
                 else:
                     logger.warning("⚠️ Results may not have loaded properly")
+                    self.diagnostics.capture(self.driver, "search results missing", selectors=selectors_to_try)
 
-                time.sleep(2)  # Give more time for results to load
+                self.pause('search_results', results_changed(previous_label))  # Give more time for results to load
 
             return True
 
@@ -587,7 +593,7 @@ class StatewiseSchoolScraper:
             if link_match:
                 relative_link = link_match.group(1)
                 if relative_link.startswith("#/"):
-                    school_data['know_more_link'] = f"https://kys.udiseplus.gov.in/{relative_link}"
+                    school_data['know_more_link'] = kys_url(relative_link)
                 else:
                     school_data['know_more_link'] = relative_link
             else:
@@ -641,25 +647,17 @@ class StatewiseSchoolScraper:
                 ".school-item"
             ]
 
-            school_elements = []
-            working_selector = None
-
-            for selector in selectors_to_try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    school_elements = elements
-                    working_selector = selector
-                    logger.info(f"✅ Found {len(elements)} school elements with selector: {selector}")
-                    break
+            working_selector, school_elements = self.waits.find_first('school_cards', selectors_to_try)
+            if school_elements:
+                logger.info(f"✅ Found {len(school_elements)} school elements with selector: {working_selector}")
 
             if not school_elements:
                 logger.warning("⚠️ No school elements found with any selector")
-                # Debug: Check page content
-                page_text = self.driver.page_source[:1000]
-                if "No records found" in page_text or "No data available" in page_text:
+                if page_has_text(self.driver, *NO_RESULTS_TEXTS):
                     logger.info("📄 Confirmed: No schools in this district")
                 else:
                     logger.warning("⚠️ Page may not have loaded properly")
+                    self.diagnostics.capture(self.driver, "no school cards", selectors=selectors_to_try)
                 return []
 
             # Process all schools
@@ -688,24 +686,29 @@ class StatewiseSchoolScraper:
 
                 # ULTRA-FAST: Minimal wait for page to load
                 if page_number > 1:
-                    time.sleep(0.2)  # Reduced from 0.5 second
+                    self.pause('page_cards')
 
                 # Extract schools from current page
                 logger.info(f"   🔍 Extracting schools from page {page_number}...")
                 page_schools = self.extract_schools_from_current_page()
+                for school in page_schools:
+                    school['page_number'] = page_number
                 schools_data.extend(page_schools)
+                if self.network:
+                    self.network.sample()  # XHR traffic of this results page
                 logger.info(f"   ✅ Extracted {len(page_schools)} schools from page {page_number}")
                 logger.info(f"   📊 Total schools so far: {len(schools_data)}")
 
                 # Try to go to next page
                 logger.info(f"   🔄 Checking for next page after page {page_number}...")
+                previous_label = results_label_text(self.driver)
                 if not self.click_next_page():
                     logger.info(f"📄 No more pages available after page {page_number}")
                     break
 
                 page_number += 1
                 # ULTRA-FAST: Minimal wait for next page to load
-                time.sleep(0.3)  # Reduced from 0.8 seconds
+                self.pause('next_page_load', results_changed(previous_label))
 
             if page_number > max_pages:
                 logger.warning(f"⚠️ Reached maximum page limit ({max_pages}) - stopping pagination")
@@ -810,7 +813,7 @@ class StatewiseSchoolScraper:
                     continue
 
             # Brief wait for filter reset to take effect
-            time.sleep(0.5)
+            self.pause('filters_reset')
             logger.info("✅ Search filters reset")
             return True
 
@@ -818,6 +821,17 @@ class StatewiseSchoolScraper:
             logger.debug(f"Error resetting search filters: {e}")
             return False
 
+    def report_driver_profile(self, state_name):
+        """Log the WebDriver call profile, wait audit and network statistics of a finished state
+        (WEBDRIVER_PROFILING=1 / WAIT_AUDIT=1 / NETWORK_STATS=1)"""
+        if self.profiler:
+            self.profiler.report(state_name)
+        if self.waits:
+            self.waits.report(state_name)
+        self.wait_policy.report(state_name)
+        if self.network:
+            self.network.report(state_name)
+
     def segregate_schools_by_links(self, schools_data, state_name):
         """Segregate schools based on know_more_links availability"""
         schools_with_links = []
@@ -912,7 +926,7 @@ class StatewiseSchoolScraper:
 
             # Minimal wait for page to fully load
             logger.info("Waiting for page to fully load...")
-            time.sleep(1)  # Reduced from 5
+            self.pause('portal_settle')
 
             # Extract all states
             states = self.extract_states_data()
@@ -984,7 +998,7 @@ class StatewiseSchoolScraper:
                                     logger.warning(f"⚠️ No schools found for {district_name}")
 
                             # Minimal delay between districts
-                            time.sleep(0.2)  # Reduced from 0.5
+                            self.pause('phase1_district_pause')
 
                         except Exception as e:
                             logger.error(f"❌ Failed to process district {district_name}: {e}")
@@ -993,6 +1007,7 @@ class StatewiseSchoolScraper:
                     # Save state data to CSV files
                     logger.info(f"\n💾 Saving data for state: {state_name}")
                     self.save_state_data_to_csv(state_name)
+                    self.report_driver_profile(state_name)
 
                     # Show state summary
                     total_with_links = len(self.state_schools_with_links[state_name])
@@ -1016,6 +1031,7 @@ class StatewiseSchoolScraper:
             logger.error(f"❌ State-wise scraping process failed: {e}")
         finally:
             if self.driver:
+                log_browser_memory(self.driver, "phase1")
                 self.driver.quit()
                 logger.info("🔒 Driver closed")
 
@@ -1061,7 +1077,7 @@ class StatewiseSchoolScraper:
                             else:
                                 logger.warning(f"Search button click failed (attempt {search_attempt + 1}/3) for district: {district['districtName']}")
                                 if search_attempt < 2:  # Don't wait after last attempt
-                                    time.sleep(2)  # Wait before retry
+                                    self.pause('search_retry')
 
                         if search_success:
                             schools_data = self.extract_schools_basic_data()
@@ -1087,7 +1103,7 @@ class StatewiseSchoolScraper:
                         logger.info(f"   📊 {with_links} with links, {without_links} without links")
 
                         # Brief delay between districts
-                        time.sleep(0.2)
+                        self.pause('phase1_district_pause')
                     else:
                         logger.warning(f"Failed to select district: {district['districtName']}")
 
@@ -1097,6 +1113,7 @@ class StatewiseSchoolScraper:
 
             # Save state data
             self.save_state_data_to_csv(target_state['stateName'])
+            self.report_driver_profile(target_state['stateName'])
 
             # Show state summary
             with_links_count = len(self.state_schools_with_links.get(target_state['stateName'], []))
@@ -1156,6 +1173,7 @@ class StatewiseSchoolScraper:
 
 # Main execution
 if __name__ == "__main__":
+    configure_logging()
     scraper = StatewiseSchoolScraper()
 
     # Configuration options
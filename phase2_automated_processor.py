@@ -11,7 +11,6 @@ Phase 2 Automated Processor - Dual Output Strategy Implementation
 
 import pandas as pd
 import time
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -22,6 +21,20 @@ import os
 import glob
 import re
 
+from change_detection import ListingChangeDetector
+from chrome_profiles import log_browser_memory
+from detail_page_cache import DetailPageCache
+from detail_page_parser import BASIC_DETAIL_FIELDS, STUDENT_FIELDS, TEACHER_FIELDS, fill_missing_from_page
+from driver_factory import create_driver
+from logging_setup import configure_logging, school_log_sampled, school_scope
+from network_profiles import attach_network_profile
+from processing_time_calculator import ProcessingTimeCalculator
+from scrape_metrics import ScrapeMetrics
+from status_server import ProgressTracker, start_status_server
+from wait_manager import attach_wait_manager
+from wait_policy import WAIT_POLICY
+from webdriver_profiler import attach_profiler
+
 # Google Sheets integration
 try:
     import gspread
@@ -42,6 +55,20 @@ GOOGLE_SHEETS_ENABLED = True
 GOOGLE_SHEET_NAME = "Know your School Database"
 SERVICE_ACCOUNT_FILE = "credentials.json"
 
+# Incremental refresh: only revisit schools whose listing (or last_modified) changed
+# since the previous run. Fingerprints are kept in change_store/. The output holds
+# only those schools, so it is not uploaded to Google Sheets (merge it into the
+# state's canonical file with snapshot_merger.py instead).
+INCREMENTAL_REFRESH = False
+
+# Keep the compressed page source of every detail page so that parser fixes can be
+# re-applied with "python detail_page_cache.py reparse" instead of re-scraping
+DETAIL_PAGE_CACHE_ENABLED = False
+
+# Write per-school stage timings (navigation, wait, extraction, CSV write, Sheets upload)
+# to metrics/*.jsonl
+SCRAPE_METRICS_ENABLED = False
+
 class GoogleSheetsUploader:
     """Google Sheets uploader for Phase 2 data"""
 
@@ -156,7 +183,7 @@ class GoogleSheetsUploader:
                 logger.info(f"📤 Uploaded batch {i//batch_size + 1}: {len(batch)} rows to {state_name}")
 
                 # Brief pause to respect API limits
-                time.sleep(1)
+                WAIT_POLICY.wait('sheets_batch')
 
             logger.info(f"✅ Successfully uploaded {total_rows} rows to Google Sheets: {state_name}")
             return True
@@ -168,6 +195,10 @@ class GoogleSheetsUploader:
 class AutomatedPhase2Processor:
     def __init__(self):
         self.driver = None
+        self.profiler = None  # WebDriver call profiler (WEBDRIVER_PROFILING=1)
+        self.waits = None  # Explicit waits per call site (implicit wait is 0)
+        self.network = None  # Blocked resources (CDP) and traffic statistics
+        self.wait_policy = WAIT_POLICY  # Named wait points instead of fixed sleeps
         self.processed_count = 0
         self.success_count = 0
         self.fail_count = 0
@@ -183,13 +214,30 @@ class AutomatedPhase2Processor:
         if GOOGLE_SHEETS_ENABLED:
             self.sheets_uploader = GoogleSheetsUploader()
 
+        # Detail page cache (opt-in)
+        self.current_state_name = None
+        self.page_cache = DetailPageCache() if DETAIL_PAGE_CACHE_ENABLED else None
+
+        # Per-stage timing log (reopened per state)
+        self.metrics = ScrapeMetrics("phase2", enabled=False)
+
+        # Appended to output file names (work unit id when run by work_planner.py)
+        self.output_suffix = None
+
+        # Live progress (served on /status and /metrics when STATUS_SERVER=1), with
+        # P50/P90 ETA from rates measured in past output CSVs and metrics logs
+        self.time_calculator = ProcessingTimeCalculator.from_measurements(lazy=True)
+        self.progress = ProgressTracker("automated", self.time_calculator)
+        self.status_server = None
+
     def setup_incremental_csv(self, state_name):
         """Setup incremental CSV file for a state"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             clean_state = state_name.replace(' ', '_').replace('&', 'and').replace('/', '_').upper()
 
-            self.incremental_csv_file = f"{clean_state}_phase2_incremental_{timestamp}.csv"
+            suffix = f"_{self.output_suffix}" if self.output_suffix else ""
+            self.incremental_csv_file = f"{clean_state}_phase2_incremental_{timestamp}{suffix}.csv"
             self.csv_headers_written = False
 
             logger.info(f"📝 Setup incremental CSV: {self.incremental_csv_file}")
@@ -278,30 +326,14 @@ class AutomatedPhase2Processor:
     def setup_driver(self):
         """Initialize Chrome browser driver with optimized settings for Phase 2 processing"""
         try:
-            # Setup Chrome options for Phase 2 data extraction
-            options = uc.ChromeOptions()
-
-            # Core stability options
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-
-            # Performance optimizations (KEEP JavaScript enabled for dynamic content)
-            options.add_argument("--disable-images")  # Speed optimization
-            options.add_argument("--disable-plugins")  # Speed optimization
-            # NOTE: JavaScript is ENABLED for proper page functionality
-
-            # Memory and resource optimizations
-            options.add_argument("--memory-pressure-off")
-            options.add_argument("--max_old_space_size=4096")
-
-            self.driver = uc.Chrome(options=options)
-            self.driver.maximize_window()
-
-            # Balanced timeouts for Phase 2 processing
-            self.driver.implicitly_wait(5)  # Increased for dynamic content
+            # Patched driver from the cache (driver_factory.py), fixed viewport / headless profile
+            self.driver = create_driver("phase2")
+            self.profiler = attach_profiler(self.driver, "phase2")
+
+            # Explicit waits only: pages are waited for in extract_focused_data, so an
+            # absent optional element (e.g. a school name heading) must not block
+            self.waits = attach_wait_manager(self.driver, "phase2")
+            self.network = attach_network_profile(self.driver, "phase2")
             self.driver.set_page_load_timeout(25)  # Increased for detailed pages
 
             logger.info("✅ Chrome browser driver initialized for Phase 2 automated processing")
@@ -310,6 +342,10 @@ class AutomatedPhase2Processor:
             logger.error("Please ensure Chrome browser is installed and updated")
             raise
 
+    def pause(self, name, condition=None):
+        """Wait at a named wait point (wait_policy.WAIT_POINTS) instead of a fixed sleep"""
+        return self.wait_policy.wait(name, self.driver, condition)
+
     def find_phase1_csv_files(self):
         """Find all Phase 1 CSV files automatically"""
         try:
@@ -359,6 +395,12 @@ class AutomatedPhase2Processor:
             logger.error(f"❌ Error extracting state name from {filename}: {e}")
             return "UNKNOWN_STATE"
 
+    def log_phase2_estimate(self, num_schools, state_name):
+        """Log the P50/P90 Phase 2 completion time from measured rates"""
+        estimate = self.time_calculator.get_percentile_estimate(num_schools, "phase2", state_name=state_name)
+        logger.info(f"   ⏱️ Estimated Phase 2 time for {num_schools} schools: P50 {estimate['p50_formatted']}, "
+                    f"P90 {estimate['p90_formatted']} ({estimate['sources']['phase2']} rates)")
+
     def filter_phase2_ready_schools(self, df):
         """Filter schools that are ready for Phase 2 processing"""
         try:
@@ -384,35 +426,44 @@ class AutomatedPhase2Processor:
         """Extract comprehensive data from school detail page with immediate browser refresh"""
         for attempt in range(max_retries):
             try:
-                logger.info(f"🌐 Navigating to school detail page: {url}")
+                logger.info("🌐 Navigating to school detail page: %s", url)
+                if attempt > 0:
+                    self.metrics.retry('extraction')
 
                 # IMMEDIATE BROWSER REFRESH: Navigate and immediately refresh
                 try:
-                    # Step 1: Navigate to the URL
-                    self.driver.get(url)
-                    logger.info(f"   📍 Initial navigation completed")
+                    with self.metrics.stage('navigation'):
+                        # Step 1: Navigate to the URL
+                        self.driver.get(url)
+                        logger.info("   📍 Initial navigation completed")
+
+                        # Step 2: IMMEDIATE REFRESH as requested
+                        logger.info("   🔄 Performing IMMEDIATE browser refresh...")
+                        self.driver.refresh()
 
-                    # Step 2: IMMEDIATE REFRESH as requested
-                    logger.info(f"   🔄 Performing IMMEDIATE browser refresh...")
-                    self.driver.refresh()
+                    with self.metrics.stage('readiness_wait'):
+                        # Step 3: Wait for refresh to complete
+                        self.pause('detail_refresh')
 
-                    # Step 3: Wait for refresh to complete
-                    time.sleep(4)  # Increased wait for refresh completion
+                        # Step 4: Verify page is loaded
+                        WebDriverWait(self.driver, 10).until(
+                            lambda driver: driver.execute_script("return document.readyState") == "complete"
+                        )
 
-                    # Step 4: Verify page is loaded
-                    WebDriverWait(self.driver, 10).until(
-                        lambda driver: driver.execute_script("return document.readyState") == "complete"
-                    )
+                        # Step 5: Additional wait for dynamic content
+                        self.pause('detail_content')
 
-                    # Step 5: Additional wait for dynamic content
-                    time.sleep(2)
+                    if self.network:
+                        self.network.sample()
 
-                    logger.info(f"   ✅ Page refreshed and loaded successfully")
-                    logger.info(f"   📍 Final URL: {self.driver.current_url}")
-                    logger.info(f"   📄 Page title: {self.driver.title}")
+                    logger.info("   ✅ Page refreshed and loaded successfully")
+                    if school_log_sampled():
+                        # Costly arguments (two WebDriver calls): only for sampled schools
+                        logger.info("   📍 Final URL: %s", self.driver.current_url)
+                        logger.info("   📄 Page title: %s", self.driver.title)
 
                 except Exception as e:
-                    logger.error(f"   ❌ Navigation/refresh error: {e}")
+                    logger.error("   ❌ Navigation/refresh error: %s", e)
                     if attempt < max_retries - 1:
                         continue
                     return None
@@ -451,19 +502,24 @@ class AutomatedPhase2Processor:
                 }
 
                 # Get page content for extraction
-                page_text = self.driver.page_source
+                with self.metrics.stage('page_source'):
+                    page_text = self.driver.page_source
+                self.metrics.add_bytes('page_source', len(page_text))
+                if self.page_cache:
+                    with self.metrics.stage('page_cache'):
+                        self.page_cache.store(url, page_text, self.current_state_name)
+                extraction_start = time.perf_counter()
 
                 # Extract school ID for verification
-                import re
                 url_school_id = re.search(r'/(\d+)/\d+$', url)
                 expected_school_id = url_school_id.group(1) if url_school_id else "unknown"
 
-                logger.info(f"   📄 Expected school ID: {expected_school_id}")
-                logger.info(f"   📄 Page content length: {len(page_text)} characters")
+                logger.info("   📄 Expected school ID: %s", expected_school_id)
+                logger.info("   📄 Page content length: %s characters", len(page_text))
 
                 # Verify we're on the correct page
                 if expected_school_id not in page_text and expected_school_id != "unknown":
-                    logger.warning(f"   ⚠️ School ID {expected_school_id} not found in page content")
+                    logger.warning("   ⚠️ School ID %s not found in page content", expected_school_id)
                     # Continue with extraction anyway, but mark as potential issue
                     data['detail_school_name'] = f"POTENTIAL_ISSUE_{expected_school_id}"
 
@@ -471,13 +527,13 @@ class AutomatedPhase2Processor:
 
                 # 1. BASIC DETAILS SECTION - Extract from .innerPad div with .schoolInfoCol elements
                 try:
-                    logger.info(f"   📋 Extracting Basic Details from .innerPad div...")
+                    logger.info("   📋 Extracting Basic Details from .innerPad div...")
 
                     # Try to find Basic Details section using Selenium elements first
                     try:
                         basic_details_elements = self.driver.find_elements(By.CSS_SELECTOR, ".innerPad .schoolInfoCol")
                         if basic_details_elements:
-                            logger.info(f"   Found {len(basic_details_elements)} basic detail elements")
+                            logger.info("   Found %s basic detail elements", len(basic_details_elements))
 
                             # Define field mapping for proper extraction
                             basic_fields_map = {
@@ -507,10 +563,10 @@ class AutomatedPhase2Processor:
                                     if title_text in basic_fields_map and value_text:
                                         field_key = basic_fields_map[title_text]
                                         data[field_key] = value_text
-                                        logger.debug(f"   Extracted {title_text}: {value_text}")
+                                        logger.debug("   Extracted %s: %s", title_text, value_text)
 
                                 except Exception as e:
-                                    logger.debug(f"   Error processing basic detail element: {e}")
+                                    logger.debug("   Error processing basic detail element: %s", e)
                                     continue
 
                             # Also check for Academic Year in the header section
@@ -519,98 +575,40 @@ class AutomatedPhase2Processor:
                                 academic_year_text = academic_year_element.text.strip()
                                 if "Academic Year" in academic_year_text:
                                     # Extract year from text like "Academic Year : 2023-24"
-                                    import re
                                     year_match = re.search(r'Academic Year[:\s]*([^<\n]+)', academic_year_text)
                                     if year_match:
                                         data['academic_year'] = year_match.group(1).strip()
-                                        logger.debug(f"   Extracted Academic Year: {data['academic_year']}")
+                                        logger.debug("   Extracted Academic Year: %s", data['academic_year'])
                             except:
                                 logger.debug("   Academic Year not found in header")
 
                     except Exception as e:
-                        logger.debug(f"   Error finding basic details elements: {e}")
-
-                    # Fallback: Use regex patterns for basic details
-                    if data['academic_year'] == 'N/A':
-                        academic_year_match = re.search(r'Academic Year[:\s]*(?:<[^>]*>)*([^<\n]+)', page_text, re.IGNORECASE)
-                        if academic_year_match:
-                            data['academic_year'] = academic_year_match.group(1).strip()
-
-                    if data['location'] == 'N/A':
-                        location_match = re.search(r'Location</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if location_match:
-                            data['location'] = location_match.group(1).strip()
-
-                    if data['school_category'] == 'N/A':
-                        category_match = re.search(r'School Category</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if category_match:
-                            data['school_category'] = category_match.group(1).strip()
-
-                    if data['school_type'] == 'N/A':
-                        type_match = re.search(r'School Type</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if type_match:
-                            data['school_type'] = type_match.group(1).strip()
-
-                    if data['year_of_establishment'] == 'N/A':
-                        year_match = re.search(r'Year of Establishment</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if year_match:
-                            data['year_of_establishment'] = year_match.group(1).strip()
-
-                    if data['class_from'] == 'N/A':
-                        class_from_match = re.search(r'Class From</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if class_from_match:
-                            data['class_from'] = class_from_match.group(1).strip()
-
-                    if data['class_to'] == 'N/A':
-                        class_to_match = re.search(r'Class To</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if class_to_match:
-                            data['class_to'] = class_to_match.group(1).strip()
-
-                    if data['national_management'] == 'N/A':
-                        national_mgmt_match = re.search(r'National Management</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if national_mgmt_match:
-                            data['national_management'] = national_mgmt_match.group(1).strip()
-
-                    if data['state_management'] == 'N/A':
-                        state_mgmt_match = re.search(r'State Management</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if state_mgmt_match:
-                            data['state_management'] = state_mgmt_match.group(1).strip()
-
-                    if data['affiliation_board_sec'] == 'N/A':
-                        affil_sec_match = re.search(r'Affiliation Board Sec\.</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if affil_sec_match:
-                            data['affiliation_board_sec'] = affil_sec_match.group(1).strip()
-
-                    if data['affiliation_board_hsec'] == 'N/A':
-                        affil_hsec_match = re.search(r'Affiliation Board HSec\.</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                        if affil_hsec_match:
-                            data['affiliation_board_hsec'] = affil_hsec_match.group(1).strip()
-
-                    # Combine class range if both from and to are found
-                    if data['class_from'] != 'N/A' and data['class_to'] != 'N/A':
-                        data['class_range'] = f"{data['class_from']} To {data['class_to']}"
+                        logger.debug("   Error finding basic details elements: %s", e)
+
+                    # Fallback: Parse remaining basic details (and class range) from the page source
+                    fill_missing_from_page(data, page_text, BASIC_DETAIL_FIELDS)
 
                     # Count extracted basic details fields
                     basic_fields_extracted = sum(1 for field in ['location', 'school_category', 'school_type', 'year_of_establishment',
                                                                 'national_management', 'state_management', 'affiliation_board_sec',
                                                                 'affiliation_board_hsec'] if data[field] != 'N/A')
 
-                    logger.info(f"   ✅ Basic Details extracted: {basic_fields_extracted}/8 fields")
-                    logger.info(f"      Category={data['school_category']}, Type={data['school_type']}, Year={data['year_of_establishment']}")
-                    logger.info(f"      Affiliation Sec={data['affiliation_board_sec']}, HSec={data['affiliation_board_hsec']}")
+                    logger.info("   ✅ Basic Details extracted: %s/8 fields", basic_fields_extracted)
+                    logger.info("      Category=%s, Type=%s, Year=%s", data['school_category'], data['school_type'], data['year_of_establishment'])
+                    logger.info("      Affiliation Sec=%s, HSec=%s", data['affiliation_board_sec'], data['affiliation_board_hsec'])
 
                 except Exception as e:
-                    logger.debug(f"   Error extracting basic details: {e}")
+                    logger.debug("   Error extracting basic details: %s", e)
 
                 # 2. STUDENT ENROLLMENT SECTION - Extract from .bg-white div with .H3Value elements
                 try:
-                    logger.info(f"   👥 Extracting Student Enrollment from .bg-white div with .H3Value elements...")
+                    logger.info("   👥 Extracting Student Enrollment from .bg-white div with .H3Value elements...")
 
                     # Try to find Student Enrollment section using Selenium elements first
                     try:
                         h3_value_elements = self.driver.find_elements(By.CSS_SELECTOR, ".bg-white .H3Value")
                         if h3_value_elements:
-                            logger.info(f"   Found {len(h3_value_elements)} H3Value elements")
+                            logger.info("   Found %s H3Value elements", len(h3_value_elements))
 
                             for element in h3_value_elements:
                                 try:
@@ -622,67 +620,31 @@ class AutomatedPhase2Processor:
                                     if value.isdigit():
                                         if "total students" in parent_text:
                                             data['total_students'] = value
-                                            logger.info(f"   Found Total Students: {value}")
+                                            logger.info("   Found Total Students: %s", value)
                                         elif "boys" in parent_text and "total" not in parent_text:
                                             data['total_boys'] = value
-                                            logger.info(f"   Found Boys: {value}")
+                                            logger.info("   Found Boys: %s", value)
                                         elif "girls" in parent_text:
                                             data['total_girls'] = value
-                                            logger.info(f"   Found Girls: {value}")
+                                            logger.info("   Found Girls: %s", value)
                                 except Exception as e:
-                                    logger.debug(f"   Error processing H3Value element: {e}")
+                                    logger.debug("   Error processing H3Value element: %s", e)
                                     continue
                     except Exception as e:
-                        logger.debug(f"   Error finding H3Value elements: {e}")
-
-                    # Fallback: Use regex patterns for student enrollment
-                    if data['total_students'] == 'N/A':
-                        total_students_patterns = [
-                            r'Total Students[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Total Students[^>]*>\s*(\d+)\s*<',
-                            r'Total Students[:\s]*(\d+)'
-                        ]
-                        for pattern in total_students_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['total_students'] = match.group(1).strip()
-                                logger.info(f"   Found Total Students (regex): {data['total_students']}")
-                                break
-
-                    if data['total_boys'] == 'N/A':
-                        boys_patterns = [
-                            r'Boys[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Boys[^>]*>\s*(\d+)\s*<',
-                            r'Boys[:\s]*(\d+)'
-                        ]
-                        for pattern in boys_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['total_boys'] = match.group(1).strip()
-                                logger.info(f"   Found Boys (regex): {data['total_boys']}")
-                                break
-
-                    if data['total_girls'] == 'N/A':
-                        girls_patterns = [
-                            r'Girls[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Girls[^>]*>\s*(\d+)\s*<',
-                            r'Girls[:\s]*(\d+)'
-                        ]
-                        for pattern in girls_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['total_girls'] = match.group(1).strip()
-                                logger.info(f"   Found Girls (regex): {data['total_girls']}")
-                                break
+                        logger.debug("   Error finding H3Value elements: %s", e)
 
-                    logger.info(f"   ✅ Student Enrollment extracted: Total={data['total_students']}, Boys={data['total_boys']}, Girls={data['total_girls']}")
+                    # Fallback: Parse student enrollment from the page source
+                    for field in fill_missing_from_page(data, page_text, STUDENT_FIELDS):
+                        logger.info("   Found %s (page source): %s", field, data[field])
+
+                    logger.info("   ✅ Student Enrollment extracted: Total=%s, Boys=%s, Girls=%s", data['total_students'], data['total_boys'], data['total_girls'])
 
                 except Exception as e:
-                    logger.debug(f"   Error extracting student enrollment: {e}")
+                    logger.debug("   Error extracting student enrollment: %s", e)
 
                 # 3. TEACHER SECTION - Extract from similar HTML structure with Total Teachers/Male/Female
                 try:
-                    logger.info(f"   👨‍🏫 Extracting Teacher data from similar HTML structure...")
+                    logger.info("   👨‍🏫 Extracting Teacher data from similar HTML structure...")
 
                     # Try to find Teacher section using Selenium elements first
                     try:
@@ -700,78 +662,42 @@ class AutomatedPhase2Processor:
                                 if value.isdigit():
                                     if "total teachers" in parent_text:
                                         data['total_teachers'] = value
-                                        logger.info(f"   Found Total Teachers: {value}")
+                                        logger.info("   Found Total Teachers: %s", value)
                                         teacher_section_found = True
                                     elif "male" in parent_text and "teacher" in parent_text:
                                         data['male_teachers'] = value
-                                        logger.info(f"   Found Male Teachers: {value}")
+                                        logger.info("   Found Male Teachers: %s", value)
                                         teacher_section_found = True
                                     elif "female" in parent_text and "teacher" in parent_text:
                                         data['female_teachers'] = value
-                                        logger.info(f"   Found Female Teachers: {value}")
+                                        logger.info("   Found Female Teachers: %s", value)
                                         teacher_section_found = True
                                     elif "male" in parent_text and teacher_section_found and data['male_teachers'] == 'N/A':
                                         # Sometimes just "Male" without "Teacher"
                                         data['male_teachers'] = value
-                                        logger.info(f"   Found Male Teachers (short): {value}")
+                                        logger.info("   Found Male Teachers (short): %s", value)
                                     elif "female" in parent_text and teacher_section_found and data['female_teachers'] == 'N/A':
                                         # Sometimes just "Female" without "Teacher"
                                         data['female_teachers'] = value
-                                        logger.info(f"   Found Female Teachers (short): {value}")
+                                        logger.info("   Found Female Teachers (short): %s", value)
                             except Exception as e:
-                                logger.debug(f"   Error processing teacher H3Value element: {e}")
+                                logger.debug("   Error processing teacher H3Value element: %s", e)
                                 continue
                     except Exception as e:
-                        logger.debug(f"   Error finding teacher H3Value elements: {e}")
-
-                    # Fallback: Use regex patterns for teacher data
-                    if data['total_teachers'] == 'N/A':
-                        teacher_patterns = [
-                            r'Total Teachers[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Total Teachers[^>]*>\s*(\d+)\s*<',
-                            r'Total Teachers[:\s]*(\d+)'
-                        ]
-                        for pattern in teacher_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['total_teachers'] = match.group(1).strip()
-                                logger.info(f"   Found Total Teachers (regex): {data['total_teachers']}")
-                                break
-
-                    if data['male_teachers'] == 'N/A':
-                        male_patterns = [
-                            r'Male[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Male Teachers[^>]*>\s*(\d+)\s*<',
-                            r'Male[:\s]*(\d+)'
-                        ]
-                        for pattern in male_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['male_teachers'] = match.group(1).strip()
-                                logger.info(f"   Found Male Teachers (regex): {data['male_teachers']}")
-                                break
-
-                    if data['female_teachers'] == 'N/A':
-                        female_patterns = [
-                            r'Female[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                            r'Female Teachers[^>]*>\s*(\d+)\s*<',
-                            r'Female[:\s]*(\d+)'
-                        ]
-                        for pattern in female_patterns:
-                            match = re.search(pattern, page_text, re.IGNORECASE)
-                            if match:
-                                data['female_teachers'] = match.group(1).strip()
-                                logger.info(f"   Found Female Teachers (regex): {data['female_teachers']}")
-                                break
+                        logger.debug("   Error finding teacher H3Value elements: %s", e)
+
+                    # Fallback: Parse teacher data from the page source
+                    for field in fill_missing_from_page(data, page_text, TEACHER_FIELDS):
+                        logger.info("   Found %s (page source): %s", field, data[field])
 
-                    logger.info(f"   ✅ Teacher data extracted: Total={data['total_teachers']}, Male={data['male_teachers']}, Female={data['female_teachers']}")
+                    logger.info("   ✅ Teacher data extracted: Total=%s, Male=%s, Female=%s", data['total_teachers'], data['male_teachers'], data['female_teachers'])
 
                 except Exception as e:
-                    logger.debug(f"   Error extracting teacher data: {e}")
+                    logger.debug("   Error extracting teacher data: %s", e)
 
                 # 4. SCHOOL NAME - Extract from page title, header, or breadcrumb
                 try:
-                    logger.info(f"   🏫 Extracting School Name...")
+                    logger.info("   🏫 Extracting School Name...")
 
                     # Method 1: Try to get school name from page title
                     page_title = self.driver.title
@@ -779,7 +705,7 @@ class AutomatedPhase2Processor:
                         clean_title = page_title.replace("Know Your School", "").replace("-", "").strip()
                         if clean_title and len(clean_title) > 3:
                             data['detail_school_name'] = clean_title
-                            logger.info(f"   Found school name from title: {clean_title}")
+                            logger.info("   Found school name from title: %s", clean_title)
 
                     # Method 2: Try to find school name in breadcrumb or header elements
                     if data['detail_school_name'] == 'N/A':
@@ -791,20 +717,23 @@ class AutomatedPhase2Processor:
                                 "[class*='title']", "[class*='name']", "[class*='header']"
                             ]
 
-                            for selector in name_selectors:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                            def school_name_texts(elements):
+                                texts = []
                                 for element in elements:
                                     text = element.text.strip()
                                     if text and len(text) > 5 and len(text) < 200:
                                         # Filter out common non-school-name text
                                         if not any(skip in text.lower() for skip in ['know your school', 'udise', 'dashboard', 'menu', 'search']):
-                                            data['detail_school_name'] = text
-                                            logger.info(f"   Found school name from {selector}: {text}")
-                                            break
-                                if data['detail_school_name'] != 'N/A':
-                                    break
+                                            texts.append(text)
+                                return texts
+
+                            selector, texts = self.waits.find_first('school_name', name_selectors,
+                                                                    accept=school_name_texts)
+                            if texts:
+                                data['detail_school_name'] = texts[0]
+                                logger.info("   Found school name from %s: %s", selector, texts[0])
                         except Exception as e:
-                            logger.debug(f"   Error finding school name in elements: {e}")
+                            logger.debug("   Error finding school name in elements: %s", e)
 
                     # Method 3: Extract from page content using regex
                     if data['detail_school_name'] == 'N/A':
@@ -819,16 +748,16 @@ class AutomatedPhase2Processor:
                                 school_name = match.group(1).strip()
                                 if school_name and len(school_name) > 3:
                                     data['detail_school_name'] = school_name
-                                    logger.info(f"   Found school name from regex: {school_name}")
+                                    logger.info("   Found school name from regex: %s", school_name)
                                     break
 
                     # Fallback: Use school ID as identifier
                     if data['detail_school_name'] == 'N/A' or data['detail_school_name'].startswith('POTENTIAL_ISSUE'):
                         data['detail_school_name'] = f"School_ID_{expected_school_id}"
-                        logger.info(f"   Using school ID as name: {data['detail_school_name']}")
+                        logger.info("   Using school ID as name: %s", data['detail_school_name'])
 
                 except Exception as e:
-                    logger.debug(f"   Error extracting school name: {e}")
+                    logger.debug("   Error extracting school name: %s", e)
                     data['detail_school_name'] = f"School_ID_{expected_school_id}"
 
                 # Strategy 5: Fallback - Extract any visible numbers as potential data
@@ -852,18 +781,18 @@ class AutomatedPhase2Processor:
                                     # Assign based on context or position
                                     if ('student' in parent_text or 'enrollment' in parent_text) and data['total_students'] == 'N/A':
                                         data['total_students'] = text
-                                        logger.debug(f"   Found students from context: {text}")
+                                        logger.debug("   Found students from context: %s", text)
                                     elif ('teacher' in parent_text or 'staff' in parent_text or 'faculty' in parent_text) and data['total_teachers'] == 'N/A':
                                         data['total_teachers'] = text
-                                        logger.debug(f"   Found teachers from context: {text}")
+                                        logger.debug("   Found teachers from context: %s", text)
                             except:
                                 continue
                     except Exception as e:
-                        logger.debug(f"   Error in fallback extraction: {e}")
+                        logger.debug("   Error in fallback extraction: %s", e)
 
                 # COMPREHENSIVE DATA VALIDATION AND STATUS INDICATORS
                 try:
-                    logger.info(f"   📊 Validating extracted data...")
+                    logger.info("   📊 Validating extracted data...")
 
                     # Count successfully extracted fields
                     extracted_fields = 0
@@ -895,35 +824,36 @@ class AutomatedPhase2Processor:
 
                     # Validation summary
                     if critical_fields >= 2:
-                        logger.info(f"✅ EXCELLENT extraction from {url}")
-                        logger.info(f"   🎯 Critical fields: {critical_fields}/2, Total fields: {extracted_fields}")
-                        logger.info(f"   📋 School: {data['detail_school_name']}")
-                        logger.info(f"   👥 Students: {data['total_students']}, Teachers: {data['total_teachers']}")
+                        logger.info("✅ EXCELLENT extraction from %s", url)
+                        logger.info("   🎯 Critical fields: %s/2, Total fields: %s", critical_fields, extracted_fields)
+                        logger.info("   📋 School: %s", data['detail_school_name'])
+                        logger.info("   👥 Students: %s, Teachers: %s", data['total_students'], data['total_teachers'])
                     elif critical_fields >= 1:
-                        logger.info(f"⚠️ PARTIAL extraction from {url}")
-                        logger.info(f"   🎯 Critical fields: {critical_fields}/2, Total fields: {extracted_fields}")
-                        logger.info(f"   📋 School: {data['detail_school_name']}")
-                        logger.info(f"   👥 Students: {data['total_students']}, Teachers: {data['total_teachers']}")
+                        logger.info("⚠️ PARTIAL extraction from %s", url)
+                        logger.info("   🎯 Critical fields: %s/2, Total fields: %s", critical_fields, extracted_fields)
+                        logger.info("   📋 School: %s", data['detail_school_name'])
+                        logger.info("   👥 Students: %s, Teachers: %s", data['total_students'], data['total_teachers'])
                     else:
-                        logger.warning(f"❌ FAILED extraction from {url}")
-                        logger.warning(f"   🎯 Critical fields: {critical_fields}/2, Total fields: {extracted_fields}")
-                        logger.warning(f"   📄 Page title: {self.driver.title}")
-                        logger.warning(f"   📄 Current URL: {self.driver.current_url}")
-                        logger.warning(f"   📄 Page source length: {len(page_text)}")
+                        logger.warning("❌ FAILED extraction from %s", url)
+                        logger.warning("   🎯 Critical fields: %s/2, Total fields: %s", critical_fields, extracted_fields)
+                        logger.warning("   📄 Page title: %s", self.driver.title)
+                        logger.warning("   📄 Current URL: %s", self.driver.current_url)
+                        logger.warning("   📄 Page source length: %s", len(page_text))
 
                 except Exception as e:
-                    logger.debug(f"   Error in data validation: {e}")
+                    logger.debug("   Error in data validation: %s", e)
                     data['extraction_status'] = 'ERROR'
                     data['fields_extracted'] = 0
                     data['critical_fields_extracted'] = 0
 
+                self.metrics.add_duration('extraction', time.perf_counter() - extraction_start)
                 return data
 
             except Exception as e:
-                logger.warning(f"⚠️ Failed to extract data from {url} (attempt {attempt + 1}/{max_retries}): {e}")
+                logger.warning("⚠️ Failed to extract data from %s (attempt %s/%s): %s", url, attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
-                    logger.info(f"⏳ Retrying in 3 seconds...")
-                    time.sleep(3)
+                    logger.info("⏳ Retrying in 3 seconds...")
+                    self.pause('extraction_retry')
                 else:
                     return None
 
@@ -933,9 +863,15 @@ class AutomatedPhase2Processor:
         """Process entire state file automatically with dual output strategy"""
         try:
             state_name = self.extract_state_name_from_filename(csv_file)
+            self.current_state_name = state_name
+            self.progress.update(phase='phase2', state=state_name)
             logger.info(f"\n🏛️ PROCESSING STATE: {state_name}")
             logger.info(f"📁 File: {csv_file}")
 
+            # Stage timings for this state
+            self.metrics.close()
+            self.metrics = ScrapeMetrics("phase2", state_name, enabled=SCRAPE_METRICS_ENABLED)
+
             # Setup incremental CSV for this state
             if not self.setup_incremental_csv(state_name):
                 logger.error("❌ Failed to setup incremental CSV")
@@ -948,66 +884,103 @@ class AutomatedPhase2Processor:
             # Filter Phase 2 ready schools
             schools_to_process = self.filter_phase2_ready_schools(df)
 
+            # Incremental refresh: skip schools whose listing is unchanged
+            change_detector = None
+            if INCREMENTAL_REFRESH:
+                change_detector = ListingChangeDetector(state_name)
+                schools_to_process = change_detector.filter_changed(schools_to_process)
+
             if len(schools_to_process) == 0:
+                # Nothing was written: an upload would only clear the state's sheet
                 logger.info("   ✅ No schools ready for Phase 2 processing")
-                # Still upload empty file to Google Sheets if configured
-                if GOOGLE_SHEETS_ENABLED and self.incremental_csv_file:
-                    self.upload_to_google_sheets(self.incremental_csv_file, state_name)
                 return True
 
             logger.info(f"   🎯 Processing {len(schools_to_process)} schools with incremental CSV writing")
+            self.progress.set_queue_depth(len(schools_to_process))
+            self.log_phase2_estimate(len(schools_to_process), state_name)
             logger.info(f"   📝 Incremental CSV: {self.incremental_csv_file}")
 
             # Process all schools individually with incremental writing
             successful_count = 0
 
-            for idx, (_, school) in enumerate(schools_to_process.iterrows(), 1):
-                try:
-                    school_name = school.get('school_name', f'School_{idx}')
-                    logger.info(f"   🏫 Processing school {idx}/{len(schools_to_process)}: {school_name}")
-
-                    # Extract Phase 2 data
-                    extracted_data = self.extract_focused_data(school['know_more_link'])
-
-                    if extracted_data:
-                        # Combine original and extracted data
-                        combined_data = school.to_dict()
-                        combined_data.update(extracted_data)
-
-                        # Write immediately to incremental CSV
-                        if self.write_to_incremental_csv(combined_data):
-                            successful_count += 1
-                            self.success_count += 1
-                            logger.info(f"   ✅ School {idx} processed and saved to CSV")
-                        else:
-                            logger.warning(f"   ⚠️ School {idx} processed but CSV write failed")
-                            self.fail_count += 1
-                    else:
-                        logger.warning(f"   ❌ School {idx} extraction failed")
-                        self.fail_count += 1
-
-                    self.processed_count += 1
-
-                    # Brief pause between schools
-                    time.sleep(0.2)
+            try:
+                for idx, (_, school) in enumerate(schools_to_process.iterrows(), 1):
+                    with school_scope(idx, str(school.get('udise_code', idx))):
+                        try:
+                            school_name = school.get('school_name', f'School_{idx}')
+                            logger.info("   🏫 Processing school %s/%s: %s", idx, len(schools_to_process), school_name)
+                            record = self.metrics.record('school', index=idx, udise_code=str(school.get('udise_code', 'N/A')),
+                                                         url=school['know_more_link'])
+
+                            # Extract Phase 2 data
+                            extracted_data = self.extract_focused_data(school['know_more_link'])
+                            self.progress.record_extraction(extracted_data.get('extraction_status') if extracted_data else 'FAILED')
+
+                            if extracted_data:
+                                # Combine original and extracted data
+                                combined_data = school.to_dict()
+                                combined_data.update(extracted_data)
+
+                                # Write immediately to incremental CSV
+                                size_before = os.path.getsize(self.incremental_csv_file) if os.path.exists(self.incremental_csv_file) else 0
+                                with record.stage('csv_write'):
+                                    written = self.write_to_incremental_csv(combined_data)
+                                if written:
+                                    record.add_bytes('csv', os.path.getsize(self.incremental_csv_file) - size_before)
+                                    successful_count += 1
+                                    self.success_count += 1
+                                    logger.info("   ✅ School %s processed and saved to CSV", idx)
+                                    if change_detector:
+                                        change_detector.mark_extracted(school.to_dict(), extracted_data.get('extraction_status'))
+                                else:
+                                    logger.warning("   ⚠️ School %s processed but CSV write failed", idx)
+                                    self.fail_count += 1
+                            else:
+                                logger.warning("   ❌ School %s extraction failed", idx)
+                                self.fail_count += 1
+
+                            self.processed_count += 1
+                            record.finish(extracted_data.get('extraction_status') if extracted_data else 'FAILED')
+
+                            # Brief pause between schools
+                            self.pause('phase2_next_school')
 
-                except Exception as e:
-                    logger.warning(f"   ⚠️ Failed to process school {idx}: {e}")
-                    self.fail_count += 1
-                    continue
+                        except Exception as e:
+                            logger.warning("   ⚠️ Failed to process school %s: %s", idx, e)
+                            self.fail_count += 1
+                            continue
+            finally:
+                # Keep the fingerprints of the schools extracted before an abort
+                if change_detector:
+                    change_detector.finalize()
 
             logger.info(f"   ✅ Completed processing state: {state_name}")
             logger.info(f"   📊 Successfully processed: {successful_count}/{len(schools_to_process)} schools")
 
-            # Upload to Google Sheets after all schools are processed
-            if GOOGLE_SHEETS_ENABLED and self.incremental_csv_file and successful_count > 0:
+            # Upload to Google Sheets after all schools are processed. An incremental refresh
+            # holds only the changed schools and the upload replaces the whole sheet.
+            if INCREMENTAL_REFRESH and GOOGLE_SHEETS_ENABLED:
+                logger.info(f"   ℹ️ Incremental refresh: Google Sheets upload skipped for {state_name}")
+            elif GOOGLE_SHEETS_ENABLED and self.incremental_csv_file and successful_count > 0:
                 logger.info(f"   📤 Uploading {state_name} data to Google Sheets...")
-                upload_success = self.upload_to_google_sheets(self.incremental_csv_file, state_name)
+                upload_record = self.metrics.record('sheets_upload', state=state_name, rows=successful_count)
+                with upload_record.stage('sheets_upload'):
+                    upload_success = self.upload_to_google_sheets(self.incremental_csv_file, state_name)
+                upload_record.add_bytes('csv', os.path.getsize(self.incremental_csv_file))
+                upload_record.finish('SUCCESS' if upload_success else 'FAILED')
                 if upload_success:
                     logger.info(f"   ✅ Google Sheets upload completed for {state_name}")
                 else:
                     logger.warning(f"   ⚠️ Google Sheets upload failed for {state_name} (CSV backup available)")
 
+            if self.profiler:
+                self.profiler.report(state_name)
+            if self.waits:
+                self.waits.report(state_name)
+            self.wait_policy.report(state_name)
+            if self.network:
+                self.network.report(state_name)
+
             return True
             
         except Exception as e:
@@ -1030,6 +1003,7 @@ class AutomatedPhase2Processor:
         try:
             logger.info("🚀 STARTING AUTOMATED PHASE 2 PROCESSING")
             logger.info("="*80)
+            self.status_server = start_status_server(self.progress)
             
             # Setup driver
             self.setup_driver()
@@ -1055,7 +1029,7 @@ class AutomatedPhase2Processor:
                     logger.warning(f"⚠️ Failed to process {csv_file}, continuing with next state")
                 
                 # Brief pause between states
-                time.sleep(2)
+                self.pause('phase2_state_pause')
             
             # Final summary
             self.show_final_summary()
@@ -1063,7 +1037,13 @@ class AutomatedPhase2Processor:
         except Exception as e:
             logger.error(f"❌ Critical error in automated processing: {e}")
         finally:
+            if self.page_cache:
+                self.page_cache.close()
+            self.metrics.close()
+            if self.status_server:
+                self.status_server.stop()
             if self.driver:
+                log_browser_memory(self.driver, "phase2")
                 self.driver.quit()
                 logger.info("🔒 Driver closed")
 
@@ -1088,6 +1068,7 @@ class AutomatedPhase2Processor:
 
 def main():
     """Main function for automated Phase 2 processing"""
+    configure_logging()
     print("🚀 AUTOMATED PHASE 2 PROCESSOR - DUAL OUTPUT STRATEGY")
     print("Automatically processes ALL Phase 1 CSV files")
     print("📝 Incremental CSV: Each school saved immediately")
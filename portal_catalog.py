@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Portal Catalog - States and districts of the portal's dropdowns, cached on disk
+- The option JSON of the state and district dropdowns (stateId, stateName,
+  districtId, udiseDistrictCode, ...) is stored as read, so select_state and
+  select_district match the cached entries exactly
+- Scrapers take fresh entries from the catalog instead of re-reading the
+  dropdowns; a missing or expired entry (CATALOG_TTL_HOURS) is read from the
+  page as before and written back, so every run keeps the catalog current
+- Menus and planning accept expired entries and only start a browser when the
+  catalog has nothing at all
+- Thread-safe, written atomically; processes and workers share one file
+
+Usage: python portal_catalog.py                     (show the catalog)
+       python portal_catalog.py STATE               (list the districts of a state)
+       python portal_catalog.py --refresh [STATE ...] (re-read the portal)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+PORTAL_CATALOG_FILE = "portal_catalog.json"
+
+# Hours after which the scrapers re-read a state's districts (0 = always re-read)
+CATALOG_TTL_HOURS = float(os.environ.get("CATALOG_TTL_HOURS", "168"))
+
+# Second option of each dropdown: the options of a cached entry are on the page
+STATE_OPTION_SELECTOR = "select.form-select.select option:nth-child(2)"
+DISTRICT_OPTION_SELECTOR = "(//select[contains(@class, 'form-select')])[2]/option[2]"
+# ===== END CONFIGURATION SECTION =====
+
+
+class PortalCatalog:
+    """Cached states and their districts, each with the time they were read"""
+
+    def __init__(self, catalog_file=PORTAL_CATALOG_FILE, ttl_hours=CATALOG_TTL_HOURS):
+        self.catalog_file = catalog_file
+        self.ttl = timedelta(hours=ttl_hours)
+        self.lock = threading.Lock()
+        self.data = self.load()
+
+    def load(self):
+        data = {}
+        if os.path.exists(self.catalog_file):
+            try:
+                with open(self.catalog_file, 'r', encoding='utf-8') as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable portal catalog {self.catalog_file}: {e}")
+        data.setdefault('states', None)
+        data.setdefault('districts', {})
+        return data
+
+    def is_fresh(self, entry):
+        refreshed_at = datetime.fromisoformat(entry['refreshed_at'])
+        return datetime.now() - refreshed_at < self.ttl
+
+    def _items(self, entry, allow_stale):
+        if not entry or not entry.get('items'):
+            return None
+        if not allow_stale and not self.is_fresh(entry):
+            return None
+        return list(entry['items'])
+
+    def states(self, allow_stale=False):
+        """Cached states, or None when missing (or expired, unless allow_stale)"""
+        return self._items(self.data['states'], allow_stale)
+
+    def state(self, state_name, allow_stale=False):
+        """Cached option data of one state, or None"""
+        for state in self.states(allow_stale) or []:
+            if state['stateName'] == state_name:
+                return state
+        return None
+
+    def districts(self, state_name, allow_stale=False):
+        """Cached districts of a state, or None when missing (or expired, unless allow_stale)"""
+        return self._items(self.data['districts'].get(state_name), allow_stale)
+
+    def put_states(self, states):
+        with self.lock:
+            self.data['states'] = self._entry(states)
+            self.save(states=True)
+
+    def put_districts(self, state_name, districts):
+        with self.lock:
+            self.data['districts'][state_name] = self._entry(districts)
+            self.save(district=state_name)
+
+    def _entry(self, items):
+        return {'refreshed_at': datetime.now().isoformat(timespec='seconds'), 'items': list(items)}
+
+    def save(self, states=False, district=None):
+        """Write the updated entry, keeping what other processes wrote meanwhile"""
+        on_disk = self.load()
+        if states:
+            on_disk['states'] = self.data['states']
+        if district is not None:
+            on_disk['districts'][district] = self.data['districts'][district]
+        self.data = on_disk
+
+        temp_file = f"{self.catalog_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as handle:
+            json.dump(self.data, handle, indent=2)   # key order kept: select_state matches the JSON
+        os.replace(temp_file, self.catalog_file)
+
+
+def refresh_catalog(state_names=None, catalog_file=PORTAL_CATALOG_FILE):
+    """Re-read the states (and the districts of state_names, all when None) from the portal"""
+    from phase1_statewise_scraper import StatewiseSchoolScraper
+
+    scraper = StatewiseSchoolScraper()
+    scraper.catalog = PortalCatalog(catalog_file, ttl_hours=0)  # every entry is read from the page
+    scraper.setup_driver()
+    try:
+        if not scraper.navigate_to_portal():
+            raise RuntimeError("Portal navigation failed")
+        states = scraper.extract_states_data()
+        if not states:
+            raise RuntimeError("No states found on the portal")
+        for state in states:
+            if state_names and state['stateName'] not in state_names:
+                continue
+            if scraper.select_state(state):
+                scraper.extract_districts_data()
+            else:
+                logger.error(f"❌ Could not select {state['stateName']}; its districts were not refreshed")
+    finally:
+        scraper.driver.quit()
+    return PortalCatalog(catalog_file)
+
+
+def main():
+    """Show or refresh the catalog"""
+    arguments = sys.argv[1:]
+    if arguments and arguments[0] == '--refresh':
+        catalog = refresh_catalog(arguments[1:] or None)
+        print(f"✅ Catalog refreshed: {len(catalog.states() or [])} states")
+        return
+
+    catalog = PortalCatalog()
+    states = catalog.states(allow_stale=True)
+    if not states:
+        print(f"❌ No {PORTAL_CATALOG_FILE} yet - run: python portal_catalog.py --refresh")
+        return
+
+    if arguments:
+        state_name = ' '.join(arguments)
+        districts = catalog.districts(state_name, allow_stale=True)
+        if districts is None:
+            print(f"❌ No districts of {state_name} in the catalog - run: python portal_catalog.py --refresh \"{state_name}\"")
+            return
+        print(f"📍 DISTRICTS OF {state_name.upper()}")
+        print("=" * 60)
+        for district in districts:
+            print(f"   {district['districtName']:<40} {district.get('udiseDistrictCode', '')}")
+        return
+
+    print("📚 PORTAL CATALOG")
+    print(f"States read {catalog.data['states']['refreshed_at']}"
+          f"{'' if catalog.states() else ' (expired)'}, TTL {CATALOG_TTL_HOURS:g} hours")
+    print("=" * 60)
+    for state in states:
+        entry = catalog.data['districts'].get(state['stateName'])
+        if entry:
+            status = f"{len(entry['items']):>4} districts, {entry['refreshed_at']}"
+            status += "" if catalog.is_fresh(entry) else " (expired)"
+        else:
+            status = "   - districts not read yet"
+        print(f"{state['stateName']:<40} {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Portal Configuration - Where the scrapers point their browser
+- Defaults to the live UDISE Plus portal
+- Override with environment variables to run against local_portal_server.py:
+    UDISE_PORTAL_URL=http://127.0.0.1:8765/#/en/home
+    KYS_BASE_URL=http://127.0.0.1:8765/
+    CHROME_HEADLESS=1
+"""
+
+import os
+
+# Home page with the "Visit Portal" button
+UDISE_PORTAL_URL = os.environ.get("UDISE_PORTAL_URL", "https://udiseplus.gov.in/#/en/home")
+
+# Base URL of the Know Your School site; relative "#/schooldetail/..." links are joined to it
+KYS_BASE_URL = os.environ.get("KYS_BASE_URL", "https://kys.udiseplus.gov.in/")
+
+# Run Chrome without a window (benchmarks and local portal runs)
+CHROME_HEADLESS = os.environ.get("CHROME_HEADLESS", "0") == "1"
+
+
+def kys_url(relative_link):
+    """Absolute know_more_link for a relative '#/schooldetail/...' link"""
+    return f"{KYS_BASE_URL.rstrip('/')}/{relative_link}"
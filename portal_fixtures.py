@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Portal Fixtures - Recorded data and page markup for the local UDISE portal
+- Builds states/districts/schools fixtures from Phase 1 / Phase 2 CSV files
+- Or generates deterministic synthetic fixtures of any size
+- Renders school cards and detail pages with the real portal class names
+  (.accordion-body, .udiseCode, .blueBtn, .schoolInfoCol, .blueCol, .H3Value)
+- Used by local_portal_server.py, the benchmarks and the parser tests
+"""
+
+import csv
+import html
+import json
+import random
+import sys
+
+from detail_page_parser import BASIC_FIELDS_MAP, parse_school_url
+from snapshot_merger import MISSING_VALUES
+
+# Listing card fields, in the order the portal shows them
+CARD_FIELDS = [
+    ('Edu. District', 'edu_district'),
+    ('Edu. Block', 'edu_block'),
+    ('Academic Year', 'academic_year'),
+    ('School Category', 'school_category'),
+    ('School Management', 'school_management'),
+    ('Class', 'class_range'),
+    ('School Type', 'school_type'),
+    ('School Location', 'school_location'),
+    ('Address', 'address'),
+    ('PIN Code', 'pin_code'),
+]
+
+# Label / column pairs of the Student and Teacher sections
+STUDENT_COUNTS = [('Total Students', 'total_students'), ('Boys', 'total_boys'), ('Girls', 'total_girls')]
+TEACHER_COUNTS = [('Total Teachers', 'total_teachers'), ('Male', 'male_teachers'), ('Female', 'female_teachers')]
+
+# Academic year code used in know_more_links (…/schooldetail/<id>/<year_code>)
+DEFAULT_YEAR_CODE = "12"
+
+NG = '_ngcontent-ng-c1808753454=""'
+
+
+def clean_value(value):
+    """Fixture value or '' for the scrapers' missing markers"""
+    text = '' if value is None else str(value).strip()
+    return '' if text in MISSING_VALUES else text
+
+
+def escape(value):
+    """HTML-escape a fixture value"""
+    return html.escape(clean_value(value))
+
+
+class PortalFixtures:
+    """In-memory states → districts → schools dataset served by the local portal"""
+
+    def __init__(self):
+        self.states = []            # [{stateId, stateName}]
+        self.districts = {}         # stateId -> [{districtId, districtName, stateId, udiseDistrictCode}]
+        self.schools = {}           # districtId -> [school row]
+        self.schools_by_id = {}     # school_id -> school row
+
+    def add_school(self, row):
+        """Add one school row (Phase 1 or Phase 2 columns)"""
+        school_id, _ = parse_school_url(row.get('know_more_link'))
+        if not school_id or school_id in self.schools_by_id:
+            return False
+
+        state_id = int(float(row.get('state_id') or 0))
+        district_id = int(float(row.get('district_id') or 0))
+
+        if state_id not in self.districts:
+            self.states.append({'stateId': state_id, 'stateName': clean_value(row.get('state')) or f"STATE {state_id}"})
+            self.districts[state_id] = []
+        if district_id not in self.schools:
+            self.districts[state_id].append({
+                'districtId': district_id,
+                'districtName': clean_value(row.get('district')) or f"DISTRICT {district_id}",
+                'stateId': state_id,
+                'udiseDistrictCode': str(district_id),
+            })
+            self.schools[district_id] = []
+
+        school = dict(row)
+        school['school_id'] = school_id
+        self.schools[district_id].append(school)
+        self.schools_by_id[school_id] = school
+        return True
+
+    def district_schools(self, state_id, district_id=None):
+        """Schools of a district, or of every district of a state"""
+        if district_id:
+            return self.schools.get(int(district_id), [])
+        schools = []
+        for district in self.districts.get(int(state_id), []):
+            schools.extend(self.schools.get(district['districtId'], []))
+        return schools
+
+    def summary(self):
+        """Counts for logging"""
+        return {
+            'states': len(self.states),
+            'districts': sum(len(d) for d in self.districts.values()),
+            'schools': len(self.schools_by_id),
+        }
+
+
+def build_fixtures_from_csv(csv_files, max_schools_per_district=None):
+    """Build fixtures from recorded Phase 1 / Phase 2 CSV files"""
+    fixtures = PortalFixtures()
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    for csv_file in csv_files:
+        with open(csv_file, 'r', newline='', encoding='utf-8') as handle:
+            reader = csv.DictReader(handle)
+            if 'know_more_link' not in (reader.fieldnames or []):
+                continue
+            for row in reader:
+                district_id = int(float(row.get('district_id') or 0))
+                if max_schools_per_district and len(fixtures.schools.get(district_id, [])) >= max_schools_per_district:
+                    continue
+                fixtures.add_school(row)
+    return fixtures
+
+
+def build_synthetic_fixtures(states=2, districts_per_state=3, schools_per_district=250, seed=0):
+    """Deterministic synthetic fixtures for benchmarks (no CSV needed)"""
+    rng = random.Random(seed)
+    fixtures = PortalFixtures()
+    school_id = 9000000
+    for s in range(1, states + 1):
+        state_id = 100 + s
+        for d in range(1, districts_per_state + 1):
+            district_id = state_id * 100 + d
+            for n in range(1, schools_per_district + 1):
+                school_id += 1
+                boys, girls = rng.randint(5, 600), rng.randint(5, 600)
+                male, female = rng.randint(0, 20), rng.randint(1, 25)
+                fixtures.add_school({
+                    'state': f"TEST STATE {s}",
+                    'state_id': state_id,
+                    'district': f"TEST DISTRICT {s}-{d}",
+                    'district_id': district_id,
+                    'udise_code': f"{district_id:06d}{n:05d}",
+                    'operational_status': 'Operational',
+                    'school_name': f"GOVT SCHOOL {s}-{d}-{n}",
+                    'know_more_link': f"https://kys.udiseplus.gov.in/#/schooldetail/{school_id}/{DEFAULT_YEAR_CODE}",
+                    'edu_district': f"Edu District {d}",
+                    'edu_block': f"Block {n % 7 + 1}",
+                    'academic_year': '2025-26',
+                    'school_category': '2-Primary with Upper Primary',
+                    'school_management': '1-Department of Education',
+                    'class_range': '1 To 8',
+                    'school_type': '3-Co-educational',
+                    'school_location': rng.choice(['1-Rural', '2-Urban']),
+                    'address': f"Village {n}, Test District {d}",
+                    'pin_code': str(400000 + n),
+                    'last_modified': '01/08/2025',
+                    'email': f"school{school_id}@example.in",
+                    'location': rng.choice(['Rural', 'Urban']),
+                    'year_of_establishment': str(rng.randint(1950, 2015)),
+                    'national_management': 'Department of Education',
+                    'state_management': 'Department of Education',
+                    'affiliation_board_sec': '2-State Board',
+                    'affiliation_board_hsec': 'NA',
+                    'total_students': str(boys + girls),
+                    'total_boys': str(boys),
+                    'total_girls': str(girls),
+                    'total_teachers': str(male + female),
+                    'male_teachers': str(male),
+                    'female_teachers': str(female),
+                })
+    return fixtures
+
+
+def option_value(data):
+    """JSON option value in the portal's compact format"""
+    return html.escape(json.dumps(data, separators=(',', ':')), quote=True)
+
+
+def render_school_card(school):
+    """Search result card (.accordion-body) for one school"""
+    school_id = school['school_id']
+    _, year_code = parse_school_url(school.get('know_more_link'))
+    lines = [
+        f'<div {NG} class="accordion-item"><div {NG} class="accordion-body">',
+        f'<div {NG} class="d-flex justify-content-between">'
+        f'<span {NG} class="udiseCode">{escape(school.get("udise_code")) or "N/A"}</span>'
+        f'<span {NG} class="OperationalStatus">{escape(school.get("operational_status")) or "Operational"}</span></div>',
+        f'<h4 {NG} class="custom-word-break">{escape(school.get("school_name"))}</h4>',
+    ]
+    for label, field in CARD_FIELDS:
+        lines.append(f'<p {NG}><span {NG}>{label}</span> : <span {NG}>{escape(school.get(field))}</span></p>')
+
+    email = clean_value(school.get('email'))
+    if email:
+        lines.append(f'<p {NG} class="ng-star-inserted"><a {NG} style="color: #451c78; text-decoration: none;" '
+                     f'href="mailto:{html.escape(email, quote=True)}"><span {NG} class="ms-2">{html.escape(email)}</span></a></p>')
+
+    last_modified = clean_value(school.get('last_modified'))
+    if last_modified:
+        lines.append(f'<p {NG}>Last Modified : <span {NG} class="lastModifiedTime">{html.escape(last_modified)}</span></p>')
+
+    lines.append(f'<a {NG} class="btn blueBtn" href="#/schooldetail/{school_id}/{year_code or DEFAULT_YEAR_CODE}">Know More</a>')
+    lines.append('</div></div>')
+    return '\n'.join(lines)
+
+
+def render_results_page(schools, page, page_size, total):
+    """Result cards plus the 'Showing X to Y of Z' label and pagination"""
+    if total == 0:
+        return '<div class="noRecord"><p>No records found</p></div>'
+
+    first = (page - 1) * page_size + 1
+    last = min(page * page_size, total)
+    has_next = last < total
+    size_options = ''.join(
+        f'<option value="{size}"{" selected" if size == page_size else ""}>{size}</option>'
+        for size in (10, 20, 50, 100)
+    )
+    cards = '\n'.join(render_school_card(school) for school in schools)
+    return f'''<div class="accordion" id="schoolResults">
+{cards}
+</div>
+<div class="d-flex justify-content-between align-items-center mt-3">
+<ul class="pagination">
+<li class="page-item{'' if page > 1 else ' disabled'}"><a class="page-link prevBtn" href="javascript:void(0)">Previous</a></li>
+<li class="page-item active"><a class="page-link" href="javascript:void(0)">{page}</a></li>
+<li class="page-item{'' if has_next else ' disabled'}"><a class="page-link nextBtn" href="javascript:void(0)">Next</a></li>
+<li class="page-item showing"><label>Showing {first} to {last} of {total}</label></li>
+</ul>
+<select class="form-select w11110">{size_options}</select>
+</div>'''
+
+
+def synthetic_counts(school):
+    """Deterministic student/teacher counts for schools recorded without Phase 2 data"""
+    rng = random.Random(int(school['school_id']))
+    boys, girls = rng.randint(5, 600), rng.randint(5, 600)
+    male, female = rng.randint(0, 20), rng.randint(1, 25)
+    return {
+        'total_students': str(boys + girls), 'total_boys': str(boys), 'total_girls': str(girls),
+        'total_teachers': str(male + female), 'male_teachers': str(male), 'female_teachers': str(female),
+    }
+
+
+def render_detail_page(school):
+    """School detail page body with the Basic Details, Student and Teacher sections"""
+    info_cols = []
+    for title, field in BASIC_FIELDS_MAP.items():
+        value = escape(school.get(field))
+        if field == 'class_from' and not value:
+            value = html.escape(clean_value(school.get('class_range')).split(' To ')[0])
+        if field == 'class_to' and not value:
+            value = html.escape(clean_value(school.get('class_range')).split(' To ')[-1])
+        info_cols.append(
+            f'<div {NG} class="schoolInfoCol"><div {NG} class="title"><p {NG} class="fw-600">{title}</p></div>'
+            f'<div {NG} class="blueCol"><span {NG}>{value or "NA"}</span></div></div>'
+        )
+
+    counts = synthetic_counts(school)
+
+    def count_items(pairs):
+        items = []
+        for label, field in pairs:
+            value = escape(school.get(field)) or counts[field]
+            items.append(f'<li><div class="brLeft"><p class="fontTitle15 mb-0">{label}</p>'
+                         f'<p class="H3Value mb-0"> {value} </p></div></li>')
+        return '\n'.join(items)
+
+    return f'''<div class="schoolDetail">
+<h3 class="schoolName">{escape(school.get("school_name"))}</h3>
+<div {NG} class="innerPad">
+<p {NG} class="fw-600">Academic Year : {escape(school.get("academic_year")) or "2025-26"}</p>
+{''.join(info_cols)}
+</div>
+<div class="bg-white my-1 rounded p-3">
+<h2 class="innerTitle">Student</h2>
+<ul class="greyInfoList">
+{count_items(STUDENT_COUNTS)}
+</ul>
+</div>
+<div class="bg-white my-1 rounded p-3 me-3 shadow">
+<h2 class="innerTitle mt89898 mb-4">Teacher</h2>
+<div class="rounded" style="background: #41257a;"><div class="greyInfoAreaBot">
+<ul class="greyInfoList text-white">
+{count_items(TEACHER_COUNTS)}
+</ul>
+</div></div>
+</div>
+<span class="d-none">{school["school_id"]}</span>
+</div>'''
@@ -2,25 +2,253 @@
 """
 School Data Processing Time Calculator
 Calculates processing time estimates for school data extraction projects
-Based on analysis of actual processing data from UDISE Plus portal scraping
+Rates are fitted from measured runs when available:
+- extraction_date / extraction_timestamp columns of past phase1/phase2 output CSVs
+- per-school / per-page records of the scrape metrics log (metrics/*.jsonl)
+Estimates are P50/P90 completion times for a given number of parallel workers.
+The fixed rates below are only used when no measurements exist.
+Processors build the calculator with lazy=True: the files are only read at the
+first estimate.
+
+Usage: python processing_time_calculator.py [plan [workers]]
 """
 
+import csv
+import glob
+import json
+import logging
 import math
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+
+from snapshot_merger import clean_state_name
+from stats_utils import percentile
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Past output files and metrics logs the rates are fitted from
+RATE_CSV_PATTERNS = ["*_phase1_complete_*.csv", "*_phase2_complete_*.csv", "*_phase2_incremental_*.csv"]
+RATE_METRICS_PATTERN = os.path.join("metrics", "*_metrics_*.jsonl")
+
+# Consecutive schools per rate sample (one results page in Phase 1)
+RATE_CHUNK_SIZE = 100
+
+# Gaps between consecutive rows longer than this are pauses/restarts, not processing
+MAX_RECORD_GAP_SECONDS = 300
+
+# Samples needed before a state's own distribution is used instead of the all-states one
+MIN_STATE_SAMPLES = 5
+# ===== END CONFIGURATION SECTION =====
+
+PHASES = ('phase1', 'phase2')
+TIMESTAMP_COLUMNS = {'phase1': 'extraction_date', 'phase2': 'extraction_timestamp'}
+
+
+def parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(str(value).strip()).timestamp()
+    except ValueError:
+        return None
+
+
+def chunk_rates(timestamps, chunk_size=RATE_CHUNK_SIZE, max_gap=MAX_RECORD_GAP_SECONDS):
+    """Seconds per school of each chunk of consecutive rows
+
+    Chunks are cut at pauses longer than max_gap so that restarts and breaks
+    between sessions do not count as processing time.
+    """
+    rates = []
+    chunk = []
+    for timestamp in sorted(timestamps):
+        if chunk and (timestamp - chunk[-1] > max_gap or len(chunk) > chunk_size):
+            if len(chunk) > 1:
+                rates.append((chunk[-1] - chunk[0]) / (len(chunk) - 1))
+            chunk = []
+        chunk.append(timestamp)
+    if len(chunk) > 1:
+        rates.append((chunk[-1] - chunk[0]) / (len(chunk) - 1))
+    return rates
+
+
+class RateModel:
+    """Measured seconds-per-school samples by phase and state"""
 
-class ProcessingTimeCalculator:
     def __init__(self):
-        # Processing rates based on actual data analysis
+        self.samples = {phase: {} for phase in PHASES}
+        self.sources = []
+
+    def add_samples(self, phase, state_name, rates):
+        if rates:
+            self.samples[phase].setdefault(clean_state_name(state_name), []).extend(rates)
+
+    def sample_count(self, phase, state_name=None):
+        if state_name:
+            return len(self.samples[phase].get(clean_state_name(state_name), []))
+        return sum(len(rates) for rates in self.samples[phase].values())
+
+    def rate(self, phase, pct, state_name=None):
+        """Seconds per school at the given percentile (state, else all states, else None)"""
+        rates = self.samples[phase].get(clean_state_name(state_name), []) if state_name else []
+        if len(rates) < MIN_STATE_SAMPLES:
+            rates = [rate for state_rates in self.samples[phase].values() for rate in state_rates]
+        if not rates:
+            return None
+        return percentile(rates, pct)
+
+    def fit_csv(self, csv_file):
+        """Add chunk rates from the timestamp column of an output CSV"""
+        phase = 'phase2' if '_phase2_' in os.path.basename(csv_file) else 'phase1'
+        column = TIMESTAMP_COLUMNS[phase]
+        timestamps_by_state = {}
+        with open(csv_file, 'r', encoding='utf-8', newline='') as handle:
+            reader = csv.DictReader(handle)
+            if column not in (reader.fieldnames or []):
+                return 0
+            for row in reader:
+                timestamp = parse_timestamp(row.get(column))
+                if timestamp is not None:
+                    timestamps_by_state.setdefault(row.get('state') or 'UNKNOWN', set()).add(timestamp)
+
+        added = 0
+        for state_name, timestamps in timestamps_by_state.items():
+            rates = chunk_rates(timestamps)
+            self.add_samples(phase, state_name, rates)
+            added += len(rates)
+        self.sources.append(csv_file)
+        return added
+
+    def fit_metrics(self, metrics_file):
+        """Add rates from a scrape metrics log ({STATE}_{phase}_metrics_*.jsonl)"""
+        match = re.match(r"(.+)_(phase[12])_metrics_", os.path.basename(metrics_file))
+        if not match:
+            return 0
+        state_name, phase = match.groups()
+
+        school_seconds = []
+        page_rates = []
+        with open(metrics_file, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get('kind') == 'school':
+                    school_seconds.append(record['total_seconds'])
+                elif record.get('kind') == 'page' and record.get('schools'):
+                    page_rates.append(record['total_seconds'] / record['schools'])
+
+        # Per-school records are averaged over chunks, like the CSV rates
+        rates = page_rates + [sum(school_seconds[i:i + RATE_CHUNK_SIZE]) / len(school_seconds[i:i + RATE_CHUNK_SIZE])
+                              for i in range(0, len(school_seconds), RATE_CHUNK_SIZE)]
+        self.add_samples(phase, state_name, rates)
+        self.sources.append(metrics_file)
+        return len(rates)
+
+    @classmethod
+    def from_measurements(cls, csv_files=None, metrics_files=None):
+        """Fit from the given files, or from the output CSVs and metrics logs in the working directory"""
+        model = cls()
+        if csv_files is None:
+            csv_files = sorted({path for pattern in RATE_CSV_PATTERNS for path in glob.glob(pattern)})
+        if metrics_files is None:
+            metrics_files = sorted(glob.glob(RATE_METRICS_PATTERN))
+        for csv_file in csv_files:
+            try:
+                model.fit_csv(csv_file)
+            except (OSError, csv.Error, UnicodeDecodeError) as e:
+                logger.warning(f"⚠️ Skipping {csv_file}: {e}")
+        for metrics_file in metrics_files:
+            try:
+                model.fit_metrics(metrics_file)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"⚠️ Skipping {metrics_file}: {e}")
+        return model
+
+
+class ProcessingTimeCalculator:
+    def __init__(self, rate_model=None, rate_loader=None):
+        # Fallback rates from the original analysis of UDISE Plus scraping runs
         self.phase1_rate = 0.29  # seconds per school (average)
         self.phase2_rate = 15.90  # seconds per school
         self.combined_rate = 16.19  # seconds per school (Phase 1 + Phase 2)
         
-        # Buffer factors for risk mitigation
+        # Fallback buffer factors for risk mitigation
         self.phase1_buffer = 1.25  # 25% buffer
         self.phase2_buffer = 1.40  # 40% buffer
         self.combined_buffer = 1.35  # 35% buffer
 
+        # rate_loader builds the rate model at the first estimate (lazy calculators)
+        self.rate_loader = rate_loader
+        self.rate_lock = threading.Lock()
+        self.rate_model = None
+        if rate_model:
+            self.apply_rate_model(rate_model)
+
+    def apply_rate_model(self, rate_model):
+        """Measured rates replace the fallbacks: P50 as the rate, P90/P50 as the buffer"""
+        self.rate_model = rate_model
+        for phase in PHASES:
+            p50, p90 = rate_model.rate(phase, 50), rate_model.rate(phase, 90)
+            if p50:
+                setattr(self, f"{phase}_rate", p50)
+                setattr(self, f"{phase}_buffer", p90 / p50)
+        self.combined_rate = self.phase1_rate + self.phase2_rate
+        self.combined_buffer = (self.phase1_rate * self.phase1_buffer +
+                                self.phase2_rate * self.phase2_buffer) / self.combined_rate
+
+    def load_rates(self):
+        """Fit the deferred rate model once (no-op for eager calculators)"""
+        if self.rate_loader is None:
+            return
+        with self.rate_lock:
+            if self.rate_loader is not None:
+                self.apply_rate_model(self.rate_loader())
+                self.rate_loader = None
+
+    @classmethod
+    def from_measurements(cls, csv_files=None, metrics_files=None, lazy=False):
+        """Calculator with rates fitted from past output CSVs and metrics logs
+
+        lazy=True defers globbing and parsing the files to the first estimate.
+        """
+        if lazy:
+            return cls(rate_loader=lambda: RateModel.from_measurements(csv_files, metrics_files))
+        return cls(RateModel.from_measurements(csv_files, metrics_files))
+
+    def phase_rate(self, phase, pct, state_name=None):
+        """Seconds per school for one phase at P50 or P90 (measured, else fallback)"""
+        self.load_rates()
+        measured = self.rate_model.rate(phase, pct, state_name) if self.rate_model else None
+        if measured:
+            return measured, 'measured'
+        rate = getattr(self, f"{phase}_rate")
+        return (rate * getattr(self, f"{phase}_buffer") if pct >= 90 else rate), 'default'
+
+    def get_percentile_estimate(self, num_schools, processing_type="combined", workers=1, state_name=None):
+        """P50/P90 wall-clock seconds for num_schools split over independent workers"""
+        phases = PHASES if processing_type.lower() == "combined" else (processing_type.lower(),)
+        workers = max(1, int(workers))
+        estimate = {'schools': num_schools, 'processing_type': processing_type, 'workers': workers,
+                    'state': state_name, 'sources': {}}
+        for pct in (50, 90):
+            seconds_per_school = 0.0
+            for phase in phases:
+                rate, source = self.phase_rate(phase, pct, state_name)
+                seconds_per_school += rate
+                estimate['sources'][phase] = source
+            # Each worker runs its own browser session: throughput scales with workers
+            estimate[f'p{pct}_seconds'] = num_schools * seconds_per_school / workers
+            estimate[f'p{pct}_formatted'] = self.format_time(estimate[f'p{pct}_seconds'])
+        return estimate
+
     def calculate_phase1_time(self, num_schools, include_buffer=True):
         """Calculate Phase 1 processing time"""
+        self.load_rates()
         base_time = num_schools * self.phase1_rate
         if include_buffer:
             base_time *= self.phase1_buffer
@@ -28,6 +256,7 @@ class ProcessingTimeCalculator:
 
     def calculate_phase2_time(self, num_schools, include_buffer=True):
         """Calculate Phase 2 processing time"""
+        self.load_rates()
         base_time = num_schools * self.phase2_rate
         if include_buffer:
             base_time *= self.phase2_buffer
@@ -35,6 +264,7 @@ class ProcessingTimeCalculator:
 
     def calculate_combined_time(self, num_schools, include_buffer=True):
         """Calculate combined Phase 1 + Phase 2 processing time"""
+        self.load_rates()
         base_time = num_schools * self.combined_rate
         if include_buffer:
             base_time *= self.combined_buffer
@@ -123,6 +353,12 @@ class ProcessingTimeCalculator:
         print(f"  Total time: {estimate['formatted_time']}")
         print(f"  In hours: {estimate['time_hours']:.1f}")
         print(f"  In days: {estimate['time_days']:.1f}")
+
+        percentile_estimate = self.get_percentile_estimate(num_schools, processing_type)
+        sources = ", ".join(f"{phase} {source}" for phase, source in percentile_estimate['sources'].items())
+        print(f"\nCOMPLETION ESTIMATE (1 worker, {sources} rates):")
+        print(f"  P50: {percentile_estimate['p50_formatted']}")
+        print(f"  P90: {percentile_estimate['p90_formatted']}")
         
         print(f"\nBATCH PROCESSING RECOMMENDATION:")
         print(f"  Recommended batch size: {batch_rec['batch_size']:,} schools")
@@ -135,13 +371,62 @@ class ProcessingTimeCalculator:
         print(f"  Schools per day (24h): {daily_capacity:.0f}")
         print(f"  Schools per day (8h): {daily_capacity/3:.0f}")
 
-def main():
+def show_rate_model(calculator):
+    """Show where the rates come from"""
+    calculator.load_rates()
+    model = calculator.rate_model
+    print(f"\n📐 RATES (seconds per school)")
+    for phase in PHASES:
+        p50, source = calculator.phase_rate(phase, 50)
+        p90, _ = calculator.phase_rate(phase, 90)
+        samples = model.sample_count(phase) if model else 0
+        print(f"  {phase.upper()}: P50 {p50:.2f}s, P90 {p90:.2f}s ({source}, {samples} samples)")
+    if model and model.sources:
+        print(f"  Fitted from {len(model.sources)} files")
+
+
+def load_state_school_counts(pattern="*_school_counts.csv"):
+    """Total schools per state from the school counting tool output"""
+    counts = {}
+    for counts_file in sorted(glob.glob(pattern)):
+        with open(counts_file, 'r', encoding='utf-8', newline='') as handle:
+            for row in csv.DictReader(handle):
+                try:
+                    counts[row['State']] = counts.get(row['State'], 0) + int(row['Total_Schools'])
+                except (KeyError, ValueError):
+                    continue
+    return counts
+
+
+def show_capacity_plan(calculator, workers=1):
+    """P50/P90 combined time per counted state and for all of them"""
+    counts = load_state_school_counts()
+    if not counts:
+        print("❌ No *_school_counts.csv files found - run school_counting_tool.py first")
+        return
+
+    print(f"\n📊 CAPACITY PLAN ({workers} worker{'s' if workers != 1 else ''}, Phase 1 + Phase 2)")
+    print("="*80)
+    print(f"{'State':<35} {'Schools':>10} {'P50':>15} {'P90':>15}")
+    print("-"*80)
+    total_p50 = total_p90 = 0
+    for state_name, schools in sorted(counts.items()):
+        estimate = calculator.get_percentile_estimate(schools, "combined", workers, state_name)
+        total_p50 += estimate['p50_seconds']
+        total_p90 += estimate['p90_seconds']
+        print(f"{state_name:<35} {schools:>10,} {estimate['p50_seconds']/3600:>14.1f}h {estimate['p90_seconds']/3600:>14.1f}h")
+    print("-"*80)
+    print(f"{'TOTAL':<35} {sum(counts.values()):>10,} {total_p50/3600:>14.1f}h {total_p90/3600:>14.1f}h")
+
+
+def main(calculator=None):
     """Interactive calculator"""
-    calculator = ProcessingTimeCalculator()
+    calculator = calculator or ProcessingTimeCalculator.from_measurements()
     
     print("🚀 SCHOOL DATA PROCESSING TIME CALCULATOR")
-    print("Based on actual UDISE Plus portal scraping performance data")
+    print("Based on measured UDISE Plus portal scraping runs")
     print("="*60)
+    show_rate_model(calculator)
     
     while True:
         try:
@@ -198,9 +483,9 @@ def main():
             print(f"❌ Error: {e}")
 
 # Predefined estimates for common scenarios
-def show_predefined_estimates():
+def show_predefined_estimates(calculator=None):
     """Show predefined estimates for common scenarios"""
-    calculator = ProcessingTimeCalculator()
+    calculator = calculator or ProcessingTimeCalculator.from_measurements()
     
     scenarios = [
         (500, "Small district"),
@@ -225,8 +510,14 @@ def show_predefined_estimates():
         print(f"{scenario:<20} {schools:<10,} {p1['formatted_time']:<15} {p2['formatted_time']:<15} {combined['formatted_time']:<15}")
 
 if __name__ == "__main__":
-    # Show predefined estimates first
-    show_predefined_estimates()
-    
-    # Then run interactive calculator
-    main()
+    fitted_calculator = ProcessingTimeCalculator.from_measurements()
+    if len(sys.argv) > 1 and sys.argv[1] == "plan":
+        show_rate_model(fitted_calculator)
+        show_capacity_plan(fitted_calculator, int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    else:
+        # Show predefined estimates first
+        show_predefined_estimates(fitted_calculator)
+
+        # Then run interactive calculator
+        main(fitted_calculator)
+
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+School Count Cache - District school counts per academic year
+- JSON file keyed by academic year → state → district, with the time of each count
+- Counted districts are skipped by the next counting run of the same year
+- Thread-safe, written atomically after every update (workers share one cache)
+- Writes the nationwide State, District, Total_Schools table
+
+Usage: python school_count_cache.py [ACADEMIC_YEAR]
+"""
+
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+SCHOOL_COUNT_CACHE_FILE = "school_counts_cache.json"
+
+# Academic year the portal currently serves (year code 12 in know_more_links)
+COUNT_ACADEMIC_YEAR = os.environ.get("COUNT_ACADEMIC_YEAR", "2025-26")
+
+# Nationwide table, one per academic year
+NATIONWIDE_COUNTS_FILE = "nationwide_school_counts_{year}.csv"
+# ===== END CONFIGURATION SECTION =====
+
+
+class SchoolCountCache:
+    """Cached district counts of one academic year"""
+
+    def __init__(self, cache_file=SCHOOL_COUNT_CACHE_FILE, academic_year=COUNT_ACADEMIC_YEAR):
+        self.cache_file = cache_file
+        self.academic_year = academic_year
+        self.lock = threading.Lock()
+        self.data = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as handle:
+                    self.data = json.load(handle)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable count cache {cache_file}: {e}")
+        self.year_data = self.data.setdefault(academic_year, {})
+
+    def get(self, state_name, district_name):
+        """Cached count, or None when the district was not counted this year"""
+        entry = self.year_data.get(state_name, {}).get(district_name)
+        return entry['count'] if entry else None
+
+    def put(self, state_name, district_name, count):
+        with self.lock:
+            self.year_data.setdefault(state_name, {})[district_name] = {
+                'count': int(count),
+                'counted_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.save()
+
+    def state_counts(self, state_name):
+        """{district: count} of a state"""
+        return {district: entry['count'] for district, entry in self.year_data.get(state_name, {}).items()}
+
+    def clear(self, state_names=None):
+        """Forget the counts of the given states (all states when None)"""
+        with self.lock:
+            for state_name in list(state_names if state_names is not None else self.year_data):
+                self.year_data.pop(state_name, None)
+            self.save()
+
+    def save(self):
+        """Write this year's counts, keeping the other years as they are on disk"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as handle:
+                self.data = json.load(handle)
+        except (OSError, ValueError):
+            pass
+        self.data[self.academic_year] = self.year_data
+
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as handle:
+            json.dump(self.data, handle, indent=2, sort_keys=True)
+        os.replace(temp_file, self.cache_file)
+
+    def rows(self):
+        """(state, district, count) rows sorted by state and district"""
+        return [(state_name, district_name, entry['count'])
+                for state_name, districts in sorted(self.year_data.items())
+                for district_name, entry in sorted(districts.items())]
+
+    def write_nationwide_csv(self, filename=None):
+        """Single State, District, Total_Schools table for all counted states"""
+        filename = filename or NATIONWIDE_COUNTS_FILE.format(year=self.academic_year)
+        rows = self.rows()
+        with open(filename, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['State', 'District', 'Total_Schools'])
+            writer.writerows(rows)
+        logger.info(f"✅ Saved {len(rows)} district counts ({sum(row[2] for row in rows):,} schools) to {filename}")
+        return filename
+
+
+def main():
+    """Show the cached counts of an academic year"""
+    academic_year = sys.argv[1] if len(sys.argv) > 1 else COUNT_ACADEMIC_YEAR
+    cache = SchoolCountCache(academic_year=academic_year)
+
+    print(f"📊 CACHED SCHOOL COUNTS ({academic_year})")
+    print("=" * 60)
+    total = 0
+    for state_name in sorted(cache.year_data):
+        counts = cache.state_counts(state_name)
+        total += sum(counts.values())
+        print(f"{state_name:<40} {len(counts):>4} districts {sum(counts.values()):>10,} schools")
+    print("-" * 60)
+    print(f"{'TOTAL':<40} {total:>26,} schools")
+
+
+if __name__ == "__main__":
+    main()
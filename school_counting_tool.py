@@ -3,6 +3,15 @@
 School Counting Tool - Count total schools in each district of every state
 Uses phase1_statewise_scraper.py as reference to navigate UDISE Plus portal
 and extract school counts from search results.
+
+Fast count mode (COUNT_WORKERS > 1):
+- District count queries are fanned out over a small pool of browser sessions
+- Each query waits only for the new "Showing X to Y of Z" label (no fixed sleeps)
+- Counts are cached per academic year (school_counts_cache.json), so an interrupted
+  run resumes and a repeated run only queries missing districts
+- Writes one nationwide table next to the per-state CSV files
+
+Usage: python school_counting_tool.py [--refresh] [STATE ...]
 """
 
 import pandas as pd
@@ -16,18 +25,51 @@ import time
 import csv
 import json
 import re
-import undetected_chromedriver as uc
 import logging
 from datetime import datetime
 import os
+import queue
+import sys
+import threading
+from selenium.common.exceptions import TimeoutException
+
+from chrome_profiles import log_browser_memory
+from diagnostics import NO_RESULTS_TEXTS, Diagnostics, page_has_text
+from driver_factory import create_driver
+from logging_setup import configure_logging
+from network_profiles import attach_network_profile
+from portal_catalog import DISTRICT_OPTION_SELECTOR, STATE_OPTION_SELECTOR, PortalCatalog
+from portal_config import UDISE_PORTAL_URL
+from school_count_cache import SchoolCountCache
+from wait_manager import attach_wait_manager
+from wait_policy import (WAIT_POLICY, district_options_text, districts_changed, element_in_view, results_changed,
+                         results_label_text)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# ===== CONFIGURATION SECTION =====
+# Parallel browser sessions for district count queries (1 = original serial mode)
+COUNT_WORKERS = int(os.environ.get("COUNT_WORKERS", "3"))
+
+# Seconds to wait for the results of one district search
+COUNT_RESULT_TIMEOUT = 15
+# ===== END CONFIGURATION SECTION =====
+
+# Results label of a search, or the empty-result message
+COUNT_LABEL_XPATH = "//label[contains(text(),'Showing')]"
+NO_RESULTS_XPATH = "//*[contains(text(),'No records found') or contains(text(),'No data available')]"
+COUNT_PATTERN = re.compile(r'Showing\s+\d+\s+to\s+\d+\s+of\s+(\d+)', re.IGNORECASE)
+
 class SchoolCountingTool:
     def __init__(self):
         self.driver = None
+        self.waits = None  # Explicit waits per call site (implicit wait is 0)
+        self.network = None  # Blocked resources (CDP) and traffic statistics
+        self.wait_policy = WAIT_POLICY  # Named wait points instead of fixed sleeps
+        self.diagnostics = Diagnostics("counting")  # Recent actions, page dumps on failure only
+        self.catalog = PortalCatalog()  # States and districts cached on disk
         self.current_state = None
         self.current_district = None
         
@@ -69,33 +111,12 @@ class SchoolCountingTool:
     def setup_driver(self):
         """Initialize the Chrome browser driver with optimized performance settings"""
         try:
-            # Setup Chrome options for optimal performance and reliability
-            options = uc.ChromeOptions()
-
-            # Core stability options
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-
-            # Performance optimizations (balanced for speed and functionality)
-            options.add_argument("--disable-images")  # Speed optimization
-            options.add_argument("--disable-plugins")
-            options.add_argument("--disable-background-timer-throttling")
-            options.add_argument("--disable-renderer-backgrounding")
-            options.add_argument("--disable-backgrounding-occluded-windows")
-
-            # Memory and resource optimizations
-            options.add_argument("--memory-pressure-off")
-            options.add_argument("--max_old_space_size=4096")
-
-            # Initialize Chrome driver
-            self.driver = uc.Chrome(options=options, version_main=138)
-            self.driver.maximize_window()
-
-            # Balanced timeouts for reliability and speed
-            self.driver.implicitly_wait(5)
+            # Patched driver from the cache (driver_factory.py), fixed viewport / headless profile
+            self.driver = create_driver("counting", keep_warm=True)
+
+            # Explicit waits only (a missing fallback selector no longer blocks)
+            self.waits = attach_wait_manager(self.driver, "counting")
+            self.network = attach_network_profile(self.driver, "counting")
             self.driver.set_page_load_timeout(20)
 
             logger.info("✅ Chrome browser driver initialized for school counting")
@@ -110,8 +131,8 @@ class SchoolCountingTool:
         for attempt in range(max_retries):
             try:
                 logger.info(f"🌐 Navigating to UDISE Plus portal... (attempt {attempt + 1}/{max_retries})")
-                self.driver.get("https://udiseplus.gov.in/#/en/home")
-                time.sleep(3)
+                self.driver.get(UDISE_PORTAL_URL)
+                self.pause('portal_load')
 
                 # Click on Visit Portal
                 logger.info("🔍 Looking for Visit Portal button...")
@@ -120,13 +141,13 @@ class SchoolCountingTool:
                 )
                 visit_portal_btn.click()
                 logger.info("✅ Clicked Visit Portal button")
-                time.sleep(3)
+                self.pause('visit_portal')
 
                 # Switch to new tab if opened
                 if len(self.driver.window_handles) > 1:
                     self.driver.switch_to.window(self.driver.window_handles[-1])
                     logger.info("🔄 Switched to new tab")
-                    time.sleep(2)
+                    self.pause('portal_tab_switch')
 
                 # Click on Advance Search
                 logger.info("🔍 Looking for Advance Search button...")
@@ -135,7 +156,7 @@ class SchoolCountingTool:
                 )
                 advance_search_btn.click()
                 logger.info("✅ Clicked Advance Search button")
-                time.sleep(3)
+                self.pause('advance_search')
 
                 # Verify we're on the advance search page
                 if "advance" in self.driver.current_url.lower():
@@ -149,16 +170,25 @@ class SchoolCountingTool:
                 logger.error(f"❌ Navigation attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
                     logger.info(f"⏳ Retrying in 5 seconds...")
-                    time.sleep(5)
+                    self.pause('count_navigation_retry')
                 else:
                     logger.error("❌ All navigation attempts failed")
                     return False
 
         return False
 
+    def pause(self, name, condition=None):
+        """Wait at a named wait point (wait_policy.WAIT_POINTS) instead of a fixed sleep"""
+        return self.wait_policy.wait(name, self.driver, condition)
+
     def extract_states_data(self):
         """Extract all states data from dropdown"""
         try:
+            states = self.catalog.states()
+            if states and self.waits.find('state_options', STATE_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(states)} states from the catalog")
+                return states
+
             logger.info("🔍 Looking for state dropdown...")
 
             # Wait for state dropdown to be present and populated
@@ -168,7 +198,7 @@ class SchoolCountingTool:
             logger.info("✅ Found state dropdown")
 
             # Wait for options to populate
-            time.sleep(1)
+            self.pause('state_options')
 
             # Get all state options
             state_options = state_select.find_elements(By.TAG_NAME, "option")
@@ -208,6 +238,8 @@ class SchoolCountingTool:
                         logger.info(f"✅ Found state (simple): {state_text}")
 
             logger.info(f"✅ Extracted {len(states_data)} states")
+            if states_data:
+                self.catalog.put_states(states_data)
             return states_data
 
         except Exception as e:
@@ -219,9 +251,13 @@ class SchoolCountingTool:
         try:
             self.current_state = state_data
             logger.info(f"🔄 Selecting state: {state_data['stateName']}")
+            self.diagnostics.note('select_state', state=state_data['stateName'])
 
-            state_select_element = self.driver.find_element(By.CSS_SELECTOR, "select.form-select.select")
+            state_select_element = self.waits.find('state_dropdown', "select.form-select.select")
+            if state_select_element is None:
+                raise Exception("state dropdown not found")
             state_select = Select(state_select_element)
+            previous_districts = district_options_text(self.driver)
 
             # Try multiple methods to select the state
             success = False
@@ -259,8 +295,8 @@ class SchoolCountingTool:
                 logger.error(f"❌ Failed to select state: {state_data['stateName']}")
                 return False
 
-            # Wait for districts to load
-            time.sleep(2)
+            # Wait for the districts of the new state to load
+            self.pause('districts_loaded', districts_changed(previous_districts))
             return True
 
         except Exception as e:
@@ -274,10 +310,15 @@ class SchoolCountingTool:
                 logger.error("❌ current_state is None")
                 return []
 
+            districts = self.catalog.districts(self.current_state['stateName'])
+            if districts and self.waits.find('district_options', DISTRICT_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(districts)} districts of {self.current_state['stateName']} from the catalog")
+                return districts
+
             logger.info(f"🔍 Extracting districts for {self.current_state['stateName']}...")
 
             # Wait for district dropdown to be populated
-            time.sleep(2)
+            self.pause('district_options')
 
             # Find all select elements and get the district one (usually the second one)
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
@@ -319,6 +360,8 @@ class SchoolCountingTool:
                         logger.info(f"✅ Found district (simple): {district_text}")
 
             logger.info(f"✅ Extracted {len(districts_data)} districts for {self.current_state['stateName']}")
+            if districts_data:
+                self.catalog.put_districts(self.current_state['stateName'], districts_data)
             return districts_data
 
         except Exception as e:
@@ -330,9 +373,10 @@ class SchoolCountingTool:
         try:
             self.current_district = district_data
             logger.info(f"🔄 Selecting district: {district_data['districtName']}")
+            self.diagnostics.note('select_district', district=district_data['districtName'])
 
             # Wait for district dropdown to populate
-            time.sleep(1)
+            self.pause('district_select_ready')
 
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
 
@@ -379,7 +423,7 @@ class SchoolCountingTool:
                 return False
 
             # Brief wait for any dynamic updates
-            time.sleep(1)
+            self.pause('district_selected')
             return True
 
         except Exception as e:
@@ -398,36 +442,23 @@ class SchoolCountingTool:
                 "//button[normalize-space()='Search']"
             ]
 
-            search_button = None
-            working_selector = None
-
-            for selector in search_selectors:
-                try:
-                    if selector.startswith("//"):
-                        # XPath selector
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-                    if elements:
-                        search_button = elements[0]
-                        working_selector = selector
-                        logger.info(f"✅ Found search button with selector: {selector}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
+            working_selector, elements = self.waits.find_first('search_button', search_selectors)
+            search_button = elements[0] if elements else None
+            if search_button:
+                logger.info(f"✅ Found search button with selector: {working_selector}")
 
             if not search_button:
                 logger.error("❌ Search button not found with any selector")
+                self.diagnostics.capture(self.driver, "search button not found")
                 return False
+            self.diagnostics.note('search', selector=working_selector)
 
             # Scroll to button and click
             try:
                 # Scroll to the search button
                 self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", search_button)
-                time.sleep(1)
+                self.pause('search_scroll', element_in_view(search_button))
+                previous_label = results_label_text(self.driver)
 
                 # Try clicking with JavaScript if regular click fails
                 try:
@@ -443,41 +474,30 @@ class SchoolCountingTool:
                 return False
 
             # Wait for results to load
-            time.sleep(3)
+            self.pause('search_results', results_changed(previous_label))
 
             # Verify results loaded by checking for common result indicators
             result_indicators = [
                 ".accordion-body",
                 ".accordion-item",
                 "[class*='accordion']",
-                "li:contains('Showing')",
+                "//li[contains(.,'Showing')]",
                 ".pagination",
                 "table tbody tr"
             ]
 
-            result_found = False
-            for indicator in result_indicators:
-                try:
-                    if indicator.startswith("li:contains"):
-                        # Special handling for text-based selectors
-                        elements = self.driver.find_elements(By.XPATH, f"//li[contains(text(),'Showing')]")
-                    else:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, indicator)
-
-                    if elements:
-                        logger.info(f"✅ Results loaded - found indicator: {indicator}")
-                        result_found = True
-                        break
-                except:
-                    continue
+            indicator, elements = self.waits.find_first('search_results', result_indicators)
+            result_found = bool(elements)
+            if result_found:
+                logger.info(f"✅ Results loaded - found indicator: {indicator}")
 
             if not result_found:
                 logger.warning("⚠️ No results found with any indicator - checking page content")
-                page_text = self.driver.page_source[:2000]
-                if "No records found" in page_text or "No data available" in page_text:
+                if page_has_text(self.driver, *NO_RESULTS_TEXTS):
                     logger.info("📄 No schools found for this district")
                 else:
                     logger.warning("⚠️ Results may not have loaded properly")
+                    self.diagnostics.capture(self.driver, "search results missing", indicators=result_indicators)
 
             return True
 
@@ -502,26 +522,11 @@ class SchoolCountingTool:
             ]
 
             count_text = None
-            working_selector = None
-
-            for selector in count_selectors:
-                try:
-                    if selector.startswith("//"):
-                        # XPath selector
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-
-                    if elements:
-                        count_text = elements[0].text.strip()
-                        working_selector = selector
-                        logger.info(f"✅ Found count element with selector: {selector}")
-                        logger.info(f"   Count text: '{count_text}'")
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
+            working_selector, elements = self.waits.find_first('count_label', count_selectors)
+            if elements:
+                count_text = elements[0].text.strip()
+                logger.info(f"✅ Found count element with selector: {working_selector}")
+                logger.info(f"   Count text: '{count_text}'")
 
             if not count_text:
                 logger.warning("⚠️ Count element not found with any selector")
@@ -569,6 +574,203 @@ class SchoolCountingTool:
             logger.error(f"❌ Failed to extract school count: {e}")
             return 0
 
+    def search_and_count(self):
+        """Click Search and read the total from the new results label
+
+        Waits for the previous results to be replaced instead of sleeping, and
+        only falls back to extract_school_count() when no label appears. Raises
+        when no count of this search can be read, so that the district is
+        reported as failed instead of caching the previous district's total or 0.
+        """
+        previous = self.driver.find_elements(By.XPATH, f"{COUNT_LABEL_XPATH} | {NO_RESULTS_XPATH}")
+        previous_text = previous[0].text if previous else None
+
+        search_button = WebDriverWait(self.driver, COUNT_RESULT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "button.purpleBtn"))
+        )
+        self.driver.execute_script("arguments[0].click();", search_button)
+
+        replaced = True
+        if previous:
+            try:
+                WebDriverWait(self.driver, COUNT_RESULT_TIMEOUT).until(EC.staleness_of(previous[0]))
+            except TimeoutException:
+                # The old label may still be on the page: only a different text is this search's
+                logger.debug("Previous results were not replaced - waiting for a new label text")
+                replaced = False
+
+        def total_from_results(driver):
+            labels = driver.find_elements(By.XPATH, COUNT_LABEL_XPATH)
+            if labels:
+                text = labels[0].text
+                match = COUNT_PATTERN.search(text)
+                if match and (replaced or text != previous_text):
+                    return match.group(1)
+            no_results = driver.find_elements(By.XPATH, NO_RESULTS_XPATH)
+            if no_results and (replaced or no_results[0].text != previous_text):
+                return "0"
+            return False
+
+        try:
+            return int(WebDriverWait(self.driver, COUNT_RESULT_TIMEOUT).until(total_from_results))
+        except TimeoutException:
+            if not replaced:
+                raise RuntimeError("search results were not updated (still showing the previous district)")
+            logger.warning("⚠️ Results label did not appear - using the full count extraction")
+
+        # extract_school_count() returns 0 when it finds no count; a real "no results"
+        # page was already answered by total_from_results
+        school_count = self.extract_school_count()
+        if not school_count:
+            raise RuntimeError("school count could not be read")
+        return school_count
+
+    def count_worker(self, worker_id, tasks, cache, failures):
+        """Worker loop: count the (state, district) tasks of the shared queue in its own browser"""
+        prefix = f"[W{worker_id}]"
+        try:
+            # driver_factory serializes the browser starts of the workers
+            if not self.setup_driver():
+                return
+            if not self.navigate_to_portal():
+                logger.error(f"❌ {prefix} Failed to navigate to portal")
+                return
+
+            while True:
+                try:
+                    state, district = tasks.get_nowait()
+                except queue.Empty:
+                    return
+
+                state_name = state['stateName']
+                district_name = district['districtName']
+                try:
+                    if self.current_state != state:
+                        if not self.select_state(state) or not self.extract_districts_data():
+                            raise Exception("state selection failed")
+                    if not self.select_district(district):
+                        raise Exception("district selection failed")
+                    school_count = self.search_and_count()
+                    cache.put(state_name, district_name, school_count)
+                    logger.info(f"✅ {prefix} {state_name} / {district_name}: {school_count} schools")
+                except Exception as e:
+                    logger.error(f"❌ {prefix} {state_name} / {district_name}: {e}")
+                    failures.append((state_name, district_name))
+                    # Start the next task from a freshly selected state
+                    self.current_state = None
+        finally:
+            if self.driver:
+                self.waits.report(f"count worker {worker_id}")
+                self.network.report(f"count worker {worker_id}")
+                log_browser_memory(self.driver, f"count worker {worker_id}")
+                self.driver.quit()
+
+    def open_portal(self):
+        """Start the planning browser on the portal, once"""
+        if self.driver:
+            return True
+        return self.setup_driver() and self.navigate_to_portal()
+
+    def collect_count_tasks(self, states, cache):
+        """(state, district) pairs without a cached count for the academic year
+
+        Districts come from the portal catalog; the browser is only started for
+        states whose districts are missing or expired there.
+        """
+        tasks = []
+        for state in states:
+            districts = self.catalog.districts(state['stateName'])
+            if districts is None:
+                if not self.open_portal() or not self.select_state(state):
+                    logger.error(f"❌ Failed to select state: {state['stateName']}")
+                    continue
+                districts = self.extract_districts_data()
+            missing = [district for district in districts
+                       if cache.get(state['stateName'], district['districtName']) is None]
+            logger.info(f"📍 {state['stateName']}: {len(districts)} districts, {len(missing)} to count")
+            tasks.extend((state, district) for district in missing)
+        return tasks
+
+    def run_parallel_counting(self, target_states=None, workers=COUNT_WORKERS, refresh=False):
+        """Fast count mode: fan district searches out over a pool of browser sessions"""
+        start_time = time.time()
+        cache = SchoolCountCache()
+        try:
+            logger.info("🚀 STARTING FAST SCHOOL COUNTING")
+            logger.info(f"   👥 Workers: {workers}, academic year: {cache.academic_year}")
+            logger.info("="*80)
+
+            # Planning needs no browser when the catalog has the states and districts
+            states = self.catalog.states()
+            if not states:
+                if not self.open_portal():
+                    logger.error("❌ Failed to open the portal")
+                    return False
+                states = self.extract_states_data()
+            if not states:
+                logger.error("❌ No states extracted. Cannot proceed.")
+                return False
+
+            if target_states:
+                if isinstance(target_states, str):
+                    target_states = [target_states]
+                states = [state for state in states if state['stateName'] in target_states]
+                logger.info(f"🎯 Filtered to target states: {[s['stateName'] for s in states]}")
+
+            if refresh:
+                cache.clear([state['stateName'] for state in states])
+
+            count_tasks = self.collect_count_tasks(states, cache)
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+
+            tasks = queue.Queue()
+            for task in count_tasks:
+                tasks.put(task)
+            failures = []
+            threads = [
+                threading.Thread(target=SchoolCountingTool().count_worker,
+                                 args=(worker_id, tasks, cache, failures), daemon=True)
+                for worker_id in range(1, min(workers, len(count_tasks)) + 1)
+            ]
+            logger.info(f"🔢 Counting {len(count_tasks)} districts with {len(threads)} workers")
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.wait_policy.report("parallel counting")
+
+            # Districts left in the queue belong to workers that could not start
+            while not tasks.empty():
+                state, district = tasks.get_nowait()
+                failures.append((state['stateName'], district['districtName']))
+
+            for state in states:
+                counts = cache.state_counts(state['stateName'])
+                if counts:
+                    self.save_state_counts_to_csv(state['stateName'], counts)
+            nationwide_file = cache.write_nationwide_csv()
+
+            logger.info(f"\n{'='*80}")
+            logger.info("🎯 FAST SCHOOL COUNTING COMPLETED")
+            logger.info(f"{'='*80}")
+            logger.info(f"⏱️ {len(count_tasks)} districts queried in {(time.time() - start_time)/60:.1f} minutes")
+            logger.info(f"❌ Failed districts: {len(failures)}")
+            for state_name, district_name in failures:
+                logger.info(f"   {state_name} / {district_name}")
+            logger.info(f"📝 Nationwide table: {nationwide_file}")
+            return not failures
+
+        except Exception as e:
+            logger.error(f"❌ Critical error in fast school counting: {e}")
+            return False
+
+        finally:
+            if self.driver:
+                self.driver.quit()
+                logger.info("🔒 Browser driver closed")
+
     def save_state_counts_to_csv(self, state_name, district_counts):
         """Save district counts for a state to CSV file"""
         try:
@@ -649,7 +851,7 @@ class SchoolCountingTool:
                     district_counts[district_name] = 0
 
                 # Brief pause between districts
-                time.sleep(1)
+                self.pause('count_district_pause')
 
             # Save results to CSV
             csv_file = self.save_state_counts_to_csv(state_name, district_counts)
@@ -716,7 +918,7 @@ class SchoolCountingTool:
                     failed_states.append(state['stateName'])
 
                 # Brief pause between states
-                time.sleep(2)
+                self.pause('count_state_pause')
 
             # Final summary
             logger.info(f"\n{'='*80}")
@@ -737,11 +939,16 @@ class SchoolCountingTool:
         finally:
             # Cleanup
             if self.driver:
+                self.waits.report()
+                self.wait_policy.report()
+                self.network.report()
+                log_browser_memory(self.driver, "counting")
                 self.driver.quit()
                 logger.info("🔒 Browser driver closed")
 
 def main():
     """Main function for school counting tool"""
+    configure_logging()
     try:
         print("🚀 SCHOOL COUNTING TOOL")
         print("Counts total schools in each district of every state")
@@ -751,11 +958,15 @@ def main():
         # Create and run the counting tool
         counter = SchoolCountingTool()
 
-        # Option to run for specific states (for testing)
-        # target_states = ["GOA", "DELHI"]  # Uncomment and modify for specific states
-        target_states = None  # Process all states
+        # States can be given on the command line, e.g. python school_counting_tool.py GOA DELHI
+        arguments = sys.argv[1:]
+        refresh = "--refresh" in arguments
+        target_states = [argument for argument in arguments if argument != "--refresh"] or None
 
-        success = counter.run_school_counting(target_states)
+        if COUNT_WORKERS > 1:
+            success = counter.run_parallel_counting(target_states, refresh=refresh)
+        else:
+            success = counter.run_school_counting(target_states)
 
         if success:
             print("\n✅ School counting completed successfully!")
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Scrape Metrics - Per-stage timing instrumentation with a JSON-lines metrics log
+- One record per school (Phase 2) or per results page (Phase 1)
+- Stage durations (navigation, readiness wait, extraction, CSV write, Sheets upload),
+  retry counts and byte sizes
+- Records are appended to metrics/{STATE}_{component}_metrics_{timestamp}.jsonl
+- "summary" shows where the time per record goes, stage by stage
+
+Usage: python scrape_metrics.py summary [metrics_file.jsonl ...]
+"""
+
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from snapshot_merger import clean_state_name
+from stats_utils import percentile
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Directory for the JSON-lines metrics files
+METRICS_DIR = "metrics"
+
+
+class MetricsRecord:
+    """Timings of one school or page, written as one JSON line by finish()"""
+
+    def __init__(self, sink, kind, fields):
+        self.sink = sink
+        self.kind = kind
+        self.fields = fields
+        self.durations = {}
+        self.retries = {}
+        self.sizes = {}
+        self.start_time = time.perf_counter()
+        self.finished = False
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage; repeated stages (retries) accumulate"""
+        stage_start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_duration(name, time.perf_counter() - stage_start)
+
+    def add_duration(self, name, seconds):
+        """Add a stage duration measured by the caller"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def retry(self, stage, count=1):
+        self.retries[stage] = self.retries.get(stage, 0) + count
+
+    def add_bytes(self, name, size):
+        self.sizes[name] = self.sizes.get(name, 0) + int(size)
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def finish(self, status=None):
+        """Write the record (once) and return it as a dict"""
+        if self.finished:
+            return None
+        self.finished = True
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'kind': self.kind,
+            **self.fields,
+            'status': status,
+            'total_seconds': round(time.perf_counter() - self.start_time, 4),
+            'stages': {name: round(duration, 4) for name, duration in self.durations.items()},
+            'retries': self.retries,
+            'bytes': self.sizes,
+        }
+        self.sink.write(record)
+        return record
+
+
+class ScrapeMetrics:
+    """Metrics log for one component (phase1 / phase2) and state"""
+
+    def __init__(self, component, state_name=None, metrics_file=None, enabled=True):
+        self.component = component
+        self.enabled = enabled
+        self.current = None
+        self.records_written = 0
+        self.handle = None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = clean_state_name(state_name) if state_name else "ALL_STATES"
+        self.metrics_file = metrics_file or os.path.join(METRICS_DIR, f"{prefix}_{component}_metrics_{timestamp}.jsonl")
+
+    def record(self, kind, **fields):
+        """Start the record that stage()/retry()/add_bytes() report to"""
+        if self.current and not self.current.finished:
+            self.current.finish('ABANDONED')
+        self.current = MetricsRecord(self, kind, fields)
+        return self.current
+
+    @contextmanager
+    def stage(self, name):
+        """Time a stage of the current record (no-op without one)"""
+        if self.current is None or self.current.finished:
+            yield None
+            return
+        with self.current.stage(name):
+            yield self.current
+
+    def add_duration(self, name, seconds):
+        if self.current is not None and not self.current.finished:
+            self.current.add_duration(name, seconds)
+
+    def retry(self, stage, count=1):
+        if self.current is not None and not self.current.finished:
+            self.current.retry(stage, count)
+
+    def add_bytes(self, name, size):
+        if self.current is not None and not self.current.finished:
+            self.current.add_bytes(name, size)
+
+    def write(self, record):
+        if not self.enabled:
+            return
+        if self.handle is None:
+            os.makedirs(os.path.dirname(self.metrics_file) or ".", exist_ok=True)
+            self.handle = open(self.metrics_file, 'a', encoding='utf-8')
+            logger.info(f"📈 Writing stage metrics to {self.metrics_file}")
+        self.handle.write(json.dumps(record) + "\n")
+        self.handle.flush()
+        self.records_written += 1
+
+    def close(self):
+        if self.current and not self.current.finished:
+            self.current.finish('ABANDONED')
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+
+def load_metrics(metrics_files):
+    """All records of the given JSON-lines files"""
+    records = []
+    for metrics_file in metrics_files:
+        with open(metrics_file, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+def summarize_metrics(records):
+    """Per kind: record count, total time percentiles and per-stage mean/p95/share"""
+    summary = {}
+    for kind in sorted({record['kind'] for record in records}):
+        kind_records = [record for record in records if record['kind'] == kind]
+        totals = [record['total_seconds'] for record in kind_records]
+        total_time = sum(totals)
+
+        stages = {}
+        for record in kind_records:
+            for name, duration in record['stages'].items():
+                stages.setdefault(name, []).append(duration)
+
+        retries = {}
+        for record in kind_records:
+            for name, count in record.get('retries', {}).items():
+                retries[name] = retries.get(name, 0) + count
+
+        summary[kind] = {
+            'records': len(kind_records),
+            'total_p50': round(percentile(totals, 50), 3),
+            'total_p95': round(percentile(totals, 95), 3),
+            'stages': {
+                name: {
+                    'mean': round(sum(durations) / len(kind_records), 3),
+                    'p95': round(percentile(durations, 95), 3),
+                    'share': round(sum(durations) / total_time, 3) if total_time else 0,
+                }
+                for name, durations in sorted(stages.items(), key=lambda item: -sum(item[1]))
+            },
+            'retries': retries,
+        }
+    return summary
+
+
+def show_summary(summary):
+    for kind, data in summary.items():
+        logger.info(f"\n📊 {kind.upper()}: {data['records']} records, "
+                    f"p50 {data['total_p50']:.2f}s, p95 {data['total_p95']:.2f}s per record")
+        for name, stage in data['stages'].items():
+            logger.info(f"   ⏱️ {name:<20} mean {stage['mean']:>7.3f}s  p95 {stage['p95']:>7.3f}s  "
+                        f"{stage['share']*100:5.1f}% of time")
+        for name, count in data['retries'].items():
+            logger.info(f"   🔄 {name} retries: {count}")
+
+
+def main():
+    """Main function for the metrics summary"""
+    print("📈 SCRAPE METRICS")
+    print("Where the time per school/page goes")
+    print()
+
+    if len(sys.argv) < 2 or sys.argv[1] != "summary":
+        print("Usage: python scrape_metrics.py summary [metrics_file.jsonl ...]")
+        return
+
+    metrics_files = sys.argv[2:] or sorted(glob.glob(os.path.join(METRICS_DIR, "*.jsonl")), key=os.path.getmtime)[-1:]
+    if not metrics_files:
+        print(f"❌ No metrics files found in {METRICS_DIR}/")
+        return
+
+    logger.info(f"📁 Reading {', '.join(metrics_files)}")
+    show_summary(summarize_metrics(load_metrics(metrics_files)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Selector Cache - Learned order of fallback selector lists per call site
+- The selector that matched last is tried first at the next lookup of the same
+  call site (wait_manager.WaitManager.find_first), so a steady-state lookup is one
+  query instead of a walk through the list
+- A learned selector is demoted once other selectors won SELECTOR_DEMOTE_AFTER
+  times in a row (portal markup changed)
+- Only chains of equivalent selectors are learned; lists ranked from specific to
+  broad (RANKED_SITES) keep their code order, since a broad selector that matched a
+  half-rendered page once would otherwise lead for good (it never misses)
+- Persisted to a JSON file (atomic writes, only when an order changes), shared by
+  all drivers of the process
+
+Usage: python selector_cache.py [--clear]
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+SELECTOR_CACHE_FILE = "selector_cache.json"
+
+# Learned ordering on/off (SELECTOR_CACHE=0 tries the lists in code order)
+SELECTOR_CACHE_ENABLED = os.environ.get("SELECTOR_CACHE", "1") == "1"
+
+# Consecutive lookups won by another selector before the learned one is demoted
+SELECTOR_DEMOTE_AFTER = 3
+
+# Call sites whose lists run from specific to broad (.accordion-body ... [class*='accordion'])
+RANKED_SITES = {'school_cards', 'search_results'}
+# ===== END CONFIGURATION SECTION =====
+
+
+class SelectorCache:
+    """Per call site: selectors in learned order and misses of the leading one"""
+
+    def __init__(self, cache_file=SELECTOR_CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.sites = {}       # site -> {'order': [selectors], 'misses': consecutive misses of order[0]}
+        self.changed = set()  # sites to write at the next save
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as handle:
+                    self.sites = json.load(handle)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable selector cache {cache_file}: {e}")
+
+    def ordered(self, site, selectors):
+        """The call site's selectors, learned ones first (unknown learned entries are skipped)"""
+        if site in RANKED_SITES:
+            return list(selectors)
+        learned = [selector for selector in self.sites.get(site, {}).get('order', []) if selector in selectors]
+        return learned + [selector for selector in selectors if selector not in learned]
+
+    def record_win(self, site, selector):
+        """Promote the selector that matched; demote a leader that keeps missing"""
+        if site in RANKED_SITES:
+            return
+        with self.lock:
+            entry = self.sites.setdefault(site, {'order': [], 'misses': 0})
+            order = entry['order']
+            self.changed.add(site)
+            if order and order[0] == selector:
+                entry['misses'] = 0
+                return
+
+            if order:
+                entry['misses'] += 1
+                if entry['misses'] < SELECTOR_DEMOTE_AFTER:
+                    # The leader stays first until it missed often enough
+                    if selector not in order:
+                        order.append(selector)
+                        self.save()
+                    return
+                logger.info(f"🔀 Selector for {site}: '{order[0]}' demoted, now trying '{selector}' first")
+
+            if selector in order:
+                order.remove(selector)
+            order.insert(0, selector)
+            entry['misses'] = 0
+            self.save()
+
+    def clear(self, sites=None):
+        """Forget the learned order of the given sites (all sites when None)"""
+        with self.lock:
+            for site in list(sites if sites is not None else self.sites):
+                self.sites.pop(site, None)
+                self.changed.add(site)
+            self.save()
+
+    def save(self):
+        """Write the changed sites, keeping the other sites as they are on disk"""
+        if not self.changed:
+            return
+        data = {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            pass
+        for site in self.changed:
+            if site in self.sites:
+                data[site] = self.sites[site]
+            else:
+                data.pop(site, None)
+
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+        os.replace(temp_file, self.cache_file)
+        self.changed.clear()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_selector_cache():
+    """Process-wide cache (None when SELECTOR_CACHE=0)"""
+    global _shared_cache
+    if not SELECTOR_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SelectorCache()
+        return _shared_cache
+
+
+def main():
+    """Show (or clear) the learned selector order"""
+    cache = SelectorCache()
+    if '--clear' in sys.argv[1:]:
+        cache.clear()
+        print(f"🧹 Cleared {SELECTOR_CACHE_FILE}")
+        return
+
+    print("🎯 LEARNED SELECTORS")
+    print("=" * 60)
+    for site, entry in sorted(cache.sites.items()):
+        order = entry.get('order', [])
+        print(f"{site:<20} {order[0] if order else '-'}  ({entry.get('misses', 0)} misses, "
+              f"{len(order)} selectors seen)")
+
+
+if __name__ == "__main__":
+    main()
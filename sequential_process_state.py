@@ -16,7 +16,6 @@ import time
 import logging
 import pandas as pd
 from datetime import datetime
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
@@ -25,6 +24,19 @@ import json
 import re
 import glob
 
+from chrome_profiles import log_browser_memory
+from diagnostics import Diagnostics
+from driver_factory import create_driver
+from logging_setup import configure_logging
+from network_profiles import attach_network_profile
+from portal_catalog import DISTRICT_OPTION_SELECTOR, STATE_OPTION_SELECTOR, PortalCatalog
+from portal_config import UDISE_PORTAL_URL, kys_url
+from processing_time_calculator import ProcessingTimeCalculator
+from status_server import ProgressTracker, start_status_server
+from wait_manager import attach_wait_manager
+from wait_policy import (WAIT_POLICY, district_options_text, districts_changed, element_in_view, results_changed,
+                         results_label_text)
+
 # Google Sheets integration
 try:
     import gspread
@@ -166,7 +178,7 @@ class GoogleSheetsUploader:
                 logger.info(f"📤 Uploaded batch {i//batch_size + 1}: {len(batch)} rows to {state_name}")
 
                 # Brief pause to respect API limits
-                time.sleep(1)
+                WAIT_POLICY.wait('sheets_batch')
 
             logger.info(f"✅ Successfully uploaded {total_rows} rows to Google Sheets: {state_name}")
             return True
@@ -178,6 +190,11 @@ class GoogleSheetsUploader:
 class SequentialStateProcessor:
     def __init__(self):
         self.driver = None
+        self.waits = None  # Explicit waits per call site (implicit wait is 0)
+        self.network = None  # Blocked resources per phase (CDP) and traffic statistics
+        self.wait_policy = WAIT_POLICY  # Named wait points instead of fixed sleeps
+        self.diagnostics = Diagnostics("sequential")  # Recent actions, page dumps on failure only
+        self.catalog = PortalCatalog()  # States and districts cached on disk
         self.current_state = None
         self.current_district = None
 
@@ -196,6 +213,12 @@ class SequentialStateProcessor:
         # Phase 2 settings
         self.phase2_batch_size = 25  # Smaller batches for sequential processing
 
+        # Live progress (served on /status and /metrics when STATUS_SERVER=1), with
+        # P50/P90 ETA from rates measured in past output CSVs and metrics logs
+        self.time_calculator = ProcessingTimeCalculator.from_measurements(lazy=True)
+        self.progress = ProgressTracker("sequential", self.time_calculator)
+        self.status_server = None
+
         # Google Sheets integration
         self.sheets_uploader = None
         if GOOGLE_SHEETS_ENABLED:
@@ -206,40 +229,15 @@ class SequentialStateProcessor:
         try:
             logger.info(f"🔧 Setting up Chrome driver for {phase}...")
             
-            # Setup Chrome options optimized for each phase
-            options = uc.ChromeOptions()
-            
-            # Core stability options
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            
-            # Performance optimizations
-            options.add_argument("--disable-images")  # Speed optimization
-            options.add_argument("--disable-plugins")
-            options.add_argument("--memory-pressure-off")
-            options.add_argument("--max_old_space_size=4096")
+            # Patched driver from the cache (driver_factory.py), fixed viewport / headless profile
+            self.driver = create_driver(phase.lower(), keep_warm=True)
             
-            # Phase-specific optimizations
+            # Explicit waits only; phase-specific page load timeouts
+            self.waits = attach_wait_manager(self.driver, phase.lower())
+            self.network = attach_network_profile(self.driver, phase.lower())
             if phase == "Phase1":
-                # Phase 1: Optimize for pagination and basic extraction
-                options.add_argument("--disable-background-timer-throttling")
-                options.add_argument("--disable-renderer-backgrounding")
-                options.add_argument("--disable-backgrounding-occluded-windows")
-                
-            # Note: Keep JavaScript enabled for Phase 2 dynamic content
-            
-            self.driver = uc.Chrome(options=options, version_main=138)
-            self.driver.maximize_window()
-            
-            # Phase-specific timeouts
-            if phase == "Phase1":
-                self.driver.implicitly_wait(5)
                 self.driver.set_page_load_timeout(20)
             else:  # Phase2
-                self.driver.implicitly_wait(5)
                 self.driver.set_page_load_timeout(25)
             
             logger.info(f"✅ Chrome driver initialized for {phase}")
@@ -253,14 +251,30 @@ class SequentialStateProcessor:
         """Safely close the Chrome driver"""
         try:
             if self.driver:
+                self.wait_policy.report()
+                if self.waits:
+                    self.waits.report()
+                if self.network:
+                    self.network.report()
+                log_browser_memory(self.driver, self.waits.label if self.waits else "driver")
                 self.driver.quit()
                 self.driver = None
+                self.waits = None
+                self.network = None
                 logger.info("🔒 Chrome driver closed")
         except Exception as e:
             logger.debug(f"Error closing driver: {e}")
     
+    def pause(self, name, condition=None):
+        """Wait at a named wait point (wait_policy.WAIT_POINTS) instead of a fixed sleep"""
+        return self.wait_policy.wait(name, self.driver, condition)
+
     def get_available_states(self):
-        """Get list of available states from the portal"""
+        """Get list of available states (portal catalog, else from the portal)"""
+        states = self.catalog.states(allow_stale=True)
+        if states:
+            return states
+
         try:
             logger.info("🌐 Connecting to UDISE Plus portal to get available states...")
             
@@ -290,8 +304,8 @@ class SequentialStateProcessor:
         for attempt in range(max_retries):
             try:
                 logger.info(f"🌐 Navigating to UDISE Plus portal... (attempt {attempt + 1}/{max_retries})")
-                self.driver.get("https://udiseplus.gov.in/#/en/home")
-                time.sleep(3)
+                self.driver.get(UDISE_PORTAL_URL)
+                self.pause('portal_load')
 
                 # Click on Visit Portal
                 logger.info("🔍 Looking for Visit Portal button...")
@@ -300,13 +314,13 @@ class SequentialStateProcessor:
                 )
                 visit_portal_btn.click()
                 logger.info("✅ Clicked Visit Portal button")
-                time.sleep(3)
+                self.pause('visit_portal')
 
                 # Switch to new tab if opened
                 if len(self.driver.window_handles) > 1:
                     self.driver.switch_to.window(self.driver.window_handles[-1])
                     logger.info("🔄 Switched to new tab")
-                    time.sleep(2)
+                    self.pause('portal_tab_switch')
 
                 # Click on Advance Search
                 logger.info("🔍 Looking for Advance Search button...")
@@ -328,10 +342,10 @@ class SequentialStateProcessor:
                 logger.error(f"❌ Failed to navigate to portal (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
                     logger.info(f"⏳ Retrying navigation in 15 seconds...")
-                    time.sleep(15)
+                    self.pause('navigation_retry')
                     try:
                         self.driver.refresh()
-                        time.sleep(5)
+                        self.pause('navigation_refresh')
                     except:
                         pass
                 else:
@@ -343,6 +357,11 @@ class SequentialStateProcessor:
     def extract_states_data(self):
         """Extract all states data from dropdown"""
         try:
+            states = self.catalog.states()
+            if states and self.waits.find('state_options', STATE_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(states)} states from the catalog")
+                return states
+
             logger.info("🔍 Extracting available states...")
 
             # Wait for state dropdown
@@ -351,7 +370,7 @@ class SequentialStateProcessor:
             )
             logger.info("✅ Found state dropdown")
 
-            time.sleep(1)  # Wait for options to populate
+            self.pause('state_options')  # Wait for options to populate
 
             # Get all state options
             state_options = state_select.find_elements(By.TAG_NAME, "option")
@@ -388,6 +407,8 @@ class SequentialStateProcessor:
                     continue
 
             logger.info(f"✅ Extracted {len(states)} valid states")
+            if states:
+                self.catalog.put_states(states)
             return states
 
         except Exception as e:
@@ -401,6 +422,7 @@ class SequentialStateProcessor:
             logger.info(f"\n{'='*100}")
             logger.info(f"🏛️ PROCESSING STATE: {state_name}")
             logger.info(f"{'='*100}")
+            self.progress.update(phase='phase1', state=state_name, district=None, page=None)
             
             # Phase 1: Extract basic school data for the entire state
             logger.info(f"📋 PHASE 1: Extracting basic school data for {state_name}")
@@ -413,6 +435,7 @@ class SequentialStateProcessor:
             
             # Phase 2: Process schools with know_more_links
             logger.info(f"\n🔍 PHASE 2: Processing detailed data for {state_name}")
+            self.progress.update(phase='phase2', district=None, page=None)
             phase2_success = self.run_phase2_for_state(state_name, phase1_file)
             
             if phase2_success:
@@ -602,6 +625,7 @@ class SequentialStateProcessor:
                     logger.info(f"\n🏘️ Processing district {i}/{len(districts)}: {district['districtName']}")
 
                     self.current_district = district
+                    self.progress.update(district=district['districtName'], page=None)
 
                     # Select district and extract schools
                     if self.select_district(district):
@@ -631,7 +655,7 @@ class SequentialStateProcessor:
                         logger.warning(f"Failed to select district: {district['districtName']}")
 
                     # Brief delay between districts
-                    time.sleep(0.3)
+                    self.pause('district_pause')
 
                 except Exception as e:
                     logger.error(f"Error processing district {district['districtName']}: {e}")
@@ -669,9 +693,13 @@ class SequentialStateProcessor:
         """Select a specific state from the dropdown"""
         try:
             logger.info(f"🔄 Selecting state: {state_data['stateName']}")
+            self.diagnostics.note('select_state', state=state_data['stateName'])
 
-            state_select_element = self.driver.find_element(By.CSS_SELECTOR, "select.form-select.select")
+            state_select_element = self.waits.find('state_dropdown', "select.form-select.select")
+            if state_select_element is None:
+                raise Exception("state dropdown not found")
             state_select = Select(state_select_element)
+            previous_districts = district_options_text(self.driver)
 
             # Try multiple methods to select the state
             success = False
@@ -713,7 +741,8 @@ class SequentialStateProcessor:
                 logger.error(f"❌ Failed to select state {state_data['stateName']}")
                 return False
 
-            time.sleep(1)  # Wait for districts to load
+            # Wait for the districts of the new state to load
+            self.pause('districts_loaded', districts_changed(previous_districts))
             return True
 
         except Exception as e:
@@ -727,8 +756,13 @@ class SequentialStateProcessor:
                 logger.error("❌ current_state is None")
                 return []
 
+            districts = self.catalog.districts(self.current_state['stateName'])
+            if districts and self.waits.find('district_options', DISTRICT_OPTION_SELECTOR) is not None:
+                logger.info(f"📚 {len(districts)} districts of {self.current_state['stateName']} from the catalog")
+                return districts
+
             logger.info(f"🔍 Extracting districts for {self.current_state['stateName']}...")
-            time.sleep(2)  # Wait for district dropdown to populate
+            self.pause('district_options')  # Wait for district dropdown to populate
 
             # Find district dropdown (usually the second select element)
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
@@ -766,6 +800,8 @@ class SequentialStateProcessor:
                         logger.info(f"✅ Found district (simple): {district_text}")
 
             logger.info(f"✅ Extracted {len(districts_data)} districts for {self.current_state['stateName']}")
+            if districts_data:
+                self.catalog.put_districts(self.current_state['stateName'], districts_data)
             return districts_data
 
         except Exception as e:
@@ -776,7 +812,8 @@ class SequentialStateProcessor:
         """Select a specific district from the dropdown"""
         try:
             logger.info(f"🔄 Selecting district: {district_data['districtName']}")
-            time.sleep(1)
+            self.diagnostics.note('select_district', district=district_data['districtName'])
+            self.pause('district_select_ready')
 
             select_elements = self.driver.find_elements(By.CSS_SELECTOR, "select.form-select.select")
 
@@ -826,7 +863,7 @@ class SequentialStateProcessor:
                 logger.error(f"❌ Failed to select district {district_data['districtName']}")
                 return False
 
-            time.sleep(1)
+            self.pause('district_selected')
             return True
 
         except Exception as e:
@@ -858,7 +895,7 @@ class SequentialStateProcessor:
                 except:
                     continue
 
-            time.sleep(0.5)
+            self.pause('filters_reset')
             return True
 
         except Exception as e:
@@ -876,28 +913,19 @@ class SequentialStateProcessor:
                 "button[class*='purpleBtn']"
             ]
 
-            search_button = None
-            for selector in search_selectors:
-                try:
-                    if selector.startswith("//"):
-                        search_button = WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                    else:
-                        search_button = WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                    break
-                except:
-                    continue
+            _, elements = self.waits.find_first('search_button', search_selectors)
+            search_button = elements[0] if elements else None
 
             if not search_button:
                 logger.error("❌ Search button not found")
+                self.diagnostics.capture(self.driver, "search button not found")
                 return False
 
             # Scroll to element and click
+            self.diagnostics.note('search')
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", search_button)
-            time.sleep(1)
+            self.pause('search_scroll', element_in_view(search_button))
+            previous_label = results_label_text(self.driver)
 
             try:
                 search_button.click()
@@ -908,7 +936,7 @@ class SequentialStateProcessor:
                 logger.info("✅ Clicked search button with JavaScript")
 
             # Wait for results to load
-            time.sleep(2)
+            self.pause('search_results', results_changed(previous_label))
             return True
 
         except Exception as e:
@@ -921,7 +949,7 @@ class SequentialStateProcessor:
             logger.info("🔧 Setting pagination to 100 results per page...")
 
             # Wait for pagination dropdown to be available
-            time.sleep(1)
+            self.pause('pagination_dropdown')
 
             # Find the pagination dropdown with the specific selector
             pagination_select = WebDriverWait(self.driver, 5).until(
@@ -933,12 +961,13 @@ class SequentialStateProcessor:
             select_obj = Select(pagination_select)
 
             # Select the option with value="100"
+            previous_label = results_label_text(self.driver)
             select_obj.select_by_value("100")
 
             logger.info("✅ Successfully set pagination to 100 results per page")
 
             # Brief wait for the page to update with new pagination
-            time.sleep(1)
+            self.pause('pagination_applied', results_changed(previous_label))
             return True
 
         except Exception as e:
@@ -958,11 +987,17 @@ class SequentialStateProcessor:
 
                 # Wait for page to load if not first page
                 if page_number > 1:
-                    time.sleep(1)  # Increased wait time for page transitions
+                    self.pause('page_transition')
 
                 # Extract schools from current page
+                self.progress.update(page=page_number)
                 page_schools = self.extract_schools_from_current_page()
+                for school in page_schools:
+                    school['page_number'] = page_number
                 schools_data.extend(page_schools)
+                if self.network:
+                    self.network.sample()  # XHR traffic of this results page
+                self.progress.record_listing(len(page_schools))
                 logger.info(f"   ✅ Extracted {len(page_schools)} schools from page {page_number}")
 
                 # Check if we got any schools on this page
@@ -984,7 +1019,10 @@ class SequentialStateProcessor:
                 page_number += 1
 
                 # Longer wait after successful page navigation
-                time.sleep(1.5)
+                self.pause('next_page_settle')
+
+            if page_number > max_pages:
+                logger.warning(f"⚠️ Reached maximum page limit ({max_pages}) - stopping pagination")
 
             logger.info(f"✅ Pagination complete: {len(schools_data)} total schools extracted across {page_number} pages")
             return schools_data
@@ -997,7 +1035,7 @@ class SequentialStateProcessor:
         """Extract schools data from the current page with optimized single scroll"""
         try:
             # Wait for page to stabilize
-            time.sleep(1)
+            self.pause('page_stabilize')
 
             # Single efficient scroll to load all content
             logger.debug("   📜 Loading all schools with single scroll...")
@@ -1005,11 +1043,11 @@ class SequentialStateProcessor:
                 // Scroll to bottom to trigger any lazy loading
                 window.scrollTo(0, document.body.scrollHeight);
             """)
-            time.sleep(1)
+            self.pause('lazy_load_scroll')
 
             # Scroll back to top for extraction
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
+            self.pause('scroll_top')
 
             # Try multiple selectors to find school elements
             selectors_to_try = [
@@ -1025,30 +1063,26 @@ class SequentialStateProcessor:
                 "[class*='result']"    # Result items
             ]
 
-            school_elements = []
-            used_selector = None
-
-            for selector in selectors_to_try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    # Filter out header rows and empty elements
-                    valid_elements = []
-                    for elem in elements:
-                        try:
-                            text = elem.text.strip()
-                            if text and len(text) > 10:  # Must have substantial content
-                                valid_elements.append(elem)
-                        except:
-                            continue
+            def valid_elements(elements):
+                # Filter out header rows and empty elements
+                valid = []
+                for elem in elements:
+                    try:
+                        text = elem.text.strip()
+                        if text and len(text) > 10:  # Must have substantial content
+                            valid.append(elem)
+                    except:
+                        continue
+                return valid
 
-                    if valid_elements:
-                        school_elements = valid_elements
-                        used_selector = selector
-                        logger.debug(f"   ✅ Found {len(school_elements)} schools with selector: {selector}")
-                        break
+            used_selector, school_elements = self.waits.find_first('school_cards', selectors_to_try,
+                                                                   accept=valid_elements)
+            if school_elements:
+                logger.debug(f"   ✅ Found {len(school_elements)} schools with selector: {used_selector}")
 
             if not school_elements:
                 logger.warning("   ⚠️ No school elements found with any selector")
+                self.diagnostics.capture(self.driver, "no school cards", selectors=selectors_to_try)
                 return []
 
             # Process all schools
@@ -1106,7 +1140,7 @@ class SequentialStateProcessor:
             if link_match:
                 relative_link = link_match.group(1)
                 if relative_link.startswith("#/"):
-                    school_data['know_more_link'] = f"https://kys.udiseplus.gov.in/{relative_link}"
+                    school_data['know_more_link'] = kys_url(relative_link)
                 else:
                     school_data['know_more_link'] = relative_link
             else:
@@ -1160,7 +1194,7 @@ class SequentialStateProcessor:
         """Click next page button if available and not disabled using proper selectors"""
         try:
             # Wait for page to stabilize
-            time.sleep(1)
+            self.pause('next_button_ready')
 
             # Use specific selector for next button based on the HTML structure
             # <li class=""><a class="nextBtn">Next</a></li> - enabled
@@ -1193,52 +1227,10 @@ class SequentialStateProcessor:
                 logger.info("   ❌ Next button not displayed")
                 return False
 
-            # Get current page info for debugging
-            try:
-                page_info_selectors = [
-                    ".pagination-info", ".page-info", "[class*='showing']",
-                    "[class*='page']", ".pagination", "[class*='result']"
-                ]
-                for selector in page_info_selectors:
-                    page_info = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if page_info:
-                        info_text = page_info[0].text.strip()
-                        if info_text and len(info_text) > 5:
-                            logger.info(f"   📊 Page info ({selector}): {info_text}")
-                            break
-            except:
-                pass
-
-            # DEBUG: Show pagination HTML structure
-            try:
-                pagination_container = self.driver.find_elements(By.CSS_SELECTOR, ".pagination, [class*='page'], ul.pagination")
-                if pagination_container:
-                    container = pagination_container[0]
-                    html_snippet = container.get_attribute('outerHTML')[:500]  # First 500 chars
-                    logger.info(f"   🔍 Pagination HTML: {html_snippet}...")
-            except:
-                pass
-
-            # Check if button is disabled - focus on parent <li> class
+            # Page info and pagination markup are only dumped when the step fails (diagnostics)
+            # Primary check (parent <li> disabled class) was done above
             is_disabled = False
 
-            # Primary Check: Parent <li> element disabled class (most reliable)
-            try:
-                parent_li = next_button.find_element(By.XPATH, "..")
-                parent_classes = parent_li.get_attribute("class") or ""
-                parent_tag = parent_li.tag_name.lower()
-
-                logger.info(f"   🔍 Parent element: <{parent_tag} class='{parent_classes}'>")
-
-                if "disabled" in parent_classes.lower():
-                    logger.info(f"   ❌ Parent <li> has disabled class: '{parent_classes}'")
-                    is_disabled = True
-                else:
-                    logger.info(f"   ✅ Parent <li> is NOT disabled: '{parent_classes}'")
-
-            except Exception as e:
-                logger.warning(f"   ⚠️ Could not check parent element: {e}")
-
             # Secondary Check: Button disabled class
             button_classes = next_button.get_attribute("class") or ""
             if "disabled" in button_classes.lower():
@@ -1266,11 +1258,14 @@ class SequentialStateProcessor:
                 logger.info("   🖱️ Clicking next button...")
 
                 # Simple JavaScript click (most reliable for Angular apps)
+                previous_label = results_label_text(self.driver)
+                self.diagnostics.note('next_page', label=previous_label)
                 self.driver.execute_script("arguments[0].click();", next_button)
                 print("clicked next button")
 
                 # Wait for page to change
-                time.sleep(3)
+                page_moved = results_changed(previous_label)
+                self.pause('next_page_change', page_moved)
 
                 # Verify page actually changed by checking pagination info
                 page_changed = False
@@ -1295,7 +1290,7 @@ class SequentialStateProcessor:
                 # If no clear change detected, wait a bit more and check again
                 if not page_changed:
                     logger.info("   ⏳ Waiting for page transition to complete...")
-                    time.sleep(2)
+                    self.pause('next_page_recheck', page_moved)
 
                     try:
                         final_page_info = self.driver.find_elements(By.CSS_SELECTOR, ".pagination, [class*='showing']")
@@ -1310,6 +1305,7 @@ class SequentialStateProcessor:
                         logger.error("   ❌ Could not verify page change")
 
                     if not page_changed:
+                        self.diagnostics.capture(self.driver, "next page did not change", label=previous_label)
                         return False
 
                 logger.info("   ✅ Successfully clicked next button and page changed")
@@ -1317,6 +1313,7 @@ class SequentialStateProcessor:
 
             except Exception as click_error:
                 logger.error(f"   ❌ Failed to click next button: {click_error}")
+                self.diagnostics.capture(self.driver, "next button click failed", error=str(click_error))
 
                 # FALLBACK: Try to find and click any pagination element that might work
                 logger.info("   🔄 Trying fallback pagination methods...")
@@ -1329,7 +1326,7 @@ class SequentialStateProcessor:
                             logger.info(f"   🔄 Trying to click page number: {link_text}")
                             link.click()
                             print(f"clicked page {link_text}")
-                            time.sleep(3)
+                            self.pause('page_link_click')
                             return True
                 except:
                     pass
@@ -1432,6 +1429,8 @@ class SequentialStateProcessor:
                 return True
 
             logger.info(f"🎯 Processing {len(phase2_schools)} schools for Phase 2")
+            self.progress.set_queue_depth(len(phase2_schools))
+            self.log_phase2_estimate(len(phase2_schools), state_name)
 
             # Setup driver for Phase 2
             if not self.setup_driver("Phase2"):
@@ -1455,7 +1454,7 @@ class SequentialStateProcessor:
                 all_phase2_results.extend(batch_results)  # Add to consolidated results
 
                 # Brief pause between batches
-                time.sleep(1)
+                self.pause('phase2_batch_pause')
 
             # Save all Phase 2 results in a single consolidated CSV file
             if all_phase2_results:
@@ -1486,6 +1485,12 @@ class SequentialStateProcessor:
             self.close_driver()
             return False
 
+    def log_phase2_estimate(self, num_schools, state_name):
+        """Log the P50/P90 Phase 2 completion time from measured rates"""
+        estimate = self.time_calculator.get_percentile_estimate(num_schools, "phase2", state_name=state_name)
+        logger.info(f"⏱️ Estimated Phase 2 time for {num_schools} schools: P50 {estimate['p50_formatted']}, "
+                    f"P90 {estimate['p90_formatted']} ({estimate['sources']['phase2']} rates)")
+
     def filter_phase2_ready_schools(self, df):
         """Filter schools that are ready for Phase 2 processing"""
         try:
@@ -1519,6 +1524,7 @@ class SequentialStateProcessor:
 
                     # Extract detailed data
                     extracted_data = self.extract_phase2_data(school['know_more_link'])
+                    self.progress.record_extraction(extracted_data.get('extraction_status') if extracted_data else 'FAILED')
 
                     if extracted_data and extracted_data.get('extraction_status') in ['SUCCESS', 'PARTIAL']:
                         # Combine original and extracted data
@@ -1532,7 +1538,7 @@ class SequentialStateProcessor:
                         logger.warning(f"   ⚠️ Failed to extract detailed data")
 
                     # Brief pause between schools
-                    time.sleep(0.5)
+                    self.pause('phase2_school_pause')
 
                 except Exception as e:
                     logger.warning(f"   ❌ Error processing school: {e}")
@@ -1561,6 +1567,7 @@ class SequentialStateProcessor:
 
                     # Extract detailed data
                     extracted_data = self.extract_phase2_data(school['know_more_link'])
+                    self.progress.record_extraction(extracted_data.get('extraction_status') if extracted_data else 'FAILED')
 
                     if extracted_data and extracted_data.get('extraction_status') in ['SUCCESS', 'PARTIAL']:
                         # Combine original and extracted data
@@ -1574,7 +1581,7 @@ class SequentialStateProcessor:
                         logger.warning(f"   ⚠️ Failed to extract detailed data")
 
                     # Brief pause between schools
-                    time.sleep(0.5)
+                    self.pause('phase2_school_pause')
 
                 except Exception as e:
                     logger.warning(f"   ❌ Error processing school: {e}")
@@ -1671,14 +1678,16 @@ class SequentialStateProcessor:
                     self.driver.refresh()
 
                     # Step 3: Wait for refresh to complete
-                    time.sleep(3)
+                    self.pause('detail_refresh')
 
                     # Step 4: Verify page is loaded
                     WebDriverWait(self.driver, 10).until(
                         lambda driver: driver.execute_script("return document.readyState") == "complete"
                     )
 
-                    time.sleep(2)  # Additional wait for dynamic content
+                    self.pause('detail_content')  # Additional wait for dynamic content
+                    if self.network:
+                        self.network.sample()
 
                 except Exception as e:
                     logger.debug(f"   ❌ Navigation/refresh error: {e}")
@@ -1885,7 +1894,7 @@ class SequentialStateProcessor:
             except Exception as e:
                 logger.debug(f"   ⚠️ Failed to extract data (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    self.pause('detail_retry')
                 else:
                     return None
 
@@ -1929,6 +1938,7 @@ class SequentialStateProcessor:
         """Main method to run sequential state processing"""
         try:
             self.start_time = time.time()
+            self.status_server = start_status_server(self.progress)
 
             logger.info("🚀 SEQUENTIAL STATE PROCESSOR")
             logger.info("="*80)
@@ -1978,7 +1988,7 @@ class SequentialStateProcessor:
                     # Brief pause between states
                     if i < len(selected_states):
                         logger.info("⏳ Brief pause before next state...")
-                        time.sleep(3)
+                        self.pause('state_pause')
 
                 except Exception as e:
                     logger.error(f"❌ Critical error processing {state['stateName']}: {e}")
@@ -1991,6 +2001,8 @@ class SequentialStateProcessor:
             logger.error(f"❌ Critical error in sequential processing: {e}")
         finally:
             self.close_driver()
+            if self.status_server:
+                self.status_server.stop()
 
     def show_final_summary(self):
         """Show final processing summary"""
@@ -2037,6 +2049,7 @@ class SequentialStateProcessor:
 
 def main():
     """Main function"""
+    configure_logging()
     print("🚀 SEQUENTIAL STATE PROCESSOR")
     print("Unified Phase 1 + Phase 2 workflow for complete state processing")
     print("Each state is fully processed (both phases) before moving to the next")
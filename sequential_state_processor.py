@@ -20,10 +20,19 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
+from diagnostics import LOADING_TEXTS, NO_RESULTS_TEXTS, page_has_text
+from logging_setup import configure_logging
+from portal_catalog import PortalCatalog
+from scrape_metrics import ScrapeMetrics
+from wait_policy import WAIT_POINTS, WAIT_POLICY, element_in_view, results_changed, results_label_text
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Write per-page stage timings (wait, extraction, CSV write, next page) to metrics/*.jsonl
+SCRAPE_METRICS_ENABLED = False
+
 class EnhancedStatewiseSchoolScraper:
     """Enhanced scraper with pagination, results per page, and scrolling improvements"""
 
@@ -44,6 +53,12 @@ class EnhancedStatewiseSchoolScraper:
         self.csv_headers_written = False
         self.total_schools_saved = 0
 
+        # Whether the last search runs at 100 results per page (page ranges depend on it)
+        self.results_per_page_100 = False
+
+        # Per-stage timing log (reopened per state in initialize_csv_file)
+        self.metrics = ScrapeMetrics("phase1", enabled=False)
+
     def __getattr__(self, name):
         """Delegate all undefined methods to the base scraper"""
         return getattr(self.base_scraper, name)
@@ -79,7 +94,11 @@ class EnhancedStatewiseSchoolScraper:
         return result
 
     def enhanced_click_search_button(self):
-        """Enhanced search button click with results per page optimization"""
+        """Enhanced search button click with results per page optimization
+
+        The outcome of the 100-results setting is kept in self.results_per_page_100.
+        """
+        self.results_per_page_100 = False
         try:
             # First, click the search button using the base method
             search_success = self.base_scraper.click_search_button()
@@ -89,14 +108,15 @@ class EnhancedStatewiseSchoolScraper:
                 return False
 
             # Balanced wait for initial results to load (reliability focused)
-            time.sleep(2.5)  # Increased from 1.5s to 2.5s for better reliability
+            self.pause('search_results')
 
             # Try to set results per page to 100 with verification
             results_per_page_success = self.set_results_per_page_to_100()
+            self.results_per_page_100 = bool(results_per_page_success)
             if results_per_page_success:
                 logger.info("✅ Successfully set results per page to 100")
                 # Reliable wait for page to reload with 100 results per page
-                time.sleep(2.5)  # Increased from 1.5s to 2.5s for complete loading
+                self.pause('page_stabilize')
 
                 # Verify that school elements are now available (with reliable timeout)
                 self.wait_for_school_elements_to_load()  # Use full method for reliability
@@ -129,6 +149,7 @@ class EnhancedStatewiseSchoolScraper:
             available_options = [option.get_attribute('value') for option in select.options]
             logger.info(f"📋 Available results per page options: {available_options}")
 
+            previous_label = results_label_text(self.driver)
             if "100" in available_options:
                 select.select_by_value("100")
 
@@ -136,7 +157,7 @@ class EnhancedStatewiseSchoolScraper:
                 selected_value = select.first_selected_option.get_attribute('value')
                 if selected_value == "100":
                     logger.info("✅ Successfully set and verified results per page to 100")
-                    time.sleep(1.5)  # Increased from 0.5s to 1.5s for reliable page update
+                    self.pause('pagination_applied', results_changed(previous_label))
                     return True
                 else:
                     logger.warning(f"⚠️ Selection verification failed. Selected: {selected_value}")
@@ -147,7 +168,7 @@ class EnhancedStatewiseSchoolScraper:
                 max_option = max([int(opt) for opt in available_options if opt.isdigit()])
                 select.select_by_value(str(max_option))
                 logger.info(f"📋 Selected maximum available option: {max_option}")
-                time.sleep(1.5)  # Increased from 0.5s to 1.5s for reliable page update
+                self.pause('pagination_applied', results_changed(previous_label))
                 return True
 
         except Exception as e:
@@ -161,7 +182,7 @@ class EnhancedStatewiseSchoolScraper:
 
             # Fast scroll to bottom without height checking for performance
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5)  # Minimal wait - reduced from 3 seconds to 0.5 seconds
+            self.pause('lazy_load_scroll')
 
             logger.debug("✅ Scrolled to bottom of page")
             return True
@@ -200,7 +221,7 @@ class EnhancedStatewiseSchoolScraper:
                 logger.warning("⚠️ No school elements found after waiting - page may have no results")
 
             # Reliable wait to ensure all content is fully rendered
-            time.sleep(3)  # Increased from 2s to 3s for complete content loading
+            self.pause('page_stabilize')
 
             return elements_found
 
@@ -225,7 +246,7 @@ class EnhancedStatewiseSchoolScraper:
                     if elements:
                         logger.debug(f"⚡ Fast found {len(elements)} elements with: {selector}")
                         # Balanced wait for content rendering
-                        time.sleep(1.5)  # Increased from 0.5s to 1.5s for better reliability
+                        self.pause('page_stabilize')
                         return True
                 except:
                     continue
@@ -237,13 +258,17 @@ class EnhancedStatewiseSchoolScraper:
             logger.debug(f"⚠️ Error in fast element check: {e}")
             return False
 
-    def initialize_csv_file(self, state_name):
-        """Initialize CSV file for incremental saving with enhanced debugging"""
+    def initialize_csv_file(self, state_name, suffix=None):
+        """Initialize CSV file for incremental saving with enhanced debugging
+
+        suffix (e.g. a work unit id) keeps files of parallel workers apart.
+        """
         try:
             # Create filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             clean_state_name = state_name.replace(' ', '_').replace('&', 'and').replace('/', '_').upper()
-            self.current_csv_file = f"{clean_state_name}_phase1_complete_{timestamp}.csv"
+            suffix = f"_{suffix}" if suffix else ""
+            self.current_csv_file = f"{clean_state_name}_phase1_complete_{timestamp}{suffix}.csv"
 
             # Get absolute path for debugging
             abs_path = os.path.abspath(self.current_csv_file)
@@ -252,6 +277,8 @@ class EnhancedStatewiseSchoolScraper:
             # Reset tracking variables
             self.csv_headers_written = False
             self.total_schools_saved = 0
+            self.metrics.close()
+            self.metrics = ScrapeMetrics("phase1", state_name, enabled=SCRAPE_METRICS_ENABLED)
 
             logger.info(f"📁 Initialized CSV file for incremental saving: {self.current_csv_file}")
             logger.info(f"📍 Absolute path: {abs_path}")
@@ -289,7 +316,7 @@ class EnhancedStatewiseSchoolScraper:
                 'has_know_more_link', 'phase2_ready', 'state', 'state_id', 'district', 'district_id',
                 'extraction_date', 'udise_code', 'school_name', 'know_more_link', 'email',
                 'operational_status', 'school_category', 'school_management', 'school_type',
-                'school_location', 'address', 'pin_code'
+                'school_location', 'address', 'pin_code', 'page_number'
             ]
 
             # Write headers if this is the first write
@@ -490,7 +517,8 @@ class EnhancedStatewiseSchoolScraper:
                 # Scroll to button to ensure it's visible
                 try:
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                    time.sleep(0.3)  # Reduced from 1 second to 0.3 seconds
+                    self.pause('next_button_scroll', element_in_view(next_button))
+                    previous_label = results_label_text(self.driver)
 
                     # Try multiple click methods with retry
                     click_success = False
@@ -530,7 +558,7 @@ class EnhancedStatewiseSchoolScraper:
 
                     if click_success:
                         # Balanced wait time for page to load after successful click
-                        time.sleep(1.5)  # Restored from 0.8s to 1.5s for reliable page loading
+                        self.pause('next_page_click', results_changed(previous_label))
                         return True
                     else:
                         logger.warning(f"All click methods failed on attempt {attempt + 1}")
@@ -540,12 +568,12 @@ class EnhancedStatewiseSchoolScraper:
 
                 # Reasonable wait before retry
                 if attempt < max_retries - 1:
-                    time.sleep(0.8)  # Increased from 0.3s to 0.8s for better reliability
+                    self.pause('next_click_retry')
 
             except Exception as e:
                 logger.warning(f"Error in enhanced_click_next_page attempt {attempt + 1}: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(1)
+                    self.pause('next_click_error_retry')
 
         logger.warning(f"Failed to click next page button after {max_retries} attempts")
         return False
@@ -629,64 +657,51 @@ class EnhancedStatewiseSchoolScraper:
                 ".school-item"
             ]
 
-            school_elements = []
+            def filter_elements(elements):
+                # Filter out potentially empty elements
+                filtered_elements = []
+                for element in elements:
+                    try:
+                        # Check if element has meaningful content
+                        element_text = element.text.strip()
+                        element_html = element.get_attribute('innerHTML')
 
-            for selector in selectors_to_try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    # Filter out potentially empty elements
-                    filtered_elements = []
-                    for element in elements:
-                        try:
-                            # Check if element has meaningful content
-                            element_text = element.text.strip()
-                            element_html = element.get_attribute('innerHTML')
-
-                            # Skip if element is empty or has minimal content
-                            if (element_text and len(element_text) > 10) or \
-                               (element_html and len(element_html) > 50):
-                                filtered_elements.append(element)
-                        except:
-                            # If we can't check the element, include it to be safe
+                        # Skip if element is empty or has minimal content
+                        if (element_text and len(element_text) > 10) or \
+                           (element_html and len(element_html) > 50):
                             filtered_elements.append(element)
+                    except:
+                        # If we can't check the element, include it to be safe
+                        filtered_elements.append(element)
+                return filtered_elements
 
-                    if filtered_elements:
-                        school_elements = filtered_elements
-                        logger.debug(f"   Found {len(elements)} elements, filtered to {len(filtered_elements)} with selector: {selector}")
-                        break
+            selector, school_elements = self.waits.find_first('school_cards', selectors_to_try, accept=filter_elements)
+            if school_elements:
+                logger.debug(f"   Found {len(school_elements)} elements with selector: {selector}")
 
             if not school_elements:
                 logger.warning("   ⚠️ No school elements found with any selector")
-                # Enhanced debugging: Check page content and state
-                page_text = self.driver.page_source[:2000]
-                current_url = self.driver.current_url
-                page_title = self.driver.title
-
-                logger.warning(f"   🔍 Debug info:")
-                logger.warning(f"      URL: {current_url}")
-                logger.warning(f"      Title: {page_title}")
-                logger.warning(f"      Page length: {len(self.driver.page_source)} chars")
+                # One script call for the page state (the page source is only dumped on failure)
+                page_state = page_has_text(self.driver, *NO_RESULTS_TEXTS, *LOADING_TEXTS)
 
-                if "No records found" in page_text or "No data available" in page_text:
+                if page_state in NO_RESULTS_TEXTS:
                     logger.info("   📄 Confirmed: No schools in this district")
-                elif "loading" in page_text.lower() or "please wait" in page_text.lower():
+                elif page_state in LOADING_TEXTS:
                     logger.warning("   ⏳ Page appears to be still loading - waiting for completion...")
-                    time.sleep(3)  # Restored from 1.5s to 3s for complete loading
+                    self.pause('results_still_loading')
                     # Retry element detection after adequate wait
-                    for selector in selectors_to_try:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if elements:
-                            school_elements = elements
-                            logger.info(f"   ✅ Found {len(elements)} school elements after retry with: {selector}")
-                            break
+                    selector, school_elements = self.waits.find_first('school_cards', selectors_to_try)
+                    if school_elements:
+                        logger.info(f"   ✅ Found {len(school_elements)} school elements after retry with: {selector}")
 
                     if not school_elements:
                         logger.warning("   ❌ Still no elements found after retry")
+                        self.diagnostics.capture(self.driver, "no school cards after loading retry",
+                                                 selectors=selectors_to_try)
                         return []
                 else:
                     logger.warning("   ⚠️ Page may not have loaded properly or has different structure")
-                    # Log a sample of page content for debugging
-                    logger.warning(f"   📄 Page sample: {page_text[:500]}...")
+                    self.diagnostics.capture(self.driver, "no school cards", selectors=selectors_to_try)
                     return []
 
             # Process all schools with enhanced extraction including email
@@ -728,51 +743,89 @@ class EnhancedStatewiseSchoolScraper:
             logger.error(f"   Error extracting schools from page with email: {e}")
             return []
 
-    def extract_schools_basic_data_enhanced(self):
-        """Optimized schools extraction with incremental CSV saving and improved pagination"""
+    def skip_to_page(self, target_page):
+        """Click through to target_page without extracting (start of a page-range work unit)"""
+        self.wait_for_school_elements_to_load()
+        for page_number in range(2, target_page + 1):
+            if not self.enhanced_click_next_page():
+                logger.warning(f"⚠️ Results end before page {target_page} (last page {page_number - 1})")
+                return False
+            self.pause('page_transition')
+            try:
+                WebDriverWait(self.driver, 8).until(
+                    lambda driver: len(driver.find_elements(By.CSS_SELECTOR, ".accordion-body, .accordion-item, [class*='accordion']")) > 0
+                )
+            except Exception as wait_error:
+                logger.warning(f"Timeout waiting for page {page_number} while skipping: {wait_error}")
+        logger.info(f"⏩ Skipped to page {target_page}")
+        return True
+
+    def extract_schools_basic_data_enhanced(self, first_page=1, last_page=None):
+        """Optimized schools extraction with incremental CSV saving and improved pagination
+
+        first_page/last_page limit the extraction to a page range (work planner units).
+        """
         try:
             schools_data = []
-            page_number = 1
+            page_number = first_page
             start_time = time.time()
 
+            if first_page > 1 and not self.skip_to_page(first_page):
+                return []
+
             logger.info("� Starting OPTIMIZED schools data extraction with robust pagination and incremental CSV saving...")
             logger.info("⚡ Performance optimizations: Reduced wait times, optimized scrolling, faster email extraction")
 
             while True:  # Remove hardcoded page limit - continue until no more pages
                 logger.info(f"📄 Processing page {page_number}")
+                district_name = self.current_district['districtName'] if self.current_district else 'N/A'
+                record = self.metrics.record('page', district=district_name, page_number=page_number)
 
                 # Reliable handling for first page
-                if page_number == 1:
-                    logger.info("🔍 First page - ensuring complete loading...")
-                    # Full check for school elements to ensure reliability
-                    self.wait_for_school_elements_to_load()
-                    # Always scroll on first page to ensure all content is loaded
-                    self.scroll_to_bottom()
-                elif page_number % 5 == 0:
-                    # Balanced scrolling: Scroll every 5th page for reliability
-                    self.scroll_to_bottom()
+                with record.stage('readiness_wait'):
+                    if page_number == first_page:
+                        logger.info("🔍 First page - ensuring complete loading...")
+                        # Full check for school elements to ensure reliability
+                        self.wait_for_school_elements_to_load()
+                        # Always scroll on first page to ensure all content is loaded
+                        self.scroll_to_bottom()
+                    elif page_number % 5 == 0:
+                        # Balanced scrolling: Scroll every 5th page for reliability
+                        self.scroll_to_bottom()
 
                 # Extract schools from current page using enhanced method with email extraction
-                page_schools = self.extract_schools_from_current_page_with_email()
+                with record.stage('extraction'):
+                    page_schools = self.extract_schools_from_current_page_with_email()
 
                 # Reliable first page recovery
-                if page_number == 1 and not page_schools:
+                if page_number == first_page and not page_schools:
                     logger.warning("⚠️ First page extraction failed - attempting reliable recovery...")
-                    # Adequate wait time for recovery
-                    time.sleep(4)  # Increased from 2s to 4s for better recovery
-                    self.scroll_to_bottom()
-                    # Additional wait after scrolling
-                    time.sleep(1)
-                    page_schools = self.extract_schools_from_current_page_with_email()
+                    record.retry('extraction')
+                    with record.stage('readiness_wait'):
+                        # Adequate wait time for recovery
+                        self.pause('first_page_recovery')
+                        self.scroll_to_bottom()
+                        # Additional wait after scrolling
+                        self.pause('lazy_load_scroll')
+                    with record.stage('extraction'):
+                        page_schools = self.extract_schools_from_current_page_with_email()
 
                     if page_schools:
                         logger.info(f"✅ First page recovery successful - found {len(page_schools)} schools")
                     else:
                         logger.error("❌ First page recovery failed - no schools extracted")
 
+                # Results page of every row, used by completeness_verifier.py
+                for school in page_schools:
+                    school['page_number'] = page_number
+
                 # Save page schools to CSV immediately for crash protection
                 if page_schools:
-                    save_success = self.save_schools_to_csv_incremental(page_schools, page_number)
+                    size_before = os.path.getsize(self.current_csv_file) if os.path.exists(self.current_csv_file) else 0
+                    with record.stage('csv_write'):
+                        save_success = self.save_schools_to_csv_incremental(page_schools, page_number)
+                    if save_success:
+                        record.add_bytes('csv', os.path.getsize(self.current_csv_file) - size_before)
                     if not save_success:
                         logger.warning(f"⚠️ Failed to save page {page_number} to CSV, but continuing extraction")
 
@@ -789,35 +842,49 @@ class EnhancedStatewiseSchoolScraper:
                 logger.info(f"   ✅ Extracted {len(page_schools)} schools from page {page_number}")
                 logger.info(f"   📊 Total schools in memory: {len(schools_data)}")
 
+                record.set(schools=len(page_schools))
+
+                if last_page and page_number >= last_page:
+                    logger.info(f"📄 Reached the last page of the range ({last_page})")
+                    record.finish('RANGE_END' if page_schools else 'EMPTY')
+                    break
+
                 # Try to go to next page using enhanced method with retry
                 logger.info(f"   🔄 Checking for next page after page {page_number}...")
-                if not self.enhanced_click_next_page():
+                with record.stage('next_page_click'):
+                    has_next_page = self.enhanced_click_next_page()
+                if not has_next_page:
                     logger.info(f"📄 No more pages available after page {page_number}")
+                    record.finish('LAST_PAGE' if page_schools else 'EMPTY')
                     break
 
                 page_number += 1
 
-                # Balanced wait time for next page to load completely
-                time.sleep(2)  # Increased from 1s to 2s for reliable page loading
+                with record.stage('next_page_wait'):
+                    # Balanced wait time for next page to load completely
+                    self.pause('next_page_settle')
 
-                # Reliable check for new content with adequate timeout
-                try:
-                    # Wait for new content to load with reliable timeout
-                    WebDriverWait(self.driver, 8).until(  # Restored from 4s to 8s for reliability
-                        lambda driver: len(driver.find_elements(By.CSS_SELECTOR, ".accordion-body, .accordion-item, [class*='accordion']")) > 0
-                    )
-                except Exception as wait_error:
-                    logger.warning(f"Timeout waiting for new page content: {wait_error}")
-                    # Continue anyway as content might already be loaded
+                    # Reliable check for new content with adequate timeout
+                    try:
+                        # Wait for new content to load with reliable timeout
+                        WebDriverWait(self.driver, 8).until(  # Restored from 4s to 8s for reliability
+                            lambda driver: len(driver.find_elements(By.CSS_SELECTOR, ".accordion-body, .accordion-item, [class*='accordion']")) > 0
+                        )
+                    except Exception as wait_error:
+                        logger.warning(f"Timeout waiting for new page content: {wait_error}")
+                        # Continue anyway as content might already be loaded
+
+                record.finish('SUCCESS' if page_schools else 'EMPTY')
 
             # Performance summary
             total_time = time.time() - start_time
-            avg_time_per_page = total_time / page_number if page_number > 0 else 0
+            pages_processed = page_number - first_page + 1
+            avg_time_per_page = total_time / pages_processed if pages_processed > 0 else 0
 
-            logger.info(f"✅ OPTIMIZED extraction completed: {len(schools_data)} total schools from {page_number} pages")
+            logger.info(f"✅ OPTIMIZED extraction completed: {len(schools_data)} total schools from {pages_processed} pages")
             logger.info(f"⚡ Performance Summary: {total_time:.1f}s total, {avg_time_per_page:.1f}s per page (target: <180s per page)")
-            logger.info(f"📊 Pagination Summary: Processed {page_number} pages with no hardcoded limits")
-            logger.info(f"📊 Average schools per page: {len(schools_data)/page_number:.1f}")
+            logger.info(f"📊 Pagination Summary: Processed pages {first_page}-{page_number}")
+            logger.info(f"📊 Average schools per page: {len(schools_data)/pages_processed:.1f}")
             logger.info(f"💾 CSV file saved: {self.current_csv_file} with {self.total_schools_saved} total schools")
             return schools_data
 
@@ -894,6 +961,7 @@ class EnhancedStatewiseSchoolScraper:
 
             # Save data to CSV (legacy method - but incremental saving already done)
             self.base_scraper.save_state_data_to_csv(target_state['stateName'])
+            self.base_scraper.report_driver_profile(target_state['stateName'])
 
             total_schools = (len(self.state_schools_with_links.get(target_state['stateName'], [])) +
                            len(self.state_schools_no_links.get(target_state['stateName'], [])))
@@ -902,6 +970,7 @@ class EnhancedStatewiseSchoolScraper:
 
             # Finalize CSV file
             self.finalize_csv_file()
+            self.metrics.close()
 
             return True
 
@@ -960,12 +1029,14 @@ class EnhancedStatewiseSchoolScraper:
 
             # Save data to CSV (legacy method - but incremental saving already done)
             self.base_scraper.save_state_data_to_csv(target_state['stateName'])
+            self.base_scraper.report_driver_profile(target_state['stateName'])
 
             logger.info(f"✅ Enhanced processing completed for {target_district['districtName']}: {len(schools_data)} schools")
             logger.info(f"💾 Incremental CSV file: {self.current_csv_file} with {self.total_schools_saved} schools saved")
 
             # Finalize CSV file
             self.finalize_csv_file()
+            self.metrics.close()
 
             return True
 
@@ -980,7 +1051,8 @@ class SequentialStateProcessor:
         self.total_schools_processed = 0
         self.start_time = None
         self.max_retries = 3
-        self.retry_delay = 30  # seconds
+        self.retry_delay = WAIT_POINTS['state_retry'][0]  # seconds
+        self.wait_policy = WAIT_POLICY  # Named wait points instead of fixed sleeps
 
         # State list (all 38 Indian states)
         self.states_list = [
@@ -1077,39 +1149,44 @@ class SequentialStateProcessor:
                 print("\n\n👋 Exiting...")
                 return None
 
-    def select_district_interactive(self, state_name):
-        """Interactive district selection for a given state"""
-        try:
-            # Import the Phase 1 scraper to get districts
-            from phase1_statewise_scraper import StatewiseSchoolScraper
-
-            logger.info(f"🔧 Getting districts for {state_name}...")
-            scraper = StatewiseSchoolScraper()
-            scraper.setup_driver()
+    def fetch_districts(self, state_name):
+        """Read a state's districts from the portal (they are added to the catalog)"""
+        # Import the Phase 1 scraper to get districts
+        from phase1_statewise_scraper import StatewiseSchoolScraper
 
+        logger.info(f"🔧 Getting districts for {state_name} from the portal...")
+        scraper = StatewiseSchoolScraper()
+        scraper.setup_driver()
+        try:
             # Navigate and get state data
             if not scraper.navigate_to_portal():
                 logger.error("Failed to navigate to portal")
-                scraper.driver.quit()
                 return None
 
-            states = scraper.extract_states_data()
             target_state = None
-            for state in states:
+            for state in scraper.extract_states_data():
                 if state['stateName'] == state_name:
                     target_state = state
                     break
 
             if not target_state:
                 logger.error(f"State {state_name} not found")
-                scraper.driver.quit()
                 return None
 
             # Select state and get districts
             scraper.select_state(target_state)
-            districts = scraper.extract_districts_data()
+            return scraper.extract_districts_data()
+        finally:
             scraper.driver.quit()
 
+    def select_district_interactive(self, state_name):
+        """Interactive district selection for a given state"""
+        try:
+            # Districts from the portal catalog (expired entries are fine for a menu)
+            districts = PortalCatalog().districts(state_name, allow_stale=True)
+            if districts is None:
+                districts = self.fetch_districts(state_name)
+
             if not districts:
                 print(f"❌ No districts found for {state_name}")
                 return None
@@ -1238,7 +1315,7 @@ class SequentialStateProcessor:
             
             if attempt < self.max_retries - 1:
                 logger.info(f"⏳ Retrying Phase 2 for {state_name} in {self.retry_delay} seconds...")
-                time.sleep(self.retry_delay)
+                self.wait_policy.wait('state_retry')
         
         logger.error(f"❌ Phase 2 failed for {state_name} after {self.max_retries} attempts")
         return False
@@ -1293,7 +1370,7 @@ class SequentialStateProcessor:
                 return False
             
             # Brief pause between phases
-            time.sleep(5)
+            self.wait_policy.wait('phase_pause')
             
             # Phase 2: Process detailed data
             logger.info(f"🔍 PHASE 2: Processing detailed data for {state_name}")
@@ -1343,7 +1420,7 @@ class SequentialStateProcessor:
                 # Brief pause between states
                 if i < len(self.states_list):
                     logger.info("⏳ Brief pause before next state...")
-                    time.sleep(10)
+                    self.wait_policy.wait('sequential_state_pause')
             
             # Final summary
             self.show_final_summary()
@@ -1433,7 +1510,7 @@ class SequentialStateProcessor:
                 return False
 
             # Brief pause between phases
-            time.sleep(5)
+            self.wait_policy.wait('phase_pause')
 
             # Phase 2: Process detailed data
             logger.info(f"🔍 PHASE 2: Processing detailed data for {district_data['districtName']}")
@@ -1477,13 +1554,14 @@ class SequentialStateProcessor:
 
             if attempt < self.max_retries - 1:
                 logger.info(f"⏳ Retrying Phase 1 for {state_name} in {self.retry_delay} seconds...")
-                time.sleep(self.retry_delay)
+                self.wait_policy.wait('state_retry')
 
         logger.error(f"❌ Phase 1 failed for {state_name} after {self.max_retries} attempts")
         return False
 
 def main():
     """Main function with interactive menu for enhanced sequential state processing"""
+    configure_logging()
     try:
         processor = SequentialStateProcessor()
 
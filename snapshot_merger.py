@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Snapshot Merger - Merge and deduplicate accumulated per-state CSV snapshots
+- Streams any number of Phase 1 / Phase 2 CSV files in fixed-size chunks
+- Deduplicates schools by udise_code (falls back to the know_more_link school id)
+- Keeps the newest record per school by extraction_timestamp / extraction_date
+- Emits one canonical CSV file per state
+- Bounded memory: only a key -> winner index is held, never the rows themselves
+
+Usage: python snapshot_merger.py [file1.csv file2.csv ...]
+       (without arguments all *_phase1_complete_* / *_phase2_* files are merged)
+"""
+
+import csv
+import glob
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Default input patterns when no files are passed on the command line
+DEFAULT_INPUT_PATTERNS = [
+    "*_phase1_complete_*.csv",
+    "*_phase2_complete_*.csv",
+    "*_phase2_incremental_*.csv",
+    "*_phase2_reparsed_*.csv",
+]
+
+# Rows are streamed in chunks of this size (progress is logged per chunk)
+CHUNK_SIZE = 50000
+
+# Values the scrapers write when a field could not be extracted
+MISSING_VALUES = {'', 'N/A', 'NA', 'nan', 'None'}
+
+SCHOOL_ID_PATTERN = re.compile(r'schooldetail/(\d+)/')
+
+# Large Phase 2 rows can exceed the csv module default field limit
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def clean_state_name(state_name):
+    """Clean state name for filenames (same convention as the scrapers)"""
+    return state_name.replace(' ', '_').replace('&', 'and').replace('/', '_').upper()
+
+
+def school_key(row):
+    """Return the deduplication key for a school row.
+
+    udise_code is preferred, but the listing cards frequently yield 'N/A', so
+    the numeric school id from know_more_link is used as a fallback and the
+    (state, district, school_name) triple as the last resort.
+    """
+    udise_code = (row.get('udise_code') or '').strip()
+    if udise_code not in MISSING_VALUES:
+        return f"udise:{udise_code}"
+
+    link_match = SCHOOL_ID_PATTERN.search(row.get('know_more_link') or '')
+    if link_match:
+        return f"school_id:{link_match.group(1)}"
+
+    return "name:{}|{}|{}".format(
+        (row.get('state') or '').strip().upper(),
+        (row.get('district') or '').strip().upper(),
+        (row.get('school_name') or '').strip().upper(),
+    )
+
+
+def record_timestamp(row):
+    """Return the newest ISO timestamp recorded for a row ('' if none)"""
+    timestamps = []
+    for column in ('extraction_timestamp', 'extraction_date'):
+        value = (row.get(column) or '').strip()
+        if value not in MISSING_VALUES:
+            timestamps.append(value)
+    return max(timestamps) if timestamps else ''
+
+
+def state_from_filename(filename):
+    """Fallback state name for rows without a 'state' column"""
+    basename = os.path.basename(filename)
+    for marker in ("_phase1_complete_", "_phase2_complete_", "_phase2_incremental_",
+                   "_phase2_reparsed_", "_canonical_"):
+        if marker in basename:
+            return basename.split(marker)[0].replace("_", " ").replace(" and ", " & ")
+    return os.path.splitext(basename)[0].replace("_", " ").upper()
+
+
+class SnapshotMerger:
+    """Two-pass streaming merge of overlapping state snapshot CSV files"""
+
+    def __init__(self, input_files, output_dir=".", chunk_size=CHUNK_SIZE):
+        self.input_files = list(input_files)
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+
+        # key -> (timestamp, file_index, row_index) of the newest record seen
+        self.winners = {}
+        # state -> ordered union of the columns of files contributing to it
+        self.state_columns = {}
+        self.readable_files = []
+
+        self.total_rows_read = 0
+        self.duplicate_rows = 0
+
+    def read_header(self, csv_file):
+        """Read only the header row of a CSV file"""
+        with open(csv_file, 'r', newline='', encoding='utf-8') as handle:
+            return next(csv.reader(handle), [])
+
+    def iter_row_chunks(self, csv_file):
+        """Yield lists of row dicts of at most chunk_size rows"""
+        with open(csv_file, 'r', newline='', encoding='utf-8') as handle:
+            reader = csv.DictReader(handle)
+            chunk = []
+            for row in reader:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    def scan_inputs(self):
+        """Pass 1: find the newest record for every school key"""
+        for file_index, csv_file in enumerate(self.input_files):
+            try:
+                header = self.read_header(csv_file)
+                if 'know_more_link' not in header and 'udise_code' not in header:
+                    logger.warning(f"⚠️ Skipping {csv_file}: no header row with udise_code/know_more_link")
+                    continue
+
+                self.readable_files.append(file_index)
+                fallback_state = state_from_filename(csv_file)
+                states_in_file = set()
+                row_index = 0
+                file_rows = 0
+
+                for chunk in self.iter_row_chunks(csv_file):
+                    for row in chunk:
+                        state = (row.get('state') or '').strip() or fallback_state
+                        if state not in states_in_file:
+                            states_in_file.add(state)
+                            columns = self.state_columns.setdefault(state, [])
+                            for column in header:
+                                if column not in columns:
+                                    columns.append(column)
+
+                        key = (state, school_key(row))
+                        timestamp = record_timestamp(row)
+                        current = self.winners.get(key)
+                        if current is not None:
+                            self.duplicate_rows += 1
+                        # Ties go to the later file/row so re-runs override older snapshots
+                        if current is None or timestamp >= current[0]:
+                            self.winners[key] = (timestamp, file_index, row_index)
+                        row_index += 1
+
+                    file_rows += len(chunk)
+                    logger.debug(f"   📄 {csv_file}: scanned {file_rows} rows")
+
+                self.total_rows_read += file_rows
+                logger.info(f"✅ Scanned {csv_file}: {file_rows} rows")
+
+            except Exception as e:
+                logger.error(f"❌ Failed to scan {csv_file}: {e}")
+
+        logger.info(f"📊 Scanned {self.total_rows_read} rows, {len(self.winners)} unique schools, "
+                    f"{self.duplicate_rows} duplicates")
+
+    def write_canonical_files(self):
+        """Pass 2: stream the inputs again and write only the winning rows"""
+        # Per-file sets of winning row indices (ints only, rows stay on disk)
+        winning_rows = {}
+        for _, file_index, row_index in self.winners.values():
+            winning_rows.setdefault(file_index, set()).add(row_index)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        handles = {}
+        writers = {}
+        written = {}
+        output_files = {}
+
+        try:
+            for file_index in self.readable_files:
+                csv_file = self.input_files[file_index]
+                rows_to_keep = winning_rows.get(file_index)
+                if not rows_to_keep:
+                    continue
+
+                fallback_state = state_from_filename(csv_file)
+                row_index = 0
+
+                for chunk in self.iter_row_chunks(csv_file):
+                    for row in chunk:
+                        if row_index in rows_to_keep:
+                            state = (row.get('state') or '').strip() or fallback_state
+                            if state not in writers:
+                                filename = os.path.join(
+                                    self.output_dir, f"{clean_state_name(state)}_canonical_{timestamp}.csv"
+                                )
+                                handles[state] = open(filename, 'w', newline='', encoding='utf-8')
+                                writers[state] = csv.DictWriter(
+                                    handles[state], fieldnames=self.state_columns[state],
+                                    restval='N/A', extrasaction='ignore'
+                                )
+                                writers[state].writeheader()
+                                written[state] = 0
+                                output_files[state] = filename
+                            writers[state].writerow(row)
+                            written[state] += 1
+                        row_index += 1
+
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+        for state, filename in output_files.items():
+            logger.info(f"💾 {state}: {written[state]} schools -> {filename}")
+
+        return output_files
+
+    def merge(self):
+        """Run the complete merge and return {state: canonical_file}"""
+        if not self.input_files:
+            logger.error("❌ No input files to merge")
+            return {}
+
+        logger.info(f"🔄 Merging {len(self.input_files)} snapshot files...")
+        self.scan_inputs()
+        if not self.winners:
+            logger.warning("⚠️ No school rows found in the input files")
+            return {}
+        return self.write_canonical_files()
+
+
+def find_default_inputs():
+    """Find snapshot files in the working directory"""
+    files = []
+    for pattern in DEFAULT_INPUT_PATTERNS:
+        files.extend(glob.glob(pattern))
+    # Oldest first so that ties resolve to the most recent snapshot
+    return sorted(set(files), key=os.path.getmtime)
+
+
+def main():
+    """Main function for the snapshot merger"""
+    print("🚀 SNAPSHOT MERGER")
+    print("Merges overlapping per-state CSV snapshots into one canonical file per state")
+    print()
+
+    input_files = sys.argv[1:] or find_default_inputs()
+    if not input_files:
+        print("❌ No snapshot files found")
+        return
+
+    merger = SnapshotMerger(input_files)
+    output_files = merger.merge()
+
+    if output_files:
+        print(f"\n✅ Created {len(output_files)} canonical state files:")
+        for state, filename in sorted(output_files.items()):
+            print(f"   🏛️ {state}: {filename}")
+    else:
+        print("\n❌ Merge produced no output. Check logs for details.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,6 @@ Standalone Phase 2 Processor - Independent CSV-based Phase 2 Processing
 
 import pandas as pd
 import time
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -21,6 +20,15 @@ from datetime import datetime
 import os
 import re
 
+from change_detection import ListingChangeDetector
+from chrome_profiles import log_browser_memory
+from detail_page_cache import DetailPageCache
+from detail_page_parser import BASIC_DETAIL_FIELDS, STUDENT_FIELDS, TEACHER_FIELDS, fill_missing_from_page
+from driver_factory import create_driver
+from logging_setup import configure_logging
+from network_profiles import attach_network_profile
+from scrape_metrics import ScrapeMetrics
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -32,12 +40,24 @@ INPUT_CSV_FILE = "GOA_phase1_complete_20250809_103414.csv"  # Change this to you
 # Optional: Limit processing for testing (set to None for all records)
 MAX_RECORDS_TO_PROCESS = None  # Set to a number like 10 for testing, None for all
 
+# Incremental refresh: only revisit schools whose listing (or last_modified) changed
+# since the previous run. Fingerprints are kept in change_store/.
+INCREMENTAL_REFRESH = False
+
+# Keep the compressed page source of every detail page so that parser fixes can be
+# re-applied with "python detail_page_cache.py reparse" instead of re-scraping
+DETAIL_PAGE_CACHE_ENABLED = False
+
+# Write per-school stage timings (navigation, wait, extraction, CSV write) to metrics/*.jsonl
+SCRAPE_METRICS_ENABLED = False
+
 # ===== END CONFIGURATION SECTION =====
 
 class StandalonePhase2Processor:
     def __init__(self, input_csv_file):
         self.input_csv_file = input_csv_file
         self.driver = None
+        self.network = None  # Blocked resources (CDP) and traffic statistics
         self.processed_count = 0
         self.success_count = 0
         self.fail_count = 0
@@ -48,6 +68,15 @@ class StandalonePhase2Processor:
         
         # Extract state name from input file
         self.state_name = self.extract_state_name_from_filename(input_csv_file)
+
+        # Listing change detection (incremental refresh mode)
+        self.change_detector = ListingChangeDetector(self.state_name) if INCREMENTAL_REFRESH else None
+
+        # Detail page cache (opt-in)
+        self.page_cache = DetailPageCache() if DETAIL_PAGE_CACHE_ENABLED else None
+
+        # Per-stage timing log
+        self.metrics = ScrapeMetrics("phase2", self.state_name, enabled=SCRAPE_METRICS_ENABLED)
         
         # Setup output CSV file
         self.setup_output_csv()
@@ -115,6 +144,15 @@ class StandalonePhase2Processor:
             logger.error(f"❌ Error writing to output CSV: {e}")
             return False
 
+    def timed_write(self, record, combined_data):
+        """write_to_output_csv with its duration and the bytes appended"""
+        size_before = os.path.getsize(self.output_csv_file) if os.path.exists(self.output_csv_file) else 0
+        with record.stage('csv_write'):
+            written = self.write_to_output_csv(combined_data)
+        if written:
+            record.add_bytes('csv', os.path.getsize(self.output_csv_file) - size_before)
+        return written
+
     def check_already_processed(self, udise_code):
         """Check if a school has already been processed (for crash recovery)"""
         try:
@@ -135,26 +173,9 @@ class StandalonePhase2Processor:
     def setup_driver(self):
         """Initialize Chrome browser driver with optimized settings for Phase 2 processing"""
         try:
-            # Setup Chrome options for Phase 2 data extraction
-            options = uc.ChromeOptions()
-            
-            # Core stability options
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            
-            # Performance optimizations (KEEP JavaScript enabled for dynamic content)
-            options.add_argument("--disable-images")  # Speed optimization
-            options.add_argument("--disable-plugins")  # Speed optimization
-            
-            # Memory and resource optimizations
-            options.add_argument("--memory-pressure-off")
-            options.add_argument("--max_old_space_size=4096")
-            
-            self.driver = uc.Chrome(options=options)
-            self.driver.maximize_window()
+            # Patched driver from the cache (driver_factory.py), fixed viewport / headless profile
+            self.driver = create_driver("phase2")
+            self.network = attach_network_profile(self.driver, "phase2")
             
             # Balanced timeouts for Phase 2 processing
             self.driver.implicitly_wait(5)
@@ -212,27 +233,34 @@ class StandalonePhase2Processor:
         for attempt in range(max_retries):
             try:
                 logger.info(f"🌐 Navigating to school detail page: {url}")
+                if attempt > 0:
+                    self.metrics.retry('extraction')
                 
                 # IMMEDIATE BROWSER REFRESH: Navigate and immediately refresh
                 try:
-                    # Step 1: Navigate to the URL
-                    self.driver.get(url)
-                    logger.debug(f"   📍 Initial navigation completed")
-                    
-                    # Step 2: IMMEDIATE REFRESH as requested
-                    logger.debug(f"   🔄 Performing IMMEDIATE browser refresh...")
-                    self.driver.refresh()
-                    
-                    # Step 3: Wait for refresh to complete
-                    time.sleep(4)  # Increased wait for refresh completion
-                    
-                    # Step 4: Verify page is loaded
-                    WebDriverWait(self.driver, 10).until(
-                        lambda driver: driver.execute_script("return document.readyState") == "complete"
-                    )
-                    
-                    # Step 5: Additional wait for dynamic content
-                    time.sleep(2)
+                    with self.metrics.stage('navigation'):
+                        # Step 1: Navigate to the URL
+                        self.driver.get(url)
+                        logger.debug(f"   📍 Initial navigation completed")
+
+                        # Step 2: IMMEDIATE REFRESH as requested
+                        logger.debug(f"   🔄 Performing IMMEDIATE browser refresh...")
+                        self.driver.refresh()
+
+                    with self.metrics.stage('readiness_wait'):
+                        # Step 3: Wait for refresh to complete
+                        time.sleep(4)  # Increased wait for refresh completion
+
+                        # Step 4: Verify page is loaded
+                        WebDriverWait(self.driver, 10).until(
+                            lambda driver: driver.execute_script("return document.readyState") == "complete"
+                        )
+
+                        # Step 5: Additional wait for dynamic content
+                        time.sleep(2)
+
+                    if self.network:
+                        self.network.sample()
                     
                     logger.debug(f"   ✅ Page refreshed and loaded successfully")
                     
@@ -275,7 +303,12 @@ class StandalonePhase2Processor:
                 }
                 
                 # Get page content for extraction
-                page_text = self.driver.page_source
+                with self.metrics.stage('page_source'):
+                    page_text = self.driver.page_source
+                self.metrics.add_bytes('page_source', len(page_text))
+                if self.page_cache:
+                    with self.metrics.stage('page_cache'):
+                        self.page_cache.store(url, page_text, self.state_name)
                 
                 # Extract school ID for verification
                 url_school_id = re.search(r'/(\d+)/\d+$', url)
@@ -285,7 +318,8 @@ class StandalonePhase2Processor:
                 logger.debug(f"   📄 Page content length: {len(page_text)} characters")
                 
                 # Continue with data extraction in the next part...
-                return self.extract_data_from_page(data, page_text, expected_school_id)
+                with self.metrics.stage('extraction'):
+                    return self.extract_data_from_page(data, page_text, expected_school_id)
                 
             except Exception as e:
                 logger.warning(f"⚠️ Failed to extract data from {url} (attempt {attempt + 1}/{max_retries}): {e}")
@@ -347,30 +381,8 @@ class StandalonePhase2Processor:
                 except Exception as e:
                     logger.debug(f"   Error finding basic details elements: {e}")
 
-                # Fallback: Use regex patterns for basic details
-                if data['location'] == 'N/A':
-                    location_match = re.search(r'Location</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                    if location_match:
-                        data['location'] = location_match.group(1).strip()
-
-                if data['school_category'] == 'N/A':
-                    category_match = re.search(r'School Category</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                    if category_match:
-                        data['school_category'] = category_match.group(1).strip()
-
-                if data['school_type'] == 'N/A':
-                    type_match = re.search(r'School Type</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                    if type_match:
-                        data['school_type'] = type_match.group(1).strip()
-
-                if data['year_of_establishment'] == 'N/A':
-                    year_match = re.search(r'Year of Establishment</p></div><div[^>]*class="blueCol">([^<]+)', page_text, re.IGNORECASE)
-                    if year_match:
-                        data['year_of_establishment'] = year_match.group(1).strip()
-
-                # Combine class range if both from and to are found
-                if data['class_from'] != 'N/A' and data['class_to'] != 'N/A':
-                    data['class_range'] = f"{data['class_from']} To {data['class_to']}"
+                # Fallback: Parse remaining basic details (and class range) from the page source
+                fill_missing_from_page(data, page_text, BASIC_DETAIL_FIELDS)
 
             except Exception as e:
                 logger.debug(f"   Error extracting basic details: {e}")
@@ -408,19 +420,9 @@ class StandalonePhase2Processor:
                 except Exception as e:
                     logger.debug(f"   Error finding H3Value elements: {e}")
 
-                # Fallback: Use regex patterns for student enrollment
-                if data['total_students'] == 'N/A':
-                    total_students_patterns = [
-                        r'Total Students[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>',
-                        r'Total Students[^>]*>\s*(\d+)\s*<',
-                        r'Total Students[:\s]*(\d+)'
-                    ]
-                    for pattern in total_students_patterns:
-                        match = re.search(pattern, page_text, re.IGNORECASE)
-                        if match:
-                            data['total_students'] = match.group(1).strip()
-                            logger.debug(f"   Found Total Students (regex): {data['total_students']}")
-                            break
+                # Fallback: Parse student enrollment from the page source
+                for field in fill_missing_from_page(data, page_text, STUDENT_FIELDS):
+                    logger.debug(f"   Found {field} (page source): {data[field]}")
 
             except Exception as e:
                 logger.debug(f"   Error extracting student enrollment: {e}")
@@ -526,25 +528,9 @@ class StandalonePhase2Processor:
                     except Exception as e:
                         logger.debug(f"   Error in fallback teacher extraction: {e}")
 
-                # Method 3: Regex fallback for teacher data
-                if data['total_teachers'] == 'N/A' or data['male_teachers'] == 'N/A' or data['female_teachers'] == 'N/A':
-                    try:
-                        # Look for teacher data in the page source with regex
-                        teacher_patterns = [
-                            (r'Total Teachers[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>', 'total_teachers'),
-                            (r'Male[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>', 'male_teachers'),
-                            (r'Female[^>]*</p>\s*<p[^>]*class="H3Value[^>]*>\s*(\d+)\s*</p>', 'female_teachers'),
-                        ]
-
-                        for pattern, field_name in teacher_patterns:
-                            if data[field_name] == 'N/A':
-                                match = re.search(pattern, page_text, re.IGNORECASE | re.DOTALL)
-                                if match:
-                                    data[field_name] = match.group(1).strip()
-                                    logger.debug(f"   Found {field_name} (regex): {data[field_name]}")
-
-                    except Exception as e:
-                        logger.debug(f"   Error in regex teacher extraction: {e}")
+                # Method 3: Parse teacher data from the page source
+                for field in fill_missing_from_page(data, page_text, TEACHER_FIELDS):
+                    logger.debug(f"   Found {field} (page source): {data[field]}")
 
             except Exception as e:
                 logger.debug(f"   Error extracting teacher data: {e}")
@@ -647,6 +633,13 @@ class StandalonePhase2Processor:
                 schools_df = schools_df.head(MAX_RECORDS_TO_PROCESS)
                 logger.info(f"🔢 Limited to {MAX_RECORDS_TO_PROCESS} records for testing")
 
+            # Incremental refresh: skip schools whose listing is unchanged
+            if self.change_detector:
+                schools_df = self.change_detector.filter_changed(schools_df)
+                if len(schools_df) == 0:
+                    logger.info("✅ No new or changed schools since the previous run")
+                    return True
+
             total_schools = len(schools_df)
             logger.info(f"🎯 Processing {total_schools} schools with know_more_link URLs")
 
@@ -666,10 +659,14 @@ class StandalonePhase2Processor:
 
                     logger.info(f"\n🏫 Processing school {idx}/{total_schools}: {school_name}")
                     logger.info(f"   📋 UDISE Code: {udise_code}")
+                    record = self.metrics.record('school', index=idx, udise_code=str(udise_code), url=know_more_link)
 
                     # Check if already processed (crash recovery)
-                    if self.check_already_processed(udise_code):
+                    with record.stage('resume_check'):
+                        already_processed = self.check_already_processed(udise_code)
+                    if already_processed:
                         logger.info(f"   ⏭️ Already processed - skipping")
+                        record.finish('SKIPPED')
                         continue
 
                     # Extract Phase 2 data
@@ -686,9 +683,11 @@ class StandalonePhase2Processor:
                             combined_data.pop(col, None)
 
                         # Write immediately to output CSV (incremental writing)
-                        if self.write_to_output_csv(combined_data):
+                        if self.timed_write(record, combined_data):
                             self.success_count += 1
                             logger.info(f"   ✅ Successfully processed and saved")
+                            if self.change_detector:
+                                self.change_detector.mark_extracted(school.to_dict(), extracted_data.get('extraction_status'))
                         else:
                             logger.error(f"   ❌ Failed to save to CSV")
                             self.fail_count += 1
@@ -709,12 +708,13 @@ class StandalonePhase2Processor:
                         for col in unwanted_columns:
                             combined_data.pop(col, None)
 
-                        if self.write_to_output_csv(combined_data):
+                        if self.timed_write(record, combined_data):
                             logger.info(f"   📝 Saved with extraction failure markers")
 
                         self.fail_count += 1
 
                     self.processed_count += 1
+                    record.finish(extracted_data.get('extraction_status') if extracted_data else 'FAILED')
 
                     # Progress update
                     if idx % 10 == 0 or idx == total_schools:
@@ -750,7 +750,15 @@ class StandalonePhase2Processor:
             return False
         finally:
             # Cleanup
+            if self.change_detector:
+                self.change_detector.finalize()
+            if self.page_cache:
+                self.page_cache.close()
+            self.metrics.close()
             if self.driver:
+                if self.network:
+                    self.network.report()
+                log_browser_memory(self.driver, "phase2")
                 self.driver.quit()
                 logger.info("🔒 Browser driver closed")
 
@@ -771,6 +779,7 @@ class StandalonePhase2Processor:
 
 def main():
     """Main function for standalone Phase 2 processing"""
+    configure_logging()
     try:
         print("🚀 STANDALONE PHASE 2 PROCESSOR")
         print("Processes Phase 1 CSV files independently to extract detailed school data")
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Stats Utils - Small numeric helpers shared by the metrics, timing and benchmark code
+- No scraper, portal or benchmark imports, so runtime instrumentation can use it
+"""
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Status Server - Live progress and throughput endpoint for long runs
+- ProgressTracker: current state/district/page, schools per minute over 1/5/15 minute
+  windows, extraction_status counts, queue depth and ETA
+- Optional fitted ProcessingTimeCalculator: P50/P90 ETA of the remaining queue
+  from measured rates of past runs
+- Embedded stdlib HTTP server in a daemon thread:
+    /status   JSON snapshot
+    /metrics  Prometheus text format
+- Used by the sequential and automated processors
+
+Enable with STATUS_SERVER=1 (port STATUS_SERVER_PORT, default 8799)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+STATUS_SERVER_ENABLED = os.environ.get("STATUS_SERVER", "0") == "1"
+STATUS_SERVER_HOST = os.environ.get("STATUS_SERVER_HOST", "127.0.0.1")
+STATUS_SERVER_PORT = int(os.environ.get("STATUS_SERVER_PORT", "8799"))
+# ===== END CONFIGURATION SECTION =====
+
+# Throughput windows in seconds (1, 5 and 15 minutes)
+THROUGHPUT_WINDOWS = (60, 300, 900)
+
+PHASES = ('phase1', 'phase2')
+
+
+class ProgressTracker:
+    """Thread-safe progress counters of one processor run"""
+
+    def __init__(self, component, calculator=None):
+        self.component = component
+        self.calculator = calculator
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+        self.position = {'phase': None, 'state': None, 'district': None, 'page': None}
+        self.queue_depth = 0
+        self.status_counts = {}
+        self.totals = {phase: 0 for phase in PHASES}
+        # (timestamp, count) events, kept for the longest window
+        self.events = {phase: deque() for phase in PHASES}
+
+    def update(self, **position):
+        """Set the current phase/state/district/page (and any extra position fields)"""
+        with self.lock:
+            self.position.update(position)
+
+    def set_queue_depth(self, remaining):
+        with self.lock:
+            self.queue_depth = max(0, int(remaining))
+
+    def record_listing(self, count):
+        """Phase 1: schools extracted from a results page"""
+        self.record_event('phase1', count)
+
+    def record_extraction(self, status):
+        """Phase 2: one school detail page with its extraction_status"""
+        with self.lock:
+            status = status or 'FAILED'
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.queue_depth = max(0, self.queue_depth - 1)
+        self.record_event('phase2', 1)
+
+    def record_event(self, phase, count):
+        now = time.time()
+        with self.lock:
+            self.totals[phase] += count
+            events = self.events[phase]
+            events.append((now, count))
+            while events and events[0][0] < now - THROUGHPUT_WINDOWS[-1]:
+                events.popleft()
+
+    def rates(self, phase, now=None):
+        """Schools per minute over each window (shorter at the start of a run)"""
+        now = now or time.time()
+        elapsed = max(now - self.started_at, 1e-9)
+        rates = {}
+        with self.lock:
+            events = list(self.events[phase])
+        for window in THROUGHPUT_WINDOWS:
+            count = sum(n for timestamp, n in events if timestamp >= now - window)
+            rates[f"{window // 60}m"] = round(count / (min(window, elapsed) / 60), 2)
+        return rates
+
+    def eta_seconds(self, rates=None):
+        """Remaining Phase 2 queue at the 5-minute rate (1-minute rate early in the run)"""
+        rates = rates or self.rates('phase2')
+        rate = rates['5m'] or rates['1m']
+        if not self.queue_depth or not rate:
+            return None
+        return round(self.queue_depth / rate * 60)
+
+    def model_eta_seconds(self):
+        """P50/P90 of the remaining Phase 2 queue from the calculator's measured rates"""
+        if not self.calculator or not self.queue_depth:
+            return None, None
+        estimate = self.calculator.get_percentile_estimate(self.queue_depth, "phase2",
+                                                            state_name=self.position['state'])
+        return round(estimate['p50_seconds']), round(estimate['p90_seconds'])
+
+    def snapshot(self):
+        """JSON-friendly status"""
+        now = time.time()
+        rates = {phase: self.rates(phase, now) for phase in PHASES}
+        with self.lock:
+            snapshot = {
+                'component': self.component,
+                'uptime_seconds': round(now - self.started_at),
+                **self.position,
+                'queue_depth': self.queue_depth,
+                'schools_total': dict(self.totals),
+                'status_counts': dict(self.status_counts),
+            }
+        snapshot['schools_per_minute'] = rates
+        snapshot['eta_seconds'] = self.eta_seconds(rates['phase2'])
+        snapshot['eta_p50_seconds'], snapshot['eta_p90_seconds'] = self.model_eta_seconds()
+        return snapshot
+
+    def prometheus(self):
+        """Prometheus text exposition of the snapshot"""
+        snapshot = self.snapshot()
+        labels = f'component="{self.component}",state="{snapshot["state"] or ""}"'
+        lines = [
+            "# HELP udise_schools_total Schools processed since start",
+            "# TYPE udise_schools_total counter",
+        ]
+        for phase, total in snapshot['schools_total'].items():
+            lines.append(f'udise_schools_total{{{labels},phase="{phase}"}} {total}')
+        lines += ["# HELP udise_schools_per_minute Schools per minute over a sliding window",
+                  "# TYPE udise_schools_per_minute gauge"]
+        for phase, rates in snapshot['schools_per_minute'].items():
+            for window, rate in rates.items():
+                lines.append(f'udise_schools_per_minute{{{labels},phase="{phase}",window="{window}"}} {rate}')
+        lines += ["# HELP udise_extractions_total Phase 2 extractions by extraction_status",
+                  "# TYPE udise_extractions_total counter"]
+        for status, count in sorted(snapshot['status_counts'].items()):
+            lines.append(f'udise_extractions_total{{{labels},status="{status}"}} {count}')
+        lines += ["# HELP udise_queue_depth Schools left in the current Phase 2 queue",
+                  "# TYPE udise_queue_depth gauge",
+                  f"udise_queue_depth{{{labels}}} {snapshot['queue_depth']}",
+                  "# HELP udise_eta_seconds Estimated seconds until the queue is empty",
+                  "# TYPE udise_eta_seconds gauge",
+                  f"udise_eta_seconds{{{labels}}} {snapshot['eta_seconds'] if snapshot['eta_seconds'] is not None else 'NaN'}",
+                  "# HELP udise_eta_model_seconds Remaining queue time from measured rates of past runs",
+                  "# TYPE udise_eta_model_seconds gauge"]
+        for quantile, key in (("0.5", 'eta_p50_seconds'), ("0.9", 'eta_p90_seconds')):
+            if snapshot[key] is not None:
+                lines.append(f'udise_eta_model_seconds{{{labels},quantile="{quantile}"}} {snapshot[key]}')
+        lines += ["# HELP udise_current_page Results page being processed",
+                  "# TYPE udise_current_page gauge",
+                  f"udise_current_page{{{labels}}} {snapshot['page'] or 0}"]
+        return "\n".join(lines) + "\n"
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    """Serves /status and /metrics"""
+
+    def log_message(self, format, *args):
+        logger.debug(f"   📡 {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        tracker = self.server.tracker
+        path = self.path.split('?')[0]
+        if path in ("/", "/status"):
+            body, content_type = json.dumps(tracker.snapshot(), indent=2), "application/json"
+        elif path == "/metrics":
+            body, content_type = tracker.prometheus(), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StatusServer:
+    """Background HTTP server exposing a ProgressTracker"""
+
+    def __init__(self, tracker, host=STATUS_SERVER_HOST, port=STATUS_SERVER_PORT):
+        self.httpd = ThreadingHTTPServer((host, port), StatusRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.tracker = tracker
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread.start()
+        logger.info(f"📡 Status endpoint: {self.url}status (Prometheus: {self.url}metrics)")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start_status_server(tracker):
+    """Start the status endpoint when STATUS_SERVER=1; never fails the run"""
+    if not STATUS_SERVER_ENABLED:
+        return None
+    try:
+        return StatusServer(tracker).start()
+    except OSError as e:
+        logger.warning(f"⚠️ Status endpoint not started on port {STATUS_SERVER_PORT}: {e}")
+        return None
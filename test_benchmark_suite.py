@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Benchmark Suite
+Verify the benchmark statistics, WebDriver call counting and run-to-run comparison
+"""
+
+import logging
+import os
+import tempfile
+
+from benchmark_suite import compare_results, latency_summary, load_previous_results, percentile, save_results
+from webdriver_profiler import attach_profiler
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class RecordingDriver:
+    """Minimal object with a WebDriver-style execute method"""
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, driver_command, params=None):
+        self.executed.append(driver_command)
+        return {'value': None}
+
+
+def test_percentile():
+    """p50/p95 with interpolation"""
+    print("🧪 TESTING PERCENTILES")
+    print("=" * 50)
+
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50.5
+    assert round(percentile(values, 95), 2) == 95.05
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0.0
+
+    print("   ✅ PASS")
+
+
+def test_call_counter():
+    """Benchmark profiler counts and passes commands through, detach restores the driver"""
+    print("\n🧪 TESTING WEBDRIVER CALL COUNTER")
+    print("=" * 50)
+
+    driver = RecordingDriver()
+    profiler = attach_profiler(driver, "test", enabled=True)
+    for command in ("findElements", "getElementText", "getElementText"):
+        driver.execute(command, {})
+
+    summary = latency_summary([1.0], [1.0], 3, 10.0, profiler)
+    assert summary['webdriver_calls'] == 3
+    assert summary['calls_by_command'] == {'getElementText': 2, 'findElements': 1}
+    assert driver.executed == ["findElements", "getElementText", "getElementText"]
+
+    profiler.detach()
+    driver.execute("get", {})
+    assert profiler.total_calls == 3
+
+    print("   ✅ PASS")
+
+
+def test_compare_results():
+    """Slower latency and lower throughput are flagged as regressions"""
+    print("\n🧪 TESTING RESULT COMPARISON")
+    print("=" * 50)
+
+    previous = {'timestamp': '20250101_000000', 'git_commit': 'aaaaaaa',
+                'phase1': {'page_latency_p50': 10.0, 'records_per_minute': 600.0, 'webdriver_calls_per_record': 12.0}}
+    current = {'timestamp': '20250102_000000', 'git_commit': 'bbbbbbb',
+               'phase1': {'page_latency_p50': 12.0, 'records_per_minute': 700.0, 'webdriver_calls_per_record': 12.5}}
+
+    comparisons = {metric: regressed for _, metric, _, _, _, regressed in compare_results(previous, current)}
+    print(f"   Comparisons: {comparisons}")
+    assert comparisons == {'page_latency_p50': True, 'webdriver_calls_per_record': False, 'records_per_minute': False}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_results(previous, temp_dir)
+        path = save_results(current, temp_dir)
+        assert os.path.basename(path) == "benchmark_20250102_000000_bbbbbbb.json"
+        assert load_previous_results(temp_dir)['git_commit'] == 'bbbbbbb'
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the benchmark suite helpers")
+    print()
+
+    test_percentile()
+    test_call_counter()
+    test_compare_results()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Benchmark runs can be compared between commits")
+
+
+if __name__ == "__main__":
+    main()
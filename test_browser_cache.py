@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Browser Cache
+Verify the seeded cache template, the per-worker profile copies and their cleanup
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import browser_cache
+from browser_cache import (CACHE_FOLDERS, apply_cache_profile, prune_worker_dirs, remove_profile_on_quit,
+                           save_template, seed_info, template_dir, worker_profile_dir, workers_dir)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class QuitDriver:
+    """Driver-style object that remembers whether it was quit"""
+
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class RecordingOptions:
+    """ChromeOptions-style object recording its arguments"""
+
+    def __init__(self):
+        self.arguments = []
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+
+def write_file(path, content="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as handle:
+        handle.write(content)
+
+
+def seeded_profile(root):
+    """A browser user-data-dir with cache entries, cookies and a profile lock"""
+    profile = os.path.join(root, "profile")
+    write_file(os.path.join(profile, "Default", "Cache", "Cache_Data", "index"), "index")
+    write_file(os.path.join(profile, "Default", "Cache", "Cache_Data", "data_1"), "angular bundle")
+    write_file(os.path.join(profile, "Default", "Code Cache", "js", "index"), "compiled")
+    write_file(os.path.join(profile, "Default", "Cookies"), "session")
+    write_file(os.path.join(profile, "SingletonLock"), "lock")
+    return profile
+
+
+def test_template_and_worker_copies():
+    """Only the cache folders reach the template and every worker gets its own copy"""
+    print("🧪 TESTING TEMPLATE AND WORKER PROFILES")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = os.path.join(temp_dir, "browser_cache")
+
+        # No template yet: no managed profile at all
+        assert worker_profile_dir(cache_dir) is None
+        assert not os.path.exists(workers_dir(cache_dir))
+
+        info = save_template(seeded_profile(temp_dir), cache_dir, url="http://portal")
+        assert seed_info(cache_dir)['url'] == "http://portal" and info['size_mb'] >= 0
+        template = template_dir(cache_dir)
+        assert not os.path.exists(os.path.join(template, "Default", "Cookies"))
+        assert not os.path.exists(os.path.join(template, "SingletonLock"))
+
+        first = worker_profile_dir(cache_dir)
+        second = worker_profile_dir(cache_dir)
+        assert first and second and first != second
+        for folder in CACHE_FOLDERS:
+            assert os.path.isdir(os.path.join(first, folder)) and os.path.isdir(os.path.join(second, folder))
+        with open(os.path.join(first, "Default", "Cache", "Cache_Data", "data_1")) as handle:
+            assert handle.read() == "angular bundle"
+
+        # Reseeding replaces the template in one step
+        save_template(seeded_profile(os.path.join(temp_dir, "again")), cache_dir, url="http://portal/2")
+        assert seed_info(cache_dir)['url'] == "http://portal/2"
+        assert sorted(os.listdir(cache_dir)) == ["template", "workers"]
+
+        # Quitting a driver removes its profile; the rest goes at exit
+        driver = remove_profile_on_quit(QuitDriver(), first)
+        driver.quit()
+        assert driver.quit_called and not os.path.exists(first) and os.path.exists(second)
+        assert first not in browser_cache._worker_dirs
+
+        browser_cache.remove_worker_dirs()
+        assert os.listdir(workers_dir(cache_dir)) == []
+
+    print("   ✅ PASS")
+
+
+def test_prune_dead_workers():
+    """Profiles of processes that are gone are removed, live ones stay"""
+    print("\n🧪 TESTING STALE PROFILE CLEANUP")
+    print("=" * 50)
+
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = workers_dir(temp_dir)
+        os.makedirs(os.path.join(root, f"{finished.pid}_abc"))
+        os.makedirs(os.path.join(root, f"{os.getppid()}_def"))
+        assert prune_worker_dirs(temp_dir) == 1
+        assert os.listdir(root) == [f"{os.getppid()}_def"]
+
+    print("   ✅ PASS")
+
+
+def test_cache_options():
+    """Workers point Chrome at their own user-data-dir with a bounded disk cache"""
+    print("\n🧪 TESTING CHROME OPTIONS")
+    print("=" * 50)
+
+    options = apply_cache_profile(RecordingOptions(), "browser_cache/workers/1_abc")
+    print(f"   {options.arguments}")
+    assert options.arguments[0] == f"--user-data-dir={os.path.abspath('browser_cache/workers/1_abc')}"
+    assert options.arguments[1].startswith("--disk-cache-size=")
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the browser cache")
+    print()
+
+    test_template_and_worker_copies()
+    test_prune_dead_workers()
+    test_cache_options()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Browsers start on a copy of the seeded cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Reparse
+Verify that cached detail pages are re-parsed across worker processes and joined to Phase 1 rows
+"""
+
+import csv
+import os
+import tempfile
+import logging
+
+from bulk_reparser import BulkReparser
+from detail_page_cache import DetailPageCache
+from test_detail_page_cache import SAMPLE_DETAIL_PAGE
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DETAIL_URL = "https://kys.udiseplus.gov.in/#/schooldetail/{}/14"
+
+
+def test_bulk_reparse():
+    """Reparse 40 cached pages with 2 workers and small shards"""
+    print("🧪 TESTING BULK REPARSE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "cache.sqlite3")
+        phase1_csv = os.path.join(temp_dir, "GOA_phase1_complete_20250820_161448.csv")
+        output_csv = os.path.join(temp_dir, "GOA_phase2_reparsed.csv")
+
+        cache = DetailPageCache(db_path)
+        try:
+            for school_id in range(1000, 1040):
+                # Vary the page so every school gets its own blob
+                page = SAMPLE_DETAIL_PAGE.replace("> 120 <", f"> {school_id} <")
+                cache.store(DETAIL_URL.format(school_id), page, "GOA")
+        finally:
+            cache.close()
+
+        # Phase 1 file covers 30 of the 40 cached schools
+        with open(phase1_csv, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['state', 'district', 'school_name', 'know_more_link', 'last_modified'])
+            for school_id in range(1000, 1030):
+                writer.writerow(['GOA', 'NORTH GOA', f"School {school_id}", DETAIL_URL.format(school_id), '01/08/2025'])
+
+        import bulk_reparser
+        original_shard_size = bulk_reparser.SHARD_SIZE
+        bulk_reparser.SHARD_SIZE = 7
+        try:
+            reparser = BulkReparser("GOA", phase1_csv, db_path=db_path, workers=2, output_csv=output_csv)
+            assert reparser.run() == output_csv
+        finally:
+            bulk_reparser.SHARD_SIZE = original_shard_size
+
+        with open(output_csv, newline='', encoding='utf-8') as handle:
+            reader = csv.DictReader(handle)
+            rows = list(reader)
+            header = reader.fieldnames
+
+        print(f"   Pages parsed: {reparser.pages_parsed}, rows written: {reparser.rows_written}")
+        assert reparser.pages_parsed == 40
+        assert len(rows) == 30
+        assert 'last_modified' not in header
+        for row in rows:
+            assert row['total_students'] == row['school_name'].split()[-1]
+            assert row['district'] == 'NORTH GOA'
+            assert row['extraction_status'] == 'SUCCESS'
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing multi-core bulk reparse")
+    print()
+
+    test_bulk_reparse()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Cached pages are re-extracted in parallel and joined to Phase 1 data")
+
+
+if __name__ == "__main__":
+    main()
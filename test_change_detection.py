@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test Change Detection
+Verify that only new or changed schools are queued for Phase 2 refresh
+"""
+
+import os
+import tempfile
+import logging
+
+from change_detection import ListingChangeDetector, listing_fingerprint
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def make_school(school_id, name, last_modified='01/08/2025', **extra):
+    """Build a Phase 1 listing row"""
+    row = {
+        'state': 'GOA',
+        'district': 'NORTH GOA',
+        'udise_code': 'N/A',
+        'school_name': name,
+        'know_more_link': f"https://kys.udiseplus.gov.in/#/schooldetail/{school_id}/14",
+        'last_modified': last_modified,
+        'extraction_date': '2025-08-20T15:55:48',
+    }
+    row.update(extra)
+    return row
+
+
+def test_fingerprint_normalization():
+    """Test that CSV strings and pandas values fingerprint identically"""
+    print("🧪 TESTING FINGERPRINT NORMALIZATION")
+    print("=" * 50)
+
+    csv_row = make_school(1, 'School A', pin_code='403001', email='N/A')
+    pandas_row = make_school(1, 'School A', pin_code=403001.0, email=float('nan'))
+    later_run = make_school(1, 'School A', pin_code='403001', email='N/A', extraction_date='2025-09-20T10:00:00')
+
+    assert listing_fingerprint(csv_row) == listing_fingerprint(pandas_row)
+    assert listing_fingerprint(csv_row) == listing_fingerprint(later_run), "extraction_date must not count as a change"
+    print("   ✅ PASS")
+
+
+def test_change_detection():
+    """Test new / changed / unchanged classification across two runs"""
+    print("\n🧪 TESTING CHANGE DETECTION ACROSS RUNS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        # First run: store is empty, everything is new
+        first_run = [make_school(1, 'School A'), make_school(2, 'School B'), make_school(3, 'School C'),
+                     make_school(5, 'School E')]
+        detector = ListingChangeDetector('GOA', store_dir=store_dir)
+        queued = [row for row in first_run if detector.needs_refresh(row)]
+        assert len(queued) == 4
+
+        detector.mark_extracted(first_run[0], 'SUCCESS')
+        detector.mark_extracted(first_run[1], 'SUCCESS')
+        detector.mark_extracted(first_run[2], 'FAILED')
+        detector.mark_extracted(first_run[3], 'PARTIAL')
+        detector.finalize()
+        assert os.path.exists(detector.store_file)
+
+        # Second run: A unchanged, B modified on the portal, C failed and E was partial last time, D is new
+        second_run = [
+            make_school(1, 'School A'),
+            make_school(2, 'School B', last_modified='15/09/2025'),
+            make_school(3, 'School C'),
+            make_school(4, 'School D'),
+            make_school(5, 'School E'),
+        ]
+        detector = ListingChangeDetector('GOA', store_dir=store_dir)
+        statuses = {row['school_name']: detector.classify(row) for row in second_run}
+
+        for name, status in statuses.items():
+            print(f"   {name}: {status}")
+
+        assert statuses == {
+            'School A': 'unchanged',
+            'School B': 'changed',
+            'School C': 'new',
+            'School D': 'new',
+            'School E': 'new',
+        }
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing incremental refresh change detection")
+    print()
+
+    test_fingerprint_normalization()
+    test_change_detection()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Only new or changed schools are queued for Phase 2")
+
+
+if __name__ == "__main__":
+    main()
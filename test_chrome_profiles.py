@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test Chrome Profiles
+Verify the fixed viewport and headless switches, and the per-worker memory measurement
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+import chrome_profiles
+from chrome_profiles import (HEADLESS_ARGUMENTS, apply_window_profile, browser_memory_mb, process_memory_kb,
+                             process_tree, window_size)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class RecordingOptions:
+    """ChromeOptions-style object recording its arguments"""
+
+    def __init__(self):
+        self.arguments = []
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+
+class ProcessDriver:
+    """Driver-style object whose browser is a given process"""
+
+    def __init__(self, pid):
+        self.browser_pid = pid
+
+
+def test_window_profile():
+    """Headed and headless drivers get the same viewport; headless adds worker switches"""
+    print("🧪 TESTING WINDOW PROFILE")
+    print("=" * 50)
+
+    original = chrome_profiles.CHROME_WINDOW_SIZE
+    try:
+        chrome_profiles.CHROME_WINDOW_SIZE = "1280x800"
+        assert window_size() == (1280, 800)
+
+        headed = apply_window_profile(RecordingOptions(), headless=False)
+        assert headed.arguments == ["--window-size=1280,800"]
+
+        headless = apply_window_profile(RecordingOptions(), headless=True)
+        print(f"   Headless arguments: {headless.arguments}")
+        assert headless.arguments == ["--window-size=1280,800"] + HEADLESS_ARGUMENTS
+        # Headless mode itself is left to uc.Chrome(headless=True)
+        assert not any(argument.startswith("--headless") for argument in headless.arguments)
+    finally:
+        chrome_profiles.CHROME_WINDOW_SIZE = original
+
+    print("   ✅ PASS")
+
+
+def test_process_tree():
+    """Descendants are collected through every level"""
+    print("\n🧪 TESTING PROCESS TREE")
+    print("=" * 50)
+
+    children = {10: [11, 12], 11: [13], 13: [14], 99: [100]}
+    assert sorted(process_tree(10, children)) == [10, 11, 12, 13, 14]
+    assert process_tree(42, children) == [42]
+
+    print("   ✅ PASS")
+
+
+def test_browser_memory():
+    """Memory of a real process tree is read from /proc"""
+    print("\n🧪 TESTING BROWSER MEMORY")
+    print("=" * 50)
+
+    if not os.path.isdir('/proc'):
+        print("   ⏭️ No /proc on this system")
+        return
+
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        assert process_memory_kb(os.getpid()) > 0
+        processes, memory_mb = browser_memory_mb(ProcessDriver(os.getpid()))
+        print(f"   Test process tree: {processes} processes, {memory_mb:.1f} MB")
+        assert processes >= 2 and memory_mb > 0
+    finally:
+        child.kill()
+        child.wait()
+
+    assert browser_memory_mb(ProcessDriver(None)) == (0, 0.0)
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing Chrome profiles")
+    print()
+
+    test_window_profile()
+    test_process_tree()
+    test_browser_memory()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Workers share one viewport and report their memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Completeness Verifier
+Verify short-district detection, missing page ranges and the repair schedule
+"""
+
+import csv
+import logging
+import os
+import tempfile
+
+from completeness_verifier import missing_page_ranges, repair_units, verify_phase1_file
+from processing_time_calculator import ProcessingTimeCalculator, RateModel
+from work_planner import schedule_from_units
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DISTRICT_COUNTS = [
+    ("GOA", "NORTH GOA", 812),
+    ("GOA", "SOUTH GOA", 150),
+    ("GOA", "CENTRAL GOA", 40),
+    ("KERALA", "IDUKKI", 900),
+]
+
+
+def write_phase1_file(path, rows, with_page_numbers=True):
+    headers = ['state', 'district', 'udise_code', 'school_name', 'know_more_link']
+    if with_page_numbers:
+        headers.append('page_number')
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=headers, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def district_rows(district, total, skip_pages=(), duplicate_page=None):
+    """Rows of a district as they come off 100-result pages"""
+    rows = []
+    for index in range(total):
+        page = index // 100 + 1
+        if page in skip_pages:
+            continue
+        row = {'state': 'GOA', 'district': district, 'udise_code': f"{district[:1]}{index:010d}",
+               'school_name': f"SCHOOL {index}", 'know_more_link': 'N/A', 'page_number': page}
+        rows.append(row)
+        if page == duplicate_page:
+            rows.append(dict(row))
+    return rows
+
+
+def test_missing_page_ranges():
+    """Consecutive short pages merge into ranges; the last range runs to the end"""
+    print("🧪 TESTING PAGE RANGES")
+    print("=" * 50)
+
+    pages = {1: 100, 2: 100, 3: 40, 4: 0, 5: 100, 7: 100}
+    ranges = missing_page_ranges(812, pages)
+    print(f"   Ranges: {ranges}")
+    assert ranges == [(3, 4), (6, 6), (8, None)]
+    assert missing_page_ranges(200, {1: 100, 2: 100}) == []
+
+    print("   ✅ PASS")
+
+
+def test_verify_file():
+    """Short districts of the file's state are reported with their gaps"""
+    print("\n🧪 TESTING FILE VERIFICATION")
+    print("=" * 50)
+
+    rows = (district_rows("NORTH GOA", 812, skip_pages=(3, 4), duplicate_page=5) +
+            district_rows("SOUTH GOA", 150))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file = os.path.join(temp_dir, "GOA_phase1_complete_20250820_155548.csv")
+        write_phase1_file(csv_file, rows)
+        results = verify_phase1_file(csv_file, DISTRICT_COUNTS)
+
+        legacy_file = os.path.join(temp_dir, "GOA_phase1_complete_20250101_000000.csv")
+        write_phase1_file(legacy_file, rows, with_page_numbers=False)
+        legacy_results = verify_phase1_file(legacy_file, DISTRICT_COUNTS)
+
+    by_district = {result['district']: result for result in results}
+    print(f"   Short districts: {sorted(by_district)}")
+    # KERALA is another state's district; SOUTH GOA is complete
+    assert sorted(by_district) == ["CENTRAL GOA", "NORTH GOA"]
+    assert by_district["NORTH GOA"]['scraped'] == 612
+    assert by_district["NORTH GOA"]['ranges'] == [(3, 4)]
+    assert by_district["CENTRAL GOA"]['ranges'] == [(1, None)]
+
+    assert {result['district']: result['ranges'] for result in legacy_results}["NORTH GOA"] == [(1, None)]
+
+    units = repair_units(results, ProcessingTimeCalculator(RateModel()))
+    assert [(unit['district'], unit['first_page'], unit['last_page'], unit['schools']) for unit in units] == [
+        ("NORTH GOA", 3, 4, 200), ("CENTRAL GOA", 1, None, 40)]
+    schedule = schedule_from_units(units, 2)
+    assert schedule['total_schools'] == 240 and schedule['total_units'] == 2
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the completeness verifier")
+    print()
+
+    test_missing_page_ranges()
+    test_verify_file()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Missing page ranges are found from the portal counts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test Detail Page Cache
+Verify caching of detail pages and browser-free reparse with the shared parser
+"""
+
+import csv
+import os
+import tempfile
+import logging
+
+from detail_page_cache import DetailPageCache, reparse_cached_pages
+from detail_page_parser import parse_detail_page
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Detail page fragment with the real Angular markup (attributes and whitespace between tags)
+SAMPLE_DETAIL_PAGE = '''
+<html><head><title>Know Your School</title></head><body>
+<div _ngcontent-ng-c1808753454="" class="innerPad">
+    <p _ngcontent-ng-c1808753454="" class="fw-600">Academic Year : 2024-25</p>
+    <div _ngcontent-ng-c1808753454="" class="schoolInfoCol">
+        <div _ngcontent-ng-c1808753454="" class="title">
+            <p _ngcontent-ng-c1808753454="" class="fw-600">Location</p>
+        </div>
+        <div _ngcontent-ng-c1808753454="" class="blueCol"><span>Rural</span></div>
+    </div>
+    <div _ngcontent-ng-c1808753454="" class="schoolInfoCol">
+        <div _ngcontent-ng-c1808753454="" class="title">
+            <p _ngcontent-ng-c1808753454="" class="fw-600">Affiliation Board Sec.</p>
+        </div>
+        <div _ngcontent-ng-c1808753454="" class="blueCol">
+            <span _ngcontent-ng-c1808753454="">1-CBSE</span>
+        </div>
+    </div>
+    <div _ngcontent-ng-c1808753454="" class="schoolInfoCol disable-card">
+        <div _ngcontent-ng-c1808753454="" class="title">
+            <p _ngcontent-ng-c1808753454="" class="fw-600">Class From</p>
+        </div>
+        <div _ngcontent-ng-c1808753454="" class="blueCol"><span>1</span></div>
+    </div>
+    <div _ngcontent-ng-c1808753454="" class="schoolInfoCol">
+        <div _ngcontent-ng-c1808753454="" class="title">
+            <p _ngcontent-ng-c1808753454="" class="fw-600">Class To</p>
+        </div>
+        <div _ngcontent-ng-c1808753454="" class="blueCol"><span>8</span></div>
+    </div>
+</div>
+<div class="bg-white my-1 rounded p-3">
+    <h2 class="innerTitle">Student</h2>
+    <ul class="greyInfoList">
+        <li><p class="fontTitle15 mb-0">Total Students</p>
+            <p class="H3Value mb-0"> 120 </p></li>
+        <li><p class="fontTitle15 mb-0">Boys</p><p class="H3Value mb-0"> 70 </p></li>
+        <li><p class="fontTitle15 mb-0">Girls</p><p class="H3Value mb-0"> 50 </p></li>
+    </ul>
+</div>
+<div class="bg-white my-1 rounded p-3 me-3 shadow">
+    <h2 class="innerTitle mt89898 mb-4">Teacher</h2>
+    <ul class="greyInfoList text-white">
+        <li><div class="brLeft"><p class="fontTitle15 mb-0">Total Teachers</p>
+            <p class="H3Value mb-0"> 9 </p></div></li>
+        <li><div class="brLeft"><p class="fontTitle15 mb-0">Male</p>
+            <p class="H3Value mb-0"> 3 </p></div></li>
+        <li><p class="fontTitle15 mb-0">Female</p>
+            <p class="H3Value mb-0"> 6 </p></li>
+    </ul>
+</div>
+</body></html>
+'''
+
+SAMPLE_URL = "https://kys.udiseplus.gov.in/#/schooldetail/2719946/14"
+
+
+def test_detail_page_parser():
+    """Test the browser-free parser against the real markup"""
+    print("🧪 TESTING DETAIL PAGE PARSER")
+    print("=" * 50)
+
+    data = parse_detail_page(SAMPLE_DETAIL_PAGE, SAMPLE_URL)
+    expected = {
+        'academic_year': '2024-25',
+        'location': 'Rural',
+        'affiliation_board_sec': '1-CBSE',
+        'class_range': '1 To 8',
+        'total_students': '120',
+        'total_boys': '70',
+        'total_girls': '50',
+        'total_teachers': '9',
+        'male_teachers': '3',
+        'female_teachers': '6',
+        'detail_school_name': 'School_ID_2719946',
+        'extraction_status': 'SUCCESS',
+    }
+
+    for field, value in expected.items():
+        status = "✅ PASS" if data[field] == value else "❌ FAIL"
+        print(f"   {field}: {data[field]} {status}")
+        assert data[field] == value
+
+
+def test_detail_page_cache():
+    """Test store/get, content deduplication and reparse"""
+    print("\n🧪 TESTING DETAIL PAGE CACHE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = DetailPageCache(os.path.join(temp_dir, "cache.sqlite3"))
+        try:
+            assert cache.store(SAMPLE_URL, SAMPLE_DETAIL_PAGE, "GOA")
+            # Same content under another year code is stored only once
+            cache.store(SAMPLE_URL.replace("/14", "/13"), SAMPLE_DETAIL_PAGE, "GOA")
+            assert cache.store("https://udiseplus.gov.in/#/en/home", "<html></html>") is None
+
+            assert cache.get_by_url(SAMPLE_URL) == SAMPLE_DETAIL_PAGE
+            stats = cache.stats()
+            print(f"   Pages: {stats['pages']}, blobs: {stats['blobs']}, "
+                  f"raw: {stats['raw_bytes']} bytes, stored: {stats['stored_bytes']} bytes")
+            assert stats['pages'] == 2 and stats['blobs'] == 1
+
+            output_csv = reparse_cached_pages(cache, "GOA", os.path.join(temp_dir, "reparsed.csv"))
+            with open(output_csv, newline='', encoding='utf-8') as handle:
+                rows = list(csv.DictReader(handle))
+            assert len(rows) == 2
+            assert {row['year_code'] for row in rows} == {'13', '14'}
+            assert all(row['total_teachers'] == '9' for row in rows)
+        finally:
+            cache.close()
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing detail page cache and reparse")
+    print()
+
+    test_detail_page_parser()
+    test_detail_page_cache()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Cached detail pages can be re-parsed without a browser")
+
+
+if __name__ == "__main__":
+    main()
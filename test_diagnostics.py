@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test Diagnostics
+Verify the action ring buffer, on-failure captures and the single-call page text check
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from diagnostics import LOADING_TEXTS, NO_RESULTS_TEXTS, Diagnostics, page_has_text
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class PageDriver:
+    """WebDriver-style object that counts every call made to it"""
+
+    def __init__(self, body_text="", fail_screenshot=False):
+        self.body_text = body_text
+        self.fail_screenshot = fail_screenshot
+        self.calls = []
+
+    @property
+    def current_url(self):
+        self.calls.append('current_url')
+        return "https://udiseplus.gov.in/#/en/home"
+
+    @property
+    def title(self):
+        self.calls.append('title')
+        return "UDISE+"
+
+    @property
+    def page_source(self):
+        self.calls.append('page_source')
+        return f"<html><body>{self.body_text}</body></html>"
+
+    def save_screenshot(self, filename):
+        self.calls.append('save_screenshot')
+        if self.fail_screenshot:
+            raise RuntimeError("screenshot unavailable")
+        with open(filename, 'wb') as handle:
+            handle.write(b"\x89PNG")
+        return True
+
+    def execute_script(self, script, *args):
+        """Evaluate page_has_text's script: first argument found in the body, any case"""
+        self.calls.append('execute_script')
+        body = self.body_text.lower()
+        return next((text for text in args if text.lower() in body), None)
+
+
+def test_ring_buffer():
+    """note() keeps the most recent actions and never touches the driver"""
+    print("🧪 TESTING ACTION RING BUFFER")
+    print("=" * 50)
+
+    diagnostics = Diagnostics("test", ring_size=3)
+    for page in range(1, 6):
+        diagnostics.note('next_page', page=page)
+    pages = [action['page'] for action in diagnostics.actions]
+    print(f"   Kept pages: {pages}")
+    assert pages == [3, 4, 5]
+    assert all(action['action'] == 'next_page' and 'time' in action for action in diagnostics.actions)
+
+    print("   ✅ PASS")
+
+
+def test_capture_on_failure():
+    """capture() writes page source, screenshot and state with the recent actions"""
+    print("\n🧪 TESTING FAILURE CAPTURE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        diagnostics = Diagnostics("test", diagnostics_dir=temp_dir)
+        driver = PageDriver(body_text="Showing 1 to 100 of 250")
+        diagnostics.note('select_state', state="KERALA")
+        diagnostics.note('search')
+        assert driver.calls == []
+
+        capture_dir = diagnostics.capture(driver, "Next page did not change!", label="Showing 1 to 100 of 250")
+        print(f"   Captured to {os.path.basename(capture_dir)}")
+        assert capture_dir.endswith("_test_next_page_did_not_change")
+        assert sorted(os.listdir(capture_dir)) == ["page.html", "screenshot.png", "state.json"]
+
+        with open(os.path.join(capture_dir, "state.json"), 'r', encoding='utf-8') as handle:
+            state = json.load(handle)
+        assert state['url'].startswith("https://udiseplus.gov.in")
+        assert state['details'] == {'label': "Showing 1 to 100 of 250"}
+        assert [action['action'] for action in state['recent_actions']] == ['select_state', 'search', 'failure']
+
+        # A failing screenshot does not lose the rest of the capture
+        capture_dir = Diagnostics("test", diagnostics_dir=temp_dir).capture(
+            PageDriver(fail_screenshot=True), "no school cards")
+        with open(os.path.join(capture_dir, "state.json"), 'r', encoding='utf-8') as handle:
+            assert 'screenshot unavailable' in json.load(handle)['screenshot_error']
+        assert os.path.exists(os.path.join(capture_dir, "page.html"))
+
+    print("   ✅ PASS")
+
+
+def test_capture_limits():
+    """Captures stop at max_captures and are skipped when disabled"""
+    print("\n🧪 TESTING CAPTURE LIMITS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        diagnostics = Diagnostics("test", diagnostics_dir=temp_dir, max_captures=2)
+        captured = [diagnostics.capture(PageDriver(), f"failure {number}") for number in range(4)]
+        assert sum(1 for capture_dir in captured if capture_dir) == 2
+        assert len(os.listdir(temp_dir)) == 2
+
+        driver = PageDriver()
+        disabled = Diagnostics("test", diagnostics_dir=temp_dir, enabled=False)
+        assert disabled.capture(driver, "failure") is None
+        assert driver.calls == []
+        assert disabled.actions[-1]['reason'] == "failure"
+
+    print("   ✅ PASS")
+
+
+def test_page_has_text():
+    """The empty-result check is one script call instead of the page source"""
+    print("\n🧪 TESTING PAGE TEXT CHECK")
+    print("=" * 50)
+
+    driver = PageDriver(body_text="Search results: no records found")
+    assert page_has_text(driver, *NO_RESULTS_TEXTS) == "No records found"
+    assert driver.calls == ['execute_script']
+
+    assert page_has_text(PageDriver("Please wait..."), *NO_RESULTS_TEXTS, *LOADING_TEXTS) == "please wait"
+    assert page_has_text(PageDriver("Showing 1 to 10 of 10"), *NO_RESULTS_TEXTS) is None
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing on-failure diagnostics")
+    print()
+
+    test_ring_buffer()
+    test_capture_on_failure()
+    test_capture_limits()
+    test_page_has_text()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Page dumps only happen when a step fails")
+
+
+if __name__ == "__main__":
+    main()
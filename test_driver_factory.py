@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test Driver Factory
+Verify the idle browser pool, cold vs warm starts and the cached driver path
+"""
+
+import logging
+import os
+import threading
+import time
+
+from driver_factory import CHROME_ARGUMENTS, DriverFactory, cached_driver_path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class SlowBrowser:
+    """Driver-style object that remembers whether it was quit"""
+
+    def __init__(self, number):
+        self.number = number
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class SlowLauncher:
+    """Launcher that takes a while per browser, like a Chrome start"""
+
+    def __init__(self, seconds=0.2):
+        self.seconds = seconds
+        self.launched = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.seconds)
+        with self.lock:
+            browser = SlowBrowser(len(self.launched) + 1)
+            self.launched.append(browser)
+        return browser
+
+
+def wait_for_pool(factory, timeout=5):
+    deadline = time.time() + timeout
+    while factory.launching and time.time() < deadline:
+        time.sleep(0.02)
+
+
+def test_warm_start_from_pool():
+    """keep_warm pre-launches the next browser; taking it skips the start time"""
+    print("🧪 TESTING WARM STARTS")
+    print("=" * 50)
+
+    launcher = SlowLauncher(seconds=0.2)
+    factory = DriverFactory(pool_size=1, launcher=launcher)
+
+    first = factory.acquire("phase1", keep_warm=True)
+    assert first.number == 1
+    wait_for_pool(factory)
+    assert len(factory.idle) == 1
+
+    started = time.perf_counter()
+    second = factory.acquire("phase2", keep_warm=True)
+    warm_seconds = time.perf_counter() - started
+    print(f"   Cold {factory.startups['cold'][0]:.2f}s, warm {warm_seconds:.3f}s")
+    assert second.number == 2 and warm_seconds < 0.1
+    assert len(factory.startups['cold']) == 1 and len(factory.startups['warm']) == 1
+
+    # The pool was refilled and is quit at shutdown
+    wait_for_pool(factory)
+    spare = factory.idle[0]
+    factory.shutdown()
+    assert spare.quit_called and factory.idle == []
+    assert not first.quit_called and not second.quit_called
+
+    print("   ✅ PASS")
+
+
+def test_no_pool_without_keep_warm():
+    """Callers that need one driver do not leave a spare browser running"""
+    print("\n🧪 TESTING ON-DEMAND STARTS")
+    print("=" * 50)
+
+    launcher = SlowLauncher(seconds=0.01)
+    factory = DriverFactory(pool_size=1, launcher=launcher)
+    factory.acquire("phase2")
+    time.sleep(0.05)
+    assert len(launcher.launched) == 1 and factory.idle == []
+
+    disabled = DriverFactory(pool_size=0, launcher=launcher)
+    disabled.acquire("sequential", keep_warm=True)
+    time.sleep(0.05)
+    assert disabled.idle == [] and disabled.launching == 0
+
+    print("   ✅ PASS")
+
+
+def test_concurrent_acquire():
+    """Worker threads each get their own browser; starts are serialized"""
+    print("\n🧪 TESTING CONCURRENT WORKERS")
+    print("=" * 50)
+
+    launcher = SlowLauncher(seconds=0.05)
+    factory = DriverFactory(pool_size=1, launcher=launcher)
+    drivers = []
+    lock = threading.Lock()
+
+    def worker():
+        driver = factory.acquire("counting", keep_warm=True)
+        with lock:
+            drivers.append(driver)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wait_for_pool(factory)
+    factory.shutdown()
+
+    numbers = [driver.number for driver in drivers]
+    print(f"   Browsers handed out: {sorted(numbers)}")
+    assert len(set(numbers)) == 4
+    assert all(not driver.quit_called for driver in drivers)
+
+    print("   ✅ PASS")
+
+
+def test_configuration():
+    """Driver cache path per Chrome version; one option set for every phase"""
+    print("\n🧪 TESTING CONFIGURATION")
+    print("=" * 50)
+
+    path = cached_driver_path("cache", 138)
+    assert os.path.dirname(path) == "cache" and os.path.basename(path).startswith("chromedriver_138")
+    assert "--disable-blink-features=AutomationControlled" in CHROME_ARGUMENTS
+    assert not any(argument.startswith(("--headless", "--disable-images")) for argument in CHROME_ARGUMENTS)
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the driver factory")
+    print()
+
+    test_warm_start_from_pool()
+    test_no_pool_without_keep_warm()
+    test_concurrent_acquire()
+    test_configuration()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Driver restarts take a pre-launched browser")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test Local Portal
+Verify that the local portal serves the real portal markup, paginates and injects errors
+"""
+
+import json
+import logging
+import re
+import urllib.error
+import urllib.request
+
+from detail_page_parser import parse_detail_page
+from local_portal_server import LocalPortalServer
+from portal_fixtures import build_synthetic_fixtures
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def fetch(url):
+    """Return (status, body) of a GET request"""
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+
+def start_portal(error_rate=0.0):
+    fixtures = build_synthetic_fixtures(states=2, districts_per_state=2, schools_per_district=25)
+    return LocalPortalServer(fixtures, port=0, latency_ms=0, jitter_ms=0, error_rate=error_rate, seed=1).start()
+
+
+def test_portal_pages():
+    """SPA shell, dropdown options, paginated results and detail page"""
+    print("🧪 TESTING LOCAL PORTAL PAGES")
+    print("=" * 50)
+
+    portal = start_portal()
+    try:
+        status, shell = fetch(portal.base_url)
+        assert status == 200
+        for marker in ("Visit Portal", "advanceSearch", "purpleBtn", "form-select select"):
+            assert marker in shell, marker
+
+        status, states = fetch(portal.base_url + "api/states")
+        values = [json.loads(value.replace('&quot;', '"')) for value in re.findall(r'value="([^"]+)"', states)]
+        assert status == 200 and len(values) == 2
+        state_id = values[0]['stateId']
+        print(f"   States: {[value['stateName'] for value in values]}")
+
+        # 2 districts x 25 schools = 50 schools for the whole state
+        status, page1 = fetch(portal.base_url + f"api/search?stateId={state_id}&page=1&size=10")
+        assert status == 200
+        assert page1.count('class="accordion-body"') == 10
+        assert "Showing 1 to 10 of 50" in page1
+        assert '<li class="page-item"><a class="page-link nextBtn"' in page1
+
+        _, page5 = fetch(portal.base_url + f"api/search?stateId={state_id}&page=5&size=10")
+        assert "Showing 41 to 50 of 50" in page5
+        assert '<li class="page-item disabled"><a class="page-link nextBtn"' in page5
+
+        link = re.search(r'href="(#/schooldetail/\d+/\d+)"', page1).group(1)
+        school_id, year_code = link.split('/')[2:4]
+        _, detail = fetch(portal.base_url + f"api/detail/{school_id}/{year_code}")
+        data = parse_detail_page(detail, portal.base_url + link)
+        print(f"   Detail {school_id}: {data['extraction_status']}, {data['total_students']} students")
+        assert data['extraction_status'] == 'SUCCESS'
+
+        assert portal.stats()['requests']['/api/search'] == 2
+    finally:
+        portal.stop()
+
+    print("   ✅ PASS")
+
+
+def test_error_injection():
+    """Every API call fails with error_rate=1.0, the shell still loads"""
+    print("\n🧪 TESTING ERROR INJECTION")
+    print("=" * 50)
+
+    portal = start_portal(error_rate=1.0)
+    try:
+        assert fetch(portal.base_url)[0] == 200
+        assert fetch(portal.base_url + "api/states")[0] == 500
+        assert portal.stats()['injected_errors'] == 1
+    finally:
+        portal.stop()
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the local UDISE portal")
+    print()
+
+    test_portal_pages()
+    test_error_injection()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Scrapers and benchmarks can run offline against the local portal")
+
+
+if __name__ == "__main__":
+    main()
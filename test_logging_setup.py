@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test Logging Setup
+Verify the background queue writer, JSON records, per-school sampling and deferred formatting
+"""
+
+import io
+import json
+import logging
+import threading
+
+import logging_setup
+from logging_setup import (DeferredQueueHandler, JsonFormatter, SchoolSampleFilter, configure_logging,
+                           school_log_sampled, school_scope, stop_logging)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class CountingValue:
+    """Log argument that counts how often it is formatted"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+def make_record(message, *args, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, message, args, None)
+
+
+def test_school_sampling():
+    """Only every Nth school keeps INFO detail; warnings always pass"""
+    print("🧪 TESTING PER-SCHOOL SAMPLING")
+    print("=" * 50)
+
+    sample_filter = SchoolSampleFilter()
+    kept = []
+    for index in range(1, 11):
+        with school_scope(index, f"UDISE{index}", sample_every=5) as sampled:
+            assert sampled == school_log_sampled()
+            if sample_filter.filter(make_record("detail")):
+                kept.append(index)
+            warning = make_record("failed", level=logging.WARNING)
+            assert sample_filter.filter(warning)
+            assert warning.school == f"UDISE{index}"
+    print(f"   Schools with INFO detail: {kept}")
+    assert kept == [1, 6]
+
+    # Outside a school everything is logged
+    assert school_log_sampled()
+    assert sample_filter.filter(make_record("state summary"))
+
+    # Scopes are per thread: a muted school in one worker does not mute another
+    results = {}
+
+    def worker(index):
+        with school_scope(index, sample_every=2):
+            results[index] = school_log_sampled()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {1: True, 2: False}
+
+    print("   ✅ PASS")
+
+
+def test_json_records():
+    """JSON records carry level, logger, thread, school and the formatted message"""
+    print("\n🧪 TESTING JSON RECORDS")
+    print("=" * 50)
+
+    record = make_record("   Found %s students", 120)
+    with school_scope(1, "32010100101", sample_every=1):
+        SchoolSampleFilter().filter(record)
+    entry = json.loads(JsonFormatter().format(record))
+    print(f"   {entry}")
+    assert entry['message'] == "Found 120 students"
+    assert entry['school'] == "32010100101"
+    assert entry['level'] == "INFO" and entry['logger'] == "test"
+
+    print("   ✅ PASS")
+
+
+def test_queue_writer():
+    """Records are written by the listener thread and formatted only there"""
+    print("\n🧪 TESTING BACKGROUND WRITER")
+    print("=" * 50)
+
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    try:
+        listener = configure_logging(log_format="json", log_file="", level="INFO", stream=stream)
+        assert configure_logging() is listener
+        assert any(isinstance(handler, DeferredQueueHandler) for handler in root.handlers)
+
+        value = CountingValue()
+        test_logger = logging.getLogger("logging_setup_test")
+        with school_scope(2, sample_every=5):
+            test_logger.info("muted school %s", value)
+            test_logger.warning("muted school warning %s", value)
+        test_logger.info("sampled %s", value)
+        stop_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        print(f"   Written: {[line['message'] for line in lines]}")
+        assert [line['message'] for line in lines] == ["muted school warning value", "sampled value"]
+        # The muted record was never formatted
+        assert value.formatted == 2
+        assert lines[0]['school'] == 2
+        assert logging_setup._listener is None
+    finally:
+        stop_logging()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the logging setup")
+    print()
+
+    test_school_sampling()
+    test_json_records()
+    test_queue_writer()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Logging is off the scraping threads")
+
+
+if __name__ == "__main__":
+    main()
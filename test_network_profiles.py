@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test Network Profiles
+Verify the CDP blocking per phase, the per-page traffic statistics and their persistence
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from network_profiles import (BLOCKED_URL_PATTERNS, NETWORK_PROFILES, NetworkProfile, blocked_patterns,
+                              profile_name)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class CdpDriver:
+    """WebDriver-style object recording CDP commands and serving page timings"""
+
+    def __init__(self, pages=(), cdp_available=True):
+        self.pages = list(pages)
+        self.cdp_available = cdp_available
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        if not self.cdp_available:
+            raise RuntimeError("CDP not supported")
+        self.cdp_commands.append((command, params))
+        return {}
+
+    def execute_script(self, script, *args):
+        return self.pages.pop(0) if self.pages else {'bytes': 0, 'requests': 0, 'ready_ms': None}
+
+
+def test_profiles_keep_scripts():
+    """Phase profiles block images, fonts, media and trackers, never scripts or XHR"""
+    print("🧪 TESTING PHASE PROFILES")
+    print("=" * 50)
+
+    for phase in ('phase1', 'phase2', 'counting'):
+        patterns = blocked_patterns(phase)
+        assert "*.png" in patterns and "*.woff2" in patterns and "*google-analytics.com*" in patterns
+        assert not any(pattern.endswith(('.js', '.json')) or 'udiseplus' in pattern for pattern in patterns)
+        assert "*.css" not in patterns
+    assert blocked_patterns('off') == []
+    assert "*.css" in blocked_patterns('lean')
+
+    assert profile_name('phase1', 'auto') == 'phase1'
+    assert profile_name('sequential', 'auto') == 'phase2'
+    assert profile_name('phase1', 'off') == 'off'
+    try:
+        profile_name('phase1', 'unknown')
+        assert False, "unknown profile accepted"
+    except ValueError:
+        pass
+
+    print(f"   {len(BLOCKED_URL_PATTERNS)} categories, {len(NETWORK_PROFILES)} profiles")
+    print("   ✅ PASS")
+
+
+def test_apply_through_cdp():
+    """The profile is sent as Network.setBlockedURLs; missing CDP only logs a warning"""
+    print("\n🧪 TESTING CDP BLOCKING")
+    print("=" * 50)
+
+    driver = CdpDriver()
+    network = NetworkProfile(driver, "phase2", profile="auto", measure=False)
+    assert network.apply()
+    assert driver.cdp_commands[0] == ('Network.enable', {})
+    assert driver.cdp_commands[1] == ('Network.setBlockedURLs', {'urls': blocked_patterns('phase2')})
+
+    fallback = NetworkProfile(CdpDriver(cdp_available=False), "phase2", profile="auto", measure=False)
+    assert not fallback.apply()
+    assert fallback.patterns == []
+
+    print("   ✅ PASS")
+
+
+def test_page_statistics():
+    """Bytes and ready time accumulate per page and persist per label and profile"""
+    print("\n🧪 TESTING TRAFFIC STATISTICS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stats_file = os.path.join(temp_dir, "network_stats.json")
+        pages = [{'bytes': 300 * 1024, 'requests': 12, 'ready_ms': 900},
+                 {'bytes': 100 * 1024, 'requests': 4, 'ready_ms': 700},
+                 {'bytes': 2048, 'requests': 1, 'ready_ms': None}]   # XHR on a loaded page
+        network = NetworkProfile(CdpDriver(pages), "phase2", profile="off", measure=True, stats_file=stats_file)
+        for _ in range(3):
+            network.sample()
+        assert network.stats['pages'] == 2 and network.stats['samples'] == 3
+        assert network.stats['bytes'] == 402 * 1024 and network.stats['ready_ms'] == 1600
+
+        network.report("TEST")
+        assert network.stats['samples'] == 0
+        blocked = NetworkProfile(CdpDriver([{'bytes': 40 * 1024, 'requests': 3, 'ready_ms': 400}]), "phase2",
+                                 profile="auto", measure=True, stats_file=stats_file)
+        blocked.sample()
+        blocked.report("TEST")
+
+        with open(stats_file, 'r', encoding='utf-8') as handle:
+            data = json.load(handle)
+        print(f"   {data}")
+        assert set(data['phase2']) == {'off', 'phase2'}
+        assert data['phase2']['off']['pages'] == 2
+        assert data['phase2']['phase2']['bytes'] == 40 * 1024
+
+    # Browsers on the seeded cache: own stats key, cache hits and first page kept apart
+    driver = CdpDriver([{'bytes': 20 * 1024, 'requests': 10, 'cached': 8, 'ready_ms': 300},
+                        {'bytes': 10 * 1024, 'requests': 5, 'cached': 5, 'ready_ms': 200}])
+    driver.browser_cache = True
+    cached = NetworkProfile(driver, "phase2", profile="auto", measure=True)
+    cached.sample()
+    cached.sample()
+    assert cached.key == "phase2+cache"
+    assert cached.stats['cached'] == 13 and cached.stats['first_pages'] == 1
+    assert cached.stats['first_bytes'] == 20 * 1024 and cached.stats['first_ready_ms'] == 300
+
+    # Measurement off: no script calls
+    driver = CdpDriver([{'bytes': 1, 'requests': 1, 'ready_ms': 1}])
+    assert NetworkProfile(driver, "phase1", profile="auto", measure=False).sample() is None
+    assert len(driver.pages) == 1
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing network profiles")
+    print()
+
+    test_profiles_keep_scripts()
+    test_apply_through_cdp()
+    test_page_statistics()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Images, fonts, media and trackers are blocked per phase")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test Portal Catalog
+Verify cached states and districts, their expiry and the shared catalog file
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from portal_catalog import PortalCatalog
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+STATES = [
+    {'stateId': 130, 'stateName': 'Goa', 'stateCode': '30'},
+    {'stateId': 135, 'stateName': 'Sikkim', 'stateCode': '11'},
+]
+GOA_DISTRICTS = [
+    {'districtId': 1301, 'districtName': 'North Goa', 'stateId': 130, 'udiseDistrictCode': '3001'},
+    {'districtId': 1302, 'districtName': 'South Goa', 'stateId': 130, 'udiseDistrictCode': '3002'},
+]
+
+
+def test_states_and_districts():
+    """Entries are served as read, for the same option JSON the dropdowns hold"""
+    print("🧪 TESTING CATALOG ENTRIES")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog_file = os.path.join(temp_dir, "portal_catalog.json")
+        catalog = PortalCatalog(catalog_file)
+        assert catalog.states() is None and catalog.districts('Goa') is None
+
+        catalog.put_states(STATES)
+        catalog.put_districts('Goa', GOA_DISTRICTS)
+
+        reloaded = PortalCatalog(catalog_file)
+        assert reloaded.states() == STATES
+        assert reloaded.state('Sikkim')['stateId'] == 135 and reloaded.state('Kerala') is None
+        assert reloaded.districts('Goa') == GOA_DISTRICTS
+        assert reloaded.districts('Sikkim') is None
+        # select_state matches the option value by its compact JSON
+        assert json.dumps(reloaded.states()[0], separators=(',', ':')) == json.dumps(STATES[0], separators=(',', ':'))
+
+    print("   ✅ PASS")
+
+
+def test_expiry():
+    """Scrapers re-read expired entries; menus still take them"""
+    print("\n🧪 TESTING EXPIRY")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog_file = os.path.join(temp_dir, "portal_catalog.json")
+        catalog = PortalCatalog(catalog_file, ttl_hours=24)
+        catalog.put_states(STATES)
+        catalog.put_districts('Goa', GOA_DISTRICTS)
+
+        two_days_ago = (datetime.now() - timedelta(days=2)).isoformat(timespec='seconds')
+        catalog.data['districts']['Goa']['refreshed_at'] = two_days_ago
+        assert catalog.states() == STATES
+        assert catalog.districts('Goa') is None
+        assert catalog.districts('Goa', allow_stale=True) == GOA_DISTRICTS
+
+        # TTL 0 (refresh command): everything is read again
+        always_stale = PortalCatalog(catalog_file, ttl_hours=0)
+        assert always_stale.states() is None and always_stale.states(allow_stale=True) == STATES
+
+    print("   ✅ PASS")
+
+
+def test_shared_file():
+    """Two processes' catalogs keep each other's entries when they save"""
+    print("\n🧪 TESTING SHARED CATALOG FILE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog_file = os.path.join(temp_dir, "portal_catalog.json")
+        first = PortalCatalog(catalog_file)
+        second = PortalCatalog(catalog_file)
+        first.put_states(STATES)
+        second.put_districts('Goa', GOA_DISTRICTS)
+        first.put_districts('Sikkim', [{'districtId': 1101, 'districtName': 'Gangtok'}])
+
+        merged = PortalCatalog(catalog_file)
+        print(f"   States: {len(merged.states())}, districts of {sorted(merged.data['districts'])}")
+        assert merged.states() == STATES
+        assert merged.districts('Goa') == GOA_DISTRICTS
+        assert merged.districts('Sikkim')[0]['districtName'] == 'Gangtok'
+        assert os.listdir(temp_dir) == ["portal_catalog.json"]
+
+        with open(catalog_file, 'w') as handle:
+            handle.write("{broken")
+        assert PortalCatalog(catalog_file).states() is None
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the portal catalog")
+    print()
+
+    test_states_and_districts()
+    test_expiry()
+    test_shared_file()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ States and districts are listed without a browser")
+
+
+if __name__ == "__main__":
+    main()
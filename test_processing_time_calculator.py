@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Processing Time Calculator
+Verify rate fitting from output CSVs and metrics logs, P50/P90 estimates and the fallback rates
+"""
+
+import csv
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from processing_time_calculator import ProcessingTimeCalculator, RateModel, chunk_rates
+from status_server import ProgressTracker
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def write_phase2_csv(path, state_name, seconds_per_school, schools, pause_after=None):
+    """Phase 2 output with an extraction_timestamp every seconds_per_school"""
+    start = datetime(2025, 8, 20, 10, 0, 0)
+    offset = 0.0
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['state', 'udise_code', 'extraction_date', 'extraction_timestamp', 'extraction_status'])
+        for index in range(schools):
+            if index == pause_after:
+                offset += 3600  # overnight restart
+            timestamp = start + timedelta(seconds=offset)
+            writer.writerow([state_name, f"{index:011d}", start.isoformat(), timestamp.isoformat(), 'SUCCESS'])
+            offset += seconds_per_school
+
+
+def test_chunk_rates():
+    """Chunks are cut at long pauses and give seconds per school"""
+    print("🧪 TESTING CHUNK RATES")
+    print("=" * 50)
+
+    timestamps = [i * 2.0 for i in range(11)] + [10000 + i * 4.0 for i in range(6)]
+    rates = chunk_rates(timestamps, chunk_size=100, max_gap=300)
+    print(f"   Rates: {rates}")
+    assert rates == [2.0, 4.0]
+
+    print("   ✅ PASS")
+
+
+def test_fit_and_estimate():
+    """Measured rates drive P50/P90 estimates and scale with workers"""
+    print("\n🧪 TESTING FITTED ESTIMATES")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file = os.path.join(temp_dir, "GOA_phase2_complete_20250820_100000.csv")
+        write_phase2_csv(csv_file, "GOA", 10.0, 1001, pause_after=500)
+
+        metrics_file = os.path.join(temp_dir, "GOA_phase1_metrics_20250820_090000.jsonl")
+        with open(metrics_file, 'w', encoding='utf-8') as handle:
+            for page_seconds in (20.0, 30.0, 40.0, 50.0, 60.0):
+                handle.write(json.dumps({'kind': 'page', 'schools': 100, 'total_seconds': page_seconds}) + "\n")
+
+        model = RateModel.from_measurements(csv_files=[csv_file], metrics_files=[metrics_file])
+
+    assert model.sample_count('phase2', 'GOA') == 10
+    assert model.sample_count('phase1') == 5
+    assert abs(model.rate('phase2', 50, 'GOA') - 10.0) < 1e-6
+    assert abs(model.rate('phase1', 50) - 0.4) < 1e-6
+
+    calculator = ProcessingTimeCalculator(model)
+    single = calculator.get_percentile_estimate(1000, "phase2", workers=1, state_name="GOA")
+    four = calculator.get_percentile_estimate(1000, "phase2", workers=4, state_name="GOA")
+    print(f"   1 worker P50: {single['p50_formatted']}, 4 workers P50: {four['p50_formatted']}")
+    assert single['sources'] == {'phase2': 'measured'}
+    assert abs(single['p50_seconds'] - 10000) < 1e-3
+    assert abs(four['p50_seconds'] - 2500) < 1e-3
+
+    combined = calculator.get_percentile_estimate(1000, "combined", state_name="KERALA")
+    assert combined['p90_seconds'] >= combined['p50_seconds']
+    assert abs(calculator.phase2_rate - 10.0) < 1e-6
+
+    print("   ✅ PASS")
+
+
+def test_lazy_fit():
+    """A lazy calculator reads the files at the first estimate, once"""
+    print("\n🧪 TESTING LAZY FIT")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_file = os.path.join(temp_dir, "GOA_phase2_complete_20250820_100000.csv")
+        calculator = ProcessingTimeCalculator.from_measurements(csv_files=[csv_file], metrics_files=[], lazy=True)
+        assert calculator.rate_model is None   # nothing read at construction
+
+        # The file appears after the processor was built
+        write_phase2_csv(csv_file, "GOA", 10.0, 501)
+        estimate = calculator.get_percentile_estimate(100, "phase2", state_name="GOA")
+        assert estimate['sources'] == {'phase2': 'measured'} and calculator.rate_loader is None
+        os.remove(csv_file)
+        assert calculator.get_percentile_estimate(100, "phase2", state_name="GOA") == estimate
+
+        # Unreadable files are skipped with a warning
+        broken = ProcessingTimeCalculator.from_measurements(csv_files=[csv_file], metrics_files=[], lazy=True)
+        assert broken.calculate_phase2_time(10, include_buffer=False) == 159.0
+
+    print("   ✅ PASS")
+
+
+def test_fallback_and_live_eta():
+    """Without measurements the original rates are used; the tracker reports model ETA"""
+    print("\n🧪 TESTING FALLBACK AND LIVE ETA")
+    print("=" * 50)
+
+    calculator = ProcessingTimeCalculator(RateModel())
+    estimate = calculator.get_percentile_estimate(100, "phase2")
+    assert estimate['sources'] == {'phase2': 'default'}
+    assert abs(estimate['p50_seconds'] - 1590) < 1e-6
+    assert abs(estimate['p90_seconds'] - 1590 * 1.40) < 1e-6
+
+    tracker = ProgressTracker("test", calculator)
+    tracker.update(phase='phase2', state='GOA')
+    tracker.set_queue_depth(100)
+    snapshot = tracker.snapshot()
+    assert snapshot['eta_p50_seconds'] == 1590
+    assert 'udise_eta_model_seconds{component="test",state="GOA",quantile="0.9"} 2226' in tracker.prometheus()
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the processing time calculator")
+    print()
+
+    test_chunk_rates()
+    test_fit_and_estimate()
+    test_lazy_fit()
+    test_fallback_and_live_eta()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Estimates are fitted from measured runs")
+
+
+if __name__ == "__main__":
+    main()
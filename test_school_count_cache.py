@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test School Count Cache
+Verify per-year district counts, resume after reload and the nationwide table
+"""
+
+import csv
+import logging
+import os
+import tempfile
+import threading
+
+from school_count_cache import SchoolCountCache
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def test_cache_per_year():
+    """Counts survive a reload and are kept apart per academic year"""
+    print("🧪 TESTING COUNT CACHE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, "counts.json")
+
+        cache = SchoolCountCache(cache_file, "2025-26")
+        cache.put("GOA", "NORTH GOA", 812)
+        cache.put("GOA", "SOUTH GOA", 0)
+
+        reloaded = SchoolCountCache(cache_file, "2025-26")
+        assert reloaded.get("GOA", "NORTH GOA") == 812
+        assert reloaded.get("GOA", "SOUTH GOA") == 0
+        assert reloaded.get("GOA", "UNKNOWN") is None
+        assert reloaded.state_counts("GOA") == {"NORTH GOA": 812, "SOUTH GOA": 0}
+
+        other_year = SchoolCountCache(cache_file, "2024-25")
+        assert other_year.get("GOA", "NORTH GOA") is None
+        other_year.put("GOA", "NORTH GOA", 790)
+        assert SchoolCountCache(cache_file, "2025-26").get("GOA", "NORTH GOA") == 812
+
+        reloaded.clear(["GOA"])
+        assert SchoolCountCache(cache_file, "2025-26").state_counts("GOA") == {}
+        assert SchoolCountCache(cache_file, "2024-25").get("GOA", "NORTH GOA") == 790
+
+    print("   ✅ PASS")
+
+
+def test_concurrent_workers_and_nationwide_table():
+    """Workers share one cache; the nationwide table holds every district"""
+    print("\n🧪 TESTING WORKERS AND NATIONWIDE TABLE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = SchoolCountCache(os.path.join(temp_dir, "counts.json"), "2025-26")
+
+        def worker(state_name):
+            for index in range(20):
+                cache.put(state_name, f"DISTRICT {index:02d}", index * 10)
+
+        threads = [threading.Thread(target=worker, args=(state_name,)) for state_name in ("GOA", "KERALA", "DELHI")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reloaded = SchoolCountCache(os.path.join(temp_dir, "counts.json"), "2025-26")
+        assert len(reloaded.rows()) == 60
+
+        nationwide_file = reloaded.write_nationwide_csv(os.path.join(temp_dir, "nationwide.csv"))
+        with open(nationwide_file, encoding='utf-8', newline='') as handle:
+            rows = list(csv.DictReader(handle))
+
+    assert len(rows) == 60
+    assert rows[0] == {'State': 'DELHI', 'District': 'DISTRICT 00', 'Total_Schools': '0'}
+    assert sum(int(row['Total_Schools']) for row in rows) == 3 * sum(index * 10 for index in range(20))
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the school count cache")
+    print()
+
+    test_cache_per_year()
+    test_concurrent_workers_and_nationwide_table()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ District counts are cached per academic year")
+
+
+if __name__ == "__main__":
+    main()
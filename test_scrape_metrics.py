@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Scrape Metrics
+Verify that stage timings, retries and byte sizes are written as JSON lines and summarized
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+
+from scrape_metrics import ScrapeMetrics, load_metrics, summarize_metrics
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def test_metrics_log():
+    """One JSON line per record with accumulated stages"""
+    print("🧪 TESTING METRICS LOG")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        metrics_file = os.path.join(temp_dir, "GOA_phase2_metrics.jsonl")
+        metrics = ScrapeMetrics("phase2", "GOA", metrics_file=metrics_file)
+
+        for index in range(1, 4):
+            record = metrics.record('school', index=index)
+            with metrics.stage('navigation'):
+                time.sleep(0.01)
+            if index == 2:
+                metrics.retry('extraction')
+                with metrics.stage('navigation'):
+                    time.sleep(0.01)
+            with record.stage('extraction'):
+                pass
+            metrics.add_bytes('page_source', 1000)
+            record.finish('SUCCESS')
+
+        # Unfinished records are closed as ABANDONED
+        metrics.record('school', index=4)
+        metrics.close()
+
+        with open(metrics_file, encoding='utf-8') as handle:
+            lines = [json.loads(line) for line in handle]
+
+        assert len(lines) == 4
+        assert lines[0]['index'] == 1 and lines[0]['status'] == 'SUCCESS'
+        assert lines[0]['bytes'] == {'page_source': 1000}
+        assert lines[1]['retries'] == {'extraction': 1}
+        assert lines[1]['stages']['navigation'] > lines[0]['stages']['navigation']
+        assert lines[3]['status'] == 'ABANDONED'
+
+        summary = summarize_metrics(load_metrics([metrics_file]))['school']
+        print(f"   Summary: {summary}")
+        assert summary['records'] == 4
+        assert list(summary['stages'])[0] == 'navigation'
+        assert summary['retries'] == {'extraction': 1}
+
+    print("   ✅ PASS")
+
+
+def test_disabled_metrics():
+    """Disabled metrics still time records but never create a file"""
+    print("\n🧪 TESTING DISABLED METRICS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        metrics_file = os.path.join(temp_dir, "metrics", "off.jsonl")
+        metrics = ScrapeMetrics("phase1", metrics_file=metrics_file, enabled=False)
+
+        # Stages outside a record are ignored
+        with metrics.stage('navigation'):
+            pass
+
+        record = metrics.record('page', page_number=1)
+        with record.stage('extraction'):
+            pass
+        assert record.finish('SUCCESS')['stages']['extraction'] >= 0
+        metrics.close()
+
+        assert not os.path.exists(metrics_file)
+        assert metrics.records_written == 0
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing per-stage scrape metrics")
+    print()
+
+    test_metrics_log()
+    test_disabled_metrics()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Stage timings are logged as JSON lines")
+
+
+if __name__ == "__main__":
+    main()
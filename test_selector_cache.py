@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test Selector Cache
+Verify learned ordering, demotion, persistence and one-query steady-state lookups
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+import selector_cache
+from selector_cache import SelectorCache
+from wait_manager import XPATH, WaitManager
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class CountPageDriver:
+    """WebDriver-style object with only the 'Showing X to Y of Z' label on the page"""
+
+    def __init__(self):
+        self.lookups = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def find_elements(self, by, value):
+        self.lookups.append(value)
+        return ["label"] if (by, value) == (XPATH, "//label[contains(text(),'Showing')]") else []
+
+
+COUNT_SELECTORS = [
+    "//li[contains(text(),'Showing')]//label",
+    "//p[contains(text(),'Showing')]//label",
+    "//label[contains(text(),'Showing')]",
+    ".pagination-info",
+]
+
+
+def test_learned_order_and_demotion():
+    """Winners move to the front; a leader is demoted after repeated misses"""
+    print("🧪 TESTING LEARNED ORDER")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = SelectorCache(os.path.join(temp_dir, "selectors.json"))
+        assert cache.ordered('count_label', COUNT_SELECTORS) == COUNT_SELECTORS
+
+        cache.record_win('count_label', COUNT_SELECTORS[2])
+        assert cache.ordered('count_label', COUNT_SELECTORS)[0] == COUNT_SELECTORS[2]
+        assert sorted(cache.ordered('count_label', COUNT_SELECTORS)) == sorted(COUNT_SELECTORS)
+
+        # One stray win does not unseat the leader
+        cache.record_win('count_label', ".pagination-info")
+        assert cache.ordered('count_label', COUNT_SELECTORS)[:2] == [COUNT_SELECTORS[2], ".pagination-info"]
+        cache.record_win('count_label', COUNT_SELECTORS[2])
+        for _ in range(selector_cache.SELECTOR_DEMOTE_AFTER - 1):
+            cache.record_win('count_label', ".pagination-info")
+        assert cache.ordered('count_label', COUNT_SELECTORS)[0] == COUNT_SELECTORS[2]
+        cache.record_win('count_label', ".pagination-info")
+        print(f"   Order: {cache.ordered('count_label', COUNT_SELECTORS)}")
+        assert cache.ordered('count_label', COUNT_SELECTORS)[:2] == [".pagination-info", COUNT_SELECTORS[2]]
+
+        # Learned selectors that left the code's list are ignored
+        assert cache.ordered('count_label', ["//label[contains(text(),'Showing')]", ".result-count"]) == \
+            ["//label[contains(text(),'Showing')]", ".result-count"]
+
+    print("   ✅ PASS")
+
+
+def test_persistence():
+    """The order survives restarts; sites of other processes on disk are kept"""
+    print("\n🧪 TESTING PERSISTENCE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, "selectors.json")
+        first = SelectorCache(cache_file)
+        other = SelectorCache(cache_file)
+        first.record_win('search_button', "button.purpleBtn")
+        other.record_win('count_label', ".pagination-info")
+
+        with open(cache_file, 'r', encoding='utf-8') as handle:
+            data = json.load(handle)
+        assert sorted(data) == ['count_label', 'search_button']
+
+        restarted = SelectorCache(cache_file)
+        assert restarted.ordered('search_button', ["//button", "button.purpleBtn"])[0] == "button.purpleBtn"
+        restarted.clear(['count_label'])
+        assert sorted(SelectorCache(cache_file).sites) == ['search_button']
+
+    print("   ✅ PASS")
+
+
+class ResultsPageDriver:
+    """WebDriver-style object whose results page renders in two steps"""
+
+    def __init__(self):
+        self.rendered = False
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def find_elements(self, by, value):
+        if value == ".accordion-body":
+            return ["card"] * 100 if self.rendered else []
+        if value == "[class*='accordion']":
+            return ["node"] * (301 if self.rendered else 1)   # the accordion shell matches early
+        return []
+
+
+CARD_SELECTORS = [".accordion-body", ".accordion-item", "[class*='accordion']", ".card-body"]
+
+
+def test_ranked_lists_keep_code_order():
+    """A broad selector that matched a half-rendered page does not take over the site"""
+    print("\n🧪 TESTING RANKED SELECTOR LISTS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = os.path.join(temp_dir, "selectors.json")
+        # An order learned before the sites were ranked is ignored as well
+        with open(cache_file, 'w', encoding='utf-8') as handle:
+            json.dump({'school_cards': {'order': ["[class*='accordion']"], 'misses': 0}}, handle)
+        cache = SelectorCache(cache_file)
+        driver = ResultsPageDriver()
+        waits = WaitManager(driver, "test", implicit_wait=0, selector_cache=cache)
+
+        selector, elements = waits.find_first('school_cards', CARD_SELECTORS, budget=0)
+        assert selector == "[class*='accordion']" and len(elements) == 1
+
+        driver.rendered = True
+        for _ in range(3):
+            selector, elements = waits.find_first('school_cards', CARD_SELECTORS, budget=0)
+            print(f"   {selector}: {len(elements)} elements")
+            assert selector == ".accordion-body" and len(elements) == 100
+        assert SelectorCache(cache_file).ordered('school_cards', CARD_SELECTORS) == CARD_SELECTORS
+
+    print("   ✅ PASS")
+
+
+def test_steady_state_lookup():
+    """After the first lookup the winning selector is queried first: one query per call"""
+    print("\n🧪 TESTING STEADY-STATE LOOKUPS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = SelectorCache(os.path.join(temp_dir, "selectors.json"))
+        driver = CountPageDriver()
+        waits = WaitManager(driver, "test", implicit_wait=0, selector_cache=cache)
+
+        waits.find_first('count_label', COUNT_SELECTORS)
+        first_lookups = len(driver.lookups)
+        driver.lookups.clear()
+        for _ in range(5):
+            selector, _ = waits.find_first('count_label', COUNT_SELECTORS)
+            assert selector == "//label[contains(text(),'Showing')]"
+
+    print(f"   First call: {first_lookups} queries, next calls: {len(driver.lookups) / 5:.0f} query each")
+    assert first_lookups == 3
+    assert len(driver.lookups) == 5
+    assert waits.sites['count_label']['lookups'] == 8
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the selector cache")
+    print()
+
+    test_learned_order_and_demotion()
+    test_persistence()
+    test_ranked_lists_keep_code_order()
+    test_steady_state_lookup()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Fallback lists cost one query once learned")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Snapshot Merge
+Verify that overlapping state snapshots are deduplicated into canonical files
+"""
+
+import csv
+import os
+import tempfile
+import logging
+
+from snapshot_merger import SnapshotMerger, school_key
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+OLD_HEADERS = ['state', 'district', 'extraction_date', 'udise_code', 'school_name', 'know_more_link', 'email']
+NEW_HEADERS = OLD_HEADERS + ['last_modified']
+
+
+def write_csv(path, headers, rows):
+    """Write a small snapshot CSV"""
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        if headers:
+            writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    """Read a CSV into a list of dicts"""
+    with open(path, 'r', newline='', encoding='utf-8') as handle:
+        return list(csv.DictReader(handle))
+
+
+def test_school_key():
+    """Test dedup key fallbacks"""
+    print("🧪 TESTING SCHOOL KEY FALLBACKS")
+    print("=" * 50)
+
+    cases = [
+        ({'udise_code': '12345678901'}, 'udise:12345678901'),
+        ({'udise_code': 'N/A', 'know_more_link': 'https://kys.udiseplus.gov.in/#/schooldetail/2719946/14'},
+         'school_id:2719946'),
+        ({'udise_code': 'N/A', 'know_more_link': 'N/A', 'state': 'Goa', 'district': 'North Goa',
+          'school_name': 'Govt School'}, 'name:GOA|NORTH GOA|GOVT SCHOOL'),
+    ]
+
+    for row, expected in cases:
+        extracted = school_key(row)
+        status = "✅ PASS" if extracted == expected else "❌ FAIL"
+        print(f"   {expected} -> {extracted}: {status}")
+        assert extracted == expected
+
+
+def test_snapshot_merge():
+    """Test merging two overlapping GOA runs plus a headerless dump"""
+    print("\n🧪 TESTING SNAPSHOT MERGE")
+    print("=" * 50)
+
+    link = "https://kys.udiseplus.gov.in/#/schooldetail/{}/14"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        older = os.path.join(temp_dir, "GOA_phase1_complete_20250820_155548.csv")
+        newer = os.path.join(temp_dir, "GOA_phase1_complete_20250820_161002.csv")
+        dump = os.path.join(temp_dir, "Dump_Phase1_GOA.csv")
+
+        write_csv(older, OLD_HEADERS, [
+            ['GOA', 'NORTH GOA', '2025-08-20T15:55:48', 'N/A', 'School A', link.format(1), 'old@a.in'],
+            ['GOA', 'NORTH GOA', '2025-08-20T15:55:49', 'N/A', 'School B', link.format(2), 'b@b.in'],
+        ])
+        write_csv(newer, NEW_HEADERS, [
+            ['GOA', 'NORTH GOA', '2025-08-20T16:10:02', 'N/A', 'School A', link.format(1), 'new@a.in', '01/08/2025'],
+            ['GOA', 'SOUTH GOA', '2025-08-20T16:10:03', 'N/A', 'School C', link.format(3), 'c@c.in', '02/08/2025'],
+        ])
+        write_csv(dump, None, [
+            ['True', 'True', 'GOA', '130', 'NORTH GOA'],
+        ])
+
+        merger = SnapshotMerger([older, newer, dump], output_dir=temp_dir, chunk_size=1)
+        output_files = merger.merge()
+
+        assert list(output_files) == ['GOA'], f"Expected one GOA file, got {list(output_files)}"
+        rows = read_csv(output_files['GOA'])
+        by_name = {row['school_name']: row for row in rows}
+
+        print(f"   Rows read: {merger.total_rows_read}")
+        print(f"   Duplicates: {merger.duplicate_rows}")
+        print(f"   Canonical rows: {len(rows)}")
+
+        assert len(rows) == 3
+        assert merger.duplicate_rows == 1
+        assert by_name['School A']['email'] == 'new@a.in', "Newest record should win"
+        assert by_name['School B']['last_modified'] == 'N/A', "Missing columns should be filled with N/A"
+        assert by_name['School C']['last_modified'] == '02/08/2025'
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing snapshot merge and dedup")
+    print()
+
+    test_school_key()
+    test_snapshot_merge()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Overlapping runs collapse to one canonical file per state")
+
+
+if __name__ == "__main__":
+    main()
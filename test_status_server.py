@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Status Server
+Verify throughput windows, status counts, ETA and the /status and /metrics endpoints
+"""
+
+import json
+import logging
+import time
+import urllib.request
+
+from status_server import ProgressTracker, StatusServer
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def test_progress_tracker():
+    """Sliding-window rates, status counts, queue depth and ETA"""
+    print("🧪 TESTING PROGRESS TRACKER")
+    print("=" * 50)
+
+    tracker = ProgressTracker("test")
+    # Pretend the run started 10 minutes ago
+    tracker.started_at = time.time() - 600
+    tracker.update(phase='phase2', state='GOA', district='NORTH GOA', page=3)
+    tracker.set_queue_depth(100)
+
+    for status in ['SUCCESS'] * 8 + ['PARTIAL', None]:
+        tracker.record_extraction(status)
+    tracker.record_listing(100)
+
+    # An old event drops out of the 1 and 5 minute windows
+    tracker.events['phase2'].appendleft((time.time() - 400, 10))
+
+    rates = tracker.rates('phase2')
+    print(f"   Rates: {rates}")
+    assert rates == {'1m': 10.0, '5m': 2.0, '15m': 2.0}
+
+    snapshot = tracker.snapshot()
+    assert snapshot['state'] == 'GOA' and snapshot['page'] == 3
+    assert snapshot['status_counts'] == {'SUCCESS': 8, 'PARTIAL': 1, 'FAILED': 1}
+    assert snapshot['queue_depth'] == 90
+    assert snapshot['schools_total'] == {'phase1': 100, 'phase2': 10}
+    assert snapshot['eta_seconds'] == 90 / 2.0 * 60
+
+    print("   ✅ PASS")
+
+
+def test_endpoints():
+    """JSON and Prometheus output over HTTP"""
+    print("\n🧪 TESTING STATUS ENDPOINTS")
+    print("=" * 50)
+
+    tracker = ProgressTracker("test")
+    tracker.update(phase='phase2', state='GOA')
+    tracker.set_queue_depth(5)
+    tracker.record_extraction('SUCCESS')
+
+    server = StatusServer(tracker, port=0).start()
+    try:
+        with urllib.request.urlopen(server.url + "status", timeout=5) as response:
+            status = json.loads(response.read())
+        with urllib.request.urlopen(server.url + "metrics", timeout=5) as response:
+            metrics = response.read().decode('utf-8')
+    finally:
+        server.stop()
+
+    assert status['state'] == 'GOA' and status['queue_depth'] == 4
+    assert 'udise_extractions_total{component="test",state="GOA",status="SUCCESS"} 1' in metrics
+    assert 'udise_queue_depth{component="test",state="GOA"} 4' in metrics
+    assert 'window="5m"' in metrics
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the live status endpoint")
+    print()
+
+    test_progress_tracker()
+    test_endpoints()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Throughput and ETA are available over HTTP")
+
+
+if __name__ == "__main__":
+    main()
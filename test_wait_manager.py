@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test Wait Manager
+Verify budgeted selector polling, zero implicit waits and the implicit-wait audit
+"""
+
+import logging
+import time
+
+from wait_manager import CSS_SELECTOR, XPATH, WaitManager, locator
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class FakeDriver:
+    """WebDriver-style object: find commands go through execute and honour the implicit wait"""
+
+    def __init__(self, elements):
+        self.elements = elements    # (strategy, selector) -> (appears_at, elements)
+        self.implicit = 0.0
+        self.created = time.perf_counter()
+        self.lookups = []
+
+    def implicitly_wait(self, seconds):
+        self.execute('setTimeouts', {'implicit': int(seconds * 1000)})
+
+    def execute(self, driver_command, params=None):
+        if driver_command == 'setTimeouts':
+            self.implicit = params['implicit'] / 1000
+            return {'value': None}
+        deadline = time.perf_counter() + self.implicit
+        while True:
+            appears_at, elements = self.elements.get((params['using'], params['value']), (0, []))
+            if elements and time.perf_counter() - self.created >= appears_at:
+                return {'value': elements}
+            if time.perf_counter() >= deadline:
+                return {'value': []}
+            time.sleep(0.01)
+
+    def find_elements(self, by, value):
+        self.lookups.append(value)
+        return self.execute('findElements', {'using': by, 'value': value})['value']
+
+
+def find_school_name(driver):
+    # Straight to execute, as selenium's find_elements (outside the repo) does
+    return driver.execute('findElements', {'using': CSS_SELECTOR, 'value': ".school-name"})['value']
+
+
+def test_locator():
+    """XPath selectors are told apart from CSS selectors"""
+    print("🧪 TESTING LOCATORS")
+    print("=" * 50)
+
+    assert locator("//li[contains(.,'Showing')]") == (XPATH, "//li[contains(.,'Showing')]")
+    assert locator("(//button)[1]")[0] == XPATH
+    assert locator("button.purpleBtn") == (CSS_SELECTOR, "button.purpleBtn")
+
+    print("   ✅ PASS")
+
+
+def test_fallback_list_costs_one_budget():
+    """Missing fallback selectors return at once; the list is polled within one budget"""
+    print("\n🧪 TESTING BUDGETED FALLBACK LISTS")
+    print("=" * 50)
+
+    driver = FakeDriver({
+        (XPATH, "//label[contains(text(),'Showing')]"): (0, ["label"]),
+        (CSS_SELECTOR, ".accordion-body"): (0.3, ["card1", "card2", ""]),
+    })
+    driver.implicitly_wait(5)
+    waits = WaitManager(driver, "test", implicit_wait=0)
+    assert driver.implicit == 0
+
+    started = time.perf_counter()
+    selector, elements = waits.find_first('count_label', ["//li[contains(text(),'Showing')]//label",
+                                                          "//p[contains(text(),'Showing')]//label",
+                                                          "//label[contains(text(),'Showing')]"])
+    elapsed = time.perf_counter() - started
+    print(f"   Count label via {selector} in {elapsed:.3f}s")
+    assert selector == "//label[contains(text(),'Showing')]" and elements == ["label"]
+    assert elapsed < 0.2
+
+    # Cards show up after 0.3s: found by polling, empty cards are filtered out
+    selector, cards = waits.find_first('school_cards', [".accordion-body", ".card-body"],
+                                       accept=lambda found: [card for card in found if card])
+    assert selector == ".accordion-body" and cards == ["card1", "card2"]
+
+    # Budget 0 looks once
+    started = time.perf_counter()
+    assert waits.find_first('school_name', ["h1", ".school-name"]) == (None, [])
+    assert time.perf_counter() - started < 0.1
+    assert waits.find('missing', ".nothing", budget=0.3) is None
+
+    assert waits.sites['count_label']['found'] == 1
+    assert waits.sites['school_name']['timeouts'] == 1
+    assert waits.sites['missing']['seconds'] >= 0.2
+
+    print("   ✅ PASS")
+
+
+def test_implicit_wait_audit():
+    """Audit mode attributes time lost in implicit waits to the calling function"""
+    print("\n🧪 TESTING IMPLICIT WAIT AUDIT")
+    print("=" * 50)
+
+    driver = FakeDriver({(CSS_SELECTOR, "h1"): (0, ["Heading"])})
+    waits = WaitManager(driver, "test", implicit_wait=0.1, audit=True)
+    assert driver.implicit == 0.1
+
+    for _ in range(3):
+        find_school_name(driver)
+    driver.find_elements(CSS_SELECTOR, "h1")
+
+    audit = waits.audit
+    print(f"   {audit.empty_finds} empty lookups, {audit.seconds:.2f}s: {audit.by_function}")
+    assert audit.empty_finds == 3
+    assert audit.seconds >= 0.3
+    assert audit.by_function['find_school_name'][0] == 3
+
+    waits.report("TEST")
+    assert audit.empty_finds == 0
+
+    # Zero implicit wait: nothing to audit
+    driver.implicitly_wait(0)
+    find_school_name(driver)
+    assert audit.empty_finds == 0
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the wait manager")
+    print()
+
+    test_locator()
+    test_fallback_list_costs_one_budget()
+    test_implicit_wait_audit()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Missing selectors no longer cost an implicit wait each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test Wait Policy
+Verify condition-driven waits, adaptive budgets, fixed points and persistence
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+
+import wait_policy
+from stats_utils import percentile
+from wait_policy import WAIT_POINTS, WAIT_POLICY_MIN_SAMPLES, WaitPolicy, results_changed
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Short test points (seconds of the "old sleep", condition)
+wait_policy.WAIT_POINTS.update({
+    'test_ready': (0.4, 'page_ready'),
+    'test_pause': (0.1, None),
+})
+
+
+class ScriptDriver:
+    """WebDriver-style object whose page becomes ready after a delay"""
+
+    def __init__(self, ready_after):
+        self.ready_at = time.perf_counter() + ready_after
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return time.perf_counter() >= self.ready_at
+
+
+def test_condition_ends_wait():
+    """A met condition ends the wait early; an unmet one waits out the budget"""
+    print("🧪 TESTING CONDITION-DRIVEN WAITS")
+    print("=" * 50)
+
+    policy = WaitPolicy(policy_file=None, adaptive=True)
+    driver = ScriptDriver(ready_after=0.05)
+    elapsed = policy.wait('test_ready', driver)
+    print(f"   Ready after {elapsed:.2f}s (old sleep 0.4s)")
+    assert elapsed < 0.3
+    assert driver.scripts[0] == wait_policy.CONDITION_SCRIPTS['page_ready']
+
+    elapsed = policy.wait('test_ready', ScriptDriver(ready_after=10))
+    assert 0.4 <= elapsed < 0.6
+
+    # Call-site conditions take precedence over the point's script
+    assert policy.wait('test_ready', driver, condition=lambda page: True) < 0.05
+
+    outcome = policy.outcomes['test_ready']
+    assert (outcome['calls'], outcome['met'], outcome['timeouts']) == (3, 2, 1)
+    assert policy.seconds_saved() > 0.4
+
+    print("   ✅ PASS")
+
+
+def test_adaptive_budget():
+    """Budgets follow the observed times within [min seconds, max factor x old sleep]"""
+    print("\n🧪 TESTING ADAPTIVE BUDGETS")
+    print("=" * 50)
+
+    policy = WaitPolicy(policy_file=None, adaptive=True)
+    assert policy.budget('test_ready') == 0.4
+
+    policy.samples['test_ready'] = [0.2] * WAIT_POLICY_MIN_SAMPLES
+    assert abs(policy.budget('test_ready') - 0.3) < 1e-9
+
+    policy.samples['test_ready'] = [0.01] * WAIT_POLICY_MIN_SAMPLES
+    assert policy.budget('test_ready') == wait_policy.WAIT_POLICY_MIN_SECONDS
+
+    # Timeouts are recorded at the budget: a slower page widens the budget again
+    policy.samples['test_ready'] = [0.2] * WAIT_POLICY_MIN_SAMPLES
+    for _ in range(3):
+        policy.wait('test_ready', ScriptDriver(ready_after=10))
+    print(f"   Budget after timeouts: {policy.budget('test_ready'):.2f}s")
+    assert policy.budget('test_ready') > 0.3
+    policy.samples['test_ready'] = [5.0] * WAIT_POLICY_MIN_SAMPLES
+    assert policy.budget('test_ready') == wait_policy.WAIT_POLICY_MAX_FACTOR * 0.4
+
+    assert abs(percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 90) - 9.1) < 1e-9   # shared linear-interpolated percentile
+
+    print("   ✅ PASS")
+
+
+def test_fixed_points_and_switch():
+    """Points without a condition, and ADAPTIVE_WAITS=0, sleep the old fixed seconds"""
+    print("\n🧪 TESTING FIXED WAITS")
+    print("=" * 50)
+
+    policy = WaitPolicy(policy_file=None, adaptive=True)
+    started = time.perf_counter()
+    assert policy.wait('test_pause', ScriptDriver(0)) == 0.1
+    assert time.perf_counter() - started >= 0.1
+    assert 'test_pause' not in policy.samples
+
+    fixed = WaitPolicy(policy_file=None, adaptive=False)
+    assert fixed.wait('test_ready', ScriptDriver(0)) == 0.4
+    assert fixed.seconds_saved() == 0
+
+    print("   ✅ PASS")
+
+
+def test_persistence():
+    """Observed times survive restarts and feed the next run's budgets"""
+    print("\n🧪 TESTING PERSISTENCE")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        policy_file = os.path.join(temp_dir, "wait_policy.json")
+        policy = WaitPolicy(policy_file=policy_file, adaptive=True)
+        for _ in range(WAIT_POLICY_MIN_SAMPLES):
+            policy.wait('test_ready', ScriptDriver(0))
+        policy.report("TEST")
+        assert policy.outcomes == {}
+
+        restarted = WaitPolicy(policy_file=policy_file, adaptive=True)
+        assert len(restarted.samples['test_ready']) == WAIT_POLICY_MIN_SAMPLES
+        print(f"   Learned budget: {restarted.budget('test_ready'):.2f}s")
+        assert restarted.budget('test_ready') == wait_policy.WAIT_POLICY_MIN_SECONDS
+
+    print("   ✅ PASS")
+
+
+class LabelDriver:
+    """WebDriver-style object answering the results label and page text scripts"""
+
+    def __init__(self, label, body=""):
+        self.label = label
+        self.body = body
+
+    def execute_script(self, script, *args):
+        return self.body if "document.body.textContent" in script else self.label
+
+
+def test_results_changed():
+    """The results condition waits for a new label, or for the no-results text"""
+    print("\n🧪 TESTING RESULTS CONDITION")
+    print("=" * 50)
+
+    condition = results_changed("Showing 1 to 100 of 812")
+    assert not condition(LabelDriver("Showing 1 to 100 of 812"))
+    assert condition(LabelDriver("Showing 101 to 200 of 812"))
+    assert not condition(LabelDriver(""))
+    assert condition(LabelDriver("", body="No records found"))
+
+    print("   ✅ PASS")
+
+
+def test_scrapers_use_wait_points():
+    """The scrapers have no fixed sleeps left and only use registered points"""
+    print("\n🧪 TESTING SCRAPER WAIT POINTS")
+    print("=" * 50)
+
+    modules = ["phase1_statewise_scraper.py", "phase2_automated_processor.py", "school_counting_tool.py",
+               "sequential_process_state.py", "sequential_state_processor.py"]
+    for module in modules:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), module), encoding='utf-8') as handle:
+            source = handle.read()
+        points = set(re.findall(r"(?:pause|wait)\('(\w+)'", source))
+        print(f"   {module}: {len(points)} wait points")
+        assert "time.sleep(" not in source, module
+        assert points and points <= set(WAIT_POINTS), points - set(WAIT_POINTS)
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the wait policy")
+    print()
+
+    test_condition_ends_wait()
+    test_adaptive_budget()
+    test_fixed_points_and_switch()
+    test_persistence()
+    test_results_changed()
+    test_scrapers_use_wait_points()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Fixed sleeps end as soon as the page is ready")
+
+
+if __name__ == "__main__":
+    main()
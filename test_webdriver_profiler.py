@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test WebDriver Profiler
+Verify per-command / per-function call counts, latency and the collapsed-stack output
+"""
+
+import logging
+import os
+import tempfile
+import time
+
+import webdriver_profiler
+from webdriver_profiler import WebDriverProfiler, attach_profiler
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class RecordingDriver:
+    """Minimal object with a WebDriver-style execute method"""
+
+    def execute(self, driver_command, params=None):
+        if driver_command == "get":
+            time.sleep(0.02)
+        return {'value': None}
+
+
+def load_page(driver):
+    driver.execute("get", {'url': 'http://127.0.0.1/'})
+
+
+def read_cards(driver):
+    for _ in range(3):
+        driver.execute("getElementText", {})
+
+
+def scrape(driver):
+    load_page(driver)
+    read_cards(driver)
+
+
+def test_profiler_tables():
+    """Calls are attributed to commands, functions and full stacks"""
+    print("🧪 TESTING WEBDRIVER PROFILER")
+    print("=" * 50)
+
+    driver = RecordingDriver()
+    profiler = WebDriverProfiler(driver, "test")
+    scrape(driver)
+
+    assert profiler.total_calls == 4
+    assert profiler.by_command['getElementText'][0] == 3
+    assert profiler.by_command['get'][1] >= 0.02
+    assert profiler.by_function['read_cards'][0] == 3
+    assert profiler.by_function['load_page'][0] == 1
+
+    stacks = {stack[-3:]: calls for stack, (calls, _) in profiler.by_stack.items()}
+    print(f"   Stacks: {stacks}")
+    assert stacks[('scrape', 'read_cards', 'getElementText')] == 3
+
+    folded = profiler.folded_lines()
+    assert any(";scrape;load_page;get " in line for line in folded)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = profiler.write_folded("GOA", profile_dir=temp_dir)
+        assert os.path.basename(path).startswith("GOA_test_webdriver_")
+        with open(path, encoding='utf-8') as handle:
+            assert "scrape;read_cards;getElementText" in handle.read()
+
+    profiler.detach()
+    driver.execute("get", {})
+    assert profiler.total_calls == 4
+
+    print("   ✅ PASS")
+
+
+def test_opt_in():
+    """attach_profiler only wraps the driver when profiling is enabled"""
+    print("\n🧪 TESTING OPT-IN")
+    print("=" * 50)
+
+    original = webdriver_profiler.WEBDRIVER_PROFILING
+    try:
+        webdriver_profiler.WEBDRIVER_PROFILING = False
+        assert attach_profiler(RecordingDriver(), "phase1") is None
+
+        webdriver_profiler.WEBDRIVER_PROFILING = True
+        assert isinstance(attach_profiler(RecordingDriver(), "phase1"), WebDriverProfiler)
+        assert attach_profiler(None, "phase1") is None
+    finally:
+        webdriver_profiler.WEBDRIVER_PROFILING = original
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the WebDriver profiler")
+    print()
+
+    test_profiler_tables()
+    test_opt_in()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ WebDriver round trips are counted per command and per function")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Test Work Planner
+Verify page-range splitting, LPT balancing and the JSON schedule round trip
+"""
+
+import csv
+import logging
+import os
+import tempfile
+
+from processing_time_calculator import ProcessingTimeCalculator, RateModel
+from work_planner import (PLAN_PAGE_SIZE, build_schedule, build_units, load_district_counts,
+                          load_worker_units, run_phase1_units, save_schedule, save_worker_outputs,
+                          upload_finished_states)
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DISTRICT_COUNTS = [
+    ("ANDAMAN & NICOBAR ISLANDS", "ANDAMANS", 181),
+    ("ANDAMAN & NICOBAR ISLANDS", "NICOBARS", 60),
+    ("GOA", "NORTH GOA", 812),
+    ("GOA", "SOUTH GOA", 790),
+    ("WEST BENGAL", "PASCHIM MEDINIPUR", 9120),
+    ("WEST BENGAL", "NORTH 24 PARGANAS", 7450),
+    ("WEST BENGAL", "DARJEELING", 1530),
+]
+
+
+class PageSizeScraper:
+    """EnhancedStatewiseSchoolScraper-style object whose 100-results setting can fail"""
+
+    class Driver:
+        def quit(self):
+            pass
+
+    class Metrics:
+        def close(self):
+            pass
+
+    def __init__(self, results_per_page_100, csv_dir):
+        self.page_size_works = results_per_page_100
+        self.results_per_page_100 = False
+        self.csv_dir = csv_dir
+        self.driver = self.Driver()
+        self.metrics = self.Metrics()
+        self.current_csv_file = None
+        self.scraped_ranges = []
+
+    def setup_driver(self):
+        return True
+
+    def navigate_to_portal(self):
+        return True
+
+    def extract_states_data(self):
+        return [{'stateName': 'GOA'}]
+
+    def select_state(self, state):
+        return True
+
+    def extract_districts_data(self):
+        return [{'districtName': 'NORTH GOA'}]
+
+    def select_district(self, district):
+        return True
+
+    def enhanced_click_search_button(self):
+        self.results_per_page_100 = self.page_size_works
+        return True   # the search itself worked, at the portal's default page size
+
+    def initialize_csv_file(self, state_name, suffix=None):
+        self.current_csv_file = os.path.join(self.csv_dir, f"{suffix}.csv")
+
+    def extract_schools_basic_data_enhanced(self, first_page, last_page):
+        self.scraped_ranges.append((first_page, last_page))
+        with open(self.current_csv_file, 'w') as handle:
+            handle.write("school\n")
+        return [{'school': 'x'}]
+
+    def finalize_csv_file(self):
+        pass
+
+
+def fallback_calculator():
+    """Calculator without measurements (fixed rates), so costs are deterministic"""
+    return ProcessingTimeCalculator(RateModel())
+
+
+def test_units_cover_every_school():
+    """Large districts are split into page ranges that cover all pages exactly once"""
+    print("🧪 TESTING UNIT SPLITTING")
+    print("=" * 50)
+
+    units = build_units(DISTRICT_COUNTS, 4, fallback_calculator())
+    for state, district, schools in DISTRICT_COUNTS:
+        pieces = sorted((unit for unit in units if unit['district'] == district), key=lambda unit: unit['first_page'])
+        assert sum(unit['schools'] for unit in pieces) == schools
+        assert pieces[0]['first_page'] == 1 and pieces[-1]['last_page'] is None
+        for previous, following in zip(pieces, pieces[1:]):
+            assert following['first_page'] == previous['last_page'] + 1
+
+    split = [unit for unit in units if unit['district'] == "PASCHIM MEDINIPUR"]
+    small = [unit for unit in units if unit['district'] == "NICOBARS"]
+    print(f"   PASCHIM MEDINIPUR: {len(split)} units, NICOBARS: {len(small)} unit")
+    assert len(split) > 1 and len(small) == 1
+    assert all(unit['schools'] <= 9120 for unit in split)
+    assert len({unit['unit_id'] for unit in units}) == len(units)
+
+    print("   ✅ PASS")
+
+
+def test_lpt_balance():
+    """LPT keeps the makespan close to the ideal share"""
+    print("\n🧪 TESTING LPT BALANCE")
+    print("=" * 50)
+
+    schedule = build_schedule(DISTRICT_COUNTS, 4, fallback_calculator(), "phase1")
+    loads = [assignment['expected_seconds'] for assignment in schedule['assignments']]
+    print(f"   Loads: {loads}, balance {schedule['balance']}")
+    assert schedule['total_schools'] == sum(schools for _, _, schools in DISTRICT_COUNTS)
+    assert schedule['balance'] > 0.9
+    assert schedule['expected_makespan_seconds'] == max(loads)
+    assert sum(len(assignment['units']) for assignment in schedule['assignments']) == schedule['total_units']
+
+    print("   ✅ PASS")
+
+
+def test_schedule_round_trip():
+    """Counts CSV in, JSON schedule out, units per worker back"""
+    print("\n🧪 TESTING SCHEDULE FILES")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        counts_file = os.path.join(temp_dir, "GOA_school_counts.csv")
+        with open(counts_file, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['State', 'District', 'Total_Schools'])
+            writer.writerow(['GOA', 'NORTH GOA', 812])
+            writer.writerow(['GOA', 'SOUTH GOA', 790])
+            writer.writerow(['GOA', 'EMPTY DISTRICT', 0])
+
+        district_counts = load_district_counts([counts_file, counts_file])
+        assert district_counts == [('GOA', 'NORTH GOA', 812), ('GOA', 'SOUTH GOA', 790)]
+
+        schedule = build_schedule(district_counts, 2, fallback_calculator())
+        path = save_schedule(schedule, plan_dir=temp_dir)
+        units = load_worker_units(path, 2)
+
+    assert units == schedule['assignments'][1]['units']
+    assert all(unit['schools'] <= 812 for unit in units)
+    assert schedule['page_size'] == PLAN_PAGE_SIZE
+
+    print("   ✅ PASS")
+
+
+def test_page_ranges_need_100_per_page():
+    """A page-range unit fails when 100 results per page could not be set"""
+    print("\n🧪 TESTING PAGE-RANGE UNITS AT THE DEFAULT PAGE SIZE")
+    print("=" * 50)
+
+    units = [
+        {'unit_id': 'u1', 'state': 'GOA', 'district': 'NORTH GOA', 'first_page': 1, 'last_page': None, 'schools': 812},
+        {'unit_id': 'u2', 'state': 'GOA', 'district': 'NORTH GOA', 'first_page': 1, 'last_page': 4, 'schools': 400},
+        {'unit_id': 'u3', 'state': 'GOA', 'district': 'NORTH GOA', 'first_page': 5, 'last_page': None, 'schools': 412},
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        scraper = PageSizeScraper(results_per_page_100=False, csv_dir=temp_dir)
+        unit_files, failed_units = run_phase1_units(units, scraper)
+        print(f"   Scraped {[unit['unit_id'] for unit, _ in unit_files]}, failed {failed_units}")
+        assert [unit['unit_id'] for unit, _ in unit_files] == ['u1']
+        assert failed_units == ['u2', 'u3'] and scraper.scraped_ranges == [(1, None)]
+
+        scraper = PageSizeScraper(results_per_page_100=True, csv_dir=temp_dir)
+        unit_files, failed_units = run_phase1_units(units, scraper)
+        assert len(unit_files) == 3 and failed_units == []
+
+    print("   ✅ PASS")
+
+
+def write_unit_output(path, udise_codes):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['state', 'udise_code', 'school_name', 'extraction_status'])
+        for udise_code in udise_codes:
+            writer.writerow(['GOA', udise_code, f"School {udise_code}", 'SUCCESS'])
+    return path
+
+
+def test_state_uploaded_once():
+    """A state is merged and uploaded once, after the last of its units finished"""
+    print("\n🧪 TESTING ONE UPLOAD PER STATE")
+    print("=" * 50)
+
+    units = [
+        {'unit_id': 'u1', 'state': 'GOA', 'district': 'NORTH GOA', 'first_page': 1, 'last_page': 4, 'schools': 400},
+        {'unit_id': 'u2', 'state': 'GOA', 'district': 'NORTH GOA', 'first_page': 5, 'last_page': None, 'schools': 412},
+    ]
+    uploads = []
+
+    def upload(csv_file, state_name):
+        with open(csv_file, 'r', encoding='utf-8', newline='') as handle:
+            uploads.append((state_name, sorted(row['udise_code'] for row in csv.DictReader(handle))))
+        return True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        schedule = {'workers': 2, 'assignments': [{'worker_id': 1, 'units': units[:1]},
+                                                  {'worker_id': 2, 'units': units[1:]}]}
+        path = save_schedule(schedule, plan_dir=temp_dir)
+        first = write_unit_output(os.path.join(temp_dir, "GOA_phase2_incremental_1_u1.csv"), ['301', '302'])
+        second = write_unit_output(os.path.join(temp_dir, "GOA_phase2_incremental_2_u2.csv"), ['303'])
+
+        save_worker_outputs(path, 1, units[:1], [(units[0], first)])
+        assert upload_finished_states(path, upload, temp_dir) == {} and uploads == []
+
+        save_worker_outputs(path, 2, units[1:], [(units[1], second)])
+        assert list(upload_finished_states(path, upload, temp_dir)) == ['GOA']
+        assert uploads == [('GOA', ['301', '302', '303'])]
+
+        # Another worker (or a later "upload" command) does not upload it again
+        assert upload_finished_states(path, upload, temp_dir) == {} and len(uploads) == 1
+
+    print("   ✅ PASS")
+
+
+def main():
+    """Main test function"""
+    print("🔧 Testing the work planner")
+    print()
+
+    test_units_cover_every_school()
+    test_lpt_balance()
+    test_schedule_round_trip()
+    test_page_ranges_need_100_per_page()
+    test_state_uploaded_once()
+
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Work is balanced across workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Wait Manager - Explicit, budgeted element waits instead of implicit waits
+- Drivers run with implicitly_wait(0): a lookup of a selector that is not on the
+  page returns at once instead of blocking for the implicit timeout
+- Every call site that needs to wait names itself (search_button, count_label, ...)
+  and gets its own budget (WAIT_BUDGETS); fallback selector lists are polled
+  together within that one budget instead of one timeout per selector
+- The selector that won last is tried first (selector_cache.py, learned per call site)
+- Audit mode (WAIT_AUDIT=1) reports the seconds spent per call site and the
+  seconds lost to implicit waits (find commands that came back empty), per function
+
+Usage: WAIT_AUDIT=1 IMPLICIT_WAIT_SECONDS=5 python sequential_process_state.py ...
+       (measures what the old implicit wait costs, then compare with the default 0)
+"""
+
+import logging
+import os
+import time
+
+from selector_cache import shared_selector_cache
+from webdriver_profiler import repo_call_stack
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+# Implicit wait for every driver (0 = all waits are explicit)
+IMPLICIT_WAIT_SECONDS = float(os.environ.get("IMPLICIT_WAIT_SECONDS", "0"))
+
+# Report wait seconds per call site and implicit-wait penalties
+WAIT_AUDIT = os.environ.get("WAIT_AUDIT", "0") == "1"
+
+# Seconds a call site may wait for its elements (0 = look once)
+WAIT_BUDGETS = {
+    'state_dropdown': 10,    # first lookup after the portal loads
+    'state_options': 10,     # options of a catalog state list (portal_catalog.py)
+    'district_options': 5,   # district options after a state is selected
+    'search_button': 5,
+    'search_results': 10,    # results after clicking search
+    'school_cards': 5,       # cards of a page that is already loaded
+    'count_label': 5,        # "Showing X to Y of Z"
+    'school_name': 0,        # optional headings on a loaded detail page
+}
+DEFAULT_WAIT_BUDGET = 5
+
+# Seconds between polls of a selector list
+WAIT_POLL_SECONDS = 0.25
+# ===== END CONFIGURATION SECTION =====
+
+# Locator strategies (values of selenium's By.XPATH / By.CSS_SELECTOR)
+XPATH = "xpath"
+CSS_SELECTOR = "css selector"
+
+# WebDriver commands whose empty result means the implicit wait ran out
+FIND_COMMANDS = {'findElement', 'findElements', 'findChildElement', 'findChildElements'}
+
+
+def locator(selector):
+    """(strategy, selector): XPath for //... and (...) selectors, CSS otherwise"""
+    if selector.startswith("//") or selector.startswith("("):
+        return XPATH, selector
+    return CSS_SELECTOR, selector
+
+
+class ImplicitWaitAudit:
+    """Time lost in implicit waits: find commands that waited and found nothing"""
+
+    def __init__(self, driver, implicit_wait=0.0):
+        self.driver = driver
+        self.implicit_wait = implicit_wait
+        self.original_execute = driver.execute
+        self.reset()
+        driver.execute = self.execute
+
+    def reset(self):
+        self.empty_finds = 0
+        self.seconds = 0.0
+        self.by_function = {}    # innermost repo function -> [empty finds, seconds]
+
+    def execute(self, driver_command, params=None):
+        if driver_command == 'setTimeouts' and params and 'implicit' in params:
+            self.implicit_wait = params['implicit'] / 1000
+        if driver_command not in FIND_COMMANDS or not self.implicit_wait:
+            return self.original_execute(driver_command, params)
+
+        stack = repo_call_stack()
+        call_start = time.perf_counter()
+        found = False
+        try:
+            response = self.original_execute(driver_command, params)
+            found = bool(response.get('value')) if isinstance(response, dict) else bool(response)
+            return response
+        finally:
+            if not found:
+                elapsed = time.perf_counter() - call_start
+                self.empty_finds += 1
+                self.seconds += elapsed
+                entry = self.by_function.setdefault(stack[-1] if stack else '<unknown>', [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def detach(self):
+        self.driver.execute = self.original_execute
+
+
+class WaitManager:
+    """Budgeted explicit waits per named call site"""
+
+    def __init__(self, driver, label="driver", implicit_wait=IMPLICIT_WAIT_SECONDS, audit=WAIT_AUDIT,
+                 selector_cache=None):
+        self.driver = driver
+        self.label = label
+        self.selector_cache = selector_cache
+        self.audit = ImplicitWaitAudit(driver, implicit_wait) if audit else None
+        driver.implicitly_wait(implicit_wait)
+        self.reset()
+
+    def reset(self):
+        self.sites = {}    # site -> {'calls', 'lookups', 'found', 'timeouts', 'seconds', 'selectors': {selector: hits}}
+        self.started_at = time.time()
+
+    def budget(self, site):
+        return WAIT_BUDGETS.get(site, DEFAULT_WAIT_BUDGET)
+
+    def record(self, site, seconds, lookups, selector=None):
+        stats = self.sites.setdefault(site, {'calls': 0, 'lookups': 0, 'found': 0, 'timeouts': 0,
+                                             'seconds': 0.0, 'selectors': {}})
+        stats['calls'] += 1
+        stats['lookups'] += lookups
+        stats['seconds'] += seconds
+        if selector is None:
+            stats['timeouts'] += 1
+        else:
+            stats['found'] += 1
+            stats['selectors'][selector] = stats['selectors'].get(selector, 0) + 1
+
+    def find_first(self, site, selectors, budget=None, accept=None, context=None):
+        """Poll an ordered selector list until one matches or the site's budget runs out
+
+        accept filters (or maps) the matched elements, e.g. to cards with text; a
+        selector only wins when something is left. Returns (selector, elements)
+        or (None, []).
+        """
+        budget = self.budget(site) if budget is None else budget
+        context = context or self.driver
+        if self.selector_cache and len(selectors) > 1:
+            selectors = self.selector_cache.ordered(site, selectors)
+        started = time.perf_counter()
+        deadline = started + budget
+        lookups = 0
+        while True:
+            for selector in selectors:
+                lookups += 1
+                try:
+                    elements = context.find_elements(*locator(selector))
+                    if elements and accept:
+                        elements = accept(elements)
+                except Exception as e:
+                    logger.debug(f"Selector {selector} failed: {e}")
+                    continue
+                if elements:
+                    self.record(site, time.perf_counter() - started, lookups, selector)
+                    if self.selector_cache and len(selectors) > 1:
+                        self.selector_cache.record_win(site, selector)
+                    return selector, elements
+            if time.perf_counter() + WAIT_POLL_SECONDS > deadline:
+                self.record(site, time.perf_counter() - started, lookups)
+                return None, []
+            time.sleep(WAIT_POLL_SECONDS)
+
+    def find(self, site, selector, budget=None):
+        """First element of one selector, or None when it does not appear within the budget"""
+        _, elements = self.find_first(site, [selector], budget)
+        return elements[0] if elements else None
+
+    def report(self, name=None, reset=True):
+        """Log seconds per call site and implicit-wait penalties (audit mode only)"""
+        if not self.audit or not self.sites and not self.audit.empty_finds:
+            return
+        wall_seconds = time.time() - self.started_at
+        logger.info(f"\n{'='*80}")
+        logger.info(f"⏳ WAIT AUDIT: {name or self.label}")
+        logger.info(f"{'='*80}")
+        waited = sum(stats['seconds'] for stats in self.sites.values())
+        logger.info(f"📊 {waited:.1f}s in explicit waits, {self.audit.seconds:.1f}s in implicit waits "
+                    f"({self.audit.empty_finds} empty lookups) of {wall_seconds:.0f}s wall time")
+        for site, stats in sorted(self.sites.items(), key=lambda item: -item[1]['seconds']):
+            winners = ", ".join(f"{selector} x{hits}" for selector, hits in
+                                sorted(stats['selectors'].items(), key=lambda item: -item[1]))
+            logger.info(f"   {site:<20} {stats['calls']:>6} calls {stats['lookups'] / stats['calls']:>5.1f} lookups/call "
+                        f"{stats['timeouts']:>5} timeouts {stats['seconds']:>8.2f}s  {winners}")
+        if self.audit.by_function:
+            logger.info("   Implicit waits by function:")
+            for function, (finds, seconds) in sorted(self.audit.by_function.items(), key=lambda item: -item[1][1]):
+                logger.info(f"      {function:<45} {finds:>6} empty lookups {seconds:>9.2f}s")
+        if reset:
+            self.reset()
+            self.audit.reset()
+
+
+def attach_wait_manager(driver, label):
+    """Set the driver's implicit wait (IMPLICIT_WAIT_SECONDS) and return its WaitManager"""
+    waits = WaitManager(driver, label, selector_cache=shared_selector_cache())
+    if waits.audit:
+        logger.info(f"⏳ Wait audit enabled for {label} (implicit wait {IMPLICIT_WAIT_SECONDS:g}s)")
+    return waits
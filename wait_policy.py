@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Wait Policy - Named wait points in place of fixed time.sleep calls
+- Every pause of the scraper is a wait point in WAIT_POINTS: the seconds of the old
+  sleep plus the page condition it was waiting for (options populated, results
+  loaded, page changed, ...)
+- A wait ends as soon as its condition holds; points without a condition (API
+  politeness, retry backoff) sleep their fixed seconds
+- Budgets adapt per point: WAIT_POLICY_MARGIN x P90 of the observed wait times,
+  capped at WAIT_POLICY_MAX_FACTOR x the old sleep; timeouts are recorded at the
+  budget, so a point whose condition got slower widens again
+- Observed times persist in wait_policy.json; report() logs the seconds saved
+  against the old fixed sleeps
+- All scrapers of a process share WAIT_POLICY, and the page conditions that need
+  call-site state (results label changed, districts of a new state) live here too
+
+ADAPTIVE_WAITS=0 restores the fixed sleeps (for A/B runs).
+Usage: python wait_policy.py   (show the learned budgets)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from stats_utils import percentile
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+WAIT_POLICY_FILE = "wait_policy.json"
+
+# Condition-driven waits on/off (off = every point sleeps its fixed seconds)
+ADAPTIVE_WAITS = os.environ.get("ADAPTIVE_WAITS", "1") == "1"
+
+# Observed wait times kept per point, and needed before the budget adapts
+WAIT_POLICY_SAMPLES = 50
+WAIT_POLICY_MIN_SAMPLES = 5
+
+# Budget = margin x P90 of the observed times, within [min seconds, max factor x fixed]
+WAIT_POLICY_MARGIN = 1.5
+WAIT_POLICY_MIN_SECONDS = 0.2
+WAIT_POLICY_MAX_FACTOR = 2.0
+
+# Seconds between condition checks
+WAIT_POLICY_POLL_SECONDS = 0.1
+
+# name -> (seconds of the old fixed sleep, condition name or None)
+WAIT_POINTS = {
+    # Portal navigation
+    'portal_load': (3, 'page_ready'),
+    'visit_portal': (3, 'page_ready'),
+    'portal_tab_switch': (2, 'page_ready'),
+    'navigation_retry': (15, None),
+    'navigation_refresh': (5, 'page_ready'),
+    'count_navigation_retry': (5, None),
+    'advance_search': (3, 'state_options'),
+    'portal_settle': (1, 'page_ready'),
+    # State / district dropdowns
+    'state_options': (1, 'state_options'),
+    'districts_loaded': (1, 'district_options'),
+    'district_options': (2, 'district_options'),
+    'district_select_ready': (1, 'district_options'),
+    'district_selected': (1, 'district_chosen'),
+    'district_pause': (0.3, None),
+    'filters_reset': (0.5, None),
+    'phase1_district_pause': (0.2, None),
+    'count_district_pause': (1, None),
+    # Search and pagination
+    'search_scroll': (1, None),
+    'search_results': (2, 'results_loaded'),
+    'search_retry': (2, None),
+    'results_still_loading': (3, 'results_loaded'),
+    'first_page_recovery': (4, 'results_loaded'),
+    'pagination_dropdown': (1, 'pagination_select'),
+    'pagination_applied': (1, 'results_loaded'),
+    'page_transition': (1, 'results_loaded'),
+    'next_page_settle': (1.5, 'results_loaded'),
+    'page_stabilize': (1, 'results_loaded'),
+    'lazy_load_scroll': (1, 'results_loaded'),
+    'scroll_top': (0.5, 'scrolled_top'),
+    'next_button_ready': (1, 'next_button'),
+    'next_page_change': (3, None),
+    'next_page_recheck': (2, None),
+    'page_link_click': (3, 'results_loaded'),
+    'page_cards': (0.2, 'results_loaded'),
+    'next_page_load': (0.3, 'results_loaded'),
+    'next_button_scroll': (0.3, None),
+    'next_page_click': (1.5, 'results_loaded'),
+    'next_click_retry': (0.8, None),
+    'next_click_error_retry': (1, None),
+    # Phase 2 detail pages
+    'detail_refresh': (3, 'page_ready'),
+    'detail_content': (2, 'detail_content'),
+    'detail_retry': (2, None),
+    'extraction_retry': (3, None),
+    'phase2_school_pause': (0.5, None),
+    'phase2_batch_pause': (1, None),
+    'phase2_next_school': (0.2, None),
+    # Between states / uploads
+    'state_pause': (3, None),
+    'phase2_state_pause': (2, None),
+    'count_state_pause': (2, None),
+    'sequential_state_pause': (10, None),
+    'phase_pause': (5, None),
+    'state_retry': (30, None),
+    'sheets_batch': (1, None),
+}
+# ===== END CONFIGURATION SECTION =====
+
+# Page conditions (JavaScript returning true once the wait can end)
+CONDITION_SCRIPTS = {
+    'page_ready': "return document.readyState === 'complete';",
+    'state_options': """
+        var selects = document.querySelectorAll('select.form-select.select');
+        return selects.length > 0 && selects[0].options.length > 1;""",
+    'district_options': """
+        var selects = document.querySelectorAll('select.form-select.select');
+        return selects.length > 1 && selects[1].options.length > 1;""",
+    'district_chosen': """
+        var selects = document.querySelectorAll('select.form-select.select');
+        return selects.length > 1 && selects[1].selectedIndex > 0;""",
+    'results_loaded': """
+        return document.querySelector('.accordion-body') !== null ||
+               document.body.textContent.indexOf('No records found') >= 0;""",
+    'pagination_select': "return document.querySelector('select.form-select.w11110') !== null;",
+    'scrolled_top': "return window.scrollY === 0;",
+    'next_button': "return document.querySelector('a.nextBtn') !== null;",
+    'detail_content': "return document.querySelector('.H3Value') !== null;",
+}
+
+
+def results_label_text(driver):
+    """Text of the 'Showing X to Y of Z' label ('' while there is none)"""
+    try:
+        return driver.execute_script(
+            "var label = document.querySelector('li.showing label');"
+            "return label ? label.textContent.trim() : '';") or ''
+    except Exception:
+        return ''
+
+
+def results_changed(previous_label):
+    """Condition: the results label differs from before a click, or the search found nothing"""
+    def condition(driver):
+        label = results_label_text(driver)
+        if label and label != previous_label:
+            return True
+        return not label and "No records found" in driver.execute_script("return document.body.textContent;")
+    return condition
+
+
+def district_options_text(driver):
+    """Option texts of the district dropdown ('' while it holds only the placeholder)"""
+    try:
+        return driver.execute_script(
+            "var selects = document.querySelectorAll('select.form-select.select');"
+            "if (selects.length < 2 || selects[1].options.length < 2) return '';"
+            "return Array.from(selects[1].options).map(function (o) { return o.text; }).join('|');") or ''
+    except Exception:
+        return ''
+
+
+def districts_changed(previous_districts):
+    """Condition: the district dropdown holds the options of a newly selected state"""
+    return lambda driver: district_options_text(driver) not in ('', previous_districts)
+
+
+def element_in_view(element):
+    """Condition: a scrolled-to element is inside the viewport"""
+    return lambda driver: driver.execute_script(
+        "var r = arguments[0].getBoundingClientRect();"
+        "return r.top >= 0 && r.bottom <= window.innerHeight;", element)
+
+
+class WaitPolicy:
+    """Registry of wait points with adaptive, condition-driven budgets"""
+
+    def __init__(self, policy_file=WAIT_POLICY_FILE, adaptive=ADAPTIVE_WAITS):
+        self.policy_file = policy_file
+        self.adaptive = adaptive
+        self.lock = threading.Lock()
+        self.samples = {}    # point -> recent wait seconds (timeouts at their budget)
+        if policy_file and os.path.exists(policy_file):
+            try:
+                with open(policy_file, 'r', encoding='utf-8') as handle:
+                    self.samples = json.load(handle)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable wait policy {policy_file}: {e}")
+        self.reset()
+
+    def reset(self):
+        self.outcomes = {}   # point -> {'calls', 'met', 'timeouts', 'seconds', 'fixed_seconds'}
+        self.started_at = time.time()
+
+    def budget(self, name):
+        """Seconds the point may wait for its condition"""
+        fixed_seconds = WAIT_POINTS[name][0]
+        samples = self.samples.get(name, [])
+        # Only condition-driven waits collect samples; fixed points keep their seconds
+        if not self.adaptive or len(samples) < WAIT_POLICY_MIN_SAMPLES:
+            return fixed_seconds
+        learned = WAIT_POLICY_MARGIN * percentile(samples, 90)
+        return min(WAIT_POLICY_MAX_FACTOR * fixed_seconds, max(WAIT_POLICY_MIN_SECONDS, learned))
+
+    def wait(self, name, driver=None, condition=None):
+        """Wait at a named point until its condition holds or its budget runs out
+
+        condition is a callable(driver) -> bool for conditions that need call-site
+        state (e.g. the results label differs from before a click); otherwise the
+        point's CONDITION_SCRIPTS entry is evaluated in the page. Returns the seconds waited.
+        """
+        fixed_seconds, condition_name = WAIT_POINTS[name]
+        if condition is None and condition_name and driver is not None:
+            script = CONDITION_SCRIPTS[condition_name]
+            condition = lambda page: page.execute_script(script)
+
+        if not self.adaptive or condition is None:
+            time.sleep(fixed_seconds)
+            self.record(name, fixed_seconds, met=None, learn=False)
+            return fixed_seconds
+
+        budget = self.budget(name)
+        started = time.perf_counter()
+        while True:
+            try:
+                met = bool(condition(driver))
+            except Exception:
+                met = False
+            elapsed = time.perf_counter() - started
+            if met or elapsed >= budget:
+                break
+            time.sleep(min(WAIT_POLICY_POLL_SECONDS, budget - elapsed))
+
+        self.record(name, elapsed, met=met, learn=True)
+        return elapsed
+
+    def record(self, name, seconds, met, learn):
+        with self.lock:
+            outcome = self.outcomes.setdefault(name, {'calls': 0, 'met': 0, 'timeouts': 0,
+                                                      'seconds': 0.0, 'fixed_seconds': 0.0})
+            outcome['calls'] += 1
+            outcome['seconds'] += seconds
+            outcome['fixed_seconds'] += WAIT_POINTS[name][0]
+            if met:
+                outcome['met'] += 1
+            elif met is False:
+                outcome['timeouts'] += 1
+            if learn:
+                samples = self.samples.setdefault(name, [])
+                samples.append(round(seconds, 3))
+                del samples[:-WAIT_POLICY_SAMPLES]
+
+    def seconds_saved(self):
+        """Seconds saved against the old fixed sleeps since the last report"""
+        return sum(outcome['fixed_seconds'] - outcome['seconds'] for outcome in self.outcomes.values())
+
+    def save(self):
+        """Write the observed wait times, keeping points of other runs as they are on disk"""
+        if not self.policy_file:
+            return
+        with self.lock:
+            data = {}
+            try:
+                with open(self.policy_file, 'r', encoding='utf-8') as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                pass
+            data.update(self.samples)
+            temp_file = f"{self.policy_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, indent=2, sort_keys=True)
+            os.replace(temp_file, self.policy_file)
+
+    def report(self, label=None, reset=True):
+        """Log waits per point and the seconds saved, then persist the observed times"""
+        if not self.outcomes:
+            return
+        waited = sum(outcome['seconds'] for outcome in self.outcomes.values())
+        logger.info(f"\n{'='*80}")
+        logger.info(f"⏱️ WAIT POINTS{': ' + label if label else ''}")
+        logger.info(f"{'='*80}")
+        logger.info(f"📊 {waited:.1f}s waited, {self.seconds_saved():.1f}s saved against fixed sleeps "
+                    f"({'adaptive' if self.adaptive else 'fixed'} waits)")
+        for name, outcome in sorted(self.outcomes.items(), key=lambda item: -item[1]['seconds']):
+            logger.info(f"   {name:<22} {outcome['calls']:>6} waits {outcome['met']:>6} met "
+                        f"{outcome['timeouts']:>5} timeouts {outcome['seconds'] / outcome['calls']:>6.2f}s avg "
+                        f"(budget {self.budget(name):.2f}s, was {WAIT_POINTS[name][0]}s) "
+                        f"saved {outcome['fixed_seconds'] - outcome['seconds']:>7.1f}s")
+        self.save()
+        if reset:
+            self.reset()
+
+
+# Wait points shared by every scraper of the process
+WAIT_POLICY = WaitPolicy()
+
+
+def main():
+    """Show the learned budget of every wait point"""
+    policy = WaitPolicy()
+    print("⏱️ WAIT POINTS")
+    print("=" * 70)
+    for name, (fixed_seconds, condition) in WAIT_POINTS.items():
+        samples = policy.samples.get(name, [])
+        print(f"{name:<22} {condition or 'fixed':<18} was {fixed_seconds:>5}s  budget {policy.budget(name):>5.2f}s"
+              f"  ({len(samples)} samples)")
+
+
+if __name__ == "__main__":
+    main()
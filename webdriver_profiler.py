@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+WebDriver Profiler - Opt-in call counter and latency profiler for Selenium round trips
+- Wraps driver.execute, which every driver and WebElement command goes through
+  (find_element, .text, get_attribute, execute_script, click, ...)
+- Counts calls and cumulative latency per command type and per calling function
+- Writes a flame-style summary per state: top commands, top functions and a
+  collapsed-stack file (profiles/*.folded) for flamegraph.pl / speedscope
+
+Enable with WEBDRIVER_PROFILING=1 (benchmark_suite.py always attaches one for its call counts)
+"""
+
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+from snapshot_merger import clean_state_name
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+WEBDRIVER_PROFILING = os.environ.get("WEBDRIVER_PROFILING", "0") == "1"
+
+# Directory for the collapsed-stack files
+PROFILE_DIR = "profiles"
+
+# Repository frames kept per call stack
+PROFILE_STACK_DEPTH = 8
+
+# Rows shown per table in the summary
+PROFILE_TOP_N = 15
+# ===== END CONFIGURATION SECTION =====
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILER_FILE = os.path.abspath(__file__)
+
+
+def repo_call_stack(depth=PROFILE_STACK_DEPTH):
+    """Names of the repository functions on the current stack, outermost first"""
+    names = []
+    frame = sys._getframe(2)
+    while frame is not None and len(names) < depth:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != PROFILER_FILE and os.path.dirname(filename) == REPO_DIR:
+            names.append(frame.f_code.co_name)
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+class WebDriverProfiler:
+    """Per-command and per-function WebDriver call statistics"""
+
+    def __init__(self, driver, label="driver"):
+        self.driver = driver
+        self.label = label
+        self.original_execute = driver.execute
+        self.reset()
+        driver.execute = self.execute
+
+    def reset(self):
+        self.total_calls = 0
+        self.total_seconds = 0.0
+        self.by_command = {}     # command -> [calls, seconds]
+        self.by_function = {}    # innermost repo function -> [calls, seconds]
+        self.by_stack = {}       # (functions..., command) -> [calls, seconds]
+        self.started_at = time.time()
+
+    def execute(self, driver_command, params=None):
+        stack = repo_call_stack()
+        call_start = time.perf_counter()
+        try:
+            return self.original_execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - call_start
+            self.total_calls += 1
+            self.total_seconds += elapsed
+            function = stack[-1] if stack else '<unknown>'
+            for table, key in ((self.by_command, driver_command), (self.by_function, function),
+                               (self.by_stack, stack + (driver_command,))):
+                entry = table.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def detach(self):
+        self.driver.execute = self.original_execute
+
+    def folded_lines(self):
+        """Collapsed stacks weighted by cumulative latency in ms"""
+        return [f"{';'.join(stack)} {max(1, round(seconds * 1000))}"
+                for stack, (_, seconds) in sorted(self.by_stack.items())]
+
+    def write_folded(self, state_name=None, profile_dir=PROFILE_DIR):
+        os.makedirs(profile_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = clean_state_name(state_name) if state_name else "ALL_STATES"
+        path = os.path.join(profile_dir, f"{prefix}_{self.label}_webdriver_{timestamp}.folded")
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write("\n".join(self.folded_lines()) + "\n")
+        return path
+
+    def report(self, state_name=None, reset=True):
+        """Log the summary tables, write the collapsed stacks and start a new window"""
+        if self.total_calls == 0:
+            return None
+
+        wall_seconds = time.time() - self.started_at
+        logger.info(f"\n{'='*80}")
+        logger.info(f"🔬 WEBDRIVER PROFILE: {state_name or self.label}")
+        logger.info(f"{'='*80}")
+        logger.info(f"📊 {self.total_calls} WebDriver calls, {self.total_seconds:.1f}s in round trips "
+                    f"({self.total_seconds / wall_seconds * 100 if wall_seconds else 0:.0f}% of {wall_seconds:.0f}s wall time)")
+
+        for title, table in (("By command", self.by_command), ("By function", self.by_function)):
+            logger.info(f"   {title}:")
+            for name, (calls, seconds) in sorted(table.items(), key=lambda item: -item[1][1])[:PROFILE_TOP_N]:
+                logger.info(f"      {name:<45} {calls:>8} calls {seconds:>9.2f}s "
+                            f"{seconds / calls * 1000:>7.1f}ms/call")
+
+        path = self.write_folded(state_name)
+        logger.info(f"🔥 Collapsed stacks: {path}")
+        if reset:
+            self.reset()
+        return path
+
+
+def attach_profiler(driver, label, enabled=None):
+    """Profiler for the driver when WEBDRIVER_PROFILING is on (or enabled=True), else None"""
+    if enabled is None:
+        enabled = WEBDRIVER_PROFILING
+    if not enabled or driver is None:
+        return None
+    logger.info(f"🔬 WebDriver profiling enabled for {label}")
+    return WebDriverProfiler(driver, label)
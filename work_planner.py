@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Work Planner - Count-driven load balancing of scraping work across workers
+- Reads the district counts written by SchoolCountingTool (*_school_counts.csv)
+- Costs every district with the measured per-school rates of ProcessingTimeCalculator
+- Splits districts larger than a fair share into page ranges (100 results per page)
+- Assigns units longest-processing-time first to the least loaded worker
+- Writes the schedule as JSON (work_plans/), which "run" executes for one worker:
+  Phase 1 for each unit (district or page range), then Phase 2 on the unit's CSV
+- Units never upload to Google Sheets (each upload replaces the state's sheet); the
+  worker that finishes the last unit of a state merges the Phase 2 output of all its
+  units (snapshot_merger) and uploads the state once
+
+Usage: python work_planner.py plan WORKERS [phase1|phase2|combined] [counts.csv ...]
+       python work_planner.py run SCHEDULE.json WORKER_ID [phase1|all]
+       python work_planner.py upload SCHEDULE.json   (retry the uploads of finished states)
+"""
+
+import csv
+import glob
+import heapq
+import json
+import logging
+import math
+import os
+import sys
+from datetime import datetime
+
+from logging_setup import configure_logging
+from processing_time_calculator import ProcessingTimeCalculator
+from snapshot_merger import SnapshotMerger, clean_state_name, state_from_filename
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# ===== CONFIGURATION SECTION =====
+WORK_PLAN_DIR = "work_plans"
+
+# Results per page after set_results_per_page_to_100
+PLAN_PAGE_SIZE = 100
+
+# A unit may cost at most this fraction of one worker's fair share before it is split
+MAX_UNIT_SHARE = 0.5
+
+# Fixed cost of starting a unit (state/district selection and search)
+UNIT_OVERHEAD_SECONDS = 15
+
+# Cost of clicking past one page to reach the start of a page range
+PAGE_SKIP_SECONDS = 3
+# ===== END CONFIGURATION SECTION =====
+
+
+def load_district_counts(counts_files=None):
+    """[(state, district, schools)] from school counting CSV files"""
+    counts_files = counts_files or sorted(glob.glob("*_school_counts.csv"))
+    districts = {}
+    for counts_file in counts_files:
+        with open(counts_file, 'r', encoding='utf-8', newline='') as handle:
+            for row in csv.DictReader(handle):
+                try:
+                    schools = int(row['Total_Schools'])
+                except (KeyError, ValueError):
+                    continue
+                # The same district in several files (per-state and nationwide) is counted once
+                districts[(row['State'], row['District'])] = schools
+    return [(state, district, schools) for (state, district), schools in sorted(districts.items()) if schools > 0]
+
+
+def build_units(district_counts, workers, calculator, processing_type="combined"):
+    """District units, with districts above MAX_UNIT_SHARE of a fair share split into page ranges"""
+    def cost(state, schools, first_page=1):
+        estimate = calculator.get_percentile_estimate(schools, processing_type, state_name=state)
+        return estimate['p50_seconds'] + UNIT_OVERHEAD_SECONDS + (first_page - 1) * PAGE_SKIP_SECONDS
+
+    total_cost = sum(cost(state, schools) for state, _, schools in district_counts)
+    max_unit_cost = max(total_cost / max(1, workers) * MAX_UNIT_SHARE, 1)
+
+    units = []
+    for state, district, schools in district_counts:
+        pages = math.ceil(schools / PLAN_PAGE_SIZE)
+        pieces = min(pages, math.ceil(cost(state, schools) / max_unit_cost))
+        if pieces <= 1:
+            units.append({'state': state, 'district': district, 'first_page': 1, 'last_page': None,
+                          'schools': schools, 'expected_seconds': round(cost(state, schools), 1)})
+            continue
+
+        pages_per_piece = math.ceil(pages / pieces)
+        for first_page in range(1, pages + 1, pages_per_piece):
+            last_page = min(first_page + pages_per_piece - 1, pages)
+            piece_schools = min(last_page * PLAN_PAGE_SIZE, schools) - (first_page - 1) * PLAN_PAGE_SIZE
+            units.append({
+                'state': state, 'district': district, 'first_page': first_page,
+                # The last piece runs to the end, in case the district grew since counting
+                'last_page': last_page if last_page < pages else None,
+                'schools': piece_schools,
+                'expected_seconds': round(cost(state, piece_schools, first_page), 1),
+            })
+
+    for index, unit in enumerate(units, 1):
+        unit['unit_id'] = f"u{index:04d}"
+    return units
+
+
+def assign_units(units, workers):
+    """Longest-processing-time-first: each unit goes to the currently least loaded worker"""
+    assignments = [{'worker_id': worker_id, 'expected_seconds': 0.0, 'units': []}
+                   for worker_id in range(1, workers + 1)]
+    loads = [(0.0, worker_id) for worker_id in range(1, workers + 1)]
+    heapq.heapify(loads)
+    for unit in sorted(units, key=lambda unit: -unit['expected_seconds']):
+        load, worker_id = heapq.heappop(loads)
+        assignment = assignments[worker_id - 1]
+        assignment['units'].append(unit)
+        assignment['expected_seconds'] = round(load + unit['expected_seconds'], 1)
+        heapq.heappush(loads, (load + unit['expected_seconds'], worker_id))
+    return assignments
+
+
+def build_schedule(district_counts, workers, calculator=None, processing_type="combined"):
+    """Complete JSON-serialisable schedule"""
+    calculator = calculator or ProcessingTimeCalculator.from_measurements()
+    units = build_units(district_counts, workers, calculator, processing_type)
+    return schedule_from_units(units, workers, processing_type)
+
+
+def schedule_from_units(units, workers, processing_type="combined"):
+    """LPT-assign ready-made units (with expected_seconds) and wrap them as a schedule"""
+    for index, unit in enumerate(units, 1):
+        unit.setdefault('unit_id', f"u{index:04d}")
+    assignments = assign_units(units, workers)
+    total_seconds = sum(unit['expected_seconds'] for unit in units)
+    makespan = max((assignment['expected_seconds'] for assignment in assignments), default=0)
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'processing_type': processing_type,
+        'workers': workers,
+        'page_size': PLAN_PAGE_SIZE,
+        'total_schools': sum(unit['schools'] for unit in units),
+        'total_units': len(units),
+        'expected_total_seconds': round(total_seconds, 1),
+        'expected_makespan_seconds': round(makespan, 1),
+        # 1.0 = every worker finishes at the same time
+        'balance': round(total_seconds / workers / makespan, 3) if makespan else 1.0,
+        'assignments': assignments,
+    }
+
+
+def save_schedule(schedule, plan_dir=WORK_PLAN_DIR, prefix="schedule"):
+    os.makedirs(plan_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(plan_dir, f"{prefix}_{schedule['workers']}w_{timestamp}.json")
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(schedule, handle, indent=2)
+    return path
+
+
+def load_worker_units(schedule_file, worker_id):
+    """Units assigned to one worker"""
+    with open(schedule_file, 'r', encoding='utf-8') as handle:
+        schedule = json.load(handle)
+    for assignment in schedule['assignments']:
+        if assignment['worker_id'] == worker_id:
+            return assignment['units']
+    raise ValueError(f"Worker {worker_id} is not in {schedule_file} ({schedule['workers']} workers)")
+
+
+def show_schedule(schedule, calculator):
+    logger.info(f"\n{'='*80}")
+    logger.info(f"🗓️ WORK PLAN: {schedule['total_units']} units, {schedule['total_schools']:,} schools, "
+                f"{schedule['workers']} workers ({schedule['processing_type']})")
+    logger.info(f"{'='*80}")
+    for assignment in schedule['assignments']:
+        schools = sum(unit['schools'] for unit in assignment['units'])
+        logger.info(f"   👷 Worker {assignment['worker_id']}: {len(assignment['units'])} units, {schools:,} schools, "
+                    f"{calculator.format_time(assignment['expected_seconds'])}")
+    logger.info(f"⏱️ Expected completion (P50): {calculator.format_time(schedule['expected_makespan_seconds'])}")
+    logger.info(f"⚖️ Balance: {schedule['balance']*100:.1f}%")
+
+
+def run_phase1_units(units, scraper=None):
+    """Phase 1 for each unit (district or page range) in one browser session
+
+    Returns ([(unit, phase1_csv)], [failed unit ids]).
+    """
+    if scraper is None:
+        from sequential_state_processor import EnhancedStatewiseSchoolScraper
+        scraper = EnhancedStatewiseSchoolScraper()
+    scraper.setup_driver()  # raises when Chrome cannot be started
+    unit_files = []
+    failed_units = []
+    try:
+        if not scraper.navigate_to_portal():
+            raise RuntimeError("Portal navigation failed")
+        states = {state['stateName']: state for state in scraper.extract_states_data()}
+
+        for index, unit in enumerate(units, 1):
+            pages = f"pages {unit['first_page']}-{unit['last_page'] or 'end'}"
+            logger.info(f"\n📦 Unit {index}/{len(units)} ({unit['unit_id']}): "
+                        f"{unit['state']} / {unit['district']}, {pages}")
+            try:
+                state = states[unit['state']]
+                if not scraper.select_state(state):
+                    raise RuntimeError("state selection failed")
+                districts = {district['districtName']: district for district in scraper.extract_districts_data()}
+                district = districts[unit['district']]
+                if not scraper.select_district(district):
+                    raise RuntimeError("district selection failed")
+                if not scraper.enhanced_click_search_button():
+                    raise RuntimeError("search failed")
+                if (unit['first_page'] > 1 or unit['last_page']) and not scraper.results_per_page_100:
+                    # The page range was planned at PLAN_PAGE_SIZE results per page
+                    raise RuntimeError(f"could not set {PLAN_PAGE_SIZE} results per page for a page range")
+
+                scraper.current_state = state
+                scraper.current_district = district
+                scraper.initialize_csv_file(unit['state'], suffix=unit['unit_id'])
+                schools = scraper.extract_schools_basic_data_enhanced(unit['first_page'], unit['last_page'])
+                scraper.finalize_csv_file()
+                scraper.metrics.close()
+                if schools and os.path.exists(scraper.current_csv_file):
+                    unit_files.append((unit, scraper.current_csv_file))
+                logger.info(f"✅ Unit {unit['unit_id']}: {len(schools)} schools (planned {unit['schools']})")
+            except Exception as e:
+                logger.error(f"❌ Unit {unit['unit_id']} failed: {e}")
+                failed_units.append(unit['unit_id'])
+    finally:
+        scraper.driver.quit()
+    return unit_files, failed_units
+
+
+def run_phase2_files(unit_files):
+    """Phase 2 on each unit's Phase 1 CSV in one browser session
+
+    Returns ([(unit, phase2_incremental_csv)], [failed unit ids]).
+    """
+    import phase2_automated_processor
+
+    # A unit holds part of a state: its upload would replace the state's whole sheet
+    sheets_enabled = phase2_automated_processor.GOOGLE_SHEETS_ENABLED
+    phase2_automated_processor.GOOGLE_SHEETS_ENABLED = False
+    processor = None
+    output_files = []
+    failed_units = []
+    try:
+        processor = phase2_automated_processor.AutomatedPhase2Processor()
+        processor.setup_driver()  # raises when Chrome cannot be started
+        for unit, csv_file in unit_files:
+            processor.output_suffix = unit['unit_id']
+            processor.incremental_csv_file = None
+            if not processor.process_state_file_automated(csv_file):
+                failed_units.append(unit['unit_id'])
+            if processor.incremental_csv_file and os.path.exists(processor.incremental_csv_file):
+                output_files.append((unit, processor.incremental_csv_file))
+    finally:
+        phase2_automated_processor.GOOGLE_SHEETS_ENABLED = sheets_enabled
+        if processor is not None and processor.driver:
+            processor.driver.quit()
+    return output_files, failed_units
+
+
+def outputs_file(schedule_file, worker_id):
+    """Finished units and Phase 2 files of one worker, next to the schedule"""
+    return f"{os.path.splitext(schedule_file)[0]}_worker{worker_id}_outputs.json"
+
+
+def save_worker_outputs(schedule_file, worker_id, units, output_files):
+    """Record that the worker's units are done (failed ones too: nothing more will come)"""
+    outputs = {'finished': [unit['unit_id'] for unit in units],
+               'phase2_files': {unit['unit_id']: csv_file for unit, csv_file in output_files}}
+    path = outputs_file(schedule_file, worker_id)
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as handle:
+        json.dump(outputs, handle, indent=2)
+    os.replace(temp_file, path)
+    return path
+
+
+def upload_state_output(csv_file, state_name):
+    """Upload one merged state file to its Phase2_{state} sheet"""
+    import phase2_automated_processor
+
+    uploader = phase2_automated_processor.GoogleSheetsUploader()
+    if not uploader.authenticate():
+        return False
+    return uploader.upload_phase2_data(csv_file, state_name)
+
+
+def upload_finished_states(schedule_file, upload=upload_state_output, output_dir="."):
+    """Merge and upload every state whose units have all finished, each state once
+
+    Returns {state: merged_csv} of the states uploaded by this call.
+    """
+    with open(schedule_file, 'r', encoding='utf-8') as handle:
+        schedule = json.load(handle)
+
+    finished = set()
+    phase2_files = {}
+    state_units = {}
+    for assignment in schedule['assignments']:
+        path = outputs_file(schedule_file, assignment['worker_id'])
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as handle:
+                outputs = json.load(handle)
+            finished.update(outputs['finished'])
+            phase2_files.update(outputs['phase2_files'])
+        for unit in assignment['units']:
+            state_units.setdefault(unit['state'], []).append(unit['unit_id'])
+
+    uploaded = {}
+    for state, unit_ids in sorted(state_units.items()):
+        running = [unit_id for unit_id in unit_ids if unit_id not in finished]
+        if running:
+            logger.info(f"⏳ {state}: upload waits for {len(running)} unfinished units")
+            continue
+        csv_files = [phase2_files[unit_id] for unit_id in unit_ids
+                     if unit_id in phase2_files and os.path.exists(phase2_files[unit_id])]
+        if not csv_files:
+            continue
+
+        # The first worker to see the state finished uploads it
+        claim_file = f"{os.path.splitext(schedule_file)[0]}_{clean_state_name(state)}.uploaded"
+        try:
+            os.close(os.open(claim_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            continue
+
+        success = False
+        try:
+            for merged_file in SnapshotMerger(csv_files, output_dir=output_dir).merge().values():
+                logger.info(f"📤 Uploading {state}: {len(csv_files)} units merged into {merged_file}")
+                success = upload(merged_file, state_from_filename(merged_file))
+                if success:
+                    uploaded[state] = merged_file
+        except Exception as e:
+            logger.error(f"❌ Error merging the units of {state}: {e}")
+        if not success:
+            os.remove(claim_file)  # "upload SCHEDULE.json" retries it
+            logger.warning(f"⚠️ Google Sheets upload failed for {state}")
+    return uploaded
+
+
+def sheets_upload_enabled():
+    import phase2_automated_processor
+
+    if not phase2_automated_processor.GOOGLE_SHEETS_ENABLED:
+        return False
+    if phase2_automated_processor.INCREMENTAL_REFRESH:
+        # The units hold only the changed schools, not the whole state
+        logger.info("ℹ️ Incremental refresh: Google Sheets upload skipped")
+        return False
+    return True
+
+
+def run_worker(schedule_file, worker_id, phases=('phase1', 'phase2')):
+    """Execute the units of one worker: Phase 1 per unit, then Phase 2 on the unit CSV"""
+    units = load_worker_units(schedule_file, worker_id)
+    logger.info(f"👷 Worker {worker_id}: {len(units)} units from {schedule_file}")
+
+    unit_files, failed_units = run_phase1_units(units)
+    if 'phase2' in phases:
+        output_files = []
+        if unit_files:
+            output_files, phase2_failed = run_phase2_files(unit_files)
+            failed_units += phase2_failed
+        save_worker_outputs(schedule_file, worker_id, units, output_files)
+        if sheets_upload_enabled():
+            upload_finished_states(schedule_file)
+
+    logger.info(f"\n🎯 Worker {worker_id} finished: {len(units) - len(set(failed_units))}/{len(units)} units")
+    if failed_units:
+        logger.info(f"   ❌ Failed units: {', '.join(sorted(set(failed_units)))}")
+    return not failed_units
+
+
+def main():
+    """Main function for the work planner"""
+    configure_logging()
+    print("🗓️ WORK PLANNER")
+    print("Balanced work units from school counts")
+    print()
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "plan":
+        workers = int(sys.argv[2])
+        processing_type = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] in ('phase1', 'phase2', 'combined') else "combined"
+        counts_files = [argument for argument in sys.argv[3:] if argument.endswith('.csv')]
+
+        district_counts = load_district_counts(counts_files)
+        if not district_counts:
+            print("❌ No school counts found - run school_counting_tool.py first")
+            return
+
+        calculator = ProcessingTimeCalculator.from_measurements()
+        schedule = build_schedule(district_counts, workers, calculator, processing_type)
+        path = save_schedule(schedule)
+        show_schedule(schedule, calculator)
+        logger.info(f"📁 Schedule saved: {path}")
+
+    elif len(sys.argv) >= 4 and sys.argv[1] == "run":
+        phases = ('phase1',) if len(sys.argv) > 4 and sys.argv[4] == 'phase1' else ('phase1', 'phase2')
+        success = run_worker(sys.argv[2], int(sys.argv[3]), phases)
+        print("\n✅ Worker completed" if success else "\n❌ Worker finished with failed units")
+
+    elif len(sys.argv) >= 3 and sys.argv[1] == "upload":
+        if not sheets_upload_enabled():
+            print("❌ Google Sheets upload is disabled")
+            return
+        uploaded = upload_finished_states(sys.argv[2])
+        print(f"\n✅ Uploaded {len(uploaded)} states" if uploaded else "\nℹ️ No finished state left to upload")
+
+    else:
+        print("Usage: python work_planner.py plan WORKERS [phase1|phase2|combined] [counts.csv ...]")
+        print("       python work_planner.py run SCHEDULE.json WORKER_ID [phase1|all]")
+        print("       python work_planner.py upload SCHEDULE.json")
+
+
+if __name__ == "__main__":
+    main()